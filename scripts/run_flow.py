@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+# ============================================================================
+# Flow Runner - DAG scheduler for syn, floorplan, pnr and signoff
+# ============================================================================
+# Purpose: Model the implementation flow of counter_32bit as a dependency
+#          graph - one node per synthesis report, the gate-level netlist,
+#          the waveform report, the analytic placement and global routing
+#          (syn/placer.py, syn/router.py) and the floorplan / place and
+#          route / signoff stages - and run it on a worker pool:
+#          independent nodes run in parallel, and only stale nodes run.
+#
+# Staleness: a node's signature hashes its input files, its settings and
+#   the signatures of the nodes it depends on. A node runs when its
+#   signature differs from the one recorded in the state file by its last
+#   successful run, or when one of its outputs is missing.
+#
+# Tcl stages run "<tool> -f <script>" from the stage directory with the
+#   output captured in the stage's simulation log. Without the EDA tool on
+#   PATH they are replayed: the committed log and reports stand in for the
+#   tool run, provided they exist.
+#
+# Timeline: every node runs in a fresh worker process, so its CPU time
+#   (user + system, including child processes) and peak RSS are its own.
+# Usage:   python scripts/run_flow.py [-j N] [--force] [--dry-run]
+#                                     [--only NODE[,NODE...]] [--timeline FILE]
+# ============================================================================
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SYN_DIR = os.path.join(ROOT, "syn")
+STATE_FILE = os.path.join(ROOT, ".flow_state.json")
+DESIGN_NAME = "counter_32bit"
+
+sys.path.insert(0, SYN_DIR)
+import flow_cache  # noqa: E402
+from report_engine import REPORT_GENERATORS  # noqa: E402
+
+# A flow node; action is a picklable (kind, *args) tuple run by execute()
+Node = namedtuple("Node", "name deps inputs outputs action")
+
+# One node's run: status is ran / replayed / fresh / skipped / failed
+NodeResult = namedtuple("NodeResult", "name status start wall cpu rss message")
+
+# Width of the timeline bars
+TIMELINE_BAR = 30
+
+
+def _path(*parts):
+    return os.path.join(ROOT, *parts)
+
+
+def build_graph():
+    """{name: Node} of the counter_32bit flow"""
+    rtl = _path("rtl", f"{DESIGN_NAME}.v")
+    sdc = _path("syn", "constraints", f"{DESIGN_NAME}.sdc")
+    lib = _path("syn", "libs", "typical_1.0V_25C.lib")
+    tool = ("tool:syn",)
+    nodes = []
+
+    reports = []
+    for filename in REPORT_GENERATORS:
+        name = f"syn.{filename.rpartition('.')[0]}"
+        reports.append(name)
+        nodes.append(Node(name, (), (rtl, sdc, lib) + tool,
+                          (_path("syn", "reports", filename),), ("report", filename)))
+    nodes.append(Node("syn.netlist", (), (rtl, sdc, lib) + tool,
+                      (_path("syn", "netlists", f"{DESIGN_NAME}_syn.v"),), ("netlist",)))
+    nodes.append(Node("syn.waveform", (), (rtl,) + tool,
+                      (_path("docs", "waveform_report.txt"),), ("waveform",)))
+
+    nodes.append(Node("floorplan", ("syn.netlist", "syn.qor", "syn.area"),
+                      (_path("floorplan", "scripts", "floorplan.tcl"), sdc),
+                      (_path("floorplan", "floorplan_simulation.log"),
+                       _path("floorplan", "reports", "design_area.rpt"),
+                       _path("floorplan", "reports", "floorplan_summary.rpt"),
+                       _path("floorplan", "reports", "port_placement.rpt")),
+                      ("tcl", "icc_shell", "floorplan", "floorplan.tcl",
+                       "floorplan_simulation.log")))
+    nodes.append(Node("pnr.place_route", ("syn.netlist", "floorplan"),
+                      (rtl, sdc, lib, _path("floorplan", "reports", "port_placement.rpt"),
+                       _path("signoff", "documentation", "layer_stack.txt")) + tool,
+                      (_path("pnr", "reports", "placement.rpt"),
+                       _path("pnr", "reports", "routing.rpt"),
+                       _path("pnr", "reports", "qor_summary.rpt")),
+                      ("place_route",)))
+    nodes.append(Node("pnr", ("floorplan", "pnr.place_route"),
+                      (_path("pnr", "scripts", "place_and_route.tcl"), sdc),
+                      (_path("pnr", "pnr_simulation.log"),
+                       _path("pnr", "reports", "timing_setup.rpt")),
+                      ("tcl", "icc2_shell", "pnr", "place_and_route.tcl",
+                       "pnr_simulation.log")))
+    nodes.append(Node("signoff", ("pnr", "syn.timing", "syn.power"),
+                      (_path("signoff", "scripts", "final_signoff.tcl"), sdc),
+                      (_path("signoff", "signoff_simulation.log"),),
+                      ("tcl", "pt_shell", "signoff", "final_signoff.tcl",
+                       "signoff_simulation.log")))
+    nodes.append(Node("syn", tuple(reports) + ("syn.netlist", "syn.waveform"), (), (),
+                      ("group",)))
+    nodes.append(Node("flow", ("syn", "signoff"), (), (), ("group",)))
+    return {node.name: node for node in nodes}
+
+
+def topological_order(graph):
+    """Node names with every node after its dependencies; raises on cycles"""
+    order, state = [], {}
+
+    def visit(name, path):
+        if state.get(name) == "done":
+            return
+        if state.get(name) == "open":
+            raise ValueError(f"Dependency cycle: {' -> '.join(path + [name])}")
+        if name not in graph:
+            raise KeyError(f"Unknown flow node '{name}'")
+        state[name] = "open"
+        for dep in graph[name].deps:
+            visit(dep, path + [name])
+        state[name] = "done"
+        order.append(name)
+
+    for name in graph:
+        visit(name, [])
+    return order
+
+
+def signatures(graph, order):
+    """{name: signature} from input digests, actions and upstream signatures"""
+    tool = flow_cache.tool_digest(os.path.join(SYN_DIR, "*.py"))
+    result = {}
+    for name in order:
+        node = graph[name]
+        h = hashlib.sha256(json.dumps(node.action).encode())
+        for path in node.inputs:
+            h.update(b"\0" + (tool if path == "tool:syn" else
+                              flow_cache.file_digest(path)).encode())
+        for dep in node.deps:
+            h.update(b"\0" + result[dep].encode())
+        result[name] = h.hexdigest()
+    return result
+
+
+def load_state(path=STATE_FILE):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_state(state, path=STATE_FILE):
+    flow_cache.write_if_changed(path, json.dumps(state, indent=1, sort_keys=True) + "\n")
+
+
+def is_stale(node, signature, state):
+    return (state.get(node.name) != signature or
+            not all(os.path.exists(path) for path in node.outputs))
+
+
+def _simulator():
+    from run_synthesis_simulation import SynthesisSimulator
+    return SynthesisSimulator()
+
+
+def _run_tcl(tool, stage, script, log):
+    """Run a stage script with its EDA tool; replay its committed outputs without it"""
+    stage_dir = _path(stage)
+    executable = shutil.which(tool)
+    if executable is None:
+        return "replayed", f"{tool} not found; using {stage}/{log}"
+    with open(os.path.join(stage_dir, log), 'w') as f:
+        proc = subprocess.run([executable, "-f", os.path.join("scripts", script)],
+                              cwd=stage_dir, stdout=f, stderr=subprocess.STDOUT)
+    if proc.returncode:
+        raise RuntimeError(f"{tool} exited with status {proc.returncode} (see {stage}/{log})")
+    return "ran", f"{tool} -f scripts/{script}"
+
+
+def execute(node):
+    """Worker entry point: run one node
+
+    Returns (status, message, start, end, cpu, rss KiB); start and end are
+    epoch times so the scheduler can place the run on its timeline.
+    """
+    start = time.time()
+    before = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    os.chdir(SYN_DIR)  # the synthesis code resolves ../syn/... paths
+    with contextlib.redirect_stdout(io.StringIO()):
+        status, message = _execute(node)
+    after = resource.getrusage(resource.RUSAGE_SELF)
+    done = resource.getrusage(resource.RUSAGE_CHILDREN)
+    cpu = (after.ru_utime - before.ru_utime + after.ru_stime - before.ru_stime +
+           done.ru_utime - children.ru_utime + done.ru_stime - children.ru_stime)
+    return status, message, start, time.time(), cpu, max(after.ru_maxrss, done.ru_maxrss)
+
+
+def _execute(node):
+    kind, *args = node.action
+    status, message = "ran", ""
+    if kind == "report":
+        filename = args[0]
+        content = getattr(_simulator(), REPORT_GENERATORS[filename])()
+        flow_cache.write_if_changed(node.outputs[0], content)
+    elif kind == "netlist":
+        _simulator().generate_synthesized_netlist()
+    elif kind == "waveform":
+        _simulator().generate_waveform_report()
+    elif kind == "place_route":
+        _simulator().save_pnr_reports()
+    elif kind == "tcl":
+        status, message = _run_tcl(*args)
+        missing = [os.path.relpath(p, ROOT) for p in node.outputs if not os.path.exists(p)]
+        if missing:
+            raise RuntimeError(f"missing outputs: {', '.join(missing)}")
+    return status, message
+
+
+def run_flow(graph, targets=None, jobs=1, force=False, dry_run=False, state_path=STATE_FILE):
+    """Run the stale nodes needed by targets (default: all); return [NodeResult]"""
+    order = topological_order(graph)
+    if targets:
+        wanted = set()
+        pending = list(targets)
+        while pending:
+            name = pending.pop()
+            if name not in graph:
+                raise KeyError(f"Unknown flow node '{name}'")
+            if name not in wanted:
+                wanted.add(name)
+                pending.extend(graph[name].deps)
+        order = [name for name in order if name in wanted]
+    signature = signatures(graph, order)
+    state = load_state(state_path)
+    # Groups have no outputs of their own: stale when a dependency is
+    stale = set()
+    for name in order:
+        node = graph[name]
+        if node.action[0] == "group":
+            if force or any(dep in stale for dep in node.deps):
+                stale.add(name)
+        elif force or is_stale(node, signature[name], state):
+            stale.add(name)
+
+    started = time.time()
+    results = {}
+    remaining = {name: set(graph[name].deps) for name in order}
+    failed = set()
+
+    def finish(name, status, start, wall=0.0, cpu=0.0, rss=0, message=""):
+        results[name] = NodeResult(name, status, start, wall, cpu, rss, message)
+        if status in ("ran", "replayed", "fresh"):
+            state[name] = signature[name]
+        else:
+            failed.add(name)
+        for deps in remaining.values():
+            deps.discard(name)
+
+    if dry_run:
+        for name in order:
+            finish(name, "stale" if name in stale else "fresh", 0.0)
+        return [results[name] for name in order]
+
+    workers = max(1, jobs)
+    with ProcessPoolExecutor(max_workers=workers, max_tasks_per_child=1) as pool:
+        running = {}
+        while remaining or running:
+            for name in [n for n, deps in remaining.items() if not deps]:
+                del remaining[name]
+                node = graph[name]
+                now = time.time() - started
+                if any(dep in failed for dep in node.deps):
+                    finish(name, "skipped", now, message="upstream failure")
+                elif node.action[0] == "group":
+                    ran = any(results[dep].status in ("ran", "replayed") for dep in node.deps)
+                    finish(name, "ran" if ran else "fresh", now)
+                elif name not in stale:
+                    finish(name, "fresh", now)
+                elif len(running) < workers:
+                    running[pool.submit(execute, node)] = (name, now)
+                else:
+                    remaining[name] = set()  # ready; wait for a worker
+                    break
+            if not running:
+                if remaining and all(remaining.values()):
+                    raise RuntimeError("flow graph stalled")  # unreachable for a DAG
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name, submitted = running.pop(future)
+                try:
+                    status, message, start, end, cpu, rss = future.result()
+                except Exception as exc:  # reported in the timeline
+                    finish(name, "failed", submitted, time.time() - started - submitted,
+                           message=str(exc))
+                else:
+                    finish(name, status, start - started, end - start, cpu, rss, message)
+    save_state(state, state_path)
+    return [results[name] for name in order]
+
+
+def timeline(results):
+    """Timeline table: start offset, wall, CPU, peak RSS and a bar per node"""
+    end = max((r.start + r.wall for r in results), default=0.0) or 1.0
+    lines = [f"{'Node':<16}{'Status':<10}{'Start':>8}{'Wall':>9}{'CPU':>9}{'Peak RSS':>11}  "
+             f"Timeline",
+             "-" * (64 + TIMELINE_BAR)]
+    for r in results:
+        first = int(r.start / end * TIMELINE_BAR)
+        width = max(int(round(r.wall / end * TIMELINE_BAR)), 1 if r.wall else 0)
+        bar = " " * first + "█" * width
+        rss = f"{r.rss / 1024:.1f} MiB" if r.rss else "-"
+        lines.append(f"{r.name:<16}{r.status:<10}{r.start:>7.2f}s{r.wall:>8.2f}s"
+                     f"{r.cpu:>8.2f}s{rss:>11}  {bar:<{TIMELINE_BAR}}"
+                     + (f"  {r.message}" if r.message else ""))
+    ran = [r for r in results if r.status in ("ran", "replayed") and r.wall]
+    cpu = sum(r.cpu for r in ran)
+    lines.append("")
+    lines.append(f"{len(ran)} of {len(results)} nodes run, wall {end if ran else 0.0:.2f}s, "
+                 f"CPU {cpu:.2f}s")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the counter_32bit flow as a DAG")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="parallel workers (default: CPU count)")
+    parser.add_argument("--only", metavar="NODE[,NODE...]",
+                        help="run these nodes and their dependencies")
+    parser.add_argument("--force", action="store_true", help="run every node")
+    parser.add_argument("--dry-run", action="store_true", help="list stale nodes only")
+    parser.add_argument("--timeline", metavar="FILE", help="also write the timeline here")
+    args = parser.parse_args(argv)
+
+    graph = build_graph()
+    targets = [name for name in args.only.split(",") if name] if args.only else None
+    results = run_flow(graph, targets, args.jobs, args.force, args.dry_run)
+    if args.dry_run:
+        for r in results:
+            deps = ", ".join(graph[r.name].deps)
+            print(f"{r.name:<16}{r.status:<8}{'<- ' + deps if deps else ''}")
+        return 0
+    table = timeline(results)
+    print(table)
+    if args.timeline:
+        with open(args.timeline, 'w') as f:
+            f.write(table + "\n")
+    return 1 if any(r.status == "failed" for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+# ============================================================================
+# Regression Runner - Concurrent simulator jobs over many seeds (asyncio)
+# ============================================================================
+# Purpose: Compile the counter testbench once, then launch one simulator
+#          run per seed, at most -j at a time (a bounded semaphore). Each
+#          job's output is streamed to its log and its $display lines
+#          ("<time> ns rst_n enable count overflow") are parsed and checked
+#          as they arrive, so a hung or slow job never blocks the others.
+#
+# Simulators: argument templates with {rtl} {tb} {top} {width} {build}
+#   {seed} {cycles} {python} {scripts} placeholders; "stub" runs
+#   scripts/stub_simulator.py, "iverilog" and "vcs" the real tools. Any
+#   other simulator plugs in through --compile / --run templates.
+#
+# Checks (per sample, streaming):
+#   - rst_n low (asynchronous reset) holds count at 0
+#   - overflow == (count is all ones && enable)
+#   - one clock period apart with rst_n high in both samples, count
+#     advances by the earlier sample's enable (modulo 2**WIDTH)
+#
+# Results: <out>/results.jsonl, one JSON object per job in completion
+#   order, and <out>/seed_<N>/simulation.log
+# Usage:   python scripts/run_regression.py [--simulator stub|iverilog|vcs]
+#              [--seeds N | --seed-list A,B,...] [-j N] [--timeout S]
+#              [--out DIR] [--compile TEMPLATE] [--run TEMPLATE]
+# ============================================================================
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import shlex
+import signal
+import sys
+import time
+from collections import Counter, namedtuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_OUT = os.path.join(ROOT, "sim", "regression")
+CLK_PERIOD = 10  # ns, as in the testbench
+
+# Longest simulator output line read in one piece
+MAX_LINE = 1 << 20
+
+# Failing seeds listed in the summary
+MAX_LISTED_FAILURES = 10
+
+# compile: argument template run once before the seeds (None: nothing to compile)
+Simulator = namedtuple("Simulator", "name compile run")
+
+SIMULATORS = {
+    "stub": Simulator("stub", None,
+                      ("{python}", "{scripts}/stub_simulator.py", "+seed={seed}",
+                       "--width", "{width}", "--cycles", "{cycles}")),
+    "iverilog": Simulator("iverilog",
+                          ("iverilog", "-g2005", "-P{top}.WIDTH={width}",
+                           "-o", "{build}/simv", "{rtl}", "{tb}"),
+                          ("vvp", "-n", "{build}/simv", "+seed={seed}")),
+    "vcs": Simulator("vcs",
+                     ("vcs", "-full64", "-sverilog", "-timescale=1ns/1ps",
+                      "-pvalue+{top}.WIDTH={width}", "{rtl}", "{tb}",
+                      "-o", "{build}/simv", "-l", "{build}/compile.log"),
+                     ("{build}/simv", "+ntb_random_seed={seed}")),
+}
+
+# One $display line of the testbench; count is None when it holds x/z bits
+Sample = namedtuple("Sample", "time rst_n enable count overflow")
+
+# status: pass, fail, timeout or error
+JobResult = namedtuple("JobResult", "seed status returncode samples overflows mismatches "
+                                    "message seconds log")
+
+DISPLAY = re.compile(r"^\s*(\d+)\s*ns\s+([01xXzZ])\s+([01xXzZ])\s+([0-9a-fA-FxXzZ]+)"
+                     r"\s+([01xXzZ])\s*$")
+OVERFLOW_EVENT = re.compile(r"\*\*\* OVERFLOW DETECTED")
+
+
+def _bit(text):
+    return int(text) if text in "01" else None
+
+
+def parse_line(line):
+    """Sample of a $display line, or None for other output"""
+    match = DISPLAY.match(line)
+    if match is None:
+        return None
+    time_, rst_n, enable, count, overflow = match.groups()
+    try:
+        value = int(count, 16)
+    except ValueError:
+        value = None  # x/z bits
+    return Sample(int(time_), _bit(rst_n), _bit(enable), value, _bit(overflow))
+
+
+class Scoreboard:
+    """Streaming checks of a job's samples against the counter's behaviour"""
+
+    def __init__(self, width=32):
+        self.mask = (1 << width) - 1
+        self.previous = None
+        self.samples = 0
+        self.overflows = 0  # OVERFLOW DETECTED messages
+        self.mismatches = 0
+        self.first_mismatch = ""
+
+    def check(self, sample):
+        """Mismatch text of a sample ('' when it is consistent)"""
+        if sample.count is None:
+            return ""
+        if sample.rst_n == 0 and sample.count:
+            return f"count {sample.count:x} under reset"
+        expected = int(sample.count == self.mask and sample.enable == 1)
+        if sample.overflow is not None and sample.overflow != expected:
+            return f"overflow {sample.overflow}, expected {expected}"
+        prev = self.previous
+        if prev is not None and prev.count is not None and prev.enable is not None \
+                and sample.time - prev.time == CLK_PERIOD and prev.rst_n == sample.rst_n == 1:
+            want = (prev.count + prev.enable) & self.mask
+            if sample.count != want:
+                return f"count {sample.count:x}, expected {want:x}"
+        return ""
+
+    def feed(self, line):
+        """Account one output line; returns its Sample or None"""
+        sample = parse_line(line)
+        if sample is None:
+            if OVERFLOW_EVENT.search(line):
+                self.overflows += 1
+            return None
+        self.samples += 1
+        mismatch = self.check(sample)
+        if mismatch:
+            self.mismatches += 1
+            if not self.first_mismatch:
+                self.first_mismatch = f"{sample.time} ns: {mismatch}"
+        self.previous = sample
+        return sample
+
+
+def _command(template, context):
+    return [arg.format(**context) for arg in template]
+
+
+def _kill(proc):
+    """Kill a job's process group (simulators may fork)"""
+    if proc.returncode is None:
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+
+async def _stream(proc, log, scoreboard, on_sample):
+    async for raw in proc.stdout:
+        line = raw.decode(errors="replace")
+        log.write(line)
+        sample = scoreboard.feed(line)
+        if sample is not None and on_sample is not None:
+            on_sample(sample)
+    return await proc.wait()
+
+
+async def run_job(simulator, seed, context, timeout=None, on_sample=None):
+    """Run one seed; its output streams to <out>/seed_<N>/simulation.log"""
+    workdir = os.path.join(context["out"], f"seed_{seed}")
+    os.makedirs(workdir, exist_ok=True)
+    log_path = os.path.join(workdir, "simulation.log")
+    scoreboard = Scoreboard(int(context["width"]))
+    started = time.perf_counter()
+    returncode, status, message = None, "error", ""
+    with open(log_path, 'w') as log:
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *_command(simulator.run, dict(context, seed=seed)), cwd=workdir,
+                stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT,
+                limit=MAX_LINE, start_new_session=True)
+        except OSError as exc:
+            message = f"cannot start simulator: {exc}"
+        else:
+            try:
+                returncode = await asyncio.wait_for(
+                    _stream(proc, log, scoreboard, on_sample and
+                            (lambda sample: on_sample(seed, sample))), timeout)
+            except asyncio.TimeoutError:
+                status, message = "timeout", f"killed after {timeout:g} s"
+            finally:
+                _kill(proc)
+                await proc.wait()
+    if returncode is not None:
+        if returncode:
+            status, message = "fail", f"exit status {returncode}"
+        elif scoreboard.mismatches:
+            status, message = "fail", scoreboard.first_mismatch
+        elif not scoreboard.samples:
+            status, message = "fail", "no $display samples"
+        else:
+            status = "pass"
+    return JobResult(seed, status, returncode, scoreboard.samples, scoreboard.overflows,
+                     scoreboard.mismatches, message, time.perf_counter() - started, log_path)
+
+
+async def compile_design(simulator, context):
+    """Run the simulator's compile step once into {build}; raises on failure"""
+    if simulator.compile is None:
+        return
+    os.makedirs(context["build"], exist_ok=True)
+    log_path = os.path.join(context["build"], "compile.out")
+    with open(log_path, 'wb') as log:
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *_command(simulator.compile, context), cwd=context["build"],
+                stdout=log, stderr=asyncio.subprocess.STDOUT)
+        except OSError as exc:
+            raise RuntimeError(f"{simulator.name} compile failed: {exc}") from None
+        if await proc.wait():
+            raise RuntimeError(f"{simulator.name} compile failed "
+                               f"(status {proc.returncode}, see {log_path})")
+
+
+async def run_regression(simulator, seeds, context, jobs=4, timeout=None,
+                         on_result=None, on_sample=None):
+    """Run every seed with at most `jobs` simulators at once; return [JobResult]
+
+    Seeds are consumed lazily, so a night's worth of seeds never sits in
+    memory as pending tasks. on_result(JobResult) is called as each job
+    finishes; on_sample(seed, Sample) for every parsed $display line.
+    """
+    await compile_design(simulator, context)
+    semaphore = asyncio.BoundedSemaphore(max(1, jobs))
+    results, running = [], set()
+
+    def done(task):
+        running.discard(task)
+        semaphore.release()
+        if not task.cancelled() and task.exception() is None:
+            results.append(task.result())
+            if on_result is not None:
+                on_result(task.result())
+
+    try:
+        for seed in seeds:
+            await semaphore.acquire()
+            task = asyncio.create_task(run_job(simulator, seed, context, timeout, on_sample))
+            running.add(task)
+            task.add_done_callback(done)
+        if running:
+            await asyncio.gather(*running)
+    finally:
+        for task in running:
+            task.cancel()
+    return results
+
+
+def summary(results, wall):
+    """Pass/fail counts, throughput and the first failing seeds"""
+    statuses = Counter(r.status for r in results)
+    lines = [f"{len(results)} jobs in {wall:.2f} s ({len(results) / max(wall, 1e-9):.1f} jobs/s): "
+             + ", ".join(f"{statuses[s]} {s}" for s in ("pass", "fail", "timeout", "error")),
+             f"{sum(r.samples for r in results):,} samples, "
+             f"{sum(r.overflows for r in results):,} overflow events, "
+             f"{sum(r.mismatches for r in results):,} mismatches"]
+    if results:
+        slowest = max(results, key=lambda r: r.seconds)
+        lines.append(f"slowest: seed {slowest.seed} ({slowest.seconds:.2f} s)")
+    failures = sorted((r for r in results if r.status != "pass"), key=lambda r: r.seed)
+    for r in failures[:MAX_LISTED_FAILURES]:
+        lines.append(f"  seed {r.seed:<8}{r.status:<9}{r.message}  ({os.path.relpath(r.log)})")
+    if len(failures) > MAX_LISTED_FAILURES:
+        lines.append(f"  ... ({len(failures) - MAX_LISTED_FAILURES} more)")
+    return "\n".join(lines)
+
+
+def _seeds(args):
+    if args.seed_list:
+        return [int(seed) for seed in args.seed_list.split(",") if seed]
+    return range(args.first_seed, args.first_seed + args.seeds)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run simulator jobs over many seeds")
+    parser.add_argument("--simulator", choices=sorted(SIMULATORS), default="stub")
+    parser.add_argument("--compile", metavar="TEMPLATE",
+                        help="custom compile command ('' for none)")
+    parser.add_argument("--run", metavar="TEMPLATE", help="custom per-seed run command")
+    parser.add_argument("--seeds", type=int, default=16, help="number of seeds")
+    parser.add_argument("--first-seed", type=int, default=1)
+    parser.add_argument("--seed-list", metavar="A,B,...", help="explicit seeds")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="concurrent simulator jobs (default: CPU count)")
+    parser.add_argument("--timeout", type=float, default=None, help="seconds per job")
+    parser.add_argument("--width", type=int, default=32)
+    parser.add_argument("--cycles", type=int, default=100, help="cycles per stub run")
+    parser.add_argument("--rtl", default=os.path.join(ROOT, "rtl", "counter_32bit.v"))
+    parser.add_argument("--tb", default=os.path.join(ROOT, "tb", "counter_32bit_tb.v"))
+    parser.add_argument("--top", default="counter_32bit_tb")
+    parser.add_argument("--out", default=DEFAULT_OUT)
+    parser.add_argument("-q", "--quiet", action="store_true", help="no per-job lines")
+    args = parser.parse_args(argv)
+
+    simulator = SIMULATORS[args.simulator]
+    if args.compile is not None:
+        simulator = simulator._replace(compile=tuple(shlex.split(args.compile)) or None)
+    if args.run:
+        simulator = simulator._replace(name="custom", run=tuple(shlex.split(args.run)))
+    out = os.path.abspath(args.out)
+    context = {"rtl": os.path.abspath(args.rtl), "tb": os.path.abspath(args.tb),
+               "top": args.top, "width": args.width, "cycles": args.cycles,
+               "out": out, "build": os.path.join(out, "build"),
+               "python": sys.executable, "scripts": os.path.join(ROOT, "scripts")}
+    os.makedirs(out, exist_ok=True)
+
+    started = time.perf_counter()
+    with open(os.path.join(out, "results.jsonl"), 'w') as results_file:
+        def report(result):
+            results_file.write(json.dumps(result._asdict()) + "\n")
+            if not args.quiet:
+                print(f"seed {result.seed:<8}{result.status:<9}{result.samples:>6} samples "
+                      f"{result.seconds:>7.2f} s  {result.message}", flush=True)
+
+        try:
+            results = asyncio.run(run_regression(simulator, _seeds(args), context, args.jobs,
+                                                 args.timeout, on_result=report))
+        except RuntimeError as exc:
+            print(f"ERROR: {exc}", file=sys.stderr)
+            return 2
+    print(summary(results, time.perf_counter() - started))
+    return 0 if all(r.status == "pass" for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# ============================================================================
+# Stub Simulator - Stand-in for VCS / Icarus in regression runs
+# ============================================================================
+# Purpose: Print the $display lines of tb/counter_32bit_tb.v
+#          ("<time> ns<TAB>rst_n<TAB>enable<TAB>count<TAB>overflow") for a
+#          seeded random stimulus, computed with syn/counter_model.py, so
+#          scripts/run_regression.py can be exercised without an EDA tool.
+#
+# Stimulus: reset for --reset cycles, then enable high with probability
+#   --duty per cycle; one sample per clock period. --start presets the
+#   counter (enable low on that cycle) so short runs reach the overflow.
+#   --delay sleeps per sample to mimic a slow simulator; --stuck-bit
+#   forces one count bit low to mimic a broken design.
+# Usage:   python scripts/stub_simulator.py [+seed=N | --seed N] [--cycles N]
+#              [--width W] [--duty D] [--start V] [--delay S] [--stuck-bit B]
+# ============================================================================
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "syn"))
+import counter_model  # noqa: E402
+
+CLK_PERIOD = 10  # ns, as in the testbench
+
+
+def _plusargs(argv):
+    """Translate simulator-style +name=value arguments to --name value"""
+    translated = []
+    for arg in argv:
+        if arg.startswith("+") and "=" in arg:
+            name, _, value = arg[1:].partition("=")
+            translated += [f"--{name.replace('_', '-')}", value]
+        else:
+            translated.append(arg)
+    return translated
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stub counter_32bit simulator")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--cycles", type=int, default=100)
+    parser.add_argument("--width", type=int, default=32)
+    parser.add_argument("--duty", type=float, default=0.8, help="enable probability")
+    parser.add_argument("--reset", type=int, default=2, help="reset cycles")
+    parser.add_argument("--start", type=lambda v: int(v, 0), default=None,
+                        help="counter value after reset (default: near the wrap)")
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds per sample")
+    parser.add_argument("--stuck-bit", type=int, default=None)
+    args = parser.parse_args(_plusargs(sys.argv[1:] if argv is None else argv))
+
+    mask = (1 << args.width) - 1
+    rst_n, enable = counter_model.power_stimulus(args.cycles, args.duty, args.reset,
+                                                 seed=args.seed)
+    start = args.start if args.start is not None else mask - args.cycles // 2
+    force = None
+    if args.reset < args.cycles:
+        # The forced cycle's clock edge holds the preset value: enable is low
+        force = {args.reset: start & mask}
+        enable[args.reset] = 0
+    trace = counter_model.trace(rst_n[:, 0], enable[:, 0], args.width, force=force)
+    digits = (args.width + 3) // 4
+
+    print(f"stub_simulator: seed {args.seed}, {args.cycles} cycles, WIDTH {args.width}")
+    for cycle in range(args.cycles):
+        count = int(trace.count[cycle])
+        if args.stuck_bit is not None:
+            count &= ~(1 << args.stuck_bit)
+        overflow = int(count == mask and trace.enable[cycle])
+        print(f"{cycle * CLK_PERIOD} ns\t{trace.rst_n[cycle]}\t{trace.enable[cycle]}\t"
+              f"{count:0{digits}x}\t{overflow}", flush=bool(args.delay))
+        if overflow:
+            print(f"*** OVERFLOW DETECTED at time {cycle * CLK_PERIOD + CLK_PERIOD // 2} ns ***")
+        if args.delay:
+            time.sleep(args.delay)
+    print(f"$finish at simulation time {args.cycles * CLK_PERIOD} ns")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
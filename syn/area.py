@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+# ============================================================================
+# Area - Cell and net area of a netlist from the Liberty library
+# ============================================================================
+# Purpose: Sum library cell areas over a netlist_db.Netlist, estimate net
+#          area with the library's wire load model, roll both up the
+#          instance hierarchy, and sweep WIDTH from per-bit slice results
+#
+# Net area: every net with a driver or load gets the wire load length of
+#   its fanout (load pins, plus one for an output port) times the model's
+#   area per unit length.
+#
+# Scaling: the counter is a chain of identical bit slices, so the netlists
+#   at WIDTH = R and R + 1 give the area of one slice; nets whose fanout
+#   grows by the same step from R to R + 1 to R + 2 (clk, rst_n,
+#   enable_buf) are re-evaluated per width with their fanout extrapolated.
+#   Every width then costs O(1) instead of building and walking its
+#   netlist.
+# Usage:   python area.py [--width W] [--scaling START:STOP:STEP]
+# ============================================================================
+
+import argparse
+import re
+import time
+from collections import namedtuple
+
+import numpy as np
+
+import cell_usage
+import liberty
+
+# Hierarchy levels are separated by '/' (or '.' in generate scopes)
+HIERARCHY_SEPARATOR = re.compile(r"[/.]")
+
+# Hierarchy rows listed before the rest are summarized
+MAX_HIERARCHY_ROWS = 16
+
+# Default WIDTH sweep of the area scaling curve
+SCALING_WIDTHS = (8, 16, 32, 64, 128, 256, 512, 1024, 2048, 4096)
+
+# Transistors per 2-input NAND gate equivalent
+TRANSISTORS_PER_GATE = 4
+
+ScalingCurve = namedtuple("ScalingCurve", "widths cells cell_area net_area total slice_area")
+
+
+def wire_length(wire_load, fanout):
+    """Wire load length of nets with the given fanouts (0 for unconnected nets)"""
+    fanout = np.asarray(fanout, dtype=np.float64)
+    if not wire_load.fanout_length:
+        return np.zeros_like(fanout)
+    fanouts, lengths = np.array(wire_load.fanout_length).T
+    length = np.interp(fanout, fanouts, lengths)
+    length += wire_load.slope * np.maximum(fanout - fanouts[-1], 0.0)
+    return np.where(fanout > 0, length, 0.0)
+
+
+def cell_areas(netlist, library):
+    """Library area (um^2) of every cell"""
+    type_area = np.array([library.cell(t.name).area for t in netlist.types] or [0.0])
+    return type_area[np.frombuffer(netlist.cell_type, dtype=np.uint16)]
+
+
+def net_fanout(netlist):
+    """Load pins of every net, counting an output port as one load"""
+    n = netlist
+    if n.net_driver is None:
+        n.build_index()
+    fanout = np.diff(n.fanout_start).astype(np.int64)
+    for port in n.ports:
+        if port.direction == "output":
+            base = n.bus_base[port.bus]
+            fanout[base:base + n.bus_width[port.bus]] += 1
+    return fanout
+
+
+def net_areas(netlist, library):
+    """Wire load area estimate (um^2) of every net"""
+    wire_load = library.wire_load
+    return wire_length(wire_load, net_fanout(netlist)) * wire_load.area
+
+
+def _scope(name):
+    """Hierarchy path of an instance name ('' at the top level)"""
+    parts = HIERARCHY_SEPARATOR.split(name)
+    return "/".join(parts[:-1])
+
+
+def hierarchy(netlist, cell_area, net_area):
+    """[(scope, depth, own cell area, own net area, rolled-up cell, rolled-up net)]
+
+    Nets count toward the scope of their driving cell (the top level for
+    nets driven by input ports). Scopes are listed depth-first.
+    """
+    n = netlist
+    blob = bytes(n.cell_name_blob)
+    if b"/" not in blob and b"." not in blob:
+        scope_of = np.zeros(n.cell_count, dtype=np.int64)
+        scopes = [""]
+    else:
+        index = {"": 0}
+        scope_of = np.array([index.setdefault(_scope(n.cell_name(c)), len(index))
+                             for c in range(n.cell_count)], dtype=np.int64)
+        scopes = list(index)
+    own_cell = np.bincount(scope_of, weights=cell_area, minlength=len(scopes))
+
+    driver = n.net_driver
+    driven = driver >= 0
+    net_scope = np.zeros(n.net_count, dtype=np.int64)
+    pin_cell = np.frombuffer(n.pin_cell, dtype=np.int32)
+    net_scope[driven] = scope_of[pin_cell[driver[driven]]] if n.cell_count else 0
+    own_net = np.bincount(net_scope, weights=net_area, minlength=len(scopes))
+
+    # Roll every scope's own area up into its ancestors
+    total_cell, total_net = {}, {}
+    for k, scope in enumerate(scopes):
+        path = scope
+        while True:
+            total_cell.setdefault(path, 0.0)
+            total_net.setdefault(path, 0.0)
+            total_cell[path] += own_cell[k]
+            total_net[path] += own_net[k]
+            if not path:
+                break
+            path = path.rpartition("/")[0]
+    own = {scope: (float(own_cell[k]), float(own_net[k])) for k, scope in enumerate(scopes)}
+    return [(scope, scope.count("/") + 1 if scope else 0, *own.get(scope, (0.0, 0.0)),
+             float(total_cell[scope]), float(total_net[scope])) for scope in sorted(total_cell)]
+
+
+def scaling_curve(build, library, widths=SCALING_WIDTHS, reference=None):
+    """Cells, cell/net/total area (um^2) of build(width) for every width
+
+    build(R), build(R + 1) and build(R + 2) are analyzed once (R = the
+    smallest width, at least 2); the other widths follow from the per-bit
+    slice.
+    """
+    widths = np.asarray(sorted(widths), dtype=np.int64)
+    if reference is None:
+        reference = max(int(widths[0]), 2)
+    if widths[0] < reference:
+        raise ValueError(f"Scaling widths must be at least the reference width {reference}")
+    wire_load = library.wire_load
+
+    def analyze(width):
+        n = build(width)
+        fanout = net_fanout(n)
+        names = {n.net_name(net): int(f) for net, f in enumerate(fanout.tolist())}
+        return n.cell_count, float(cell_areas(n, library).sum()), names
+
+    cells_a, cell_area_a, fanout_a = analyze(reference)
+    cells_b, cell_area_b, fanout_b = analyze(reference + 1)
+    _, _, fanout_c = analyze(reference + 2)
+
+    # Nets whose fanout grows by the same step with every added bit (a net
+    # at the end of the chain changes fanout only once)
+    growing = {}
+    for name, f in fanout_a.items():
+        step = fanout_b.get(name, f) - f
+        if step > 0 and fanout_c.get(name, f) - fanout_b[name] == step:
+            growing[name] = (f, step)
+
+    def fixed_area(fanouts):
+        rest = [f for name, f in fanouts.items() if name not in growing]
+        return float((wire_length(wire_load, rest) * wire_load.area).sum())
+
+    fixed_a, fixed_b = fixed_area(fanout_a), fixed_area(fanout_b)
+    extra = widths - reference
+    if growing:
+        start, step = np.array(list(growing.values()), dtype=np.float64).T
+        grown = start[:, None] + step[:, None] * extra[None, :]
+        growing_area = (wire_length(wire_load, grown) * wire_load.area).sum(axis=0)
+    else:
+        growing_area = np.zeros(len(widths))
+
+    cells = cells_a + (cells_b - cells_a) * extra
+    cell_area = cell_area_a + (cell_area_b - cell_area_a) * extra
+    net_area = fixed_a + (fixed_b - fixed_a) * extra + growing_area
+    slice_area = cell_area_b - cell_area_a + fixed_b - fixed_a
+    return ScalingCurve(widths, cells, cell_area, net_area, cell_area + net_area, slice_area)
+
+
+def _breakdown_rows(types, counts, total_area):
+    rows = []
+    for cell in types:
+        label = f"{cell.name} ({cell.description})" if cell.description else cell.name
+        area = counts.get(cell.name, 0) * cell.area
+        rows.append(f"  {label:<29}{counts.get(cell.name, 0):>5}{area:>15.2f}"
+                    f"{area / total_area if total_area else 0.0:>11.1%}")
+    return rows
+
+
+def report_fields(netlist, library, width, curve=None):
+    """Fields of the area report (and the QoR area summary)"""
+    n = netlist
+    if n.net_driver is None:
+        n.build_index()
+    cell_area = cell_areas(n, library)
+    net_area = net_areas(n, library)
+    total_cell, total_net = float(cell_area.sum()), float(net_area.sum())
+    total = total_cell + total_net
+    counts = n.cell_counts()
+
+    rows = []
+    scopes = hierarchy(n, cell_area, net_area)
+    for scope, depth, own_cell, own_net, rolled_cell, rolled_net in scopes[:MAX_HIERARCHY_ROWS]:
+        if not scope:
+            rows.append(f"{n.name:<37}{rolled_cell:>11.2f}{rolled_net:>12.2f}"
+                        f"{rolled_cell + rolled_net:>14.2f}")
+            if len(scopes) > 1 or own_cell:
+                rows.append(f"{'  (top level)':<37}{own_cell:>11.2f}{own_net:>12.2f}"
+                            f"{own_cell + own_net:>14.2f}")
+        else:
+            label = "  " * depth + scope.rpartition("/")[2]
+            rows.append(f"{label:<37}{rolled_cell:>11.2f}{rolled_net:>12.2f}"
+                        f"{rolled_cell + rolled_net:>14.2f}")
+    if len(scopes) > MAX_HIERARCHY_ROWS:
+        rows.append(f"  ... ({len(scopes) - MAX_HIERARCHY_ROWS} more scopes)")
+
+    # Every library cell of each category, used or not
+    sequential = [c for c in library.cells() if cell_usage.category(c) == "Sequential"]
+    combinational = [c for c in library.cells() if cell_usage.category(c) != "Sequential"]
+    used = set(counts)
+    sequential_count = sum(counts[c.name] for c in sequential if c.name in used)
+    sequential_area = sum(counts[c.name] * c.area for c in sequential if c.name in used)
+    buffers = sum(counts[c.name] for c in combinational
+                  if c.name in used and cell_usage.category(c) == "Buffers/Inverters")
+    combinational_count = n.cell_count - sequential_count
+    nand = library.cell("NAND2X1").area if "NAND2X1" in library else 1.0
+    gate_equivalent = total_cell / nand
+
+    fields = {
+        'wire_load': library.wire_load.name or "none",
+        'hierarchy_rows': "\n".join(rows),
+        'sequential_rows': "\n".join(_breakdown_rows(sequential, counts, total_cell)),
+        'sequential_count': sequential_count,
+        'sequential_area': sequential_area,
+        'sequential_share': sequential_area / total_cell if total_cell else 0.0,
+        'combinational_rows': "\n".join(_breakdown_rows(combinational, counts, total_cell)),
+        'combinational_count': combinational_count,
+        'combinational_area': total_cell - sequential_area,
+        'combinational_share': 1 - sequential_area / total_cell if total_cell else 0.0,
+        'total_cells': n.cell_count,
+        'total_cell_area': total_cell,
+        'net_area': total_net,
+        'total_area': total,
+        'flip_flops': sequential_count,
+        'logic_gates': combinational_count - buffers,
+        'buffer_cells': buffers,
+        'gate_equivalent': gate_equivalent,
+        'transistor_count': round(gate_equivalent * TRANSISTORS_PER_GATE),
+        'area_per_bit': total / width,
+        'net_count': int(np.count_nonzero((n.net_driver >= 0) | (np.diff(n.fanout_start) > 0))),
+        'port_count': sum(n.bus_width[p.bus] for p in n.ports),
+        'input_ports': sum(n.bus_width[p.bus] for p in n.ports if p.direction == "input"),
+        'output_ports': sum(n.bus_width[p.bus] for p in n.ports if p.direction == "output"),
+    }
+    if curve is not None:
+        fields['scaling_rows'] = "\n".join(
+            f"{w:>8}{c:>10}{a:>14.2f}{net:>12.2f}{t:>14.2f}{t / w:>12.2f}"
+            for w, c, a, net, t in zip(curve.widths.tolist(), curve.cells.tolist(),
+                                       curve.cell_area.tolist(), curve.net_area.tolist(),
+                                       curve.total.tolist()))
+        fields['slice_area'] = curve.slice_area
+    return fields
+
+
+def main(argv=None):
+    import netlist_gen
+
+    parser = argparse.ArgumentParser(description="Netlist area and WIDTH scaling")
+    parser.add_argument("--width", type=int, default=32)
+    parser.add_argument("--lib", default=liberty.DEFAULT_LIBRARY, help="Liberty cell library")
+    parser.add_argument("--scaling", metavar="START:STOP:STEP",
+                        help="WIDTH sweep (default: powers of two 8..4096)")
+    args = parser.parse_args(argv)
+    library = liberty.load_library(args.lib)
+
+    started = time.perf_counter()
+    fields = report_fields(netlist_gen.build_counter(args.width), library, args.width)
+    elapsed = time.perf_counter() - started
+    print(f"WIDTH {args.width}: {fields['total_cells']:,} cells, cell area "
+          f"{fields['total_cell_area']:.2f}, net area {fields['net_area']:.2f}, total "
+          f"{fields['total_area']:.2f} um^2 ({elapsed * 1e3:.1f} ms)")
+
+    if args.scaling:
+        start, stop, step = (int(x) for x in args.scaling.split(":"))
+        widths = range(start, stop + 1, step)
+    else:
+        widths = SCALING_WIDTHS
+    started = time.perf_counter()
+    curve = scaling_curve(netlist_gen.build_counter, library, widths)
+    elapsed = time.perf_counter() - started
+    print(f"\n{'WIDTH':>8}{'Cells':>10}{'Cell Area':>14}{'Net Area':>12}{'Total':>14}"
+          f"{'Per Bit':>12}")
+    for w, c, a, net, t in zip(curve.widths.tolist(), curve.cells.tolist(),
+                               curve.cell_area.tolist(), curve.net_area.tolist(),
+                               curve.total.tolist()):
+        print(f"{w:>8}{c:>10}{a:>14.2f}{net:>12.2f}{t:>14.2f}{t / w:>12.2f}")
+    print(f"\n{len(curve.widths)} widths in {elapsed * 1e3:.1f} ms "
+          f"(slice {curve.slice_area:.2f} um^2/bit)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# ============================================================================
+# Benchmark - Netlist DB memory and build time
+# ============================================================================
+# Purpose: Build the counter netlist at ~1M cells and report retained and
+#          peak memory per cell, build and index time, and query rate,
+#          against a dict/tuple-of-strings representation of the same cells
+# Usage:   python bench_netlist_db.py [--cells N] [--baseline-cells N]
+# ============================================================================
+
+import argparse
+import time
+import tracemalloc
+from collections import namedtuple
+
+import netlist_gen
+
+StringCell = namedtuple("StringCell", "name type pins")
+
+
+def string_counter(width):
+    """The counter as cells holding (pin, net name) tuples, for comparison"""
+    nets = {}
+    cells = []
+    carry = lambda i: "count[0]" if i == 0 else f"carry[{i}]"
+    for i in range(width):
+        if i:
+            cells.append(StringCell(f"U_inc_{i}", "XOR2X1", (
+                ("A", f"count[{i}]"), ("B", carry(i - 1)), ("Y", f"inc_result[{i}]"))))
+            cells.append(StringCell(f"U_carry_{i}", "AND2X1", (
+                ("A", f"count[{i}]"), ("B", carry(i - 1)), ("Y", f"carry[{i}]"))))
+        cells.append(StringCell(f"U_mux_{i}", "MUX2X1", (
+            ("A", f"count[{i}]"), ("B", f"inc_result[{i}]"), ("S", "enable_buf"),
+            ("Y", f"next_count[{i}]"))))
+        cells.append(StringCell(f"count_reg_{i}", "DFFQX1", (
+            ("D", f"next_count[{i}]"), ("CK", "clk"), ("CLR", "rst_n"), ("Q", f"count[{i}]"))))
+    for cell in cells:
+        for pin, net in cell.pins:
+            nets.setdefault(net, []).append((cell.name, pin))
+    return cells, nets
+
+
+def measure(build):
+    """(result, seconds, retained bytes, peak bytes) of build()
+
+    Time is taken on an untraced run, memory on a second run under
+    tracemalloc (which slows allocation-heavy code several times over).
+    """
+    start = time.perf_counter()
+    build()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    result = build()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, current, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cells", type=int, default=1_000_000,
+                        help="approximate netlist size in cells (default: 1000000)")
+    parser.add_argument("--baseline-cells", type=int, default=200_000,
+                        help="size of the string-based comparison (0 to skip)")
+    args = parser.parse_args()
+
+    width = max(1, args.cells // 4)
+    netlist, build_s, retained, peak = measure(lambda: netlist_gen.build_counter(width))
+    cells = netlist.cell_count
+    _, index_s, index_bytes, index_peak = measure(netlist.build_index)
+    retained += index_bytes
+
+    start = time.perf_counter()
+    loads = sum(len(netlist.fanout(net)) for net in range(0, netlist.net_count, 7))
+    query_s = time.perf_counter() - start
+
+    print(f"Netlist DB: {cells:,} cells, {len(netlist.pin_net):,} pins, "
+          f"{netlist.net_count:,} nets (WIDTH={width:,})")
+    print("-" * 80)
+    print(f"{'Build time':<32}{build_s:>12.2f} s   ({cells / build_s:,.0f} cells/s)")
+    print(f"{'Index time (driver + fanout)':<32}{index_s:>12.2f} s")
+    print(f"{'Array + blob bytes':<32}{netlist.nbytes() / cells:>12.1f} B/cell")
+    print(f"{'Retained (tracemalloc)':<32}{retained / cells:>12.1f} B/cell"
+          f"   ({retained / 2**20:,.1f} MiB)")
+    print(f"{'Peak during build':<32}{peak / cells:>12.1f} B/cell")
+    print(f"{'Peak during index':<32}{index_peak / cells:>12.1f} B/cell")
+    print(f"{'Fanout queries':<32}{netlist.net_count / 7 / query_s:>12,.0f} nets/s"
+          f"   ({loads:,} loads)")
+
+    if args.baseline_cells:
+        del netlist
+        (string_cells, _), build_s, retained, _ = measure(
+            lambda: string_counter(max(1, args.baseline_cells // 4)))
+        print()
+        print(f"Dict/tuple-of-strings baseline: {len(string_cells):,} cells")
+        print("-" * 80)
+        print(f"{'Build time':<32}{build_s:>12.2f} s   "
+              f"({len(string_cells) / build_s:,.0f} cells/s)")
+        print(f"{'Retained (tracemalloc)':<32}{retained / len(string_cells):>12.1f} B/cell")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# ============================================================================
+# Microbenchmark - Report rendering throughput (reports/second)
+# ============================================================================
+# Purpose: Compare per-call f-string formatting (the previous implementation
+#          of generate_*_report) against the compiled report templates.
+#          Both paths render the fields of SynthesisSimulator.layout_fields,
+#          computed once per configuration outside the measurement.
+# Usage:   python bench_report_templates.py [--seconds S]
+# ============================================================================
+
+import argparse
+import time
+from datetime import datetime
+
+from report_layouts import LAYOUTS
+from report_templates import render, timestamp
+from run_synthesis_simulation import SynthesisSimulator
+
+BENCH_REPORTS = [
+    ('timing', 'generate_timing_report'),
+    ('power', 'generate_power_report'),
+    ('qor', 'generate_qor_report'),  # formats a timestamp
+]
+
+# The two paths are measured alternately in this many rounds, best kept,
+# so drift in machine load does not favor whichever runs first
+ROUNDS = 5
+
+
+def legacy_renderer(name):
+    """Rebuild the layout as an f-string evaluated on every call
+
+    This reproduces the cost of the former generate_*_report methods: the
+    whole literal is re-assembled each call and the date is formatted inline.
+    """
+    source = "f" + repr(LAYOUTS[name]).replace("{date}", "{now().strftime(DATE_FORMAT)}")
+    code = compile(source, f"<legacy {name}>", "eval")
+
+    def render_legacy(fields):
+        fields = dict(fields)
+        fields['now'] = datetime.now
+        fields['DATE_FORMAT'] = '%Y-%m-%d %H:%M:%S'
+        return eval(code, {}, fields)
+    return render_legacy
+
+
+def template_renderer(name):
+    """The compiled path of generate_*_report once its fields are known"""
+    def render_template(fields):
+        fields['date'] = timestamp()
+        return render(name, fields)
+    return render_template
+
+
+def layout_fields(name, sims):
+    """Fields of the layout for each simulator, computed once per simulator"""
+    computed = {}
+    for sim in sims:
+        if id(sim) not in computed:
+            computed[id(sim)] = sim.layout_fields(name)
+    return [computed[id(sim)] for sim in sims]
+
+
+def throughput(func, workload, seconds):
+    """Calls per second of func(fields) over the given field sets"""
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        for fields in workload:
+            func(fields)
+        calls += len(workload)
+        elapsed = time.perf_counter() - start
+        if elapsed >= seconds:
+            return calls / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Report rendering throughput: per-call f-strings vs compiled templates")
+    parser.add_argument("--seconds", type=float, default=1.0,
+                        help="measurement time per case (default: 1.0)")
+    args = parser.parse_args()
+
+    # "sweep": every call sees a new configuration (no memo hits)
+    # "repeat": the same configuration is re-rendered
+    sweep = [SynthesisSimulator(clock_period=5.0 + i / 100) for i in range(100)]
+    repeat = [SynthesisSimulator()] * 100
+
+    print(f"{'Report':<28}{'Workload':<10}{'f-string (rps)':>16}"
+          f"{'template (rps)':>16}{'speedup':>10}")
+    print("-" * 80)
+    for name, method in BENCH_REPORTS:
+        legacy, compiled = legacy_renderer(name), template_renderer(name)
+        for workload, sims in (("sweep", sweep), ("repeat", repeat)):
+            fields = layout_fields(name, sims)
+            before = after = 0.0
+            for _ in range(ROUNDS):
+                before = max(before, throughput(legacy, fields, args.seconds / ROUNDS))
+                after = max(after, throughput(compiled, fields, args.seconds / ROUNDS))
+            print(f"{method:<28}{workload:<10}{before:>16,.0f}{after:>16,.0f}"
+                  f"{after / before:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# ============================================================================
+# Cell Usage - Instance, fanout and library usage of a netlist
+# ============================================================================
+# Purpose: Compute the cell usage report fields from a netlist_db.Netlist
+#          and its Liberty library: per-type instance counts and areas,
+#          the instance list by category, fanout distribution, high fanout
+#          nets and the share of the library the design uses
+# ============================================================================
+
+import numpy as np
+
+# Instances listed per category before the list is elided
+MAX_LISTED_INSTANCES = 5
+
+# Nets with at least this many load pins are listed as high fanout
+HIGH_FANOUT = 8
+MAX_HIGH_FANOUT_NETS = 5
+
+FANOUT_RANGES = ((0, 1), (2, 4), (5, 8), (9, 16), (17, None))
+
+# Width of the largest bar of the library cell distribution
+DISTRIBUTION_BAR = 44
+
+CATEGORIES = ("Sequential", "Combinational", "Buffers/Inverters")
+LIST_HEADINGS = ("Sequential Elements", "Combinational Logic", "Buffers/Inverters")
+
+
+def category(cell):
+    """Report category of a library cell"""
+    if cell.sequential or cell.clock_gating:
+        return "Sequential"
+    return "Buffers/Inverters" if len(cell.inputs) == 1 else "Combinational"
+
+
+def type_order(netlist, library):
+    """Cell types of a netlist: sequential first, then library order"""
+    order = {name: index for index, name in enumerate(library)}
+    return sorted(netlist.types, key=lambda t: (category(library.cell(t.name)) != "Sequential",
+                                                order.get(t.name, len(order))))
+
+
+def _instance_rows(netlist, library, cells, loads):
+    rows = []
+    for cell in cells:
+        type_ = netlist.type_of(cell)
+        net = netlist.pin_net[netlist.cell_pin_start[cell + 1] - 1]
+        rows.append(f"  {netlist.cell_name(cell):<25}{type_.name:<11}{loads[net]:>6}"
+                    f"{library.cell(type_.name).area:>14.2f}      {netlist.net_name(net)}")
+    return rows
+
+
+def report_fields(netlist, library):
+    """Fields of the cell usage report"""
+    n = netlist
+    if n.net_driver is None:
+        n.build_index()
+    cell_type = np.frombuffer(n.cell_type, dtype=np.uint16)
+    counts = np.bincount(cell_type, minlength=len(n.types))
+    types = type_order(n, library)
+    lib_cells = {t.name: library.cell(t.name) for t in types}
+
+    summary = [f"{t.name:<20}{t.name:<14}{counts[t.id]:>9}{1:>12}"
+               f"{counts[t.id] * lib_cells[t.name].area:>16.2f}" for t in types]
+    total_area = sum(counts[t.id] * lib_cells[t.name].area for t in types)
+
+    # Instances by category, in netlist order
+    loads = np.diff(n.fanout_start)
+    type_category = np.array([CATEGORIES.index(category(lib_cells[t.name])) for t in n.types])
+    cell_category = type_category[cell_type] if len(cell_type) else np.zeros(0, dtype=int)
+    instances = []
+    for index, heading in enumerate(LIST_HEADINGS):
+        cells = np.flatnonzero(cell_category == index).tolist()
+        if not cells:
+            continue
+        if instances:
+            instances.append("")
+        instances.append(f"{heading}:")
+        if len(cells) > MAX_LISTED_INSTANCES + 1:
+            instances += _instance_rows(n, library, cells[:MAX_LISTED_INSTANCES], loads)
+            instances.append(f"  ... ({len(cells) - MAX_LISTED_INSTANCES - 1} more)")
+            instances += _instance_rows(n, library, cells[-1:], loads)
+        else:
+            instances += _instance_rows(n, library, cells, loads)
+
+    # Fanout (load pins) of each instance's output net
+    out_nets = np.frombuffer(n.pin_net, dtype=np.int32)[
+        np.frombuffer(n.cell_pin_start, dtype=np.int32)[1:] - 1]
+    fanout = loads[out_nets]
+    total = max(len(fanout), 1)
+    distribution = []
+    for low, high in FANOUT_RANGES:
+        label = f"> {low - 1}" if high is None else f"{low} - {high}"
+        upper = np.inf if high is None else high
+        count = int(((fanout >= low) & (fanout <= upper)).sum())
+        distribution.append(f"{label:<20}{count:>9}{count / total:>18.1%}")
+
+    high_nets = np.flatnonzero(loads >= HIGH_FANOUT)
+    high_nets = high_nets[np.argsort(-loads[high_nets], kind="stable")][:MAX_HIGH_FANOUT_NETS]
+    high_fanout = [f"  {n.net_name(int(net)):<23}Fanout: {loads[net]}" for net in high_nets]
+
+    per_category = np.bincount(cell_category, minlength=len(CATEGORIES))
+    largest = max(int(per_category.max(initial=0)), 1)
+    labels = ("[Sequential Cells]", "[Combinational]", "[Buffers]")
+    cell_distribution = [
+        f"{label:<20}{'█' * max(round(DISTRIBUTION_BAR * count / largest), 1 if count else 0)}"
+        f"  {count} ({count / total:.1%})" for label, count in zip(labels, per_category.tolist())]
+
+    used = {t.name for t in types if counts[t.id]}
+    type_counts = {name: sum(1 for t in used if category(library.cell(t)) == name)
+                   for name in CATEGORIES}
+    unused = [f"  - {cell.name} ({cell.description})" for cell in library.cells()
+              if cell.name not in used]
+
+    def types_used(count):
+        return f"{count} type{'' if count == 1 else 's'} used"
+
+    return {
+        'cell_library': f"{library.name}.db",
+        'cell_summary': "\n".join(summary),
+        'total_instances': n.cell_count,
+        'reference_count': len(used),
+        'total_cell_area': total_area,
+        'instance_list': "\n".join(instances),
+        'fanout_distribution': "\n".join(distribution),
+        'high_fanout_nets': "\n".join(high_fanout) or f"  (no net with fanout >= {HIGH_FANOUT})",
+        'cell_distribution': "\n".join(cell_distribution),
+        'library_cells': len(library),
+        'library_usage': len(used) / max(len(library), 1),
+        'sequential_types': types_used(type_counts["Sequential"]),
+        'combinational_types': types_used(type_counts["Combinational"]),
+        'buffer_types': types_used(type_counts["Buffers/Inverters"]),
+        'unused_cells': "\n".join(unused) or "  (none)",
+    }
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+# ============================================================================
+# Clock Gating - What-if power of the counter register bank with clock gates
+# ============================================================================
+# Purpose: Compare the power of the counter_32bit register bank as
+#          synthesized (every flip-flop clocked each cycle, a MUX2X1 holds
+#          the count while enable is low) against two gated alternatives
+#          built from the library's integrated clock gate (ICGX1):
+#   none     clk drives all WIDTH flip-flops; recirculation muxes
+#   icg      one ICG enabled by `enable` drives all flip-flops; no muxes
+#   nibble   one ICG per 4-bit nibble, enabled by enable & carry-in of the
+#            nibble (an AND2X1 per upper nibble); no muxes
+#
+# Register bank = flip-flops, recirculation muxes, clock gates and their
+#   enable gates, and the clk / gated clock / enable nets they load. The
+#   incrementer and its nets are the same in every architecture and are
+#   left out.
+#
+# Activity: nibble k is clocked on the cycles that carry into it, i.e. as
+#   often as count[4k] toggles (nibble 0: every enabled cycle). A duty d
+#   of a free-running enable gives count[i] d / 2**i transitions per
+#   cycle; an enable trace (simulation or VCD) gives the counts directly.
+#   Every quantity is linear in the activity, so a sweep over N duties is
+#   one set of (N,) array expressions per architecture.
+# Usage:   python clock_gating.py [--width W] [--sweep N]
+#                                 [--distribution D:W,...] [--vcd FILE]
+# ============================================================================
+
+import argparse
+from collections import namedtuple
+
+import numpy as np
+
+import area
+import counter_model
+import liberty
+
+ARCHITECTURES = ("none", "icg", "nibble")
+ARCHITECTURE_NAMES = {
+    "none": "No gating (mux hold)",
+    "icg": "Single ICG",
+    "nibble": "Per-nibble ICG",
+}
+SWEEP_HEADINGS = ("No gating", "Single ICG", "Per-nibble")
+
+# Bits per gated group of the per-nibble architecture
+NIBBLE = 4
+
+# Duties listed in the sweep table, and points of the default sweep
+TABLE_DUTIES = (0.0, 0.05, 0.1, 0.25, 0.5, 0.75, 0.9, 1.0)
+SWEEP_POINTS = 1001
+
+# Per-cycle register bank activity for N cases (duties or traces):
+#   duty            (N,) fraction of cycles with enable high
+#   bit_density     (N, WIDTH) transitions per cycle of each count bit
+#   enable_density  (N,) transitions per cycle of enable
+BankActivity = namedtuple("BankActivity", "duty bit_density enable_density")
+
+# Power (µW, (N,) arrays) of one architecture; clock = clock pins, clock
+# gates and clock nets, logic = flip-flop data and mux/enable gates
+BankPower = namedtuple("BankPower", "name cells area clock logic leakage total")
+
+
+def duty_activity(duties, width):
+    """BankActivity of a free-running counter with a random enable of each duty"""
+    duty = np.atleast_1d(np.asarray(duties, dtype=np.float64))
+    return BankActivity(duty, counter_model.bit_density(width, duty), 2 * duty * (1 - duty))
+
+
+def trace_activity(activity):
+    """BankActivity of every instance of a counter_model.Activity
+
+    Bit 0 toggles on every increment, so its count is the number of
+    enabled (non-reset) cycles.
+    """
+    cycles = max(activity.cycles, 1)
+    bit_density = np.asarray(activity.bit_toggles, dtype=np.float64).T / cycles
+    return BankActivity(bit_density[:, 0], bit_density,
+                        np.asarray(activity.enable_toggles, dtype=np.float64) / cycles)
+
+
+def vcd_activity(stats, width):
+    """BankActivity of VcdReader.toggle_stats() of a counter dump"""
+    cycles = max(int(stats["clk"].bit_toggles[0]) // 2, 1) if "clk" in stats else 1
+    bit_density = np.zeros((1, width))
+    if "count" in stats:
+        toggles = np.asarray(stats["count"].bit_toggles[:width], dtype=np.float64)
+        bit_density[0, :len(toggles)] = toggles / cycles
+    enable = stats["enable"].bit_toggles[0] / cycles if "enable" in stats else 0.0
+    return BankActivity(bit_density[:, 0], bit_density, np.array([enable]))
+
+
+def windowed_duties(enable, window):
+    """Enable duty of every full window of a per-cycle enable trace"""
+    enable = np.asarray(enable, dtype=np.float64).ravel()
+    windows = len(enable) // window
+    return enable[:windows * window].reshape(windows, window).mean(axis=1)
+
+
+def bank_power(library, width, activity, frequency, voltage=None, leakage_derate=1.0):
+    """{architecture: BankPower} of the register bank for every activity case"""
+    voltage = library.nom_voltage if voltage is None else voltage
+    flop, mux = library.cell("DFFQX1"), library.cell("MUX2X1")
+    icg, and2 = library.cell("ICGX1"), library.cell("AND2X1")
+    wire_load = library.wire_load
+    duty, bit_density, enable_density = activity
+    nibbles = -(-width // NIBBLE)
+    nibble_bits = np.minimum(width - NIBBLE * np.arange(nibbles), NIBBLE)
+    # Nibble k is clocked as often as count[4k] toggles
+    clocked = bit_density[:, ::NIBBLE]
+
+    energy_scale = (voltage / library.nom_voltage) ** 2
+    to_uw = energy_scale * frequency / 1e3  # fJ per cycle -> µW
+
+    def net(pin_cap, fanout, density):
+        """Switching power (µW) of a net, 1/2 C V^2 per transition"""
+        capacitance = pin_cap + area.wire_length(wire_load, fanout) * wire_load.capacitance
+        return 0.5 * capacitance * voltage ** 2 * density * frequency
+
+    ck = flop.pin(flop.clock_pin).capacitance
+    data = flop.internal_energy * bit_density.sum(axis=1) * to_uw
+    flop_leakage = width * flop.leakage
+
+    results = {}
+    # Every flip-flop clocked each cycle; muxes feed Q back while enable is low
+    clock = width * flop.clock_energy * 2 * to_uw + net(width * ck, width, 2.0)
+    logic = (data + mux.internal_energy * bit_density.sum(axis=1) * to_uw +
+             net(width * mux.pin("S").capacitance, width, enable_density))
+    leakage = (flop_leakage + width * mux.leakage) * leakage_derate / 1e3
+    results["none"] = (2 * width, width * (flop.area + mux.area), clock, logic, leakage)
+
+    # One gate: the flip-flops see 2 transitions per enabled cycle
+    clock = (icg.clock_energy * 2 * to_uw + net(icg.pin("CK").capacitance, 1, 2.0) +
+             icg.internal_energy * 2 * duty * to_uw +
+             width * flop.clock_energy * 2 * duty * to_uw + net(width * ck, width, 2 * duty))
+    logic = data + net(icg.pin("E").capacitance, 1, enable_density)
+    leakage = (flop_leakage + icg.leakage) * leakage_derate / 1e3
+    results["icg"] = (width + 1, width * flop.area + icg.area, clock, logic, leakage)
+
+    # A gate per nibble; upper nibbles AND their carry-in into the enable
+    clock = (nibbles * icg.clock_energy * 2 * to_uw +
+             net(nibbles * icg.pin("CK").capacitance, nibbles, 2.0) +
+             icg.internal_energy * 2 * clocked.sum(axis=1) * to_uw +
+             flop.clock_energy * 2 * (clocked @ nibble_bits) * to_uw +
+             net(nibble_bits * ck, nibble_bits, 2 * clocked).sum(axis=1))
+    upper = clocked[:, 1:]
+    logic = (data + and2.internal_energy * 2 * upper.sum(axis=1) * to_uw +
+             net(icg.pin("E").capacitance + (nibbles - 1) * and2.pin("A").capacitance,
+                 nibbles, enable_density) +
+             net(icg.pin("E").capacitance, 1, 2 * upper).sum(axis=1))
+    leakage = ((flop_leakage + nibbles * icg.leakage + (nibbles - 1) * and2.leakage) *
+               leakage_derate / 1e3)
+    results["nibble"] = (width + 2 * nibbles - 1,
+                         width * flop.area + nibbles * icg.area + (nibbles - 1) * and2.area,
+                         clock, logic, leakage)
+
+    count = len(duty)
+    return {name: BankPower(name, cells, cell_area, np.broadcast_to(clock, (count,)),
+                            np.broadcast_to(logic, (count,)),
+                            np.full(count, leakage), clock + logic + leakage)
+            for name, (cells, cell_area, clock, logic, leakage) in results.items()}
+
+
+def break_even(duties, baseline, gated):
+    """Highest duty at which a gated architecture still saves power (None: never)"""
+    saves = np.flatnonzero(gated < baseline)
+    return float(duties[saves[-1]]) if saves.size else None
+
+
+def savings_rows(powers, weights=None):
+    """Savings table rows: power averaged over the cases (weighted)"""
+    baseline = np.average(powers["none"].total, weights=weights)
+    rows = []
+    for name in ARCHITECTURES:
+        p = powers[name]
+        clock, logic, leakage, total = (float(np.average(v, weights=weights))
+                                        for v in (p.clock, p.logic, p.leakage, p.total))
+        saving = 1 - total / baseline if baseline else 0.0
+        rows.append(f"{ARCHITECTURE_NAMES[name]:<21}{p.cells:>5}{p.area:>10.2f}{clock:>8.2f}"
+                    f"{logic:>8.2f}{leakage:>9.2f}{total:>9.2f}{saving:>9.1%}")
+    return rows
+
+
+def sweep_rows(library, width, frequency, voltage=None, leakage_derate=1.0,
+               points=SWEEP_POINTS):
+    """Duty sweep rows at TABLE_DUTIES plus the break-even duties of a full sweep"""
+    duties = np.union1d(np.linspace(0.0, 1.0, points), TABLE_DUTIES)
+    powers = bank_power(library, width, duty_activity(duties, width), frequency,
+                        voltage, leakage_derate)
+    rows = []
+    for duty in TABLE_DUTIES:
+        i = int(np.searchsorted(duties, duty))
+        totals = [float(powers[name].total[i]) for name in ARCHITECTURES]
+        best = ARCHITECTURES[int(np.argmin(totals))]
+        rows.append(f"{duty:>8.0%}   " + "".join(f"{t:>13.2f}" for t in totals) +
+                    f"    {ARCHITECTURE_NAMES[best]}")
+    rows.append("")
+    for name in ARCHITECTURES[1:]:
+        duty = break_even(duties, powers["none"].total, powers[name].total)
+        limit = ("never saves power" if duty is None else
+                 "saves power at every duty" if duty >= 1.0 else
+                 f"saves power below {duty:.1%} enable duty")
+        rows.append(f"{ARCHITECTURE_NAMES[name]}: {limit} ({len(duties):,}-point sweep)")
+    return rows, powers, duties
+
+
+def report_fields(library, width, activity, frequency, voltage=None, leakage_derate=1.0,
+                  weights=None):
+    """Fields of the power report's clock gating what-if
+
+    The savings table averages the activity cases (weighted); the duty
+    sweep is independent of them.
+    """
+    powers = bank_power(library, width, activity, frequency, voltage, leakage_derate)
+    sweep, _, _ = sweep_rows(library, width, frequency, voltage, leakage_derate)
+    totals = {name: float(np.average(powers[name].total, weights=weights))
+              for name in ARCHITECTURES}
+    best = min(ARCHITECTURES, key=totals.get)
+    if best == "none":
+        note = "✓ Clock gating would not reduce power at this enable activity"
+    else:
+        baseline = totals["none"]
+        note = (f"- {ARCHITECTURE_NAMES[best]} gating would save "
+                f"{1 - totals[best] / baseline:.1%} of register bank power "
+                f"({totals[best]:.2f} vs {baseline:.2f} µW)")
+    return {
+        'clock_gating_savings': "\n".join(savings_rows(powers, weights)),
+        'clock_gating_sweep': "\n".join(sweep),
+        'clock_gating_note': note,
+    }
+
+
+def parse_distribution(text):
+    """'D:W,D:W,...' -> (duties, weights)"""
+    duties, weights = [], []
+    for item in text.split(","):
+        duty, _, weight = item.partition(":")
+        duties.append(float(duty))
+        weights.append(float(weight or 1))
+    return np.array(duties), np.array(weights)
+
+
+def main(argv=None):
+    import time
+
+    parser = argparse.ArgumentParser(description="Clock gating what-if of the register bank")
+    parser.add_argument("--width", type=int, default=32)
+    parser.add_argument("--frequency", type=float, default=100.0, help="clock (MHz)")
+    parser.add_argument("--lib", default=liberty.DEFAULT_LIBRARY, help="Liberty cell library")
+    parser.add_argument("--sweep", type=int, default=SWEEP_POINTS, help="duty sweep points")
+    parser.add_argument("--distribution", metavar="D:W[,D:W...]",
+                        help="enable duty distribution (duty:weight pairs)")
+    parser.add_argument("--vcd", help="enable trace: toggle counts of a counter VCD")
+    args = parser.parse_args(argv)
+
+    library = liberty.load_library(args.lib)
+    started = time.perf_counter()
+    rows, _, duties = sweep_rows(library, args.width, args.frequency, points=args.sweep)
+    elapsed = time.perf_counter() - started
+    header = f"{'Enable Duty':<11}" + "".join(f"{h:>13}" for h in SWEEP_HEADINGS) + "    Best"
+    print(f"Register bank of WIDTH={args.width} @ {args.frequency:g} MHz, "
+          f"{len(duties):,} duties in {elapsed * 1e3:.1f} ms (µW)\n")
+    print(header)
+    print("\n".join(rows))
+
+    weights = None
+    if args.vcd:
+        import vcd
+        with vcd.VcdReader(args.vcd) as reader:
+            activity = vcd_activity(reader.toggle_stats(), args.width)
+        source = args.vcd
+    elif args.distribution:
+        duties, weights = parse_distribution(args.distribution)
+        activity = duty_activity(duties, args.width)
+        source = "duty distribution"
+    else:
+        rst_n, enable = counter_model.power_stimulus(100_000, 0.25)
+        activity = trace_activity(counter_model.simulate(rst_n, enable, width=args.width))
+        source = "random enable, 25% duty"
+    powers = bank_power(library, args.width, activity, args.frequency)
+    print(f"\nSavings ({source}):\n")
+    print(f"{'Architecture':<21}{'Cells':>5}{'Area':>10}{'Clock':>8}{'Logic':>8}"
+          f"{'Leakage':>9}{'Total':>9}{'Savings':>9}")
+    print("\n".join(savings_rows(powers, weights)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+# ============================================================================
+# Counter Model - Cycle-based bit-parallel simulator of rtl/counter_32bit.v
+# ============================================================================
+# Purpose: Compute toggle activity of counter_32bit from a stimulus. Many
+#          independent counter instances and long runs are evaluated with
+#          NumPy array operations, one block of cycles at a time.
+#
+# Cycle semantics (one clock period per cycle t):
+#   - rst_n[t] and enable[t] are the inputs applied at the start of cycle t
+#   - count[t] is the register value at the start of cycle t; an active
+#     rst_n (async reset) forces it to 0 immediately
+#   - overflow[t] = (count[t] == 2**WIDTH - 1) && enable[t]
+#   - the rising edge of cycle t loads count[t + 1]
+# ============================================================================
+
+from collections import namedtuple
+from fractions import Fraction
+
+import numpy as np
+
+# Largest WIDTH representable in the uint64 lanes of the array simulator
+MAX_ARRAY_WIDTH = 64
+
+# Cycles evaluated per array operation; bounds the working set
+DEFAULT_BLOCK_CYCLES = 1 << 16
+
+# Per-instance activity totals over a run
+Activity = namedtuple("Activity", [
+    "width",             # counter WIDTH
+    "cycles",            # cycles simulated
+    "bit_toggles",       # (WIDTH, instances) transitions of each count bit
+    "overflow_toggles",  # (instances,) transitions of the overflow output
+    "overflow_cycles",   # (instances,) cycles with overflow high (= wraps)
+    "enable_toggles",    # (instances,) transitions of enable
+    "rst_n_toggles",     # (instances,) transitions of rst_n
+    "final_count",       # (instances,) count after the last clock edge
+])
+
+# Per-cycle waveform of a single instance
+Trace = namedtuple("Trace", "width rst_n enable count overflow")
+
+
+def _as_matrix(values, cycles=None):
+    """Coerce a stimulus to a (cycles, instances) uint8 array"""
+    arr = np.asarray(values, dtype=np.uint8)
+    if arr.ndim == 1:
+        arr = arr[:, None]
+    if cycles is not None and arr.shape[0] != cycles:
+        raise ValueError(f"stimulus has {arr.shape[0]} cycles, expected {cycles}")
+    return arr
+
+
+class CounterArraySimulator:
+    """Simulates N independent counter_32bit instances in lock step
+
+    Feed stimulus blocks through run(); state and toggle totals carry over
+    between calls so arbitrarily long runs stream through bounded memory.
+    """
+
+    def __init__(self, width=32, instances=1, start=0):
+        if not 1 <= width <= MAX_ARRAY_WIDTH:
+            raise ValueError(f"WIDTH must be 1..{MAX_ARRAY_WIDTH} for the array "
+                             f"simulator (got {width})")
+        self.width = width
+        self.instances = instances
+        self.mask = np.uint64((1 << width) - 1)
+        self.count = np.full(instances, start, dtype=np.uint64) & self.mask
+        self.cycles = 0
+        self.bit_toggles = np.zeros((width, instances), dtype=np.int64)
+        self.overflow_toggles = np.zeros(instances, dtype=np.int64)
+        self.overflow_cycles = np.zeros(instances, dtype=np.int64)
+        self.enable_toggles = np.zeros(instances, dtype=np.int64)
+        self.rst_n_toggles = np.zeros(instances, dtype=np.int64)
+        # Observed values of the previous cycle (None before the first cycle)
+        self._last = None
+
+    def run(self, rst_n, enable, force=None, block_cycles=DEFAULT_BLOCK_CYCLES,
+            record=False):
+        """Simulate a stimulus of shape (cycles,) or (cycles, instances)
+
+        force optionally maps cycle index -> count value forced for that
+        whole cycle (the testbench's force/release of dut.count).
+        With record=True, returns the per-cycle (count, overflow) arrays.
+        """
+        rst_n = _as_matrix(rst_n)
+        enable = _as_matrix(enable, rst_n.shape[0])
+        recorded = []
+        for lo in range(0, rst_n.shape[0], block_cycles):
+            hi = min(lo + block_cycles, rst_n.shape[0])
+            block_force = None
+            if force:
+                block_force = {t - lo: v for t, v in force.items() if lo <= t < hi}
+            observed = self._run_block(rst_n[lo:hi], enable[lo:hi], block_force)
+            if record:
+                recorded.append(observed)
+        if record:
+            return (np.concatenate([c for c, _ in recorded]),
+                    np.concatenate([o for _, o in recorded]))
+        return None
+
+    def _run_block(self, rst_n, enable, force):
+        cycles, n = rst_n.shape
+        steps = np.arange(cycles)[:, None]
+        en = enable.astype(np.uint64)
+
+        # Cycles whose clock edge loads a fixed value: reset loads 0,
+        # force holds the forced count (enable is ignored on those edges)
+        load = rst_n == 0
+        load_value = np.zeros((cycles, n), dtype=np.uint64)
+        forced = force or {}
+        for t, value in forced.items():
+            load[t] = True
+            load_value[t] = np.where(rst_n[t] == 0, 0, value)
+
+        # count after edge t = load value + enables since the last load
+        csum = np.cumsum(en, axis=0)
+        last = np.maximum.accumulate(np.where(load, steps, -1), axis=0)
+        has_load = last >= 0
+        last_idx = np.maximum(last, 0)
+        since = csum - np.take_along_axis(csum, last_idx, axis=0)
+        base = np.where(has_load, np.take_along_axis(load_value, last_idx, axis=0),
+                        self.count[None, :])
+        after = np.where(has_load, base + since, base + csum) & self.mask
+
+        # Register value at the start of each cycle; async reset shows 0
+        count = np.empty((cycles, n), dtype=np.uint64)
+        count[0] = self.count
+        count[1:] = after[:-1]
+        for t in forced:
+            count[t] = load_value[t]
+        count[rst_n == 0] = 0
+        overflow = ((count == self.mask) & (enable != 0)).astype(np.uint8)
+
+        self._accumulate(rst_n, enable, count, overflow)
+        self.count = after[-1].copy()
+        self.cycles += cycles
+        return count, overflow
+
+    def _accumulate(self, rst_n, enable, count, overflow):
+        if self._last is None:
+            # Nothing precedes the first cycle, so it contributes no transition
+            self._last = (rst_n[0], enable[0], count[0], overflow[0])
+        prev_rst, prev_en, prev_count, prev_ovf = self._last
+
+        def transitions(seq, first):
+            return (np.count_nonzero(seq[1:] != seq[:-1], axis=0)
+                    + (seq[0] != first))
+
+        self.rst_n_toggles += transitions(rst_n, prev_rst)
+        self.enable_toggles += transitions(enable, prev_en)
+        self.overflow_toggles += transitions(overflow, prev_ovf)
+        self.overflow_cycles += overflow.sum(axis=0, dtype=np.int64)
+
+        # Per-bit transitions: XOR consecutive counts, then unpack the bits
+        diff = np.empty_like(count)
+        diff[0] = count[0] ^ prev_count
+        diff[1:] = count[1:] ^ count[:-1]
+        bits = np.unpackbits(diff.astype('<u8').view(np.uint8).reshape(*diff.shape, 8),
+                             axis=2, bitorder='little')
+        self.bit_toggles += bits.reshape(diff.shape[0], self.instances, 64) \
+            .sum(axis=0, dtype=np.int64).T[:self.width]
+
+        self._last = (rst_n[-1], enable[-1], count[-1], overflow[-1])
+
+    def activity(self):
+        """Activity totals accumulated so far"""
+        return Activity(self.width, self.cycles, self.bit_toggles.copy(),
+                        self.overflow_toggles.copy(), self.overflow_cycles.copy(),
+                        self.enable_toggles.copy(), self.rst_n_toggles.copy(),
+                        self.count.copy())
+
+
+def simulate(rst_n, enable, width=32, start=0, force=None,
+             block_cycles=DEFAULT_BLOCK_CYCLES):
+    """Simulate a stimulus and return its Activity"""
+    rst_n = _as_matrix(rst_n)
+    sim = CounterArraySimulator(width, rst_n.shape[1], start)
+    sim.run(rst_n, enable, force=force, block_cycles=block_cycles)
+    return sim.activity()
+
+
+def trace(rst_n, enable, width=32, start=0, force=None):
+    """Simulate a single-instance stimulus and return its per-cycle Trace"""
+    sim = CounterArraySimulator(width, 1, start)
+    count, overflow = sim.run(rst_n, enable, force=force, record=True)
+    return Trace(width, np.asarray(rst_n, np.uint8), np.asarray(enable, np.uint8),
+                 count[:, 0], overflow[:, 0])
+
+
+def duty_pattern(duty, max_period=1000):
+    """Shortest periodic enable pattern (ones first) approximating a duty cycle"""
+    ratio = Fraction(duty).limit_denominator(max_period)
+    if not 0 <= ratio <= 1:
+        raise ValueError(f"enable duty must be within [0, 1] (got {duty})")
+    return (1,) * ratio.numerator + (0,) * (ratio.denominator - ratio.numerator)
+
+
+def _pattern_ones(pattern, ones_prefix, cycles):
+    """Enabled cycles among the first `cycles` cycles of a periodic pattern"""
+    full, rest = divmod(cycles, len(pattern))
+    return full * ones_prefix[-1] + ones_prefix[rest]
+
+
+def analytic_activity(width, cycles, enable_pattern=(1,), start=0):
+    """Exact activity of a run without resets, in O(WIDTH) big-int operations
+
+    enable_pattern is repeated for the whole run (cycle t sees
+    enable_pattern[t % len(enable_pattern)]). The result matches what
+    CounterArraySimulator reports for the same stimulus, for any WIDTH and
+    any run length, without stepping through the cycles.
+    """
+    pattern = tuple(1 if e else 0 for e in enable_pattern)
+    if not pattern:
+        raise ValueError("enable pattern must not be empty")
+    mask = (1 << width) - 1
+    start &= mask
+    ones_prefix = [0]
+    for e in pattern:
+        ones_prefix.append(ones_prefix[-1] + e)
+
+    if cycles == 0:
+        zeros = np.zeros(1, dtype=np.int64)
+        return Activity(width, 0, np.zeros((width, 1), dtype=np.int64), zeros, zeros,
+                        zeros, zeros, np.array([start], dtype=object))
+
+    # Increments visible within the run (edges 0..T-2) and in total (0..T-1)
+    seen = start + _pattern_ones(pattern, ones_prefix, cycles - 1)
+    total = start + _pattern_ones(pattern, ones_prefix, cycles)
+
+    # Bit b of the unbounded count flips once per 2**b increments
+    bit_toggles = [(seen >> b) - (start >> b) for b in range(width)]
+
+    # Every wrap is a single isolated overflow cycle; the run boundaries
+    # cut the transitions of a pulse on the first or last cycle
+    wraps = (total >> width) - (start >> width)
+    first_high = start == mask and pattern[0]
+    last_high = (total & mask) == 0 and pattern[(cycles - 1) % len(pattern)] and wraps
+    overflow_toggles = 2 * wraps - bool(first_high) - bool(last_high)
+
+    # Enable transitions between cycle t-1 and t, for t = 1..T-1
+    changes = [int(pattern[j] != pattern[j - 1]) for j in range(len(pattern))]
+    full, rest = divmod(cycles - 1, len(pattern))
+    enable_toggles = full * sum(changes) + sum(changes[1:rest + 1])
+
+    def lane(value):
+        return np.array([value], dtype=np.int64)
+
+    return Activity(width, cycles, np.array(bit_toggles, dtype=np.int64)[:, None],
+                    lane(overflow_toggles), lane(wraps), lane(enable_toggles), lane(0),
+                    np.array([total & mask], dtype=object))
+
+
+def bit_density(width, duty):
+    """Steady-state transitions per cycle of each count bit, shape duty + (WIDTH,)
+
+    With enable high on a fraction `duty` of the cycles, bit b flips once
+    per 2**b increments (as analytic_activity counts), so D_b = duty / 2**b.
+    """
+    duty = np.asarray(duty, dtype=np.float64)
+    if ((duty < 0) | (duty > 1)).any():
+        raise ValueError("enable duties must be within [0, 1]")
+    return np.ldexp(duty[..., None], -np.arange(width))
+
+
+def power_stimulus(cycles, enable_duty=1.0, reset_cycles=2, instances=1, seed=1):
+    """Reset for a few cycles, then random enable with the given duty cycle"""
+    rng = np.random.default_rng(seed)
+    rst_n = np.ones((cycles, instances), dtype=np.uint8)
+    rst_n[:reset_cycles] = 0
+    if enable_duty >= 1.0:
+        enable = np.ones((cycles, instances), dtype=np.uint8)
+    else:
+        enable = (rng.random((cycles, instances)) < enable_duty).astype(np.uint8)
+    enable[:reset_cycles] = 0
+    return rst_n, enable
+
+
+def testbench_stimulus(width=32, clk_period=10):
+    """Per-cycle stimulus of tb/counter_32bit_tb.v
+
+    Returns (rst_n, enable, force): the testbench changes its inputs on
+    multiples of the clock period, so each cycle sees one input value.
+    """
+    # (time in ns, rst_n, enable) after each assignment in the testbench
+    events = [(0, 0, 0), (20, 1, 0), (40, 1, 1), (250, 1, 0), (310, 1, 1),
+              (420, 0, 1), (440, 1, 1), (660, 0, 1), (670, 1, 1)]
+    end_time = 980
+    cycles = end_time // clk_period
+    rst_n = np.zeros(cycles, dtype=np.uint8)
+    enable = np.zeros(cycles, dtype=np.uint8)
+    for (time, rst, en), nxt in zip(events, events[1:] + [(end_time, 0, 0)]):
+        rst_n[time // clk_period:nxt[0] // clk_period] = rst
+        enable[time // clk_period:nxt[0] // clk_period] = en
+    # force dut.count = 'hFFFFFFF0 at 670 ns, released at 680 ns
+    force = {670 // clk_period: ((1 << width) - 1) ^ 0xF}
+    return rst_n, enable, force
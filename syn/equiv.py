@@ -0,0 +1,561 @@
+#!/usr/bin/env python3
+# ============================================================================
+# Equiv - Combinational equivalence of the gate-level counter and the RTL
+# ============================================================================
+# Purpose: Prove that a gate-level netlist (by default the one
+#          generate_synthesized_netlist builds for WIDTH) implements
+#          rtl/counter_32bit.v: the next state of every register, the
+#          asynchronous clear and every output, as functions of the inputs
+#          and the current register values.
+#
+# Method:
+#   1. Both sides go into one and-inverter graph (AIG) with structural
+#      hashing. Netlist cells come from their Liberty truth tables and the
+#      RTL side from the statements of rtl/counter_32bit.v. Pairs whose
+#      literals coincide are proven by structure.
+#   2. Simulation pruning: every AIG node is evaluated on weighted random
+#      patterns, 64 patterns per uint64 word, one vectorized step per AIG
+#      level. A pair whose signatures differ is disproven, with the
+#      differing pattern as counterexample.
+#   3. The remaining candidate pairs are decided by a reduced ordered BDD
+#      with complement edges, built over their fan-in cones. The variable
+#      order is primary inputs first, then register bits MSB first. With
+#      this order every carry, sum and compare function stays linear in
+#      WIDTH.
+# Usage:   python equiv.py [netlist.v] [--width W [W ...]] [--patterns P]
+#              [--node-limit N]
+# ============================================================================
+
+import argparse
+import time
+from collections import namedtuple
+
+import numpy as np
+
+import gate_sim
+import liberty
+
+# Random patterns of the simulation pruning
+DEFAULT_PATTERNS = 2048
+
+# BDD nodes before the proof of the remaining pairs is abandoned
+NODE_LIMIT = 2_000_000
+
+# Widths checked by default: the small corner cases, the reference 32 bits
+# and a wide counter
+DEFAULT_WIDTHS = (1, 2, 3, 8, 31, 32, 33, 64, 1024)
+
+# One compared function: (kind, bus, bit) key, verdict ("equivalent",
+# "different" or "undecided"), deciding method ("structure", "simulation",
+# "bdd" or "unmatched"), counterexample {bus: value} and the (netlist, RTL)
+# values under it
+PairResult = namedtuple("PairResult", "key status method counterexample values")
+
+# Outcome of one netlist against the RTL, times in seconds
+EquivResult = namedtuple("EquivResult", "width pairs aig_nodes bdd_nodes build_seconds "
+                                        "sim_seconds bdd_seconds")
+
+
+class BddLimit(Exception):
+    """The BDD outgrew its node limit"""
+
+
+# ----------------------------------------------------------------------------
+# And-inverter graph
+# ----------------------------------------------------------------------------
+
+class Aig:
+    """And-inverter graph with structural hashing
+
+    Literal 2 * node + complement. Node 0 is constant false, so literal 0
+    is 0 and literal 1 is 1. Nodes are created in topological order.
+    """
+
+    def __init__(self):
+        self.fanin0 = [-1]
+        self.fanin1 = [-1]
+        self.inputs = {}  # key -> node
+        self.strash = {}
+
+    @property
+    def node_count(self):
+        return len(self.fanin0)
+
+    def input(self, key):
+        """Literal of the input named key; created on first use"""
+        node = self.inputs.get(key)
+        if node is None:
+            node = self.inputs[key] = len(self.fanin0)
+            self.fanin0.append(-1)
+            self.fanin1.append(-1)
+        return node << 1
+
+    def and_(self, a, b):
+        if a > b:
+            a, b = b, a
+        if a == 0 or a ^ b == 1:
+            return 0
+        if a == 1 or a == b:
+            return b
+        node = self.strash.get((a, b))
+        if node is None:
+            node = self.strash[(a, b)] = len(self.fanin0)
+            self.fanin0.append(a)
+            self.fanin1.append(b)
+        return node << 1
+
+    def or_(self, a, b):
+        return self.and_(a ^ 1, b ^ 1) ^ 1
+
+    def ite(self, s, t, e):
+        """s ? t : e"""
+        if s < 2:
+            return t if s else e
+        if t == e:
+            return t
+        if (t, e) == (1, 0):
+            return s
+        if (t, e) == (0, 1):
+            return s ^ 1
+        return self.or_(self.and_(s, t), self.and_(s ^ 1, e))
+
+    def xor(self, a, b):
+        return self.ite(b, a ^ 1, a)
+
+    def and_tree(self, literals):
+        """Balanced AND of literals"""
+        literals = list(literals) or [1]
+        while len(literals) > 1:
+            paired = [self.and_(a, b) for a, b in zip(literals[::2], literals[1::2])]
+            literals = paired + literals[len(paired) * 2:]
+        return literals[0]
+
+    def table(self, rows, literals):
+        """Literal of a truth table by Shannon expansion on the last input
+
+        Row r gives literal i the value (r >> i) & 1.
+        """
+        if rows.count(rows[0]) == len(rows):
+            return int(bool(rows[0]))
+        half = len(rows) // 2
+        return self.ite(literals[-1], self.table(rows[half:], literals[:-1]),
+                        self.table(rows[:half], literals[:-1]))
+
+    def cone(self, literals):
+        """Sorted nodes in the fan-in cone of literals"""
+        seen, stack = set(), [lit >> 1 for lit in literals]
+        while stack:
+            node = stack.pop()
+            if node in seen:
+                continue
+            seen.add(node)
+            if self.fanin0[node] >= 0:
+                stack += (self.fanin0[node] >> 1, self.fanin1[node] >> 1)
+        return sorted(seen)
+
+
+def _masks(literals):
+    """All-ones words where a literal is complemented"""
+    return np.where(np.asarray(literals) & 1, gate_sim.ALL_ONES, np.uint64(0))
+
+
+def simulate(aig, patterns=DEFAULT_PATTERNS, seed=1):
+    """(node values (nodes, words), input bits (inputs, words)) of weighted
+    random patterns
+
+    Each pattern draws its inputs with a probability of a one of 2**-k or
+    1 - 2**-k, so that AND and OR functions wide enough to hold every input
+    still see both values.
+    """
+    words = max(-(-patterns // gate_sim.WORD_BITS), 1)
+    rng = np.random.default_rng(seed)
+    inputs = np.fromiter(aig.inputs.values(), dtype=np.int64, count=len(aig.inputs))
+    k = rng.integers(0, max(len(inputs), 1).bit_length() + 3, words * gate_sim.WORD_BITS)
+    ones = np.ldexp(1.0, -k)
+    ones = np.where(rng.random(ones.shape) < 0.5, ones, 1.0 - ones).astype(np.float32)
+    bits = rng.random((len(inputs), ones.size), dtype=np.float32) < ones
+    packed = np.packbits(bits.reshape(len(inputs), words, gate_sim.WORD_BITS), axis=2,
+                         bitorder="little").view("<u8").reshape(len(inputs), words)
+
+    fanin0 = np.array(aig.fanin0, dtype=np.int64)
+    fanin1 = np.array(aig.fanin1, dtype=np.int64)
+    level = [0] * aig.node_count
+    for node in range(1, aig.node_count):
+        if aig.fanin0[node] >= 0:
+            level[node] = 1 + max(level[aig.fanin0[node] >> 1], level[aig.fanin1[node] >> 1])
+    level = np.array(level)
+
+    values = np.zeros((aig.node_count, words), dtype=np.uint64)
+    values[inputs] = packed
+    gates = np.flatnonzero(fanin0 >= 0)
+    gates = gates[np.argsort(level[gates], kind="stable")]
+    for run in np.split(gates, np.flatnonzero(np.diff(level[gates])) + 1):
+        a, b = fanin0[run], fanin1[run]
+        values[run] = (values[a >> 1] ^ _masks(a)[:, None]) & \
+            (values[b >> 1] ^ _masks(b)[:, None])
+    return values, packed
+
+
+# ----------------------------------------------------------------------------
+# BDD core
+# ----------------------------------------------------------------------------
+
+class Bdd:
+    """Reduced ordered BDD with complement edges
+
+    Edge 2 * node + complement. Node 0 is the constant false, so edge 0 is
+    0 and edge 1 is 1. Low edges are never complemented, which keeps every
+    function to a single edge: equal functions have equal edges.
+    """
+
+    def __init__(self, variables, limit=NODE_LIMIT):
+        self.level = {key: i for i, key in enumerate(variables)}
+        self.variables = list(variables)
+        self.var = [len(self.variables)]  # the constant sits below every variable
+        self.high = [0]
+        self.low = [0]
+        self.unique = {}
+        self.cache = {}
+        self.limit = limit
+
+    @property
+    def node_count(self):
+        return len(self.var)
+
+    def variable(self, key):
+        return self.node(self.level[key], 1, 0)
+
+    def node(self, var, high, low):
+        if high == low:
+            return high
+        complement = low & 1
+        if complement:
+            high, low = high ^ 1, low ^ 1
+        index = self.unique.get((var, high, low))
+        if index is None:
+            index = len(self.var)
+            if index >= self.limit:
+                raise BddLimit(f"more than {self.limit:,} BDD nodes")
+            self.unique[(var, high, low)] = index
+            self.var.append(var)
+            self.high.append(high)
+            self.low.append(low)
+        return index << 1 | complement
+
+    def _cofactors(self, edge, var):
+        node = edge >> 1
+        if self.var[node] != var:
+            return edge, edge
+        complement = edge & 1
+        return self.high[node] ^ complement, self.low[node] ^ complement
+
+    @staticmethod
+    def _trivial(f, g):
+        if f == 0 or g == 0 or f ^ g == 1:
+            return 0
+        if f == 1 or f == g:
+            return g
+        if g == 1:
+            return f
+        return None
+
+    def and_(self, f, g):
+        """Conjunction of two edges, without recursion (the carry chains of
+        wide counters are deeper than the interpreter stack)"""
+        result = self._trivial(f, g)
+        if result is not None:
+            return result
+        cache = self.cache
+        stack = [(min(f, g), max(f, g))]
+        while stack:
+            key = stack[-1]
+            if key in cache:
+                stack.pop()
+                continue
+            f, g = key
+            var = min(self.var[f >> 1], self.var[g >> 1])
+            f1, f0 = self._cofactors(f, var)
+            g1, g0 = self._cofactors(g, var)
+            pending = []
+            results = []
+            for a, b in ((f1, g1), (f0, g0)):
+                result = self._trivial(a, b)
+                if result is None:
+                    pair = (min(a, b), max(a, b))
+                    result = cache.get(pair)
+                    if result is None:
+                        pending.append(pair)
+                results.append(result)
+            if pending:
+                stack += pending
+                continue
+            stack.pop()
+            cache[key] = self.node(var, *results)
+        return cache[(min(f, g), max(f, g))]
+
+    def satisfy(self, edge):
+        """{variable: 0/1} of one assignment where edge is 1 (edge != 0)"""
+        assignment = {}
+        while edge >> 1:
+            node, complement = edge >> 1, edge & 1
+            high = self.high[node] ^ complement
+            take = high != 0
+            assignment[self.variables[self.var[node]]] = int(take)
+            edge = high if take else self.low[node] ^ complement
+        return assignment
+
+    def build(self, aig, literals):
+        """{AIG node: edge} over the fan-in cone of literals"""
+        edges = {0: 0}
+        keys = {node: key for key, node in aig.inputs.items()}
+        for node in aig.cone(literals):
+            if node in keys:
+                edges[node] = self.variable(keys[node])
+            elif node:
+                a, b = aig.fanin0[node], aig.fanin1[node]
+                edges[node] = self.and_(edges[a >> 1] ^ (a & 1), edges[b >> 1] ^ (b & 1))
+        return edges
+
+
+# ----------------------------------------------------------------------------
+# The two sides
+# ----------------------------------------------------------------------------
+
+def netlist_functions(aig, netlist, library=None, clock="clk"):
+    """({(kind, bus, bit): literal}, register keys) of a gate-level netlist
+
+    Kinds: "next" (flip-flop data input), "clear"/"preset" (asynchronous
+    control active) and "output". Inputs are the primary inputs and the
+    flip-flop outputs, keyed (bus, bit).
+    """
+    level = gate_sim.GateLevel(netlist, library, clock)
+    n = level.netlist
+    literal = {}
+    for name, nets in level.inputs.items():
+        if level.clock_net is None or nets[0] != level.clock_net:
+            for bit, net in enumerate(nets.tolist()):
+                literal[net] = aig.input((name, bit))
+    literal.update(level.constants)
+
+    def key(net):
+        bus = n.net_bus(net)
+        return n.bus_names[bus], net - n.bus_base[bus]
+    registers = []
+    for flop in level.flops:
+        registers.append(key(flop.output))
+        literal[flop.output] = aig.input(registers[-1])
+
+    def net_literal(net):
+        """Literal of a net; undriven nets are free inputs"""
+        if net not in literal:
+            literal[net] = aig.input(key(net))
+        return literal[net]
+    combinational = np.flatnonzero(~level.sequential)
+    for cell in combinational[np.argsort(level.level[combinational], kind="stable")].tolist():
+        type_ = n.types[level.cell_type[cell]]
+        start = level.starts[cell]
+        ins = [net_literal(net) for net in level.pin_net[start:start + type_.inputs].tolist()]
+        literal[int(level.out_net[cell])] = aig.table(level.models[type_.id].rows, ins)
+
+    functions = {}
+    for flop, register in zip(level.flops, registers):
+        functions[("next", *register)] = net_literal(flop.data)
+        for value, kind in ((0, "clear"), (1, "preset")):
+            active = [net_literal(net) ^ (1 - lvl) for net, lvl, val in flop.controls
+                      if val == value]
+            if active or kind == "clear":
+                functions[(kind, *register)] = aig.and_tree(a ^ 1 for a in active) ^ 1
+    for name, nets in level.outputs.items():
+        for bit, net in enumerate(nets.tolist()):
+            functions[("output", name, bit)] = net_literal(net)
+    return functions, registers
+
+
+def rtl_functions(aig, width):
+    """{(kind, bus, bit): literal} of rtl/counter_32bit.v for WIDTH"""
+    enable = aig.input(("enable", 0))
+    rst_n = aig.input(("rst_n", 0))
+    count = [aig.input(("count", i)) for i in range(width)]
+
+    # count + 1'b1: ripple-carry adder, addend 1 at bit 0 and carry-in 0
+    total, carry = [], 0
+    for i, a in enumerate(count):
+        b = int(i == 0)
+        half = aig.xor(a, b)
+        total.append(aig.xor(half, carry))
+        carry = aig.or_(aig.and_(a, b), aig.and_(half, carry))
+
+    functions = {}
+    for i, a in enumerate(count):
+        # if (!rst_n) count <= 0; else if (enable) count <= count + 1'b1
+        functions[("next", "count", i)] = aig.ite(enable, total[i], a)
+        functions[("clear", "count", i)] = rst_n ^ 1
+        functions[("output", "count", i)] = a
+    # overflow = (count == {WIDTH{1'b1}}) && enable
+    functions[("output", "overflow", 0)] = aig.and_(aig.and_tree(count), enable)
+    return functions
+
+
+# ----------------------------------------------------------------------------
+# Checking
+# ----------------------------------------------------------------------------
+
+def _assignment(bits):
+    """{bus: value} of {(bus, bit): 0/1}"""
+    values = {}
+    for (bus, bit), value in bits.items():
+        values[bus] = values.get(bus, 0) | (int(value) << bit)
+    return values
+
+
+def _variable_order(aig, registers):
+    """Primary inputs, then register buses MSB first"""
+    state = set(registers)
+    return sorted(aig.inputs, key=lambda k: (k in state, k[0], -k[1]))
+
+
+def check(netlist, library=None, width=None, patterns=DEFAULT_PATTERNS,
+          node_limit=NODE_LIMIT, seed=1):
+    """EquivResult of a netlist against rtl/counter_32bit.v
+
+    width defaults to the width of the netlist's count bus.
+    """
+    started = time.perf_counter()
+    aig = Aig()
+    implementation, registers = netlist_functions(aig, netlist, library)
+    if width is None:
+        width = netlist.bus_width[netlist.bus_index["count"]]
+    specification = rtl_functions(aig, width)
+    build_seconds = time.perf_counter() - started
+
+    keys = list(specification) + [k for k in implementation if k not in specification]
+    results, candidates = {}, []
+    for key in keys:
+        if key not in implementation or key not in specification:
+            results[key] = PairResult(key, "different", "unmatched", None, None)
+        elif implementation[key] == specification[key]:
+            results[key] = PairResult(key, "equivalent", "structure", None, None)
+        else:
+            candidates.append(key)
+
+    started = time.perf_counter()
+    if candidates:
+        values, packed = simulate(aig, patterns, seed)
+        input_keys = list(aig.inputs)
+
+        def signature(lit):
+            return values[lit >> 1] ^ (gate_sim.ALL_ONES if lit & 1 else np.uint64(0))
+        remaining = []
+        for key in candidates:
+            ours, theirs = signature(implementation[key]), signature(specification[key])
+            differ = np.flatnonzero(ours ^ theirs)
+            if not differ.size:
+                remaining.append(key)
+                continue
+            word = int(differ[0])
+            mask = int(ours[word] ^ theirs[word])
+            bit = (mask & -mask).bit_length() - 1
+            pattern = (packed[:, word] >> np.uint64(bit)) & np.uint64(1)
+            results[key] = PairResult(
+                key, "different", "simulation",
+                _assignment(dict(zip(input_keys, pattern.tolist()))),
+                (int(ours[word] >> np.uint64(bit)) & 1, int(theirs[word] >> np.uint64(bit)) & 1))
+        candidates = remaining
+    sim_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    bdd = Bdd(_variable_order(aig, registers), node_limit)
+    if candidates:
+        try:
+            edges = bdd.build(aig, [lit for key in candidates for lit in
+                                    (implementation[key], specification[key])])
+        except BddLimit:
+            edges = None
+        for key in candidates:
+            if edges is None:
+                results[key] = PairResult(key, "undecided", "bdd", None, None)
+                continue
+            ours = edges[implementation[key] >> 1] ^ (implementation[key] & 1)
+            theirs = edges[specification[key] >> 1] ^ (specification[key] & 1)
+            if ours == theirs:
+                results[key] = PairResult(key, "equivalent", "bdd", None, None)
+                continue
+            witness = bdd.and_(ours, theirs ^ 1)
+            values = (1, 0) if witness else (0, 1)
+            assignment = bdd.satisfy(witness or bdd.and_(ours ^ 1, theirs))
+            results[key] = PairResult(key, "different", "bdd", _assignment(
+                {k: assignment.get(k, 0) for k in aig.inputs}), values)
+    bdd_seconds = time.perf_counter() - started
+    return EquivResult(width, [results[key] for key in keys], aig.node_count,
+                       bdd.node_count, build_seconds, sim_seconds, bdd_seconds)
+
+
+def describe(key):
+    """Readable name of a compared function, e.g. next count[3]"""
+    kind, bus, bit = key
+    return f"{kind} {bus}[{bit}]"
+
+
+def _format_value(value):
+    text = f"{value:#x}"
+    return text if len(text) <= 24 else f"{text[:12]}...{text[-8:]}"
+
+
+def summary_lines(result, limit=5):
+    """Verdict line and the first mismatches of an EquivResult"""
+    methods, verdicts = {}, {}
+    for pair in result.pairs:
+        verdicts[pair.status] = verdicts.get(pair.status, 0) + 1
+        if pair.status == "equivalent":
+            methods[pair.method] = methods.get(pair.method, 0) + 1
+    verdict = ("NOT EQUIVALENT" if verdicts.get("different") else
+               "UNDECIDED" if verdicts.get("undecided") else "EQUIVALENT")
+    seconds = result.build_seconds + result.sim_seconds + result.bdd_seconds
+    yield (f"WIDTH {result.width:>5}: {verdict:<14} {len(result.pairs):>6} pairs "
+           f"({methods.get('structure', 0)} structure, {methods.get('bdd', 0)} bdd, "
+           f"{verdicts.get('different', 0)} different, {verdicts.get('undecided', 0)} undecided)"
+           f"  {result.aig_nodes:,} AIG / {result.bdd_nodes:,} BDD nodes  {seconds:.2f} s")
+    shown = 0
+    for pair in result.pairs:
+        if pair.status == "equivalent" or shown == limit:
+            continue
+        shown += 1
+        line = f"    {describe(pair.key)}: {pair.status} ({pair.method})"
+        if pair.counterexample is not None:
+            inputs = ", ".join(f"{bus}={_format_value(value)}"
+                               for bus, value in sorted(pair.counterexample.items()))
+            line += f" netlist={pair.values[0]} rtl={pair.values[1]} at {inputs}"
+        yield line
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Equivalence of the counter netlist and RTL")
+    parser.add_argument("netlist", nargs="?",
+                        help="gate-level Verilog (default: generated counter of each --width)")
+    parser.add_argument("--width", type=int, nargs="+", default=list(DEFAULT_WIDTHS))
+    parser.add_argument("--lib", default=liberty.DEFAULT_LIBRARY, help="Liberty cell library")
+    parser.add_argument("--patterns", type=int, default=DEFAULT_PATTERNS,
+                        help="random patterns of the simulation pruning")
+    parser.add_argument("--node-limit", type=int, default=NODE_LIMIT)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    library = liberty.load_library(args.lib)
+    if args.netlist:
+        import verilog_parser
+        netlists = [verilog_parser.read_netlist(args.netlist)]
+    else:
+        import netlist_gen
+        netlists = (netlist_gen.build_counter(width) for width in args.width)
+    failed = False
+    for netlist in netlists:
+        result = check(netlist, library, patterns=args.patterns, node_limit=args.node_limit,
+                       seed=args.seed)
+        failed |= any(pair.status != "equivalent" for pair in result.pairs)
+        for line in summary_lines(result):
+            print(line)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
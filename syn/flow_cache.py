@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# ============================================================================
+# Flow Cache - Content-addressed artifact cache for flow stages
+# ============================================================================
+# Purpose: Skip flow stages (reports, netlist, waveform) whose inputs did
+#          not change. A stage's key is the SHA-256 of its name, the
+#          digests of its input files (RTL, SDC, cell library, the flow's
+#          own Python sources) and its settings; its artifact is the set of
+#          files it wrote.
+#
+# Layout:  <root>/<key[:2]>/<key>   one JSON artifact per stage key
+#   Artifacts are written to a temporary file and moved into place with
+#   os.replace, so concurrent writers (parallel sweep workers) never expose
+#   a partial artifact; two writers of one key produce the same content.
+#   A hit refreshes the artifact's mtime; when the cache grows past
+#   max_bytes or max_entries the least recently used artifacts are evicted.
+# Usage:   python flow_cache.py [--root DIR] [--clear]
+# ============================================================================
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+
+DEFAULT_CACHE_DIR = "../syn/.flow_cache"
+DEFAULT_MAX_BYTES = 256 << 20
+DEFAULT_MAX_ENTRIES = 4096
+
+# Files every stage depends on: the flow's own sources
+TOOL_SOURCES = "../syn/*.py"
+
+# Input file digests, reused while (size, mtime) is unchanged
+_digests = {}
+
+
+def file_digest(path):
+    """SHA-256 of a file's contents ('' for a missing file)"""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return ""
+    stamp = (st.st_size, st.st_mtime_ns)
+    cached = _digests.get(path)
+    if cached and cached[0] == stamp:
+        return cached[1]
+    with open(path, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    _digests[path] = (stamp, digest)
+    return digest
+
+
+def tool_digest(pattern=TOOL_SOURCES):
+    """Digest over the flow's Python sources"""
+    h = hashlib.sha256()
+    for path in sorted(glob.glob(pattern)):
+        h.update(os.path.basename(path).encode())
+        h.update(file_digest(path).encode())
+    return h.hexdigest()
+
+
+def _jsonable(value):
+    """JSON form of settings values json does not know (arrays, paths)"""
+    return value.tolist() if hasattr(value, "tolist") else str(value)
+
+
+def _write_atomic(path, data):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def write_if_changed(path, text):
+    """Write a text file atomically unless it already holds text; True if written"""
+    data = text.encode()
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
+    _write_atomic(path, data)
+    return True
+
+
+class FlowCache:
+    """Content-addressed store of stage artifacts ({name: text})"""
+
+    def __init__(self, root=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES,
+                 max_entries=DEFAULT_MAX_ENTRIES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, stage, inputs=(), settings=None):
+        """Key of a stage from its input files and settings (JSON-serializable)"""
+        h = hashlib.sha256(stage.encode())
+        for path in inputs:
+            h.update(b"\0" + file_digest(path).encode())
+        h.update(b"\0" + json.dumps(settings, sort_keys=True, default=_jsonable).encode())
+        return h.hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.root, key[:2], key)
+
+    def get(self, key):
+        """Artifact of a key, or None"""
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as f:
+                artifact = json.loads(f.read())
+        except (FileNotFoundError, ValueError):
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)  # LRU: last use
+        except OSError:
+            pass
+        self.hits += 1
+        return artifact
+
+    def put(self, key, artifact):
+        """Store an artifact; evict the least recently used beyond the limits"""
+        try:
+            _write_atomic(self.path(key), json.dumps(artifact).encode())
+        except OSError:
+            return  # read-only or full cache: run uncached
+        self.evict()
+
+    def entries(self):
+        """[(mtime, size, path)] of every artifact"""
+        found = []
+        if not os.path.isdir(self.root):
+            return found
+        for shard in os.scandir(self.root):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith(".tmp"):
+                    continue
+                try:
+                    st = entry.stat()
+                except FileNotFoundError:
+                    continue  # evicted by another worker
+                found.append((st.st_mtime_ns, st.st_size, entry.path))
+        return found
+
+    def evict(self):
+        """Drop least recently used artifacts until within max_bytes/max_entries"""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes and len(entries) <= self.max_entries:
+            return 0
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes and len(entries) - removed <= self.max_entries:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self):
+        for _, _, path in self.entries():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def stage(self, key, outputs, build):
+        """Run a stage through the cache
+
+        outputs is {artifact name: file path}; build() writes those files.
+        On a hit the files are restored (only where their contents
+        differ) instead. Returns True on a hit.
+        """
+        artifact = self.get(key)
+        if artifact is not None and set(artifact) == set(outputs):
+            for name, path in outputs.items():
+                os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+                write_if_changed(path, artifact[name])
+            return True
+        build()
+        artifact = {}
+        for name, path in outputs.items():
+            with open(path, encoding='utf-8') as f:
+                artifact[name] = f.read()
+        self.put(key, artifact)
+        return False
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Flow stage artifact cache")
+    parser.add_argument("--root", default=DEFAULT_CACHE_DIR)
+    parser.add_argument("--clear", action="store_true", help="remove every artifact")
+    args = parser.parse_args(argv)
+
+    cache = FlowCache(args.root)
+    if args.clear:
+        cache.clear()
+    entries = cache.entries()
+    size = sum(size for _, size, _ in entries)
+    print(f"{cache.root}: {len(entries)} artifacts, {size / 1024:.1f} KiB "
+          f"(limit {cache.max_bytes >> 20} MiB, {cache.max_entries} entries)")
+
+
+if __name__ == "__main__":
+    main()
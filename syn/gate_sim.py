@@ -0,0 +1,505 @@
+#!/usr/bin/env python3
+# ============================================================================
+# Gate Sim - Gate-level logic simulation of a netlist_db.Netlist
+# ============================================================================
+# Purpose: Simulate the gate-level netlist cycle by cycle with two engines
+#          sharing one cell model (Liberty functions as truth tables):
+#            CompiledSimulator  levelized, zero-delay; every net holds one
+#                               bit per test pattern, 64 patterns per
+#                               uint64 word, and each (level, cell type)
+#                               run is one vectorized bitwise expression
+#            EventSimulator     event-driven with per-cell Liberty delays;
+#                               one pattern, timing accurate: glitches,
+#                               clock-to-q and setup checks at the flops
+#
+# Cycle semantics (as counter_model): inputs change at the start of cycle
+#   t; outputs are observed at the rising clock edge of cycle t (mid
+#   period), before the edge loads the flip-flops. An active asynchronous
+#   clear forces the flip-flop output to 0 at once. Flip-flops power up at
+#   0 (no X state).
+#
+# Flip-flops: data pin = next state, clock pin = rising-edge clock. The
+#   library index keeps no ff groups, so asynchronous controls are known by
+#   pin name (ASYNC_PINS).
+# Usage:   python gate_sim.py [netlist.v] [--width W] [--cycles N]
+#              [--patterns P] [--event-patterns E] [--period NS]
+# ============================================================================
+
+import argparse
+import heapq
+import time
+from collections import namedtuple
+
+import numpy as np
+
+import counter_model
+import liberty
+import sta
+
+# Asynchronous flip-flop pins: name -> (active level, forced output)
+ASYNC_PINS = {"CLR": (0, 0), "RN": (0, 0), "PRE": (0, 1), "SN": (0, 1)}
+
+# Patterns per machine word of the compiled engine
+WORD_BITS = 64
+
+ALL_ONES = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+# A flip-flop: data, clock and output nets, asynchronous (net, level, value)
+# controls, clock-to-q delay and setup time (ns)
+FlipFlop = namedtuple("FlipFlop", "cell data clock output controls delay setup")
+
+# Stimulus checks against the RTL model (counter_model); rates in
+# pattern-cycles per second
+CrossCheck = namedtuple(
+    "CrossCheck", "width cycles patterns compiled_mismatches compiled_seconds "
+                  "compiled_rate event_patterns event_mismatches event_seconds event_rate "
+                  "events glitches setup_violations")
+
+
+class _CellModel:
+    """Truth table of a cell type as a sum of products over its inputs"""
+
+    __slots__ = ("table", "rows", "terms", "invert")
+
+    def __init__(self, function, pins):
+        self.table = liberty.truth_table(function, pins)
+        self.rows = tuple(int(v) for v in self.table)
+        rows = np.flatnonzero(self.table)
+        # Cover the minority value: fewer product terms
+        self.invert = len(rows) > len(self.table) // 2
+        if self.invert:
+            rows = np.flatnonzero(~self.table)
+        self.terms = [[(i, bool((row >> i) & 1)) for i in range(len(pins))]
+                      for row in rows.tolist()]
+
+    def evaluate(self, inputs):
+        """Output words from input words of shape (cells, inputs, words)"""
+        out = None
+        for term in self.terms:
+            product = None
+            for i, positive in term:
+                literal = inputs[:, i] if positive else ~inputs[:, i]
+                product = literal if product is None else product & literal
+            if product is None:  # constant function
+                product = np.full(inputs.shape[::2], ALL_ONES)
+            out = product if out is None else out | product
+        if out is None:
+            out = np.zeros(inputs.shape[::2], dtype=np.uint64)
+        return ~out if self.invert else out
+
+    def value(self, row):
+        """Output of one input combination (row r gives input i (r >> i) & 1)"""
+        return self.rows[row]
+
+
+def _pack(values):
+    """(cycles, patterns) of 0/1 -> (cycles, words) uint64, pattern p in
+    bit p % 64 of word p // 64"""
+    values = np.asarray(values, dtype=np.uint8)
+    cycles, patterns = values.shape
+    words = -(-patterns // WORD_BITS)
+    padded = np.zeros((cycles, words * WORD_BITS), dtype=np.uint8)
+    padded[:, :patterns] = values
+    packed = np.packbits(padded.reshape(cycles, words, WORD_BITS), axis=2,
+                         bitorder="little")
+    return packed.view("<u8").reshape(cycles, words)
+
+
+def _unpack(words, patterns):
+    """Inverse of _pack: (..., words) uint64 -> (..., patterns) of 0/1"""
+    raw = np.ascontiguousarray(words, dtype="<u8").view(np.uint8)
+    return np.unpackbits(raw, axis=-1, bitorder="little")[..., :patterns]
+
+
+class GateLevel:
+    """Levelized cells, flip-flops and ports shared by both engines"""
+
+    def __init__(self, netlist, library=None, clock="clk", derate=1.0):
+        n = netlist
+        if n.net_driver is None:
+            n.build_index()
+        self.netlist = n
+        self.library = library or liberty.load_library()
+        self.sequential, self.out_net, in_nets = sta.cell_connections(n)
+        self.level, _ = sta.levelize(n, in_nets, self.sequential)
+        self.cell_type = np.frombuffer(n.cell_type, dtype=np.uint16)
+        self.starts = np.frombuffer(n.cell_pin_start, dtype=np.int32)
+        self.pin_net = np.frombuffer(n.pin_net, dtype=np.int32)
+        self.clock_net = n.net(clock) if clock in n.bus_index else None
+
+        cells = [self.library.cell(t.name) for t in n.types]
+        self.models = {}
+        for t in n.types:
+            if not t.sequential:
+                self.models[t.id] = _CellModel(cells[t.id].function, t.pins[:t.inputs])
+        self.type_delay = np.array([c.delay for c in cells] or [0.0]) * derate
+
+        self.flops = []
+        for cell in np.flatnonzero(self.sequential).tolist():
+            type_, lib_cell = n.type_of(cell), cells[self.cell_type[cell]]
+            nets = dict(zip(type_.pins, self.pin_net[self.starts[cell]:self.starts[cell + 1]]
+                            .tolist()))
+            controls = tuple((nets[pin], *ASYNC_PINS[pin]) for pin in type_.pins[:type_.inputs]
+                             if pin in ASYNC_PINS)
+            self.flops.append(FlipFlop(cell, nets[lib_cell.data_pin], nets[lib_cell.clock_pin],
+                                       int(self.out_net[cell]), controls,
+                                       lib_cell.delay * derate, lib_cell.setup * derate))
+
+        self.inputs, self.outputs = {}, {}
+        for port in n.ports:
+            name = n.bus_names[port.bus]
+            nets = np.arange(n.bus_base[port.bus], n.bus_base[port.bus] + n.bus_width[port.bus])
+            (self.inputs if port.direction == "input" else self.outputs)[name] = nets
+        self.constants = {net: int(name == "1'b1") for name in ("1'b0", "1'b1")
+                          if name in n.bus_index for net in [n.net(name)]}
+
+    def register_nets(self, initial):
+        """{flip-flop output net: values} of {bus name: values} presets"""
+        n, preset = self.netlist, {}
+        flop_nets = {f.output for f in self.flops}
+        for name, values in (initial or {}).items():
+            bus = n.bus_index[name]
+            for bit in range(n.bus_width[bus]):
+                net = n.bus_base[bus] + bit
+                if net in flop_nets:
+                    preset[net] = (np.asarray(values, dtype=np.uint64) >> np.uint64(bit)) & 1
+        return preset
+
+    def stimulus_bits(self, stimulus, cycles, patterns):
+        """{input net: (cycles, patterns) 0/1} of {port: values}; ports default to 0"""
+        bits = {}
+        for name, nets in self.inputs.items():
+            if nets[0] == self.clock_net:
+                continue
+            values = np.zeros((cycles, patterns), dtype=np.uint64)
+            if name in stimulus:
+                given = np.asarray(stimulus[name], dtype=np.uint64)
+                values[:] = given.reshape(cycles, -1) if given.ndim == 1 else given
+            for bit, net in enumerate(nets.tolist()):
+                bits[net] = (values >> np.uint64(bit)) & 1
+        return bits
+
+    def output_values(self, bits, name):
+        """Bus values (cycles, patterns) from per-bit (bit, cycles, patterns) arrays"""
+        width = len(self.outputs[name])
+        if width > counter_model.MAX_ARRAY_WIDTH:
+            raise ValueError(f"{name}: {width} bits do not fit a uint64 value")
+        weights = np.left_shift(np.uint64(1), np.arange(width, dtype=np.uint64))
+        return np.einsum("bcp,b->cp", bits.astype(np.uint64), weights)
+
+
+def _shape(stimulus):
+    """(cycles, patterns) of a stimulus dict"""
+    shapes = {np.shape(v) for v in stimulus.values()}
+    cycles = max(s[0] for s in shapes)
+    patterns = max((s[1] for s in shapes if len(s) > 1), default=1)
+    return cycles, patterns
+
+
+class CompiledSimulator(GateLevel):
+    """Levelized zero-delay simulation of many patterns in packed words"""
+
+    def __init__(self, netlist, library=None, clock="clk"):
+        super().__init__(netlist, library, clock)
+        n = self.netlist
+        # Combinational cells in (level, type) order, cut into same-type runs
+        self.segments = []
+        combinational = np.flatnonzero(~self.sequential)
+        if combinational.size:
+            order = combinational[np.lexsort((self.cell_type[combinational],
+                                              self.level[combinational]))]
+            keys = self.level[order].astype(np.int64) * len(n.types) + self.cell_type[order]
+            for run in np.split(order, np.flatnonzero(np.diff(keys)) + 1):
+                type_ = n.types[self.cell_type[run[0]]]
+                ins = self.pin_net[self.starts[run][:, None] + np.arange(type_.inputs)]
+                self.segments.append((self.models[type_.id], ins, self.out_net[run]))
+        self.flop_d = np.array([f.data for f in self.flops], dtype=np.int64)
+        self.flop_q = np.array([f.output for f in self.flops], dtype=np.int64)
+        # (control nets, flops, active level, forced value) per control kind
+        self.controls = []
+        for level, value in set(ASYNC_PINS.values()):
+            pairs = [(net, i) for i, f in enumerate(self.flops)
+                     for net, lvl, val in f.controls if (lvl, val) == (level, value)]
+            if pairs:
+                nets, flops = (np.array(x, dtype=np.int64) for x in zip(*pairs))
+                self.controls.append((nets, flops, level, value))
+        # Controls driven by logic need a second pass after the clear
+        logic = {int(self.out_net[c]) for c in combinational.tolist()}
+        self.settle_twice = any(net in logic for nets, *_ in self.controls
+                                for net in nets.tolist())
+        self.evaluations = 0
+
+    def _apply_controls(self, values, state):
+        """Force flip-flop outputs with an active asynchronous control"""
+        forced = False
+        for nets, flops, level, value in self.controls:
+            active = values[nets] if level else ~values[nets]
+            if value:
+                state[flops] |= active
+            else:
+                state[flops] &= ~active
+            forced = True
+        values[self.flop_q] = state
+        return forced
+
+    def _settle(self, values):
+        for model, ins, out in self.segments:
+            values[out] = model.evaluate(values[ins])
+
+    def run(self, stimulus, initial=None):
+        """Outputs {port: (cycles, patterns) values} of a stimulus
+
+        stimulus maps input ports to (cycles,) or (cycles, patterns) values;
+        initial presets flip-flops by bus name, e.g. {"count": values}.
+        """
+        cycles, patterns = _shape(stimulus)
+        words = -(-patterns // WORD_BITS)
+        values = np.zeros((self.netlist.net_count, words), dtype=np.uint64)
+        for net, bit in self.constants.items():
+            values[net] = ALL_ONES if bit else 0
+        packed = {net: _pack(bits) for net, bits in
+                  self.stimulus_bits(stimulus, cycles, patterns).items()}
+        input_nets = np.array(list(packed), dtype=np.int64)
+        input_words = np.stack(list(packed.values()), axis=1) if packed else None
+
+        state = np.zeros((len(self.flops), words), dtype=np.uint64)
+        presets = self.register_nets(initial)
+        if presets:
+            index = {net: i for i, net in enumerate(self.flop_q.tolist())}
+            for net, bits in presets.items():
+                state[index[net]] = _pack(np.broadcast_to(bits, (patterns,))[None])[0]
+
+        output_nets = np.concatenate(list(self.outputs.values()))
+        observed = np.empty((cycles, len(output_nets), words), dtype=np.uint64)
+        for t in range(cycles):
+            if input_words is not None:
+                values[input_nets] = input_words[t]
+            if not self.settle_twice:
+                self._apply_controls(values, state)
+            values[self.flop_q] = state
+            self._settle(values)
+            if self.settle_twice and self._apply_controls(values, state):
+                self._settle(values)
+            observed[t] = values[output_nets]
+            # Rising edge: load D, except where a control holds the output
+            state = values[self.flop_d].copy()
+            for nets, flops, level, value in self.controls:
+                active = values[nets] if level else ~values[nets]
+                state[flops] = (state[flops] | active) if value else (state[flops] & ~active)
+        self.evaluations += cycles * len(self.out_net) * words
+
+        bits = _unpack(observed, patterns)  # (cycles, nets, patterns)
+        outputs, offset = {}, 0
+        for name, nets in self.outputs.items():
+            outputs[name] = self.output_values(
+                bits[:, offset:offset + len(nets)].transpose(1, 0, 2), name)
+            offset += len(nets)
+        return outputs
+
+
+class EventSimulator(GateLevel):
+    """Event-driven simulation of one pattern with Liberty cell delays
+
+    Nets change through scheduled events (transport delay); a cell
+    re-evaluates when an input changes and schedules its output only when
+    the value differs from the last one scheduled for it.
+    """
+
+    def __init__(self, netlist, library=None, clock="clk", period=10.0, derate=1.0):
+        super().__init__(netlist, library, clock, derate)
+        n = self.netlist
+        self.period = period
+        self.loads = [[] for _ in range(n.net_count)]  # net -> [(kind, index)]
+        self.gates = []  # (model, input nets, output net, delay)
+        for cell in np.flatnonzero(~self.sequential).tolist():
+            type_ = n.type_of(cell)
+            ins = self.pin_net[self.starts[cell]:self.starts[cell] + type_.inputs].tolist()
+            self.gates.append((self.models[type_.id], ins, int(self.out_net[cell]),
+                               float(self.type_delay[self.cell_type[cell]])))
+            for net in set(ins):
+                self.loads[net].append(("gate", len(self.gates) - 1))
+        for i, flop in enumerate(self.flops):
+            self.loads[flop.clock].append(("clock", i))
+            for net, _, _ in flop.controls:
+                self.loads[net].append(("control", i))
+        self.events = self.transitions = self.glitches = self.setup_violations = 0
+
+    def _gate_output(self, gate, values):
+        model, ins, _, _ = gate
+        row = 0
+        for i, net in enumerate(ins):
+            row |= values[net] << i
+        return model.value(row)
+
+    def run(self, stimulus, initial=None):
+        """Outputs {port: (cycles,) values} of a single-pattern stimulus"""
+        cycles, _ = _shape(stimulus)
+        inputs = {net: bits[:, 0].astype(int).tolist() for net, bits in
+                  self.stimulus_bits(stimulus, cycles, 1).items()}
+        n, period = self.netlist, self.period
+        values = [0] * n.net_count
+        for net, bit in self.constants.items():
+            values[net] = bit
+        for net, bits in inputs.items():
+            values[net] = bits[0] if cycles else 0
+        for net, bits in self.register_nets(initial).items():
+            values[net] = int(np.ravel(bits)[0])
+        for flop in self.flops:
+            if any(values[net] == level for net, level, _ in flop.controls):
+                values[flop.output] = next(v for net, level, v in flop.controls
+                                           if values[net] == level)
+        # Settle the power-up state in level order (zero delay)
+        order = np.argsort(self.level[~self.sequential], kind="stable")
+        for index in order.tolist():
+            gate = self.gates[index]
+            values[gate[2]] = self._gate_output(gate, values)
+        scheduled = list(values)  # last value scheduled per net
+        last_change = [-np.inf] * n.net_count
+        queue, sequence = [], 0
+
+        def schedule(when, net, value):
+            nonlocal sequence
+            if scheduled[net] != value:
+                scheduled[net] = value
+                heapq.heappush(queue, (when, sequence, net, value))
+                sequence += 1
+
+        def advance(until):
+            """Process events strictly before `until`"""
+            toggled = {}
+            while queue and queue[0][0] < until:
+                now, _, net, value = heapq.heappop(queue)
+                self.events += 1
+                if values[net] == value:
+                    continue
+                values[net] = value
+                last_change[net] = now
+                self.transitions += 1
+                toggled[net] = toggled.get(net, 0) + 1
+                for kind, index in self.loads[net]:
+                    if kind == "gate":
+                        gate = self.gates[index]
+                        schedule(now + gate[3], gate[2], self._gate_output(gate, values))
+                        continue
+                    flop = self.flops[index]
+                    held = next((v for c, level, v in flop.controls if values[c] == level), None)
+                    if held is not None:
+                        schedule(now + flop.delay, flop.output, held)
+                    elif kind == "clock" and value == 1:
+                        if now - last_change[flop.data] < flop.setup:
+                            self.setup_violations += 1
+                        schedule(now + flop.delay, flop.output, values[flop.data])
+            return toggled
+
+        output_nets = np.concatenate(list(self.outputs.values())).tolist()
+        observed = np.empty((len(output_nets), cycles), dtype=np.uint8)
+        clock = self.clock_net
+        for t in range(cycles):
+            start = t * period
+            for net, bits in inputs.items():
+                schedule(start, net, bits[t])
+            if clock is not None:
+                schedule(start + period / 2, clock, 1)
+            toggled = [advance(start + period / 2)]
+            observed[:, t] = [values[net] for net in output_nets]
+            if clock is not None:
+                schedule(start + period, clock, 0)
+            toggled.append(advance(start + period))
+            # Per half period (input change, clock edge): transitions beyond
+            # the one a settled change needs are glitches
+            self.glitches += sum(count - count % 2 for half in toggled
+                                 for net, count in half.items() if net != clock)
+
+        outputs, offset = {}, 0
+        for name, nets in self.outputs.items():
+            outputs[name] = self.output_values(
+                observed[offset:offset + len(nets), :, None], name)[:, 0]
+            offset += len(nets)
+        return outputs
+
+
+# ----------------------------------------------------------------------------
+# Cross-check against the RTL model
+# ----------------------------------------------------------------------------
+
+def counter_stimulus(cycles, patterns, width=32, duty=0.7, reset_rate=0.02, seed=1):
+    """Random rst_n/enable per pattern and register presets near the wrap"""
+    rng = np.random.default_rng(seed)
+    rst_n = (rng.random((cycles, patterns)) >= reset_rate).astype(np.uint8)
+    enable = (rng.random((cycles, patterns)) < duty).astype(np.uint8)
+    mask = (1 << width) - 1
+    start = (mask - rng.integers(0, max(cycles, 1), patterns, dtype=np.uint64)) & \
+        np.uint64(mask)
+    return rst_n, enable, start
+
+
+def cross_check(netlist, library=None, cycles=200, patterns=4096, event_patterns=4,
+                period=10.0, seed=1):
+    """Compiled and event-driven runs against counter_model on one stimulus"""
+    width = netlist.bus_width[netlist.bus_index["count"]]
+    rst_n, enable, start = counter_stimulus(cycles, patterns, width, seed=seed)
+    model = counter_model.CounterArraySimulator(width, patterns, start)
+    count, overflow = model.run(rst_n, enable, record=True)
+
+    compiled = CompiledSimulator(netlist, library)
+    started = time.perf_counter()
+    result = compiled.run({"rst_n": rst_n, "enable": enable}, {"count": start})
+    compiled_seconds = time.perf_counter() - started
+    compiled_mismatches = int(np.count_nonzero((result["count"] != count) |
+                                               (result["overflow"] != overflow)))
+
+    event = EventSimulator(netlist, compiled.library, period=period)
+    event_mismatches = 0
+    started = time.perf_counter()
+    for p in range(min(event_patterns, patterns)):
+        result = event.run({"rst_n": rst_n[:, p], "enable": enable[:, p]},
+                           {"count": start[p:p + 1]})
+        event_mismatches += int(np.count_nonzero((result["count"] != count[:, p]) |
+                                                 (result["overflow"] != overflow[:, p])))
+    event_seconds = time.perf_counter() - started
+    event_patterns = min(event_patterns, patterns)
+    return CrossCheck(width, cycles, patterns, compiled_mismatches, compiled_seconds,
+                      cycles * patterns / max(compiled_seconds, 1e-9), event_patterns,
+                      event_mismatches, event_seconds,
+                      cycles * event_patterns / max(event_seconds, 1e-9),
+                      event.events, event.glitches, event.setup_violations)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gate-level simulation of the counter")
+    parser.add_argument("netlist", nargs="?",
+                        help="gate-level Verilog (default: generated counter of --width)")
+    parser.add_argument("--width", type=int, default=32)
+    parser.add_argument("--lib", default=liberty.DEFAULT_LIBRARY, help="Liberty cell library")
+    parser.add_argument("--cycles", type=int, default=200)
+    parser.add_argument("--patterns", type=int, default=4096,
+                        help="patterns of the compiled engine")
+    parser.add_argument("--event-patterns", type=int, default=4,
+                        help="patterns replayed by the event-driven engine")
+    parser.add_argument("--period", type=float, default=10.0, help="clock period (ns)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    if args.netlist:
+        import verilog_parser
+        netlist = verilog_parser.read_netlist(args.netlist)
+    else:
+        import netlist_gen
+        netlist = netlist_gen.build_counter(args.width)
+    check = cross_check(netlist, liberty.load_library(args.lib), args.cycles, args.patterns,
+                        args.event_patterns, args.period, args.seed)
+    print(f"{netlist.name}: {netlist.cell_count:,} cells, WIDTH {check.width}, "
+          f"{check.cycles} cycles")
+    print(f"compiled  {check.patterns:>6} patterns  {check.compiled_seconds:7.3f} s  "
+          f"{check.compiled_rate:>12,.0f} pattern-cycles/s  "
+          f"{check.compiled_mismatches} mismatches vs RTL model")
+    print(f"event     {check.event_patterns:>6} patterns  {check.event_seconds:7.3f} s  "
+          f"{check.event_rate:>12,.0f} pattern-cycles/s  "
+          f"{check.event_mismatches} mismatches vs RTL model")
+    print(f"          {check.events:,} events, {check.glitches:,} glitch transitions, "
+          f"{check.setup_violations} setup violations at {args.period:g} ns")
+    return 1 if check.compiled_mismatches or check.event_mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,532 @@
+#!/usr/bin/env python3
+# ============================================================================
+# Liberty - Standard cell library loader with a cached binary index
+# ============================================================================
+# Purpose: Read the cell area, leakage, pins, delays, setup/hold checks and
+#          internal energies of a Liberty (.lib) library, and compile them
+#          into a binary index keyed on the file's SHA-256 so later runs
+#          memory-map the index instead of re-parsing the text
+#
+# Liberty subset: groups name (args) { ... }, simple attributes a : v;,
+#   complex attributes a (v, ...);, /* */ comments, \ line continuation.
+#   Timing and power tables are reduced to their worst (largest) value.
+#
+# Cache layout (little endian), libs/.cache/<library>.<sha256[:16]>.bin:
+#   header  magic, sha256, cell/pin/string counts, library name,
+#           nominal voltage and temperature, default wire load model
+#   cells   name, pin range, area, leakage, delay, setup, hold,
+#           internal energy, clock-pin energy, flags
+#   pins    name, function, capacitance, direction/clock flags
+#   points  (fanout, length) table of the wire load model
+#   strings UTF-8 blob the records point into
+# Usage:   python liberty.py [library.lib] [--rebuild]
+# ============================================================================
+
+import argparse
+import hashlib
+import mmap
+import os
+import re
+import struct
+import time
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+DEFAULT_LIBRARY = "../syn/libs/typical_1.0V_25C.lib"
+CACHE_DIR = ".cache"
+
+CACHE_MAGIC = b"CTRLIB2\0"
+HEADER = struct.Struct("<8s32sIIIIHddIHdddI")
+CELL_RECORD = struct.Struct("<IHIHIH7dB")
+PIN_RECORD = struct.Struct("<IHIHdB")
+POINT_RECORD = struct.Struct("<dd")
+
+# Cell flags
+SEQUENTIAL, CLOCK_GATING = 1, 2
+
+# Pin flags: direction in the low bits, clock pin above
+DIRECTIONS = ("input", "output", "inout")
+CLOCK_PIN = 4
+
+# Timing arcs that are not data propagation (asynchronous clear/preset)
+ASYNC_ARCS = {"clear", "preset"}
+
+Pin = namedtuple("Pin", "name direction capacitance clock function")
+
+# Wire load model: net length (library length units) by fanout, extended
+# past the table with slope per extra fanout; area and capacitance per
+# unit length
+WireLoad = namedtuple("WireLoad", "name area slope capacitance fanout_length")
+NO_WIRE_LOAD = WireLoad("", 0.0, 0.0, 0.0, ())
+
+
+class Cell(namedtuple("Cell", "name description area leakage delay setup hold "
+                              "internal_energy clock_energy sequential clock_gating pins")):
+    """Library cell: area (um^2), leakage (nW), worst delay and checks (ns),
+    internal energy per output / clock-pin transition (fJ)"""
+
+    __slots__ = ()
+
+    @property
+    def inputs(self):
+        return tuple(p.name for p in self.pins if p.direction != "output")
+
+    @property
+    def outputs(self):
+        return tuple(p.name for p in self.pins if p.direction == "output")
+
+    @property
+    def clock_pin(self):
+        return next((p.name for p in self.pins if p.clock), None)
+
+    @property
+    def data_pin(self):
+        """First non-clock input, e.g. the D pin of a flip-flop"""
+        return next((p.name for p in self.pins if p.direction == "input" and not p.clock), None)
+
+    @property
+    def function(self):
+        """Boolean function of the (first) output pin"""
+        return next((p.function for p in self.pins if p.direction == "output"), "")
+
+    def pin(self, name):
+        for p in self.pins:
+            if p.name == name:
+                return p
+        raise KeyError(f"{self.name} has no pin '{name}'")
+
+
+# ----------------------------------------------------------------------------
+# Liberty text parser
+# ----------------------------------------------------------------------------
+
+_COMMENT = re.compile(r"/\*.*?\*/|//[^\n]*", re.S)
+_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*"|[^\s(){}:;,"]+|[(){}:;,]')
+
+
+class Group:
+    """A parsed Liberty group: type (args) { attributes; groups }"""
+
+    __slots__ = ("type", "args", "attributes", "repeated", "groups")
+
+    def __init__(self, type_, args):
+        self.type = type_
+        self.args = args
+        self.attributes = {}
+        self.repeated = {}  # complex attribute -> every occurrence, in order
+        self.groups = []
+
+    def find(self, type_):
+        return [g for g in self.groups if g.type == type_]
+
+    def get(self, name, default=None):
+        return self.attributes.get(name, default)
+
+    def get_all(self, name):
+        return self.repeated.get(name, [])
+
+
+def _unquote(token):
+    return token[1:-1] if token.startswith('"') else token
+
+
+def parse(text):
+    """Top-level group (normally the library group) of Liberty text"""
+    text = _COMMENT.sub(" ", text).replace("\\\n", " ")
+    tokens = _TOKEN.findall(text)
+    root = Group(None, [])
+    stack, pos, end = [root], 0, len(tokens)
+
+    while pos < end:
+        name = tokens[pos]
+        pos += 1
+        if name == "}":
+            if len(stack) == 1:
+                raise ValueError("Unbalanced '}' in library")
+            stack.pop()
+            continue
+        if name == ";":
+            continue
+        if pos >= end:
+            raise ValueError(f"Unexpected end of library after '{name}'")
+        if tokens[pos] == ":":
+            # simple attribute: name : value ;
+            value = []
+            pos += 1
+            while pos < end and tokens[pos] not in (";", "}"):
+                value.append(_unquote(tokens[pos]))
+                pos += 1
+            stack[-1].attributes[name] = " ".join(value)
+        elif tokens[pos] == "(":
+            args, pos = [], pos + 1
+            while pos < end and tokens[pos] != ")":
+                if tokens[pos] != ",":
+                    args.append(_unquote(tokens[pos]))
+                pos += 1
+            pos += 1
+            if pos < end and tokens[pos] == "{":
+                group = Group(name, args)
+                stack[-1].groups.append(group)
+                stack.append(group)
+                pos += 1
+            else:
+                # complex attribute: name (v, ...) ;
+                stack[-1].attributes[name] = args
+                stack[-1].repeated.setdefault(name, []).append(args)
+        else:
+            raise ValueError(f"Unexpected '{tokens[pos]}' after '{name}'")
+    if len(stack) != 1:
+        raise ValueError(f"Unterminated group '{stack[-1].type}'")
+    return root.groups[0] if len(root.groups) == 1 else root
+
+
+def _worst_value(group, *tables):
+    """Largest value of the named table groups (values ("a, b", "c, d"))"""
+    values = [float(v) for table in tables for g in group.find(table)
+              for row in g.get("values", []) for v in row.replace(",", " ").split()]
+    return max(values) if values else 0.0
+
+
+def _energy(group):
+    """Worst mean rise/fall energy over the internal_power groups"""
+    energies = [(_worst_value(g, "rise_power") + _worst_value(g, "fall_power")) / 2
+                for g in group.find("internal_power")]
+    return max(energies, default=0.0)
+
+
+def _cell(group):
+    pins = []
+    delay = setup = hold = internal = clock_energy = 0.0
+    for pin_group in group.find("pin"):
+        direction = pin_group.get("direction", "input")
+        clock = pin_group.get("clock", "false") == "true"
+        function = pin_group.get("function", pin_group.get("state_function", ""))
+        capacitance = float(pin_group.get("capacitance", 0.0))
+        for name in pin_group.args:
+            pins.append(Pin(name, direction, capacitance, clock, function))
+        for arc in pin_group.find("timing"):
+            timing_type = arc.get("timing_type", "combinational")
+            if timing_type.startswith("setup"):
+                setup = max(setup, _worst_value(arc, "rise_constraint", "fall_constraint"))
+            elif timing_type.startswith("hold"):
+                hold = max(hold, _worst_value(arc, "rise_constraint", "fall_constraint"))
+            elif timing_type not in ASYNC_ARCS:
+                delay = max(delay, _worst_value(arc, "cell_rise", "cell_fall"))
+        if clock:
+            clock_energy = max(clock_energy, _energy(pin_group))
+        elif direction == "output":
+            internal = max(internal, _energy(pin_group))
+    return Cell(group.args[0], group.get("cell_description", ""),
+                float(group.get("area", 0.0)), float(group.get("cell_leakage_power", 0.0)),
+                delay, setup, hold, internal, clock_energy,
+                bool(group.find("ff") or group.find("latch")),
+                "clock_gating_integrated_cell" in group.attributes, tuple(pins))
+
+
+def _wire_load(library):
+    """The default_wire_load model of the library (else its first one)"""
+    groups = library.find("wire_load")
+    default = library.get("default_wire_load")
+    group = next((g for g in groups if g.args and g.args[0] == default),
+                 groups[0] if groups else None)
+    if group is None:
+        return NO_WIRE_LOAD
+    points = sorted((float(fanout), float(length))
+                    for fanout, length in group.get_all("fanout_length"))
+    return WireLoad(group.args[0] if group.args else "", float(group.get("area", 0.0)),
+                    float(group.get("slope", 0.0)), float(group.get("capacitance", 0.0)),
+                    tuple(points))
+
+
+def parse_library(text):
+    """(library name, nominal voltage, nominal temperature, wire load, cells)
+    of Liberty text"""
+    library = parse(text)
+    if library.type != "library":
+        raise ValueError("No library group found")
+    cells = [_cell(g) for g in library.find("cell")]
+    return (library.args[0], float(library.get("nom_voltage", 1.0)),
+            float(library.get("nom_temperature", 25.0)), _wire_load(library), cells)
+
+
+_FUNCTION_TOKEN = re.compile(r"\s*([A-Za-z_][A-Za-z0-9_]*|[01]|[!'&*|+^()])")
+
+
+def truth_table(function, inputs):
+    """Value of a Liberty pin function for every input combination
+
+    Row r gives input i the value (r >> i) & 1. Operators, tightest
+    first: ! and postfix ', then ^, then & * or juxtaposition (AND),
+    then | + (OR).
+    """
+    text = function.strip()
+    tokens, pos = [], 0
+    while pos < len(text):
+        match = _FUNCTION_TOKEN.match(text, pos)
+        if not match:
+            raise ValueError(f"Bad function '{function}' at '{text[pos:]}'")
+        tokens.append(match.group(1))
+        pos = match.end()
+        while pos < len(text) and text[pos].isspace():
+            pos += 1
+    rows = np.arange(1 << len(inputs))
+    columns = {name: ((rows >> i) & 1).astype(bool) for i, name in enumerate(inputs)}
+    pos = 0
+
+    def peek():
+        return tokens[pos] if pos < len(tokens) else None
+
+    def take():
+        nonlocal pos
+        pos += 1
+        return tokens[pos - 1]
+
+    def unary():
+        token = take() if peek() is not None else None
+        if token == "!":
+            value = ~unary()
+        elif token == "(":
+            value = either()
+            if take() != ")":
+                raise ValueError(f"Unbalanced parentheses in '{function}'")
+        elif token in ("0", "1"):
+            value = np.full(len(rows), token == "1")
+        elif token in columns:
+            value = columns[token]
+        else:
+            raise ValueError(f"Unknown input '{token}' in function '{function}'")
+        while peek() == "'":
+            take()
+            value = ~value
+        return value
+
+    def exclusive():
+        value = unary()
+        while peek() == "^":
+            take()
+            value = value ^ unary()
+        return value
+
+    def both():
+        value = exclusive()
+        while peek() not in (None, "|", "+", ")"):
+            if peek() in ("&", "*"):
+                take()
+            value = value & exclusive()
+        return value
+
+    def either():
+        value = both()
+        while peek() in ("|", "+"):
+            take()
+            value = value | both()
+        return value
+
+    value = either()
+    if pos != len(tokens):
+        raise ValueError(f"Unexpected '{tokens[pos]}' in function '{function}'")
+    return value.astype(np.uint8)
+
+
+# ----------------------------------------------------------------------------
+# Binary index
+# ----------------------------------------------------------------------------
+
+def compile_index(digest, name, voltage, temperature, wire_load, cells):
+    """Binary index of a parsed library"""
+    strings = bytearray()
+    offsets = {}
+
+    def intern(text):
+        data = text.encode()
+        if data not in offsets:
+            offsets[data] = len(strings)
+            strings.extend(data)
+        return offsets[data], len(data)
+
+    name_ref = intern(name)
+    cell_records, pin_records = [], []
+    for cell in cells:
+        flags = (SEQUENTIAL if cell.sequential else 0) | (CLOCK_GATING if cell.clock_gating else 0)
+        cell_records.append(CELL_RECORD.pack(
+            *intern(cell.name), len(pin_records), len(cell.pins), *intern(cell.description),
+            cell.area, cell.leakage, cell.delay, cell.setup, cell.hold,
+            cell.internal_energy, cell.clock_energy, flags))
+        for pin in cell.pins:
+            pin_records.append(PIN_RECORD.pack(
+                *intern(pin.name), *intern(pin.function), pin.capacitance,
+                DIRECTIONS.index(pin.direction) | (CLOCK_PIN if pin.clock else 0)))
+    wire_ref = intern(wire_load.name)
+    points = [POINT_RECORD.pack(*point) for point in wire_load.fanout_length]
+    header = HEADER.pack(CACHE_MAGIC, digest, len(cell_records), len(pin_records),
+                         len(strings), *name_ref, voltage, temperature,
+                         *wire_ref, wire_load.area, wire_load.slope,
+                         wire_load.capacitance, len(points))
+    return b"".join([header, *cell_records, *pin_records, *points, bytes(strings)])
+
+
+class Library:
+    """Cell library read from a binary index (bytes or an mmap)
+
+    Only the header and the cell-name index are decoded up front; a cell's
+    record and pins are unpacked on first lookup.
+    """
+
+    def __init__(self, buffer, path=None):
+        self.buffer = buffer
+        self.path = path
+        (magic, self.digest, cells, pins, strings, name_offset, name_length,
+         self.nom_voltage, self.nom_temperature, wire_offset, wire_length, wire_area,
+         wire_slope, wire_capacitance, points) = HEADER.unpack_from(buffer, 0)
+        if magic != CACHE_MAGIC:
+            raise ValueError(f"Not a library index (magic {magic!r})")
+        self._cells_at = HEADER.size
+        self._pins_at = self._cells_at + cells * CELL_RECORD.size
+        points_at = self._pins_at + pins * PIN_RECORD.size
+        self._strings_at = points_at + points * POINT_RECORD.size
+        if len(buffer) != self._strings_at + strings:
+            raise ValueError("Truncated library index")
+        self.name = self._string(name_offset, name_length)
+        self.wire_load = WireLoad(
+            self._string(wire_offset, wire_length), wire_area, wire_slope, wire_capacitance,
+            tuple(POINT_RECORD.unpack_from(buffer, points_at + k * POINT_RECORD.size)
+                  for k in range(points)))
+        self.index = {}
+        for i in range(cells):
+            offset, length = struct.unpack_from("<IH", buffer, self._cells_at + i * CELL_RECORD.size)
+            self.index[self._string(offset, length)] = i
+        self._cells = {}
+
+    def _string(self, offset, length):
+        start = self._strings_at + offset
+        return bytes(self.buffer[start:start + length]).decode()
+
+    def cell(self, name):
+        """Cell by name (KeyError when the library has no such cell)"""
+        cell = self._cells.get(name)
+        if cell is None:
+            index = self.index.get(name)
+            if index is None:
+                raise KeyError(f"Cell '{name}' not in library {self.name}")
+            (_, _, pin_start, pin_count, description_offset, description_length,
+             area, leakage, delay, setup, hold, internal, clock_energy, flags) = \
+                CELL_RECORD.unpack_from(self.buffer, self._cells_at + index * CELL_RECORD.size)
+            pins = []
+            for p in range(pin_start, pin_start + pin_count):
+                (name_offset, name_length, function_offset, function_length,
+                 capacitance, pin_flags) = PIN_RECORD.unpack_from(
+                    self.buffer, self._pins_at + p * PIN_RECORD.size)
+                pins.append(Pin(self._string(name_offset, name_length), DIRECTIONS[pin_flags & 3],
+                                capacitance, bool(pin_flags & CLOCK_PIN),
+                                self._string(function_offset, function_length)))
+            cell = Cell(name, self._string(description_offset, description_length),
+                        area, leakage, delay, setup, hold, internal, clock_energy,
+                        bool(flags & SEQUENTIAL), bool(flags & CLOCK_GATING), tuple(pins))
+            self._cells[name] = cell
+        return cell
+
+    def cells(self):
+        """All cells, in library order"""
+        return [self.cell(name) for name in self.index]
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+    def __iter__(self):
+        return iter(self.index)
+
+
+def cache_path(path, digest):
+    """Index file of a library version: <dir>/.cache/<stem>.<sha256[:16]>.bin"""
+    directory, filename = os.path.split(os.path.abspath(path))
+    stem = os.path.splitext(filename)[0]
+    return os.path.join(directory, CACHE_DIR, f"{stem}.{digest.hex()[:16]}.bin")
+
+
+def _write_atomic(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _map(path):
+    with open(path, 'rb') as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def build_library(path, rebuild=False):
+    """Library of a .lib file, through its binary index
+
+    The index is rebuilt when the file's SHA-256 changes (or rebuild is
+    set); an unwritable cache directory falls back to an in-memory index.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    digest = hashlib.sha256(data).digest()
+    index_path = cache_path(path, digest)
+    if not rebuild and os.path.exists(index_path):
+        try:
+            library = Library(_map(index_path), index_path)
+            if library.digest == digest:
+                return library
+        except (OSError, ValueError, struct.error):
+            pass  # stale or damaged index: rebuild it
+
+    index = compile_index(digest, *parse_library(data.decode()))
+    try:
+        _write_atomic(index_path, index)
+        return Library(_map(index_path), index_path)
+    except OSError:
+        return Library(index)
+
+
+@lru_cache(maxsize=None)
+def load_library(path=DEFAULT_LIBRARY):
+    """Shared Library of a .lib file (one per path and process)"""
+    return build_library(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parse a Liberty library and build its index")
+    parser.add_argument('library', nargs='?', default=DEFAULT_LIBRARY)
+    parser.add_argument('--rebuild', action='store_true', help="Re-parse even if cached")
+    args = parser.parse_args(argv)
+
+    with open(args.library) as f:
+        text = f.read()
+    start = time.perf_counter()
+    for _ in range(10):
+        parse_library(text)
+    parse_time = (time.perf_counter() - start) / 10
+    build_library(args.library, rebuild=args.rebuild)
+    start = time.perf_counter()
+    for _ in range(10):
+        library = build_library(args.library)
+        library.cells()
+    load_time = (time.perf_counter() - start) / 10
+
+    print(f"Library {library.name}: {len(library)} cells, "
+          f"{library.nom_voltage:.2f} V, {library.nom_temperature:g} C")
+    print(f"Index: {library.path or '(in memory)'}")
+    wire_load = library.wire_load
+    print(f"Wire load {wire_load.name or '(none)'}: {len(wire_load.fanout_length)} fanout points, "
+          f"slope {wire_load.slope:g}, area {wire_load.area:g} per unit length")
+    print(f"Parse {parse_time * 1e3:.2f} ms, indexed load {load_time * 1e3:.2f} ms")
+    print(f"{'Cell':<10}{'Area':>8}{'Leak':>8}{'Delay':>8}{'Setup':>8}{'Hold':>8}"
+          f"{'Int fJ':>8}{'CK fJ':>8}  Pins")
+    for cell in library.cells():
+        pins = " ".join(p.name for p in cell.pins)
+        print(f"{cell.name:<10}{cell.area:>8.2f}{cell.leakage:>8.2f}{cell.delay:>8.2f}"
+              f"{cell.setup:>8.2f}{cell.hold:>8.2f}{cell.internal_energy:>8.2f}"
+              f"{cell.clock_energy:>8.2f}  {pins}")
+
+
+if __name__ == "__main__":
+    main()
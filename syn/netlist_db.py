@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+# ============================================================================
+# Netlist DB - Compact array-backed gate-level netlist
+# ============================================================================
+# Purpose: Store cells, pins and nets of a flat netlist in typed arrays so
+#          timing, power and area analyses can walk netlists of ~1M cells
+#
+# Layout:
+#   cells   cell_type[c]                interned CellType id
+#           cell_pin_start[c..c+1]      CSR range of the cell's pins
+#           cell names                  one byte blob + offsets
+#   pins    pin_net[p], pin_cell[p]     pin p is pin (p - start) of its
+#                                       cell type's pin list
+#   nets    buses (name, lsb, width) of consecutive net ids; a scalar net
+#           is a bus of width 1, so per-bit nets carry no name storage
+#   index   net_driver[n]               driving pin, or -1 (input port)
+#           fanout_start / fanout_pins  CSR list of the load pins per net
+# ============================================================================
+
+from array import array
+from bisect import bisect_right
+from collections import Counter
+
+import numpy as np
+
+# Cell type -> (input pins, output pins)
+CELL_PINS = {
+    "BUFX2": (("A",), ("Y",)),
+    "INVX1": (("A",), ("Y",)),
+    "NAND2X1": (("A", "B"), ("Y",)),
+    "NOR2X1": (("A", "B"), ("Y",)),
+    "AND2X1": (("A", "B"), ("Y",)),
+    "AND2X2": (("A", "B"), ("Y",)),
+    "OR2X1": (("A", "B"), ("Y",)),
+    "XOR2X1": (("A", "B"), ("Y",)),
+    "MUX2X1": (("A", "B", "S"), ("Y",)),
+    "AOI21X1": (("A0", "A1", "B0"), ("Y",)),
+    "DFFQX1": (("D", "CK", "CLR"), ("Q",)),
+    "DFFQX2": (("D", "CK", "CLR"), ("Q",)),
+}
+
+# Cell types whose outputs start timing paths
+SEQUENTIAL_TYPES = {"DFFQX1", "DFFQX2"}
+
+
+class CellType:
+    """Interned cell type: pin names in connection order, outputs last"""
+
+    __slots__ = ("id", "name", "pins", "inputs", "outputs", "sequential")
+
+    def __init__(self, type_id, name, inputs, outputs):
+        self.id = type_id
+        self.name = name
+        self.pins = tuple(inputs) + tuple(outputs)
+        self.inputs = len(inputs)   # pins[:inputs] are inputs
+        self.outputs = len(outputs)
+        self.sequential = name in SEQUENTIAL_TYPES
+
+    def is_output(self, index):
+        return index >= self.inputs
+
+    def __repr__(self):
+        return f"CellType({self.name})"
+
+
+class Port:
+    """Top-level port of the module, backed by one bus"""
+
+    __slots__ = ("direction", "bus")
+
+    def __init__(self, direction, bus):
+        self.direction = direction
+        self.bus = bus
+
+
+class Netlist:
+    """A flat module: interned cell types, cells, pins and bus-named nets"""
+
+    def __init__(self, name):
+        self.name = name
+        self.types = []
+        self.type_index = {}
+        self.ports = []
+        self.comments = {}  # cell id -> section comment emitted before it
+
+        # Nets: bus b spans net ids bus_base[b] .. bus_base[b] + bus_width[b]
+        self.bus_names = []
+        self.bus_index = {}
+        self.bus_base = array('i')
+        self.bus_lsb = array('i')
+        self.bus_width = array('i')
+        self.bus_is_vector = array('b')
+        self.net_count = 0
+
+        self.cell_type = array('H')
+        self.cell_pin_start = array('i', [0])
+        self.cell_name_start = array('I', [0])
+        self.cell_name_blob = bytearray()
+        self.pin_net = array('i')
+        self.pin_cell = array('i')
+
+        self.net_driver = None
+        self.fanout_start = None
+        self.fanout_pins = None
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    def cell_type_id(self, name):
+        """Intern a cell type by name"""
+        type_id = self.type_index.get(name)
+        if type_id is None:
+            if name not in CELL_PINS:
+                raise KeyError(f"Unknown cell type '{name}'")
+            type_id = len(self.types)
+            self.types.append(CellType(type_id, name, *CELL_PINS[name]))
+            self.type_index[name] = type_id
+        return type_id
+
+    def add_bus(self, name, msb=None, lsb=0):
+        """Declare a wire (msb None) or bus [msb:lsb]; returns the bus id"""
+        if name in self.bus_index:
+            raise ValueError(f"Net '{name}' declared twice")
+        bus = len(self.bus_names)
+        width = 1 if msb is None else msb - lsb + 1
+        self.bus_names.append(name)
+        self.bus_index[name] = bus
+        self.bus_base.append(self.net_count)
+        self.bus_lsb.append(lsb)
+        self.bus_width.append(width)
+        self.bus_is_vector.append(msb is not None)
+        self.net_count += width
+        return bus
+
+    def add_port(self, direction, name, width=1, lsb=0):
+        """Declare a port (and its net bus); returns the bus id"""
+        bus = self.add_bus(name, lsb + width - 1 if width > 1 else None, lsb)
+        self.ports.append(Port(direction, bus))
+        return bus
+
+    def bit(self, bus, index=None):
+        """Net id of bit `index` of a bus (or of a scalar net)"""
+        if index is None:
+            return self.bus_base[bus]
+        return self.bus_base[bus] + index - self.bus_lsb[bus]
+
+    def net(self, name):
+        """Net id for "name" or "name[i]"; constants 1'b0/1'b1 are created on use"""
+        bus = self.bus_index.get(name)
+        if bus is not None:
+            return self.bus_base[bus]
+        if name.endswith("]"):
+            base, _, index = name[:-1].partition("[")
+            bus = self.bus_index.get(base)
+            if bus is not None:
+                return self.bit(bus, int(index))
+        if name in ("1'b0", "1'b1"):
+            return self.bus_base[self.add_bus(name)]
+        raise KeyError(f"Undeclared net '{name}'")
+
+    def add_cell(self, cell_type, name, nets):
+        """Add an instance; nets lists the net id of each pin in type pin order"""
+        type_id = self.cell_type_id(cell_type) if isinstance(cell_type, str) else cell_type
+        pins = len(nets)
+        if pins != len(self.types[type_id].pins):
+            raise ValueError(f"{name}: {pins} nets for the "
+                             f"{len(self.types[type_id].pins)} pins of {self.types[type_id].name}")
+        cell = len(self.cell_type)
+        self.cell_type.append(type_id)
+        pin_net = self.pin_net
+        pin_net.extend(nets)
+        self.pin_cell.extend((cell,) * pins)
+        self.cell_pin_start.append(len(pin_net))
+        blob = self.cell_name_blob
+        blob += name.encode()
+        self.cell_name_start.append(len(blob))
+        self.net_driver = None  # connectivity index is stale
+        return cell
+
+    # ------------------------------------------------------------------
+    # Connectivity index
+    # ------------------------------------------------------------------
+
+    def build_index(self):
+        """Build the per-net driver and CSR fanout index (NumPy, O(pins))"""
+        pin_net = np.frombuffer(self.pin_net, dtype=np.int32)
+        pin_cell = np.frombuffer(self.pin_cell, dtype=np.int32)
+        starts = np.frombuffer(self.cell_pin_start, dtype=np.int32)
+        inputs = np.array([type_.inputs for type_ in self.types], dtype=np.int32)
+        cell_type = np.frombuffer(self.cell_type, dtype=np.uint16)
+
+        pins = np.arange(len(pin_net), dtype=np.int32)
+        is_output = pins - starts[pin_cell] >= inputs[cell_type][pin_cell] if len(pins) else \
+            np.zeros(0, dtype=bool)
+
+        driver = np.full(self.net_count, -1, dtype=np.int32)
+        driver[pin_net[is_output]] = pins[is_output]
+
+        # Load pins grouped by net (stable, so pins keep netlist order)
+        load_pins = pins[~is_output]
+        order = np.argsort(pin_net[load_pins], kind="stable")
+        fanout_start = np.zeros(self.net_count + 1, dtype=np.int32)
+        np.cumsum(np.bincount(pin_net[load_pins], minlength=self.net_count),
+                  out=fanout_start[1:])
+
+        self.net_driver = driver
+        self.fanout_start = fanout_start
+        self.fanout_pins = load_pins[order]
+
+    def _index(self):
+        if self.net_driver is None:
+            self.build_index()
+
+    def driver(self, net):
+        """Driving pin of a net, or -1 when it is driven by an input port"""
+        self._index()
+        return self.net_driver[net]
+
+    def fanout(self, net):
+        """Load pins of a net"""
+        self._index()
+        return self.fanout_pins[self.fanout_start[net]:self.fanout_start[net + 1]]
+
+    def fanin_cells(self, cell):
+        """Cells driving the inputs of a cell"""
+        self._index()
+        start = self.cell_pin_start[cell]
+        inputs = self.types[self.cell_type[cell]].inputs
+        driven = (int(self.net_driver[self.pin_net[pin]]) for pin in range(start, start + inputs))
+        return [self.pin_cell[pin] for pin in driven if pin >= 0]
+
+    def fanout_cells(self, cell):
+        """Cells loading the outputs of a cell"""
+        self._index()
+        start, end = self.cell_pin_start[cell], self.cell_pin_start[cell + 1]
+        first_output = start + self.types[self.cell_type[cell]].inputs
+        return [self.pin_cell[pin] for p in range(first_output, end)
+                for pin in self.fanout(self.pin_net[p]).tolist()]
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    @property
+    def cell_count(self):
+        return len(self.cell_type)
+
+    def type_of(self, cell):
+        return self.types[self.cell_type[cell]]
+
+    def cell_name(self, cell):
+        start, end = self.cell_name_start[cell], self.cell_name_start[cell + 1]
+        return self.cell_name_blob[start:end].decode()
+
+    def cell_pins(self, cell):
+        """Pin ids of a cell, in its type's pin order"""
+        return range(self.cell_pin_start[cell], self.cell_pin_start[cell + 1])
+
+    def pin_name(self, pin):
+        """Pin name within its cell type, e.g. 'Y'"""
+        cell = self.pin_cell[pin]
+        return self.types[self.cell_type[cell]].pins[pin - self.cell_pin_start[cell]]
+
+    def net_bus(self, net):
+        return bisect_right(self.bus_base, net) - 1
+
+    def net_name(self, net):
+        bus = self.net_bus(net)
+        if not self.bus_is_vector[bus]:
+            return self.bus_names[bus]
+        return f"{self.bus_names[bus]}[{net - self.bus_base[bus] + self.bus_lsb[bus]}]"
+
+    def cell_counts(self):
+        """Instances per cell type name"""
+        per_type = Counter(self.cell_type)
+        return Counter({self.types[t].name: n for t, n in per_type.items()})
+
+    def nbytes(self):
+        """Bytes held by the netlist arrays and name blob"""
+        arrays = [self.cell_type, self.cell_pin_start, self.cell_name_start, self.pin_net,
+                  self.pin_cell, self.bus_base, self.bus_lsb, self.bus_width, self.bus_is_vector]
+        if self.net_driver is not None:
+            arrays += [self.net_driver, self.fanout_start, self.fanout_pins]
+        return sum(memoryview(a).nbytes for a in arrays) + len(self.cell_name_blob)
@@ -2,7 +2,7 @@
 // Gate-Level Netlist - Synthesized Design
 // ============================================================================
 // Design: counter_32bit
-// Date: 2025-12-04 00:12:49
+// Date: 2026-10-17 22:44:34
 // Tool: Synopsys Design Compiler (Simulated Output)
 // Technology: Generic 45nm Standard Cell Library
 // ============================================================================
@@ -16,62 +16,149 @@ module counter_32bit (
 );
 
   // Internal wires
-  wire [31:0] count_int;
   wire [31:0] next_count;
   wire [31:0] inc_result;
+  wire [31:1] carry;
   wire enable_buf;
-  
+
   // Buffer enable signal
   BUFX2 U_enable_buf ( .A(enable), .Y(enable_buf) );
-  
-  // 32-bit incrementer (ripple-carry adder structure)
-  // Bit 0 (LSB)
-  XOR2X1 U_inc_0 ( .A(count_int[0]), .B(1'b1), .Y(inc_result[0]) );
-  wire carry_0;
-  AND2X1 U_carry_0 ( .A(count_int[0]), .B(1'b1), .Y(carry_0) );
-  
-  // Bit 1
-  XOR2X1 U_inc_1 ( .A(count_int[1]), .B(carry_0), .Y(inc_result[1]) );
-  wire carry_1;
-  AND2X2 U_carry_1 ( .A(count_int[1]), .B(carry_0), .Y(carry_1) );
-  
-  // Bits 2-30 (similar structure)
-  // ... (additional adder stages)
-  
-  // Bit 31 (MSB)
-  wire carry_30;
-  XOR2X1 U_inc_31 ( .A(count_int[31]), .B(carry_30), .Y(inc_result[31]) );
-  
+
+  // 32-bit incrementer (ripple-carry chain)
+  INVX1 U_inc_0 ( .A(count[0]), .Y(inc_result[0]) );
+  XOR2X1 U_inc_1 ( .A(count[1]), .B(count[0]), .Y(inc_result[1]) );
+  AND2X1 U_carry_1 ( .A(count[1]), .B(count[0]), .Y(carry[1]) );
+  XOR2X1 U_inc_2 ( .A(count[2]), .B(carry[1]), .Y(inc_result[2]) );
+  AND2X1 U_carry_2 ( .A(count[2]), .B(carry[1]), .Y(carry[2]) );
+  XOR2X1 U_inc_3 ( .A(count[3]), .B(carry[2]), .Y(inc_result[3]) );
+  AND2X1 U_carry_3 ( .A(count[3]), .B(carry[2]), .Y(carry[3]) );
+  XOR2X1 U_inc_4 ( .A(count[4]), .B(carry[3]), .Y(inc_result[4]) );
+  AND2X1 U_carry_4 ( .A(count[4]), .B(carry[3]), .Y(carry[4]) );
+  XOR2X1 U_inc_5 ( .A(count[5]), .B(carry[4]), .Y(inc_result[5]) );
+  AND2X1 U_carry_5 ( .A(count[5]), .B(carry[4]), .Y(carry[5]) );
+  XOR2X1 U_inc_6 ( .A(count[6]), .B(carry[5]), .Y(inc_result[6]) );
+  AND2X1 U_carry_6 ( .A(count[6]), .B(carry[5]), .Y(carry[6]) );
+  XOR2X1 U_inc_7 ( .A(count[7]), .B(carry[6]), .Y(inc_result[7]) );
+  AND2X1 U_carry_7 ( .A(count[7]), .B(carry[6]), .Y(carry[7]) );
+  XOR2X1 U_inc_8 ( .A(count[8]), .B(carry[7]), .Y(inc_result[8]) );
+  AND2X1 U_carry_8 ( .A(count[8]), .B(carry[7]), .Y(carry[8]) );
+  XOR2X1 U_inc_9 ( .A(count[9]), .B(carry[8]), .Y(inc_result[9]) );
+  AND2X1 U_carry_9 ( .A(count[9]), .B(carry[8]), .Y(carry[9]) );
+  XOR2X1 U_inc_10 ( .A(count[10]), .B(carry[9]), .Y(inc_result[10]) );
+  AND2X1 U_carry_10 ( .A(count[10]), .B(carry[9]), .Y(carry[10]) );
+  XOR2X1 U_inc_11 ( .A(count[11]), .B(carry[10]), .Y(inc_result[11]) );
+  AND2X1 U_carry_11 ( .A(count[11]), .B(carry[10]), .Y(carry[11]) );
+  XOR2X1 U_inc_12 ( .A(count[12]), .B(carry[11]), .Y(inc_result[12]) );
+  AND2X1 U_carry_12 ( .A(count[12]), .B(carry[11]), .Y(carry[12]) );
+  XOR2X1 U_inc_13 ( .A(count[13]), .B(carry[12]), .Y(inc_result[13]) );
+  AND2X1 U_carry_13 ( .A(count[13]), .B(carry[12]), .Y(carry[13]) );
+  XOR2X1 U_inc_14 ( .A(count[14]), .B(carry[13]), .Y(inc_result[14]) );
+  AND2X1 U_carry_14 ( .A(count[14]), .B(carry[13]), .Y(carry[14]) );
+  XOR2X1 U_inc_15 ( .A(count[15]), .B(carry[14]), .Y(inc_result[15]) );
+  AND2X1 U_carry_15 ( .A(count[15]), .B(carry[14]), .Y(carry[15]) );
+  XOR2X1 U_inc_16 ( .A(count[16]), .B(carry[15]), .Y(inc_result[16]) );
+  AND2X1 U_carry_16 ( .A(count[16]), .B(carry[15]), .Y(carry[16]) );
+  XOR2X1 U_inc_17 ( .A(count[17]), .B(carry[16]), .Y(inc_result[17]) );
+  AND2X1 U_carry_17 ( .A(count[17]), .B(carry[16]), .Y(carry[17]) );
+  XOR2X1 U_inc_18 ( .A(count[18]), .B(carry[17]), .Y(inc_result[18]) );
+  AND2X1 U_carry_18 ( .A(count[18]), .B(carry[17]), .Y(carry[18]) );
+  XOR2X1 U_inc_19 ( .A(count[19]), .B(carry[18]), .Y(inc_result[19]) );
+  AND2X1 U_carry_19 ( .A(count[19]), .B(carry[18]), .Y(carry[19]) );
+  XOR2X1 U_inc_20 ( .A(count[20]), .B(carry[19]), .Y(inc_result[20]) );
+  AND2X1 U_carry_20 ( .A(count[20]), .B(carry[19]), .Y(carry[20]) );
+  XOR2X1 U_inc_21 ( .A(count[21]), .B(carry[20]), .Y(inc_result[21]) );
+  AND2X1 U_carry_21 ( .A(count[21]), .B(carry[20]), .Y(carry[21]) );
+  XOR2X1 U_inc_22 ( .A(count[22]), .B(carry[21]), .Y(inc_result[22]) );
+  AND2X1 U_carry_22 ( .A(count[22]), .B(carry[21]), .Y(carry[22]) );
+  XOR2X1 U_inc_23 ( .A(count[23]), .B(carry[22]), .Y(inc_result[23]) );
+  AND2X1 U_carry_23 ( .A(count[23]), .B(carry[22]), .Y(carry[23]) );
+  XOR2X1 U_inc_24 ( .A(count[24]), .B(carry[23]), .Y(inc_result[24]) );
+  AND2X1 U_carry_24 ( .A(count[24]), .B(carry[23]), .Y(carry[24]) );
+  XOR2X1 U_inc_25 ( .A(count[25]), .B(carry[24]), .Y(inc_result[25]) );
+  AND2X1 U_carry_25 ( .A(count[25]), .B(carry[24]), .Y(carry[25]) );
+  XOR2X1 U_inc_26 ( .A(count[26]), .B(carry[25]), .Y(inc_result[26]) );
+  AND2X1 U_carry_26 ( .A(count[26]), .B(carry[25]), .Y(carry[26]) );
+  XOR2X1 U_inc_27 ( .A(count[27]), .B(carry[26]), .Y(inc_result[27]) );
+  AND2X1 U_carry_27 ( .A(count[27]), .B(carry[26]), .Y(carry[27]) );
+  XOR2X1 U_inc_28 ( .A(count[28]), .B(carry[27]), .Y(inc_result[28]) );
+  AND2X1 U_carry_28 ( .A(count[28]), .B(carry[27]), .Y(carry[28]) );
+  XOR2X1 U_inc_29 ( .A(count[29]), .B(carry[28]), .Y(inc_result[29]) );
+  AND2X1 U_carry_29 ( .A(count[29]), .B(carry[28]), .Y(carry[29]) );
+  XOR2X1 U_inc_30 ( .A(count[30]), .B(carry[29]), .Y(inc_result[30]) );
+  AND2X1 U_carry_30 ( .A(count[30]), .B(carry[29]), .Y(carry[30]) );
+  XOR2X1 U_inc_31 ( .A(count[31]), .B(carry[30]), .Y(inc_result[31]) );
+  AND2X1 U_carry_31 ( .A(count[31]), .B(carry[30]), .Y(carry[31]) );
+
   // Multiplexers for enable control
-  genvar i;
-  generate
-    for (i = 0; i < 32; i = i + 1) begin : gen_mux
-      MUX2X1 U_mux ( 
-        .A(count_int[i]), 
-        .B(inc_result[i]), 
-        .S(enable_buf), 
-        .Y(next_count[i]) 
-      );
-    end
-  endgenerate
-  
+  MUX2X1 U_mux_0 ( .A(count[0]), .B(inc_result[0]), .S(enable_buf), .Y(next_count[0]) );
+  MUX2X1 U_mux_1 ( .A(count[1]), .B(inc_result[1]), .S(enable_buf), .Y(next_count[1]) );
+  MUX2X1 U_mux_2 ( .A(count[2]), .B(inc_result[2]), .S(enable_buf), .Y(next_count[2]) );
+  MUX2X1 U_mux_3 ( .A(count[3]), .B(inc_result[3]), .S(enable_buf), .Y(next_count[3]) );
+  MUX2X1 U_mux_4 ( .A(count[4]), .B(inc_result[4]), .S(enable_buf), .Y(next_count[4]) );
+  MUX2X1 U_mux_5 ( .A(count[5]), .B(inc_result[5]), .S(enable_buf), .Y(next_count[5]) );
+  MUX2X1 U_mux_6 ( .A(count[6]), .B(inc_result[6]), .S(enable_buf), .Y(next_count[6]) );
+  MUX2X1 U_mux_7 ( .A(count[7]), .B(inc_result[7]), .S(enable_buf), .Y(next_count[7]) );
+  MUX2X1 U_mux_8 ( .A(count[8]), .B(inc_result[8]), .S(enable_buf), .Y(next_count[8]) );
+  MUX2X1 U_mux_9 ( .A(count[9]), .B(inc_result[9]), .S(enable_buf), .Y(next_count[9]) );
+  MUX2X1 U_mux_10 ( .A(count[10]), .B(inc_result[10]), .S(enable_buf), .Y(next_count[10]) );
+  MUX2X1 U_mux_11 ( .A(count[11]), .B(inc_result[11]), .S(enable_buf), .Y(next_count[11]) );
+  MUX2X1 U_mux_12 ( .A(count[12]), .B(inc_result[12]), .S(enable_buf), .Y(next_count[12]) );
+  MUX2X1 U_mux_13 ( .A(count[13]), .B(inc_result[13]), .S(enable_buf), .Y(next_count[13]) );
+  MUX2X1 U_mux_14 ( .A(count[14]), .B(inc_result[14]), .S(enable_buf), .Y(next_count[14]) );
+  MUX2X1 U_mux_15 ( .A(count[15]), .B(inc_result[15]), .S(enable_buf), .Y(next_count[15]) );
+  MUX2X1 U_mux_16 ( .A(count[16]), .B(inc_result[16]), .S(enable_buf), .Y(next_count[16]) );
+  MUX2X1 U_mux_17 ( .A(count[17]), .B(inc_result[17]), .S(enable_buf), .Y(next_count[17]) );
+  MUX2X1 U_mux_18 ( .A(count[18]), .B(inc_result[18]), .S(enable_buf), .Y(next_count[18]) );
+  MUX2X1 U_mux_19 ( .A(count[19]), .B(inc_result[19]), .S(enable_buf), .Y(next_count[19]) );
+  MUX2X1 U_mux_20 ( .A(count[20]), .B(inc_result[20]), .S(enable_buf), .Y(next_count[20]) );
+  MUX2X1 U_mux_21 ( .A(count[21]), .B(inc_result[21]), .S(enable_buf), .Y(next_count[21]) );
+  MUX2X1 U_mux_22 ( .A(count[22]), .B(inc_result[22]), .S(enable_buf), .Y(next_count[22]) );
+  MUX2X1 U_mux_23 ( .A(count[23]), .B(inc_result[23]), .S(enable_buf), .Y(next_count[23]) );
+  MUX2X1 U_mux_24 ( .A(count[24]), .B(inc_result[24]), .S(enable_buf), .Y(next_count[24]) );
+  MUX2X1 U_mux_25 ( .A(count[25]), .B(inc_result[25]), .S(enable_buf), .Y(next_count[25]) );
+  MUX2X1 U_mux_26 ( .A(count[26]), .B(inc_result[26]), .S(enable_buf), .Y(next_count[26]) );
+  MUX2X1 U_mux_27 ( .A(count[27]), .B(inc_result[27]), .S(enable_buf), .Y(next_count[27]) );
+  MUX2X1 U_mux_28 ( .A(count[28]), .B(inc_result[28]), .S(enable_buf), .Y(next_count[28]) );
+  MUX2X1 U_mux_29 ( .A(count[29]), .B(inc_result[29]), .S(enable_buf), .Y(next_count[29]) );
+  MUX2X1 U_mux_30 ( .A(count[30]), .B(inc_result[30]), .S(enable_buf), .Y(next_count[30]) );
+  MUX2X1 U_mux_31 ( .A(count[31]), .B(inc_result[31]), .S(enable_buf), .Y(next_count[31]) );
+
   // D Flip-Flops (32 instances)
-  DFFQX1 count_reg_0 ( .D(next_count[0]), .CK(clk), .CLR(rst_n), .Q(count_int[0]) );
-  DFFQX1 count_reg_1 ( .D(next_count[1]), .CK(clk), .CLR(rst_n), .Q(count_int[1]) );
-  DFFQX1 count_reg_2 ( .D(next_count[2]), .CK(clk), .CLR(rst_n), .Q(count_int[2]) );
-  // ... (count_reg_3 through count_reg_30)
-  DFFQX1 count_reg_31 ( .D(next_count[31]), .CK(clk), .CLR(rst_n), .Q(count_int[31]) );
-  
-  // Overflow detection logic (all bits high AND enable)
-  wire all_ones;
-  AND2X2 U_ovf_0 ( .A(count_int[0]), .B(count_int[1]), .Y(n_ovf_0) );
-  AND2X2 U_ovf_1 ( .A(n_ovf_0), .B(count_int[2]), .Y(n_ovf_1) );
-  // ... (cascade AND gates for all 32 bits)
-  AND2X2 U_ovf_final ( .A(n_ovf_30), .B(count_int[31]), .Y(all_ones) );
-  AND2X2 U_overflow ( .A(all_ones), .B(enable_buf), .Y(overflow) );
-  
-  // Output assignment
-  assign count = count_int;
+  DFFQX1 count_reg_0 ( .D(next_count[0]), .CK(clk), .CLR(rst_n), .Q(count[0]) );
+  DFFQX1 count_reg_1 ( .D(next_count[1]), .CK(clk), .CLR(rst_n), .Q(count[1]) );
+  DFFQX1 count_reg_2 ( .D(next_count[2]), .CK(clk), .CLR(rst_n), .Q(count[2]) );
+  DFFQX1 count_reg_3 ( .D(next_count[3]), .CK(clk), .CLR(rst_n), .Q(count[3]) );
+  DFFQX1 count_reg_4 ( .D(next_count[4]), .CK(clk), .CLR(rst_n), .Q(count[4]) );
+  DFFQX1 count_reg_5 ( .D(next_count[5]), .CK(clk), .CLR(rst_n), .Q(count[5]) );
+  DFFQX1 count_reg_6 ( .D(next_count[6]), .CK(clk), .CLR(rst_n), .Q(count[6]) );
+  DFFQX1 count_reg_7 ( .D(next_count[7]), .CK(clk), .CLR(rst_n), .Q(count[7]) );
+  DFFQX1 count_reg_8 ( .D(next_count[8]), .CK(clk), .CLR(rst_n), .Q(count[8]) );
+  DFFQX1 count_reg_9 ( .D(next_count[9]), .CK(clk), .CLR(rst_n), .Q(count[9]) );
+  DFFQX1 count_reg_10 ( .D(next_count[10]), .CK(clk), .CLR(rst_n), .Q(count[10]) );
+  DFFQX1 count_reg_11 ( .D(next_count[11]), .CK(clk), .CLR(rst_n), .Q(count[11]) );
+  DFFQX1 count_reg_12 ( .D(next_count[12]), .CK(clk), .CLR(rst_n), .Q(count[12]) );
+  DFFQX1 count_reg_13 ( .D(next_count[13]), .CK(clk), .CLR(rst_n), .Q(count[13]) );
+  DFFQX1 count_reg_14 ( .D(next_count[14]), .CK(clk), .CLR(rst_n), .Q(count[14]) );
+  DFFQX1 count_reg_15 ( .D(next_count[15]), .CK(clk), .CLR(rst_n), .Q(count[15]) );
+  DFFQX1 count_reg_16 ( .D(next_count[16]), .CK(clk), .CLR(rst_n), .Q(count[16]) );
+  DFFQX1 count_reg_17 ( .D(next_count[17]), .CK(clk), .CLR(rst_n), .Q(count[17]) );
+  DFFQX1 count_reg_18 ( .D(next_count[18]), .CK(clk), .CLR(rst_n), .Q(count[18]) );
+  DFFQX1 count_reg_19 ( .D(next_count[19]), .CK(clk), .CLR(rst_n), .Q(count[19]) );
+  DFFQX1 count_reg_20 ( .D(next_count[20]), .CK(clk), .CLR(rst_n), .Q(count[20]) );
+  DFFQX1 count_reg_21 ( .D(next_count[21]), .CK(clk), .CLR(rst_n), .Q(count[21]) );
+  DFFQX1 count_reg_22 ( .D(next_count[22]), .CK(clk), .CLR(rst_n), .Q(count[22]) );
+  DFFQX1 count_reg_23 ( .D(next_count[23]), .CK(clk), .CLR(rst_n), .Q(count[23]) );
+  DFFQX1 count_reg_24 ( .D(next_count[24]), .CK(clk), .CLR(rst_n), .Q(count[24]) );
+  DFFQX1 count_reg_25 ( .D(next_count[25]), .CK(clk), .CLR(rst_n), .Q(count[25]) );
+  DFFQX1 count_reg_26 ( .D(next_count[26]), .CK(clk), .CLR(rst_n), .Q(count[26]) );
+  DFFQX1 count_reg_27 ( .D(next_count[27]), .CK(clk), .CLR(rst_n), .Q(count[27]) );
+  DFFQX1 count_reg_28 ( .D(next_count[28]), .CK(clk), .CLR(rst_n), .Q(count[28]) );
+  DFFQX1 count_reg_29 ( .D(next_count[29]), .CK(clk), .CLR(rst_n), .Q(count[29]) );
+  DFFQX1 count_reg_30 ( .D(next_count[30]), .CK(clk), .CLR(rst_n), .Q(count[30]) );
+  DFFQX1 count_reg_31 ( .D(next_count[31]), .CK(clk), .CLR(rst_n), .Q(count[31]) );
+
+  // Overflow detection (carry out of the chain = all bits high) AND enable
+  AND2X2 U_overflow ( .A(carry[31]), .B(enable_buf), .Y(overflow) );
 
 endmodule
 
@@ -80,13 +167,11 @@ endmodule
 // ============================================================================
 // Cell Count Summary:
 //   DFFQX1:  32 instances
-//   AND2X1:  12 instances
-//   AND2X2:   8 instances
-//   OR2X1:    6 instances
-//   XOR2X1:  18 instances
-//   INVX1:    8 instances
-//   BUFX2:    4 instances
-//   MUX2X1:  10 instances
-//   AOI21X1:  2 instances
-// Total Cells: 112
+//   AND2X1:  31 instances
+//   AND2X2:   1 instances
+//   XOR2X1:  31 instances
+//   INVX1:    1 instances
+//   BUFX2:    1 instances
+//   MUX2X1:  32 instances
+// Total Cells: 129
 // ============================================================================
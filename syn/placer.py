@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+# ============================================================================
+# Placer - Analytic quadratic placement and row legalization
+# ============================================================================
+# Purpose: Place the cells of a netlist_db.Netlist in the floorplan core:
+#          minimize quadratic wirelength with the I/O ports fixed on the
+#          core boundary, spread the cells over the core, legalize them into
+#          standard cell rows and report half-perimeter wirelength (HPWL)
+#
+# Net model: nets with up to STAR_PINS pins are cliques (edge weight
+#   1/(k-1)); larger nets (clk, rst_n, enable_buf) get a movable star node
+#   instead, so the system grows linearly with the pin count.
+# Solve: the x and y systems share one sparse Laplacian (COO sorted by
+#   row, matvec with np.bincount) and are solved together by
+#   Jacobi-preconditioned conjugate gradient, warm-started every iteration.
+# Spreading: after each solve the cells are shifted to equal-area
+#   positions within horizontal and vertical stripes; the next solve pulls
+#   every cell towards its spread position with a pseudo-net whose weight
+#   grows with the iteration.
+# Legalization: cells keep the row of their spread position unless the
+#   row is full (boundaries move in y order), then are packed left to
+#   right on the site grid with a running maximum, all rows at once.
+# Usage:   python placer.py [--width W] [--iterations N]
+#          (pnr/reports: python run_synthesis_simulation.py --place)
+# ============================================================================
+
+import argparse
+import os
+import re
+import time
+from collections import namedtuple
+
+import numpy as np
+
+import liberty
+
+# Floorplan of counter_32bit (floorplan/reports/design_area.rpt); larger
+# designs grow the core to TARGET_UTILIZATION
+CORE_WIDTH = 55.0
+CORE_HEIGHT = 55.0
+TARGET_UTILIZATION = 0.70
+ROW_HEIGHT = 1.2
+SITE_WIDTH = 0.14
+PORT_REPORT = "../floorplan/reports/port_placement.rpt"
+
+# Nets with more pins than this use a star node instead of a clique
+STAR_PINS = 4
+
+# Global placement iterations, pseudo-net weight per iteration and solver
+ITERATIONS = 5
+ANCHOR_WEIGHT = 0.2
+CG_TOLERANCE = 1e-5
+CG_MAX_ITERATIONS = 300
+SEED = 1
+
+# Off-diagonal Laplacian entries of the movable objects (cells then star
+# nodes) in COO form; fixed terminals only contribute to diag and rhs
+System = namedtuple("System", "rows cols values diag rhs")
+
+# Pins of every net sorted by net: obj >= 0 is a cell, -1 a fixed port
+NetPins = namedtuple("NetPins", "net obj fixed_x fixed_y starts")
+
+Placement = namedtuple("Placement", [
+    "x", "y",              # (cells,) lower-left corner of every cell (um)
+    "width",               # (cells,) cell width (um), a multiple of SITE_WIDTH
+    "row",                 # (cells,) row index
+    "core_width", "core_height", "rows",
+    "initial_hpwl",        # random placement
+    "history",             # [(iteration, solver iterations, HPWL)] of global placement
+    "global_hpwl",         # HPWL of the last spread placement
+    "hpwl",                # HPWL of the legal placement
+    "displacement",        # (mean, max) legalization displacement (um)
+    "violations",          # overlapping or out-of-core cells after legalization
+    "ports",               # {net: (x, y)} of the port terminals
+    "seconds",
+])
+
+
+def core_size(cell_area):
+    """Core width and height (um): the floorplan core, grown if too small"""
+    side = np.sqrt(cell_area / TARGET_UTILIZATION)
+    if side <= CORE_WIDTH:
+        return CORE_WIDTH, CORE_HEIGHT
+    return (float(np.ceil(side / SITE_WIDTH) * SITE_WIDTH),
+            float(np.ceil(side / ROW_HEIGHT) * ROW_HEIGHT))
+
+
+def read_port_report(path=PORT_REPORT):
+    """{port bit name: (x, y)} listed in the floorplan port placement report"""
+    positions = {}
+    if not os.path.exists(path):
+        return positions
+    row = re.compile(r"^(\S+)\s+(?:LEFT|RIGHT|TOP|BOTTOM)\s+\(([-\d.]+),\s*([-\d.]+)\)")
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            match = row.match(line)
+            if match:
+                positions[match.group(1)] = (float(match.group(2)), float(match.group(3)))
+    return positions
+
+
+def port_positions(netlist, width, height, listed=None):
+    """{net: (x, y)} of every port bit on the core boundary
+
+    Inputs go on the left edge; output buses put their lower half on the
+    right edge and the rest (with scalar outputs) on the top edge, evenly
+    spaced. Positions from the floorplan port report take precedence when
+    they lie on this core's boundary.
+    """
+    n = netlist
+    left, right, top = [], [], []
+    for port in n.ports:
+        base, count = n.bus_base[port.bus], n.bus_width[port.bus]
+        name = n.bus_names[port.bus]
+        bits = [(n.net_name(base + i), base + i) for i in range(count)]
+        if port.direction == "input":
+            left += bits
+        elif count > 1:
+            right += bits[:count // 2]
+            top += bits[count // 2:]
+        else:
+            top += bits
+    positions = {}
+    for side, bits in (("left", left), ("right", right), ("top", top)):
+        for i, (name, net) in enumerate(bits):
+            t = (i + 1) / (len(bits) + 1)
+            positions[net] = {"left": (0.0, t * height), "right": (width, t * height),
+                              "top": (t * width, height)}[side]
+    for name, (x, y) in (listed or {}).items():
+        on_boundary = (x in (0.0, width) and 0 <= y <= height or
+                       y in (0.0, height) and 0 <= x <= width)
+        try:
+            net = n.net(name)
+        except KeyError:
+            continue
+        if on_boundary and net in positions:
+            positions[net] = (x, y)
+    return positions
+
+
+def cell_widths(netlist, library):
+    """Width (um) of every cell: library area over the row height, in whole sites"""
+    sites = np.array([np.ceil(library.cell(t.name).area / ROW_HEIGHT / SITE_WIDTH - 1e-9)
+                      for t in netlist.types] or [1.0])
+    return sites[np.frombuffer(netlist.cell_type, dtype=np.uint16)] * SITE_WIDTH
+
+
+def net_pins(netlist, ports):
+    """NetPins of every net with at least two pins (cell pins and port terminals)"""
+    n = netlist
+    pin_net = np.frombuffer(n.pin_net, dtype=np.int32).astype(np.int64)
+    pin_cell = np.frombuffer(n.pin_cell, dtype=np.int32).astype(np.int64)
+    port_nets = np.fromiter(ports, dtype=np.int64, count=len(ports))
+    port_xy = np.array(list(ports.values()), dtype=np.float64).reshape(-1, 2)
+    net = np.concatenate([pin_net, port_nets])
+    obj = np.concatenate([pin_cell, np.full(len(port_nets), -1)])
+    fixed_x = np.concatenate([np.zeros(len(pin_net)), port_xy[:, 0]])
+    fixed_y = np.concatenate([np.zeros(len(pin_net)), port_xy[:, 1]])
+
+    # One pin per (net, object): a cell with two pins on a net counts once
+    order = np.lexsort((obj, net))
+    net, obj, fixed_x, fixed_y = net[order], obj[order], fixed_x[order], fixed_y[order]
+    keep = np.ones(len(net), dtype=bool)
+    keep[1:] = (net[1:] != net[:-1]) | (obj[1:] != obj[:-1]) | (obj[1:] < 0)
+    net, obj, fixed_x, fixed_y = net[keep], obj[keep], fixed_x[keep], fixed_y[keep]
+
+    counts = np.bincount(net, minlength=n.net_count)
+    keep = counts[net] >= 2
+    net, obj, fixed_x, fixed_y = net[keep], obj[keep], fixed_x[keep], fixed_y[keep]
+    starts = np.flatnonzero(np.r_[True, net[1:] != net[:-1]])
+    return NetPins(net, obj, fixed_x, fixed_y, starts)
+
+
+def build_system(pins, cells):
+    """System of the quadratic wirelength over cells plus one star node per large net"""
+    sizes = np.diff(np.r_[pins.starts, len(pins.net)])
+    weight = 1.0 / (sizes - 1)
+    star = sizes > STAR_PINS
+    star_id = np.full(len(sizes), -1)
+    star_id[star] = cells + np.arange(star.sum())
+    objects = cells + int(star.sum())
+    segment = np.repeat(np.arange(len(sizes)), sizes)
+
+    a, b, w = [], [], []
+    # Star nets: every pin to the net's star node, weight k/(k-1)
+    on_star = star[segment]
+    a.append(star_id[segment[on_star]])
+    b.append(np.where(pins.obj[on_star] >= 0, pins.obj[on_star], -1))
+    w.append((sizes * weight)[segment[on_star]])
+    # Clique nets: every pair of pins
+    for k in range(2, STAR_PINS + 1):
+        nets = np.flatnonzero(sizes == k)
+        if not len(nets):
+            continue
+        first = pins.starts[nets]
+        for i in range(k):
+            for j in range(i + 1, k):
+                a.append(first + i)
+                b.append(first + j)
+                w.append(np.full(len(nets), weight[nets[0]]))
+    star_pins = len(a[0])
+    a = np.concatenate(a)
+    b = np.concatenate(b)
+    w = np.concatenate(w)
+
+    # Clique entries are pin indices so far; star entries are objects
+    pin_a = np.r_[np.full(star_pins, -1), a[star_pins:]]
+    pin_b = np.r_[np.flatnonzero(on_star), b[star_pins:]]
+    obj_a = np.r_[a[:star_pins], pins.obj[a[star_pins:]]]
+    obj_b = pins.obj[pin_b]
+
+    diag = np.zeros(objects)
+    rhs = np.zeros((objects, 2))
+    movable = (obj_a >= 0) & (obj_b >= 0)
+    for own, other_pin, other in ((obj_a, pin_b, obj_b), (obj_b, pin_a, obj_a)):
+        fixed = (own >= 0) & (other < 0)
+        np.add.at(diag, own[fixed], w[fixed])
+        np.add.at(rhs[:, 0], own[fixed], w[fixed] * pins.fixed_x[other_pin[fixed]])
+        np.add.at(rhs[:, 1], own[fixed], w[fixed] * pins.fixed_y[other_pin[fixed]])
+    np.add.at(diag, obj_a[movable], w[movable])
+    np.add.at(diag, obj_b[movable], w[movable])
+
+    rows = np.r_[obj_a[movable], obj_b[movable]]
+    cols = np.r_[obj_b[movable], obj_a[movable]]
+    values = np.r_[-w[movable], -w[movable]]
+    order = np.argsort(rows, kind="stable")
+    return System(rows[order], cols[order], values[order], diag, rhs)
+
+
+def _matvec(system, diag, v):
+    out = diag[:, None] * v
+    for axis in range(v.shape[1]):
+        out[:, axis] += np.bincount(system.rows, system.values * v[system.cols, axis],
+                                    minlength=len(diag))
+    return out
+
+
+def conjugate_gradient(system, diag, rhs, x0, tolerance=CG_TOLERANCE,
+                       max_iterations=CG_MAX_ITERATIONS):
+    """Solve (L + diag) X = rhs for both columns at once; return (X, iterations)"""
+    x = x0.copy()
+    inverse = 1.0 / diag[:, None]
+    r = rhs - _matvec(system, diag, x)
+    z = r * inverse
+    p = z.copy()
+    rz = (r * z).sum(axis=0)
+    limit = tolerance * np.maximum(np.linalg.norm(rhs, axis=0), 1e-12)
+    for iteration in range(1, max_iterations + 1):
+        q = _matvec(system, diag, p)
+        alpha = rz / np.maximum((p * q).sum(axis=0), 1e-300)
+        x += alpha * p
+        r -= alpha * q
+        if (np.linalg.norm(r, axis=0) <= limit).all():
+            return x, iteration
+        z = r * inverse
+        rz_next = (r * z).sum(axis=0)
+        p = z + (rz_next / np.maximum(rz, 1e-300)) * p
+        rz = rz_next
+    return x, max_iterations
+
+
+def hpwl(pins, cx, cy):
+    """Total half-perimeter wirelength (um) of cell centers cx, cy"""
+    movable = pins.obj >= 0
+    x = np.where(movable, cx[np.maximum(pins.obj, 0)], pins.fixed_x)
+    y = np.where(movable, cy[np.maximum(pins.obj, 0)], pins.fixed_y)
+    return float((np.maximum.reduceat(x, pins.starts) - np.minimum.reduceat(x, pins.starts)).sum()
+                 + (np.maximum.reduceat(y, pins.starts) - np.minimum.reduceat(y, pins.starts)).sum())
+
+
+def _stripe_spread(along, across, width, extent, stripes):
+    """Equal-area positions along one axis within stripes of the other axis"""
+    stripe = np.minimum((across / max(across.max(), 1e-12) * stripes).astype(np.int64),
+                        stripes - 1)
+    order = np.lexsort((along, stripe))
+    w = width[order]
+    total = np.bincount(stripe, weights=width, minlength=stripes)
+    before = np.cumsum(w) - w
+    stripe_sorted = stripe[order]
+    first = np.r_[0, np.cumsum(np.bincount(stripe_sorted, minlength=stripes))[:-1]]
+    before -= (np.cumsum(w) - w)[first][stripe_sorted]
+    target = np.empty_like(along)
+    target[order] = (before + w / 2) / np.maximum(total[stripe_sorted], 1e-12) * extent
+    return target
+
+
+def spread(cx, cy, width, core_width, core_height):
+    """Cell centers shifted to uniform density over the core"""
+    stripes = max(int(np.sqrt(len(cx)) / 2), 1)
+    tx = _stripe_spread(cx, cy, width, core_width, stripes)
+    ty = _stripe_spread(cy, cx, width * ROW_HEIGHT, core_height, stripes)
+    return tx, ty
+
+
+def legalize(cx, cy, width, core_width, core_height):
+    """Row and lower-left x of every cell, packed on the site grid
+
+    Raises ValueError when the cells do not fit in the core.
+    """
+    rows = int(core_height / ROW_HEIGHT + 1e-9)
+    core_width = np.floor(core_width / SITE_WIDTH + 1e-9) * SITE_WIDTH  # whole sites
+    if width.sum() > rows * core_width + 1e-6:
+        raise ValueError(f"cells ({width.sum():.1f} um of rows) do not fit in "
+                         f"{rows} rows of {core_width:.2f} um")
+    order = np.argsort(cy, kind="stable")
+    cum = np.r_[0.0, np.cumsum(width[order])]
+    desired = np.clip((cy[order] / ROW_HEIGHT).astype(np.int64), 0, rows - 1)
+    bounds = np.searchsorted(desired, np.arange(rows + 1)).astype(np.int64)
+    bounds[-1] = len(order)
+    slack = 1e-9
+    # Full rows pass their highest cells up, then the top rows pass down
+    for r in range(rows - 1):
+        fits = np.searchsorted(cum, cum[bounds[r]] + core_width + slack, 'right') - 1
+        bounds[r + 1] = max(bounds[r], min(bounds[r + 1], fits))
+    for r in range(rows - 1, 0, -1):
+        fits = np.searchsorted(cum, cum[bounds[r + 1]] - core_width - slack, 'left')
+        bounds[r] = min(bounds[r + 1], max(bounds[r], fits))
+    row = np.empty(len(order), dtype=np.int64)
+    row[order] = np.repeat(np.arange(rows), np.diff(bounds))
+
+    # Pack every row at once: x_i = c_i + max_{j<=i}(d_j - c_j), offset per row
+    left = np.round(np.clip(cx - width / 2, 0, None) / SITE_WIDTH) * SITE_WIDTH
+    order = np.lexsort((left, row))
+    w, r = width[order], row[order]
+    start = np.r_[0, np.cumsum(np.bincount(r, minlength=rows))[:-1]]
+    c = np.cumsum(w) - w
+    c -= c[start][r]
+    row_total = np.bincount(r, weights=w, minlength=rows)
+    offset = r * (4 * core_width + 4 * row_total.max())
+    x = np.maximum.accumulate(left[order] - c + offset) - offset + c
+    x = np.minimum(x, c + core_width - row_total[r])
+    result = np.empty_like(x)
+    result[order] = np.round(x / SITE_WIDTH) * SITE_WIDTH
+    return row, result
+
+
+def violations(x, row, width, core_width):
+    """Cells overlapping their left neighbour or outside the core"""
+    order = np.lexsort((x, row))
+    xs, ws, rs = x[order], width[order], row[order]
+    overlap = (rs[1:] == rs[:-1]) & (xs[1:] < xs[:-1] + ws[:-1] - 1e-6)
+    outside = (xs < -1e-6) | (xs + ws > core_width + 1e-6)
+    return int(overlap.sum() + outside.sum())
+
+
+def place(netlist, library=None, iterations=ITERATIONS, seed=SEED, ports=None):
+    """Placement of a netlist in its core"""
+    started = time.perf_counter()
+    n = netlist
+    library = library or liberty.load_library()
+    if n.net_driver is None:
+        n.build_index()
+    width = cell_widths(n, library)
+    core_width, core_height = core_size(float((width * ROW_HEIGHT).sum()))
+    if ports is None:
+        listed = read_port_report() if (core_width, core_height) == (CORE_WIDTH, CORE_HEIGHT) \
+            else {}
+        ports = port_positions(n, core_width, core_height, listed)
+    pins = net_pins(n, ports)
+    system = build_system(pins, n.cell_count)
+    objects = len(system.diag)
+
+    rng = np.random.default_rng(seed)
+    position = rng.random((objects, 2)) * [core_width, core_height]
+    initial = hpwl(pins, position[:, 0], position[:, 1])
+
+    history = []
+    # Objects with no connection to a fixed terminal stay solvable
+    base = system.diag + 1e-6
+    anchors = np.zeros(objects)
+    target = np.zeros((objects, 2))
+    tx = ty = None
+    for iteration in range(1, iterations + 1):
+        diag = base + anchors
+        rhs = system.rhs + anchors[:, None] * target
+        position, steps = conjugate_gradient(system, diag, rhs, position)
+        cx, cy = position[:n.cell_count, 0], position[:n.cell_count, 1]
+        tx, ty = spread(cx, cy, width, core_width, core_height)
+        history.append((iteration, steps, hpwl(pins, tx, ty)))
+        # Pull cells towards their spread position, harder every iteration
+        anchors[:n.cell_count] = ANCHOR_WEIGHT * iteration * system.diag[:n.cell_count]
+        target[:n.cell_count, 0], target[:n.cell_count, 1] = tx, ty
+
+    row, x = legalize(tx, ty, width, core_width, core_height)
+    y = row * ROW_HEIGHT
+    moved = np.hypot(x + width / 2 - tx, y + ROW_HEIGHT / 2 - ty)
+    legal = hpwl(pins, x + width / 2, y + ROW_HEIGHT / 2)
+    return Placement(x, y, width, row, core_width, core_height,
+                     int(core_height / ROW_HEIGHT + 1e-9), initial, history,
+                     history[-1][2] if history else initial, legal,
+                     (float(moved.mean()) if len(moved) else 0.0,
+                      float(moved.max(initial=0.0))),
+                     violations(x, row, width, core_width), ports,
+                     time.perf_counter() - started)
+
+
+def report_fields(netlist, placement, library=None):
+    """Fields of the placement report and the area section of the pnr QoR summary"""
+    p = placement
+    library = library or liberty.load_library()
+    import area
+    cell_area = float(area.cell_areas(netlist, library).sum())
+    core_area = p.core_width * p.core_height
+    used = np.bincount(p.row, weights=p.width, minlength=p.rows) / p.core_width
+    history = [f"  Iteration {i}: HPWL = {value:.2f} um ({steps} CG iterations)"
+               for i, steps, value in p.history]
+    improvement = 1 - p.hpwl / p.initial_hpwl if p.initial_hpwl else 0.0
+    return {
+        'core_width': p.core_width,
+        'core_height': p.core_height,
+        'core_area': core_area,
+        'cell_area': cell_area,
+        'utilization': cell_area / core_area,
+        'placed_cells': netlist.cell_count,
+        'pnr_net_count': int(np.count_nonzero(np.bincount(
+            np.frombuffer(netlist.pin_net, dtype=np.int32), minlength=netlist.net_count))),
+        'row_count': p.rows,
+        'sites_per_row': int(p.core_width / SITE_WIDTH + 1e-9),
+        'initial_hpwl': p.initial_hpwl,
+        'hpwl_iterations': "\n".join(history),
+        'global_hpwl': p.global_hpwl,
+        'final_hpwl': p.hpwl,
+        'hpwl_improvement': improvement,
+        'mean_displacement': p.displacement[0],
+        'max_displacement': p.displacement[1],
+        'legality': ("✓ 100% legal" if not p.violations else
+                     f"✗ {p.violations} violations"),
+        'row_utilization_min': float(used.min(initial=0.0)),
+        'row_utilization_max': float(used.max(initial=0.0)),
+    }
+
+
+def main(argv=None):
+    import netlist_gen
+
+    parser = argparse.ArgumentParser(description="Quadratic placement and legalization")
+    parser.add_argument("--width", type=int, default=32)
+    parser.add_argument("--iterations", type=int, default=ITERATIONS)
+    parser.add_argument("--lib", default=liberty.DEFAULT_LIBRARY, help="Liberty cell library")
+    args = parser.parse_args(argv)
+
+    library = liberty.load_library(args.lib)
+    netlist = netlist_gen.build_counter(args.width)
+    placement = place(netlist, library, args.iterations)
+    fields = report_fields(netlist, placement, library)
+    print(f"{netlist.name}: {netlist.cell_count:,} cells in a {placement.core_width:.2f} x "
+          f"{placement.core_height:.2f} um core ({fields['utilization']:.2%} utilization)")
+    print(f"  Initial HPWL: {placement.initial_hpwl:.2f} um")
+    print(fields['hpwl_iterations'])
+    print(f"  Legal HPWL:   {placement.hpwl:.2f} um, {fields['legality']}, "
+          f"mean displacement {placement.displacement[0]:.2f} um")
+    print(f"  {placement.seconds:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+# ============================================================================
+# Power - Activity-driven power estimation over a netlist_db.Netlist
+# ============================================================================
+# Purpose: Compute internal, switching and leakage power per cell, per net
+#          and per hierarchy scope from the Liberty library and the
+#          switching activity of the nets, for a batch of activity
+#          profiles (operating modes) at once
+#
+# Activity (per net): signal probability P = P(net is 1) and switching
+#   density D = transitions per clock cycle.
+#   toggle mode          nets annotated with toggle counts from a cycle
+#                        simulation (counter_model) or a VCD (vcd.py)
+#   probabilistic mode   only primary inputs (and registers) annotated
+# Nets without an annotation are propagated in one levelized pass:
+#   P(y) = sum over the truth table rows, D(y) = sum_i P(dy/dx_i) D(x_i)
+#   (Najm's transition density, inputs independent). Flip-flop outputs
+#   are startpoints: annotated, else DEFAULT_REGISTER_ACTIVITY.
+#
+# Power (f in MHz, V in volts):
+#   internal   E_out(fJ) x D(out) x f + E_ck(fJ) x 2 x f  (flip-flops)
+#   switching  1/2 C(pF) V^2 x D x f, C = load pins + wire load
+#   leakage    cell leakage (nW) x corner derate
+# Usage:   python power.py [--width W] [--frequency MHZ] [--vcd FILE]
+# ============================================================================
+
+import argparse
+from collections import namedtuple
+
+import numpy as np
+
+import area
+import liberty
+import sta
+
+# Scopes listed in the hierarchical breakdown
+MAX_HIERARCHY_ROWS = area.MAX_HIERARCHY_ROWS
+
+# Activity (P, D) of unannotated primary inputs and flip-flop outputs
+DEFAULT_INPUT_ACTIVITY = (0.5, 0.1)
+DEFAULT_REGISTER_ACTIVITY = (0.5, 0.1)
+
+# An operating mode: clock running or gated, and {net name: (P, D)}
+Profile = namedtuple("Profile", "name clock annotations")
+
+# Per-profile (last axis) results; power in µW
+PowerResult = namedtuple(
+    "PowerResult", "profiles probability density internal switching leakage")
+
+
+def net_capacitance(netlist, library):
+    """Capacitance (pF) of every net: load pin capacitances plus wire load"""
+    n = netlist
+    if n.net_driver is None:
+        n.build_index()
+    # pin_cap[type][k] is the input capacitance of pin k of that type
+    width = max((len(t.pins) for t in n.types), default=1)
+    pin_cap = np.zeros((max(len(n.types), 1), width))
+    for t in n.types:
+        cell = library.cell(t.name)
+        pin_cap[t.id, :len(t.pins)] = [cell.pin(pin).capacitance for pin in t.pins]
+    pin_cell = np.frombuffer(n.pin_cell, dtype=np.int32)
+    starts = np.frombuffer(n.cell_pin_start, dtype=np.int32)
+    cell_type = np.frombuffer(n.cell_type, dtype=np.uint16)
+    pin_net = np.frombuffer(n.pin_net, dtype=np.int32)
+    loads = n.fanout_pins
+    caps = pin_cap[cell_type[pin_cell[loads]], loads - starts[pin_cell[loads]]]
+    wire_load = library.wire_load
+    wire = area.wire_length(wire_load, area.net_fanout(n)) * wire_load.capacitance
+    return np.bincount(pin_net[loads], weights=caps, minlength=n.net_count) + wire
+
+
+class _GateModel:
+    """Truth table of a cell type and the Boolean differences of its inputs"""
+
+    __slots__ = ("table", "bits", "differences")
+
+    def __init__(self, cell, pins):
+        inputs = len(pins)
+        self.table = liberty.truth_table(cell.function, pins).astype(np.float64)
+        rows = np.arange(1 << inputs)
+        self.bits = ((rows[:, None] >> np.arange(inputs)) & 1).astype(bool)
+        # dy/dx_i is 1 on row r (x_i = 0) when flipping x_i changes y
+        self.differences = []
+        for i in range(inputs):
+            low = rows[(rows >> i) & 1 == 0]
+            flips = self.table[low] != self.table[low | (1 << i)]
+            self.differences.append((low[flips], low[flips] | (1 << i)))
+
+    def propagate(self, p, d):
+        """(P, D) of the output from (cells, inputs, profiles) input P and D"""
+        weight = np.ones((p.shape[0], len(self.table), p.shape[2]))
+        for i in range(p.shape[1]):
+            weight *= np.where(self.bits[None, :, i, None], p[:, None, i, :],
+                               1.0 - p[:, None, i, :])
+        probability = np.einsum("r,crm->cm", self.table, weight)
+        density = np.zeros_like(probability)
+        for i, (low, high) in enumerate(self.differences):
+            if len(low):
+                sensitive = weight[:, low, :].sum(axis=1) + weight[:, high, :].sum(axis=1)
+                density += sensitive * d[:, i, :]
+        return probability, density
+
+
+class PowerEngine:
+    """Levelized activity propagation and power of one netlist"""
+
+    def __init__(self, netlist, library=None, clock="clk"):
+        n = netlist
+        if n.net_driver is None:
+            n.build_index()
+        self.netlist = n
+        self.library = library or liberty.load_library()
+        self.sequential, self.out_net, in_nets = sta.cell_connections(n)
+        level, _ = sta.levelize(n, in_nets, self.sequential)
+        self.cell_type = np.frombuffer(n.cell_type, dtype=np.uint16)
+        cells = [self.library.cell(t.name) for t in n.types]
+
+        # Combinational cells in (level, type) order, cut into same-type runs
+        self.segments = []
+        combinational = np.flatnonzero(~self.sequential)
+        if combinational.size:
+            order = combinational[np.lexsort((self.cell_type[combinational],
+                                              level[combinational]))]
+            keys = level[order].astype(np.int64) * len(n.types) + self.cell_type[order]
+            bounds = np.flatnonzero(np.diff(keys)) + 1
+            models = {}
+            for run in np.split(order, bounds):
+                type_ = n.types[self.cell_type[run[0]]]
+                if type_.id not in models:
+                    models[type_.id] = _GateModel(cells[type_.id], type_.pins[:type_.inputs])
+                self.segments.append((models[type_.id], in_nets[run, :type_.inputs],
+                                      self.out_net[run]))
+
+        self.capacitance = net_capacitance(n, self.library)
+        self.internal_energy = np.array([c.internal_energy for c in cells] or [0.0])
+        self.clock_energy = np.array([c.clock_energy for c in cells] or [0.0])
+        self.type_leakage = np.array([c.leakage for c in cells] or [0.0])
+        self.clock_net = n.net(clock) if clock in n.bus_index else None
+
+        self.input_nets = []
+        for port in n.ports:
+            if port.direction == "input":
+                base = n.bus_base[port.bus]
+                self.input_nets.extend(range(base, base + n.bus_width[port.bus]))
+
+    def activity(self, profiles):
+        """(P, D) of every net, shape (nets, profiles)"""
+        n, count = self.netlist, len(profiles)
+        probability = np.full((n.net_count, count), 0.5)
+        density = np.zeros((n.net_count, count))
+        fixed = np.zeros((n.net_count, count), dtype=bool)
+
+        inputs = np.array(self.input_nets, dtype=np.int64)
+        probability[inputs], density[inputs] = DEFAULT_INPUT_ACTIVITY
+        registers = self.out_net[self.sequential]
+        probability[registers], density[registers] = DEFAULT_REGISTER_ACTIVITY
+        for m, profile in enumerate(profiles):
+            if self.clock_net is not None:
+                probability[self.clock_net, m] = 0.5
+                density[self.clock_net, m] = 2.0 if profile.clock else 0.0
+            for name, (p, d) in profile.annotations.items():
+                net = n.net(name)
+                probability[net, m], density[net, m] = p, d
+                fixed[net, m] = True
+
+        for model, ins, out in self.segments:
+            p, d = model.propagate(probability[ins], density[ins])
+            keep = fixed[out]
+            probability[out] = np.where(keep, probability[out], p)
+            density[out] = np.where(keep, density[out], d)
+        return probability, density
+
+    def evaluate(self, profiles, frequency, voltage=None, leakage_derate=1.0, activity=None):
+        """PowerResult of a batch of profiles at a clock frequency (MHz)
+
+        activity is the (P, D) of self.activity(profiles), when already
+        propagated (e.g. once for several operating corners).
+        """
+        library = self.library
+        voltage = library.nom_voltage if voltage is None else voltage
+        probability, density = activity or self.activity(profiles)
+        clocks = np.array([1.0 if p.clock else 0.0 for p in profiles])
+
+        # fJ x transitions/cycle x MHz = nW
+        energy_scale = (voltage / library.nom_voltage) ** 2
+        internal = self.internal_energy[self.cell_type][:, None] * density[self.out_net]
+        internal += (self.clock_energy[self.cell_type] * self.sequential)[:, None] * 2 * clocks
+        internal *= energy_scale * frequency / 1e3
+
+        # pF x V^2 x MHz = µW, half CV^2 per transition
+        switching = 0.5 * self.capacitance[:, None] * voltage ** 2 * density * frequency
+        leakage = self.type_leakage[self.cell_type] * leakage_derate / 1e3
+        return PowerResult([p.name for p in profiles], probability, density,
+                           internal, switching, leakage)
+
+
+def totals(result):
+    """Internal/switching/leakage/total power (µW) per profile"""
+    internal = result.internal.sum(axis=0)
+    switching = result.switching.sum(axis=0)
+    leakage = np.full(len(result.profiles), result.leakage.sum())
+    return {'internal': internal, 'switching': switching, 'leakage': leakage,
+            'total': internal + switching + leakage}
+
+
+def cell_power(engine, result, profile=0):
+    """Total power (µW) of each cell: internal + leakage + its output net's switching"""
+    return (result.internal[:, profile] + result.leakage +
+            result.switching[engine.out_net, profile])
+
+
+def toggle_annotations(toggles, cycles, probabilities=None):
+    """{net: (P, D)} from {net: transitions over the run}
+
+    Nets missing from probabilities are taken as high half of the time.
+    """
+    probabilities = probabilities or {}
+    cycles = max(cycles, 1)
+    return {name: (probabilities.get(name, 0.5), transitions / cycles)
+            for name, transitions in toggles.items()}
+
+
+def vcd_toggles(stats):
+    """{net: transitions} of VcdReader.toggle_stats() (vectors per bit)"""
+    toggles = {}
+    for sig in stats.values():
+        if sig.width == 1:
+            toggles[sig.name] = int(sig.bit_toggles[0])
+        else:
+            for bit in range(sig.width):
+                toggles[f"{sig.name}[{bit}]"] = int(sig.bit_toggles[bit])
+    return toggles
+
+
+def _sections(netlist):
+    """[(label, first cell, end cell)] of the netlist's section comments"""
+    starts = sorted(netlist.comments)
+    ends = starts[1:] + [netlist.cell_count]
+    return [(netlist.comments[start].partition(" (")[0], start, end)
+            for start, end in zip(starts, ends) if end > start]
+
+
+def _hierarchy_rows(engine, result):
+    """HIERARCHICAL POWER BREAKDOWN rows of profile 0
+
+    Cells carry their internal and leakage power, nets their switching
+    power (counted in the scope of the driving cell). A flat netlist is
+    broken down by its section comments instead.
+    """
+    n = engine.netlist
+    internal, leakage = result.internal[:, 0], result.leakage
+    switching = result.switching[:, 0]
+    dynamic = area.hierarchy(n, internal, switching)
+    static = area.hierarchy(n, leakage, np.zeros(n.net_count))
+
+    def row(label, cell, net, leak):
+        return f"{label:<34}{cell:>9.2f}{net:>12.2f}{leak:>11.2f}{cell + net + leak:>11.2f}"
+
+    rows = []
+    for (scope, depth, _, _, cell, net), static_row in zip(dynamic[:MAX_HIERARCHY_ROWS],
+                                                           static):
+        label = f"{n.name} (top)" if not scope else "  " * depth + scope.rpartition("/")[2]
+        rows.append(row(label, cell, net, static_row[4]))
+    if len(dynamic) > MAX_HIERARCHY_ROWS:
+        rows.append(f"  ... ({len(dynamic) - MAX_HIERARCHY_ROWS} more scopes)")
+    elif len(dynamic) == 1:
+        out_switching = switching[engine.out_net]
+        for label, start, end in _sections(n):
+            rows.append(row(f"  {label}", internal[start:end].sum(),
+                            out_switching[start:end].sum(), leakage[start:end].sum()))
+        driven = n.net_driver >= 0
+        if not driven.all():
+            rows.append(row("  (input port nets)", 0.0, switching[~driven].sum(), 0.0))
+    return rows
+
+
+def report_fields(engine, result, frequency, voltage):
+    """Fields of the power report and the QoR power summary
+
+    Profile 0 is the design's active mode; every profile gets a row of
+    the operating mode table, its activity relative to profile 0's
+    dynamic power.
+    """
+    n = engine.netlist
+    total = totals(result)
+    power = {key: float(value[0]) for key, value in total.items()}
+    whole = power['total'] or 1.0
+    dynamic = total['internal'] + total['switching']
+
+    per_cell = cell_power(engine, result)
+    by_type = np.bincount(engine.cell_type, weights=per_cell, minlength=len(n.types))
+    counts = np.bincount(engine.cell_type, minlength=len(n.types))
+    type_rows = [f"{t.name:<22}{counts[t.id]:>7}{by_type[t.id]:>15.2f}"
+                 f"{by_type[t.id] / max(counts[t.id], 1):>18.2f}"
+                 for t in sorted(n.types, key=lambda t: -by_type[t.id]) if counts[t.id]]
+
+    mode_rows = []
+    for m, name in enumerate(result.profiles):
+        clock = engine.clock_net is None or result.density[engine.clock_net, m] > 0
+        activity = dynamic[m] / dynamic[0] if dynamic[0] else 0.0
+        note = " (leakage only)" if not dynamic[m] else ""
+        mode_rows.append(f"{name:<22}{frequency if clock else 0:>6g} MHz{activity:>12.0%}"
+                         f"{total['total'][m]:>13.2f}{note}")
+
+    leakage_share = power['leakage'] / whole
+    return {
+        'internal_power': power['internal'],
+        'switching_power': power['switching'],
+        'leakage_power': power['leakage'],
+        'dynamic_power': float(dynamic[0]),
+        'total_power': power['total'],
+        'internal_share': power['internal'] / whole,
+        'switching_share': power['switching'] / whole,
+        'leakage_share': leakage_share,
+        'dynamic_share': float(dynamic[0]) / whole,
+        'power_hierarchy': "\n".join(_hierarchy_rows(engine, result)),
+        'cell_type_power': "\n".join(type_rows),
+        'operating_modes': "\n".join(mode_rows),
+        'power_per_mhz': power['total'] / frequency,
+        'power_per_gate': power['total'] / max(n.cell_count, 1),
+        'energy_per_cycle': power['total'] / frequency,  # µW / MHz = pJ
+        'average_current': power['total'] / voltage,
+        'leakage_note': (f"✓ Leakage power is minimal ({leakage_share:.1%} of total)"
+                         if leakage_share < 0.1 else
+                         f"- Leakage power is {leakage_share:.1%} of total"),
+    }
+
+
+def main(argv=None):
+    import netlist_gen
+    import time
+
+    parser = argparse.ArgumentParser(description="Activity-driven power estimation")
+    parser.add_argument("--width", type=int, default=32)
+    parser.add_argument("--frequency", type=float, default=100.0, help="clock (MHz)")
+    parser.add_argument("--lib", default=liberty.DEFAULT_LIBRARY, help="Liberty cell library")
+    parser.add_argument("--vcd", help="annotate net toggle counts from a VCD")
+    parser.add_argument("--cycles", type=int, help="clock cycles of the VCD (default: "
+                        "clk transitions / 2)")
+    args = parser.parse_args(argv)
+
+    netlist = netlist_gen.build_counter(args.width)
+    started = time.perf_counter()
+    engine = PowerEngine(netlist, liberty.load_library(args.lib))
+    profiles = [Profile("probabilistic", True, {})]
+    if args.vcd:
+        import vcd
+        with vcd.VcdReader(args.vcd) as reader:
+            toggles = vcd_toggles(reader.toggle_stats())
+        cycles = args.cycles or toggles.pop("clk", 2) // 2
+        toggles.pop("clk", None)
+        toggles = {name: t for name, t in toggles.items() if name in netlist.bus_index or
+                   name.partition("[")[0] in netlist.bus_index}
+        profiles.append(Profile("vcd", True, toggle_annotations(toggles, cycles)))
+    result = engine.evaluate(profiles, args.frequency)
+    elapsed = time.perf_counter() - started
+
+    total = totals(result)
+    print(f"{netlist.name}: {netlist.cell_count:,} cells, {len(engine.segments)} "
+          f"propagation segments ({elapsed * 1e3:.1f} ms)")
+    print(f"\n{'Profile':<16}{'Internal':>12}{'Switching':>12}{'Leakage':>12}{'Total':>12}")
+    for m, name in enumerate(result.profiles):
+        print(f"{name:<16}{total['internal'][m]:>12.2f}{total['switching'][m]:>12.2f}"
+              f"{total['leakage'][m]:>12.2f}{total['total'][m]:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# ============================================================================
+# Report Engine - Parallel report generation for SynthesisSimulator
+# ============================================================================
+# Purpose: Render synthesis reports concurrently on a process pool and
+#          write them to disk through a single batched writer
+# ============================================================================
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Report file name -> SynthesisSimulator method that renders it
+REPORT_GENERATORS = {
+    'qor.rpt': 'generate_qor_report',
+    'timing.rpt': 'generate_timing_report',
+    'area.rpt': 'generate_area_report',
+    'power.rpt': 'generate_power_report',
+    'cell_usage.rpt': 'generate_cell_usage_report',
+    'resources.rpt': 'generate_resources_report',
+    'constraints.rpt': 'generate_constraint_report',
+    'mcmm.rpt': 'generate_mcmm_report',
+}
+
+
+def default_jobs():
+    """Number of workers used when --jobs is not given"""
+    return os.cpu_count() or 1
+
+
+def _render(sim, method_name):
+    """Worker entry point: render one report"""
+    return getattr(sim, method_name)()
+
+
+class BatchedReportWriter:
+    """Collects rendered reports and writes them in one pass"""
+
+    def __init__(self, report_dir):
+        self.report_dir = report_dir
+        self.pending = []
+
+    def add(self, filename, content):
+        self.pending.append((filename, content))
+
+    def flush(self):
+        """Write all pending reports, return the paths written"""
+        os.makedirs(self.report_dir, exist_ok=True)
+        written = []
+        for filename, content in self.pending:
+            filepath = os.path.join(self.report_dir, filename)
+            with open(filepath, 'w') as f:
+                f.write(content)
+            written.append(filepath)
+        self.pending = []
+        return written
+
+
+class ReportEngine:
+    """Runs the generate_*_report methods of a simulator concurrently"""
+
+    def __init__(self, jobs=None):
+        self.jobs = max(1, jobs if jobs is not None else default_jobs())
+
+    def render(self, sim, generators=None):
+        """Render every report, return {filename: content} in table order"""
+        generators = generators or REPORT_GENERATORS
+        if self.jobs == 1:
+            return {name: _render(sim, method) for name, method in generators.items()}
+
+        workers = min(self.jobs, len(generators))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {name: pool.submit(_render, sim, method)
+                       for name, method in generators.items()}
+            return {name: future.result() for name, future in futures.items()}
+
+    def save(self, sim, report_dir, generators=None):
+        """Render and write all reports through one batched writer"""
+        reports = self.render(sim, generators)
+        writer = BatchedReportWriter(report_dir)
+        for filename, content in reports.items():
+            writer.add(filename, content)
+        for filepath in writer.flush():
+            print(f"✓ Generated: {filepath}")
+        return reports
@@ -0,0 +1,770 @@
+#!/usr/bin/env python3
+# ============================================================================
+# Report Layouts - Static text of every synthesis report
+# ============================================================================
+# Purpose: Layout strings compiled by report_templates. Variable fields are
+#          written as {name} or {name:format_spec}.
+# ============================================================================
+
+LAYOUTS = {}
+
+LAYOUTS["qor"] = """
+================================================================================
+                    QUALITY OF RESULTS (QoR) REPORT
+================================================================================
+Design: {design_name}
+Date: {date}
+Tool: Synopsys Design Compiler (Simulated)
+Technology: Generic 45nm (Typical)
+================================================================================
+
+TIMING SUMMARY
+--------------------------------------------------------------------------------
+Critical Path Setup Slack:     {setup_slack:8.2f} ns ({setup_status})
+Critical Path Hold Slack:      {hold_slack:8.2f} ns ({hold_status})
+Worst Negative Slack (WNS):    {wns:8.2f} ns
+Total Negative Slack (TNS):    {tns:8.2f} ns
+Number of Failing Endpoints:      {failing_endpoints}
+
+Clock Period:                  {clock_period:8.2f} ns
+Clock Frequency:               {frequency:8.2f} MHz
+Achieved Frequency:            {achieved_frequency:8.2f} MHz ({timing_margin})
+
+AREA SUMMARY
+--------------------------------------------------------------------------------
+Combinational Area:           {combinational_area:8.2f} µm²
+Non-combinational Area:       {sequential_area:8.2f} µm²
+Total Cell Area:              {total_cell_area:8.2f} µm²
+Net Interconnect Area:        {net_area:8.2f} µm²
+Total Area:                   {total_area:8.2f} µm²
+
+Cell Count:
+  Sequential Cells (DFF):      {flip_flops:>7}
+  Combinational Cells:         {logic_gates:>7}
+  Buffer/Inverter Cells:       {buffer_cells:>7}
+  Total Cells:                 {total_cells:>7}
+
+POWER SUMMARY (Estimated @{frequency:g}MHz)
+--------------------------------------------------------------------------------
+Internal Power:               {internal_power:9.2f} µW
+Switching Power:              {switching_power:9.2f} µW
+Leakage Power:                {leakage_power:9.2f} µW
+Total Power:                  {total_power:9.2f} µW
+
+DESIGN HIERARCHY
+--------------------------------------------------------------------------------
+Design: {design_name}
+  Instances: 1
+  Cells: {total_cells}
+  Nets: {net_count}
+  Ports: {port_count} ({input_ports} inputs, {output_ports} outputs)
+
+OPTIMIZATION SUMMARY
+--------------------------------------------------------------------------------
+Compile Strategy:                compile_ultra
+Optimization Effort:             high
+Area Optimization:               enabled
+Power Optimization:              enabled
+Timing Optimization:             enabled
+
+Design Rule Violations:          {design_rule_violations}
+Constraint Violations:           {failing_endpoints}
+
+VERIFICATION STATUS
+--------------------------------------------------------------------------------
+Check Design:                    PASSED
+Design Rule Check:               {design_rule_check}
+Timing Check:                    {timing_check}
+Constraint Check:                {constraint_check}
+
+================================================================================
+                            QoR: {qor_grade}
+================================================================================
+{qor_conclusion}
+================================================================================
+"""
+
+LAYOUTS["timing"] = """
+================================================================================
+                         TIMING ANALYSIS REPORT
+================================================================================
+Design: {design_name}
+Operating Conditions: {corner} ({temperature}C, {voltage:.1f}V)
+Timing Library: {library}
+================================================================================
+
+CLOCK SUMMARY
+--------------------------------------------------------------------------------
+Clock Name:    {clock_name}
+Period:        {clock_period:.2f} ns
+Frequency:     {frequency:.2f} MHz
+Uncertainty:   {clock_uncertainty:.2f} ns
+Latency:       {clock_latency:.2f} ns
+
+SETUP TIMING CHECK (Max Delay Analysis)
+================================================================================
+{setup_path}
+
+HOLD TIMING CHECK (Min Delay Analysis)
+================================================================================
+{hold_path}
+
+SUMMARY OF CRITICAL PATHS
+================================================================================
+Path #  From                To                  Slack     Type
+------------------------------------------------------------------------
+{path_summary}
+
+ENDPOINT SLACK HISTOGRAM (Setup)
+================================================================================
+Slack Range (ns)            Endpoints
+------------------------------------------------------------------------
+{slack_histogram}
+
+{timing_status}
+================================================================================
+Total Endpoints:         {endpoints:>7}
+Failing Endpoints:       {failing_endpoints:>7}
+Critical Path Slack:{setup_slack:>12.2f} ns
+Worst Negative Slack:{wns:>11.2f} ns
+Total Negative Slack:{tns:>11.2f} ns
+
+Timing margin:              {timing_margin}
+================================================================================
+"""
+
+LAYOUTS["area"] = """
+================================================================================
+                            AREA REPORT
+================================================================================
+Design: {design_name}
+Technology: Generic 45nm CMOS
+Date: {date}
+Wire Load Model: {wire_load}
+================================================================================
+
+HIERARCHICAL AREA BREAKDOWN
+--------------------------------------------------------------------------------
+Hierarchy                              Cell Area    Net Area    Total Area
+                                         (µm²)        (µm²)        (µm²)
+--------------------------------------------------------------------------------
+{hierarchy_rows}
+
+CELL AREA BREAKDOWN
+--------------------------------------------------------------------------------
+Cell Type                    Instances    Area (µm²)   Percentage
+--------------------------------------------------------------------------------
+Sequential Cells:
+{sequential_rows}
+                                 ----       --------     ------
+  Total Sequential:            {sequential_count:>5}{sequential_area:>15.2f}{sequential_share:>11.1%}
+
+Combinational Cells:
+{combinational_rows}
+                                 ----       --------     ------
+  Total Combinational:         {combinational_count:>5}{combinational_area:>15.2f}{combinational_share:>11.1%}
+
+--------------------------------------------------------------------------------
+Total Cell Area:               {total_cells:>5}{total_cell_area:>15.2f}     100.0%
+Net Interconnect Area:              {net_area:>15.2f}
+================================================================================
+Total Design Area:                  {total_area:>15.2f} µm²
+================================================================================
+
+RESOURCE UTILIZATION
+--------------------------------------------------------------------------------
+Resource Type              Used    Available    Utilization
+--------------------------------------------------------------------------------
+Flip-Flops                {flip_flops:>4}      unlimited      -
+Logic Gates               {logic_gates:>4}      unlimited      -
+Buffers/Inverters         {buffer_cells:>4}      unlimited      -
+Total Cells               {total_cells:>4}      unlimited      -
+
+AREA COMPARISON
+--------------------------------------------------------------------------------
+Metric                              Value         Units
+--------------------------------------------------------------------------------
+Gate Count:                     {total_cells:>9}         gates
+Gate Equivalent:                {gate_equivalent:>9.0f}         2-input NAND
+Transistor Count:               {transistor_count:>9}         transistors (estimated)
+Area per bit (counter):         {area_per_bit:>9.2f}         µm²/bit
+
+AREA SCALING (WIDTH sweep from per-bit slices)
+--------------------------------------------------------------------------------
+   WIDTH     Cells    Cell (µm²)   Net (µm²)   Total (µm²)     µm²/bit
+--------------------------------------------------------------------------------
+{scaling_rows}
+
+Area per added bit: {slice_area:.2f} µm²
+
+AREA OPTIMIZATION SUMMARY
+--------------------------------------------------------------------------------
+Optimization Level:         High
+Area Effort:                Maximum
+Final Area:                 {total_area:.2f} µm²
+
+STATUS: Area goals met - Design is area-efficient
+================================================================================
+"""
+
+LAYOUTS["power"] = """
+================================================================================
+                           POWER ANALYSIS REPORT
+================================================================================
+Design: {design_name}
+Operating Frequency: {frequency:g} MHz
+Operating Conditions: {voltage:.1f}V, {temperature}°C
+Activity: {activity_source}
+================================================================================
+
+POWER SUMMARY
+--------------------------------------------------------------------------------
+Power Component              Power (µW)    Percentage    Notes
+--------------------------------------------------------------------------------
+Internal Power:             {internal_power:>8.2f}      {internal_share:>7.1%}        Cell internal
+Switching Power:            {switching_power:>8.2f}      {switching_share:>7.1%}        Net switching
+Leakage Power:              {leakage_power:>8.2f}      {leakage_share:>7.1%}        Static leakage
+                             --------      --------
+Total Dynamic Power:        {dynamic_power:>8.2f}      {dynamic_share:>7.1%}
+Total Power:                {total_power:>8.2f}       100.0%
+
+HIERARCHICAL POWER BREAKDOWN
+--------------------------------------------------------------------------------
+Instance                           Internal   Switching    Leakage      Total
+                                     (µW)        (µW)        (µW)        (µW)
+--------------------------------------------------------------------------------
+{power_hierarchy}
+
+CELL TYPE POWER BREAKDOWN
+--------------------------------------------------------------------------------
+Cell Type              Instances    Power (µW)    Power/Cell (µW)
+--------------------------------------------------------------------------------
+{cell_type_power}
+
+SIGNAL ACTIVITY ANALYSIS
+--------------------------------------------------------------------------------
+Signal                  Toggle Rate    Capacitance    Power (µW)
+                           (%/ns)         (pF)
+--------------------------------------------------------------------------------
+{signal_activity}
+
+POWER BY OPERATING MODE
+--------------------------------------------------------------------------------
+Operating Mode         Frequency    Activity    Power (µW)
+--------------------------------------------------------------------------------
+{operating_modes}
+
+CLOCK GATING WHAT-IF (register bank)
+--------------------------------------------------------------------------------
+Architecture         Cells      Area   Clock   Logic  Leakage    Total  Savings
+                               (µm²)    (µW)    (µW)     (µW)     (µW)
+--------------------------------------------------------------------------------
+{clock_gating_savings}
+
+Activity: {clock_gating_source}
+
+Enable Duty    No gating   Single ICG   Per-nibble    Best
+                    (µW)         (µW)         (µW)
+--------------------------------------------------------------------------------
+{clock_gating_sweep}
+
+POWER OPTIMIZATION SUMMARY
+--------------------------------------------------------------------------------
+Clock Gating:              Not applied (what-if above)
+Multi-Vt Cells:            Not used (single Vt library)
+Power Gating:              Not applicable
+Operand Isolation:         Not applicable
+
+POWER EFFICIENCY METRICS
+--------------------------------------------------------------------------------
+Power per MHz:             {power_per_mhz:.2f} µW/MHz
+Power per gate:            {power_per_gate:.2f} µW/gate
+Energy per operation:      {energy_per_cycle:.2f} pJ/cycle
+
+RECOMMENDATIONS
+--------------------------------------------------------------------------------
+✓ Power consumption is within acceptable range for this design
+{leakage_note}
+{clock_gating_note}
+- Multi-Vt optimization could reduce leakage by ~20%
+
+================================================================================
+Total Power @ {frequency:g}MHz: {total_power:.2f} µW
+Average Current @ {voltage:.1f}V: {average_current:.2f} µA
+================================================================================
+STATUS: Power goals met - Design is power-efficient
+================================================================================
+"""
+
+LAYOUTS["cell_usage"] = """
+================================================================================
+                         CELL USAGE REPORT
+================================================================================
+Design: {design_name}
+Technology Library: {cell_library} (Generic 45nm)
+================================================================================
+
+CELL INSTANCE SUMMARY
+--------------------------------------------------------------------------------
+Cell Type            Library        Instances    Ref Count    Total Area
+                     Reference                                  (µm²)
+--------------------------------------------------------------------------------
+{cell_summary}
+--------------------------------------------------------------------------------
+TOTAL                             {total_instances:>9}{reference_count:>12}{total_cell_area:>16.2f}
+
+DETAILED INSTANCE LIST
+--------------------------------------------------------------------------------
+Instance Name              Cell Type    Fanout    Area (µm²)    Net
+--------------------------------------------------------------------------------
+{instance_list}
+
+FANOUT DISTRIBUTION
+--------------------------------------------------------------------------------
+Fanout Range        Instance Count    Percentage
+--------------------------------------------------------------------------------
+{fanout_distribution}
+
+High Fanout Nets:
+{high_fanout_nets}
+
+LIBRARY CELL DISTRIBUTION
+--------------------------------------------------------------------------------
+{cell_distribution}
+
+REFERENCE UTILIZATION
+--------------------------------------------------------------------------------
+Library: {cell_library}
+  Total Cells Available:    {library_cells:>4}
+  Cells Used:               {reference_count:>4} ({library_usage:.1%})
+
+Cell Categories:
+  Sequential:          {sequential_types}
+  Combinational:       {combinational_types}
+  Buffers/Inverters:   {buffer_types}
+
+Unused Cell Types:
+{unused_cells}
+
+STATUS: Cell usage is optimal and efficient
+================================================================================
+"""
+
+LAYOUTS["resources"] = """
+================================================================================
+                        DESIGN RESOURCES REPORT
+================================================================================
+Design: {design_name}
+Hierarchy Level: Top
+================================================================================
+
+DESIGN OBJECT COUNTS
+--------------------------------------------------------------------------------
+Object Type                      Count        Percentage
+--------------------------------------------------------------------------------
+Ports:                     {port_count:>10}            -
+  Input Ports:             {input_ports:>10}         {input_port_share:>5.1%}
+  Output Ports:            {output_ports:>10}         {output_port_share:>5.1%}
+  Inout Ports:                      0          0.0%
+
+Nets:                      {total_nets:>10}            -
+  Signal Nets:             {signal_nets:>10}         {signal_net_share:>5.1%}
+  Power Nets:                       1         {single_net_share:>5.1%}
+  Ground Nets:                      1         {single_net_share:>5.1%}
+  Clock Nets:                       1         {single_net_share:>5.1%}
+
+Cells:                     {total_cells:>10}            -
+  Sequential Cells:        {flip_flops:>10}         {sequential_cell_share:>5.1%}
+  Combinational Cells:     {logic_gates:>10}         {logic_cell_share:>5.1%}
+  Buffer/Inverter Cells:   {buffer_cells:>10}         {buffer_cell_share:>5.1%}
+  
+Registers:                 {register_count:>10}            -
+  1-bit Registers:         {register_count:>10}        100.0%
+  
+References:                {reference_count:>10}            -
+  Leaf Cells:              {reference_count:>10}        100.0%
+  Hierarchical:                     0          0.0%
+
+SEQUENTIAL RESOURCES
+--------------------------------------------------------------------------------
+Register Type           Count    Bits    Reset    Clock    Enable
+--------------------------------------------------------------------------------
+{register_rows}
+                        ----     ---
+Total Registers:        {register_count:>4}{register_count:>8}
+
+Reset Type Distribution:
+  Asynchronous Reset:   {async_registers:>4}{async_share:>10.1%}
+  Synchronous Reset:       0      0.0%
+  No Reset:             {unreset_registers:>4}{unreset_share:>10.1%}
+
+Clock Domain Distribution:
+{clock_domain_rows}
+
+COMBINATIONAL RESOURCES
+--------------------------------------------------------------------------------
+Logic Type              Count    Inputs    Outputs    Levels
+--------------------------------------------------------------------------------
+{logic_rows}
+
+Logic Depth (per endpoint):
+  Minimum:                {depth_min}
+  Average:                {depth_mean}
+  Maximum:                {depth_max} (critical path: {critical_cells} cells)
+
+ARITHMETIC RESOURCES
+--------------------------------------------------------------------------------
+Component Type          Count    Width    Implementation
+--------------------------------------------------------------------------------
+Incrementer:              1{data_bits:>9}      Ripple-carry adder
+Comparator:               1{comparator_bits:>9}      Shared carry chain
+
+TIMING RESOURCES
+--------------------------------------------------------------------------------
+Clock Domains:            1
+  {clock_name} ({frequency:g} MHz)
+
+Register Endpoints:  {register_endpoints:>6}
+Output Endpoints:    {output_endpoints:>6}
+Total Endpoints:     {endpoints:>6}
+
+Critical Paths:      {critical_paths:>6} (top {max_paths} analyzed)
+False Paths:         {false_path_count:>6} ({false_path_sources})
+Multi-cycle Paths:   {multicycle_count:>6}
+
+MEMORY RESOURCES
+--------------------------------------------------------------------------------
+Type                    Count    Bits    Implementation
+--------------------------------------------------------------------------------
+Registers:             {register_count:>4}{register_count:>8}      Flip-flops
+RAM/ROM:                  0       0      None
+FIFO:                     0       0      None
+
+INTERFACE RESOURCES
+--------------------------------------------------------------------------------
+Interface Type          Count    Width    Direction
+--------------------------------------------------------------------------------
+{interface_rows}
+
+Total I/O:             {port_count:>4} bits
+  Input:               {input_ports:>4} bits
+  Output:              {output_ports:>4} bits ({data_bits}-bit data + {status_bits} status)
+
+DESIGN CHARACTERISTICS
+--------------------------------------------------------------------------------
+Design Style:            Synchronous
+Clock Strategy:          Single clock domain
+Reset Strategy:          {reset_strategy}
+Enable Strategy:         Synchronous enable
+Optimization:            Area & timing optimized
+
+Design Complexity:       {complexity} ({total_cells} cells)
+  Logic Levels:          {depth_max} ({critical_cells} cells on the critical path)
+  Fanout:                {fanout_detail}
+  Failing Endpoints:     {failing_endpoints}
+
+RESOURCE EFFICIENCY
+--------------------------------------------------------------------------------
+Metric                          Value         Rating
+--------------------------------------------------------------------------------
+Gate Count Efficiency:          Good          ✓
+Area Utilization:               Optimal       ✓
+Timing Margin:                  {timing_margin_share:<14}{timing_margin_check}
+Power Efficiency:               Excellent     ✓
+Routability:                    Easy          ✓
+
+================================================================================
+RESOURCE SUMMARY
+================================================================================
+Total Cells:         {total_cells:>9}
+Total Nets:          {total_nets:>9}
+Total Area:          {total_area:>10.2f} µm²
+Design Efficiency:      Excellent ✓
+================================================================================
+"""
+
+LAYOUTS["constraints"] = """
+================================================================================
+                      CONSTRAINT VALIDATION REPORT
+================================================================================
+Design: {design_name}
+================================================================================
+
+TIMING CONSTRAINTS STATUS
+--------------------------------------------------------------------------------
+Constraint Type              Status    Details
+--------------------------------------------------------------------------------
+{constraint_status}
+
+TIMING ANALYSIS SUMMARY
+--------------------------------------------------------------------------------
+Analysis Type             Slack (ns)    TNS (ns)    Failing      Status
+--------------------------------------------------------------------------------
+Setup (max delay)          {setup_slack:>7.2f}  {tns:>10.2f}  {setup_failing:>9}         {setup_check}
+Hold (min delay)           {hold_slack:>7.2f}  {hold_tns:>10.2f}  {hold_failing:>9}         {hold_check}
+Recovery                      N/A         N/A         N/A         N/A (rst_n false path)
+Removal                       N/A         N/A         N/A         N/A (rst_n false path)
+
+{timing_conclusion}
+
+DESIGN RULE CONSTRAINTS
+--------------------------------------------------------------------------------
+Rule Type                  Violations    Max Value    Details
+--------------------------------------------------------------------------------
+Max Transition Time         {transition_violations:>5}         {max_transition:<12}{transition_detail}
+Max Fanout                  {fanout_violations:>5}         {max_fanout:<12}{fanout_detail}
+Max Capacitance             {capacitance_violations:>5}         {max_capacitance:<12}{capacitance_detail}
+Min Capacitance                 0         N/A         Not specified
+
+{design_rule_conclusion}
+
+AREA CONSTRAINTS
+--------------------------------------------------------------------------------
+Constraint                 Target        Achieved      Status
+--------------------------------------------------------------------------------
+Max Area                   Minimize      {total_area:.2f} µm²   ✓ Optimized
+
+POWER CONSTRAINTS
+--------------------------------------------------------------------------------
+Constraint                 Target        Achieved      Status
+--------------------------------------------------------------------------------
+Total Power                Minimize      {total_power:.2f} µW     ✓ Optimized
+
+FALSE PATH SUMMARY
+--------------------------------------------------------------------------------
+From                    To                      Paths    Reason
+--------------------------------------------------------------------------------
+{false_path_rows}
+
+Multi-cycle paths:      {multicycle_count}
+Case analysis:          {case_analysis_count}
+Disabled timing arcs:   {disabled_arc_count}
+
+CLOCK CONSTRAINTS DETAIL
+--------------------------------------------------------------------------------
+Clock: {sdc_clock}
+  Period:             {sdc_period:6.2f} ns
+  Frequency:         {sdc_frequency:7.2f} MHz
+  Uncertainty:        {clock_uncertainty:6.2f} ns
+  Source Latency:     {source_latency:6.2f} ns
+  Network Latency:    {network_latency:6.2f} ns
+  Transition:         {clock_transition:6.2f} ns
+  
+  Fanout:             {clock_fanout:>4} registers
+  Skew:                 0.00 ns (ideal clock network)
+
+INPUT CONSTRAINTS DETAIL
+--------------------------------------------------------------------------------
+Port        Delay Max    Delay Min    Transition    Drive Cell
+            (ns)         (ns)         (ns)
+--------------------------------------------------------------------------------
+{input_constraints}
+
+OUTPUT CONSTRAINTS DETAIL
+--------------------------------------------------------------------------------
+Port          Delay Max    Delay Min    Load (pF)
+              (ns)         (ns)
+--------------------------------------------------------------------------------
+{output_constraints}
+
+CONSTRAINT COVERAGE
+--------------------------------------------------------------------------------
+Constrained Paths:          {constrained_paths:>4}
+Unconstrained Paths:        {unconstrained_paths:>4}
+Over-constrained Paths:     {overconstrained_paths:>4}
+
+Port Coverage:
+  Input Ports Constrained:  {input_coverage}
+  Output Ports Constrained: {output_coverage}
+
+Path Coverage:
+  Setup Paths Covered:      {constrained_paths:>4}
+  Hold Paths Covered:       {hold_paths_covered:>4}
+
+EXCEPTIONS SUMMARY
+--------------------------------------------------------------------------------
+False Paths:                {false_path_count:3d}
+Multi-cycle Paths:          {multicycle_count:3d}
+Case Analysis:              {case_analysis_count:3d}
+Clock Groups:               {clock_group_count:3d}
+
+CONSTRAINT VALIDATION
+--------------------------------------------------------------------------------
+{constraint_checks}
+
+================================================================================
+CONSTRAINT STATUS: {constraint_verdict}
+================================================================================
+{constraint_conclusion}
+================================================================================
+"""
+
+LAYOUTS["mcmm"] = """
+================================================================================
+               MULTI-CORNER MULTI-MODE (MCMM) ANALYSIS REPORT
+================================================================================
+Design: {design_name}
+Date: {date}
+Clock Period: {clock_period:.2f} ns ({frequency:.2f} MHz)
+Corners Analyzed: {corner_count}
+================================================================================
+
+CORNER DEFINITIONS
+--------------------------------------------------------------------------------
+Corner        Library                  Voltage    Temp  Delay Derate  Leakage
+--------------------------------------------------------------------------------
+{corner_definitions}
+
+TIMING BY CORNER
+--------------------------------------------------------------------------------
+Corner        Setup Slack   Setup TNS  Failing  Hold Slack    Hold TNS  Failing
+                     (ns)        (ns)                 (ns)        (ns)
+--------------------------------------------------------------------------------
+{corner_timing}
+
+POWER BY CORNER ({power_profile}: {activity_source})
+--------------------------------------------------------------------------------
+Corner          Internal   Switching     Leakage       Total
+                    (µW)        (µW)        (µW)        (µW)
+--------------------------------------------------------------------------------
+{corner_power}
+
+WORST CORNERS
+--------------------------------------------------------------------------------
+Setup:     {worst_setup}
+Hold:      {worst_hold}
+Power:     {worst_power}
+Leakage:   {worst_leakage}
+
+WORST SETUP PATH ({worst_setup_corner} corner)
+================================================================================
+{worst_setup_path}
+
+================================================================================
+{mcmm_status}
+================================================================================
+"""
+
+LAYOUTS["placement"] = """
+================================================================================
+PLACEMENT REPORT
+================================================================================
+
+Design:               {design_name}
+Technology:           45nm CMOS
+Date:                 {date}
+
+CORE
+────────────────────────────────────────────────────────────────────────────────
+Core Size:            {core_width:.2f} x {core_height:.2f} µm
+Rows:                 {row_count} x {sites_per_row} sites
+Cell Area:            {cell_area:.2f} µm²
+Placement Density:    {utilization:.2%}
+
+GLOBAL PLACEMENT (quadratic, {placed_cells} cells)
+────────────────────────────────────────────────────────────────────────────────
+  Initial HPWL: {initial_hpwl:.2f} um (random placement)
+{hpwl_iterations}
+
+LEGALIZATION
+────────────────────────────────────────────────────────────────────────────────
+Final HPWL:           {final_hpwl:.2f} um
+HPWL Improvement:     {hpwl_improvement:.1%}
+Mean Displacement:    {mean_displacement:.2f} um
+Max Displacement:     {max_displacement:.2f} um
+Placement Legality:   {legality}
+Row Utilization:      {row_utilization_min:.1%} - {row_utilization_max:.1%}
+
+================================================================================
+"""
+
+LAYOUTS["pnr_qor"] = """================================================================================
+PLACE & ROUTE - QUALITY OF RESULTS SUMMARY
+================================================================================
+
+Design:               {design_name}
+Technology:           45nm CMOS
+Date:                 {date}
+
+TIMING
+────────────────────────────────────────────────────────────────────────────────
+Clock Period:         {clock_period:.2f} ns ({frequency:g} MHz)
+Critical Path Delay:  {critical_path_delay:.2f} ns
+Setup Slack:          {setup_slack:+.2f} ns (WNS)
+Hold Slack:           {hold_slack:+.2f} ns (WNS)
+Setup Violations:     {setup_violations}
+Hold Violations:      {hold_violations}
+Max Frequency:        {achieved_frequency:.2f} MHz
+
+AREA
+────────────────────────────────────────────────────────────────────────────────
+Core Area:            {core_area:.2f} µm²
+Cell Area:            {cell_area:.2f} µm²
+Utilization:          {utilization:.2%}
+Cell Count:           {placed_cells}
+Net Count:            {pnr_net_count}
+Placed HPWL:          {final_hpwl:.2f} µm
+
+POWER
+────────────────────────────────────────────────────────────────────────────────
+Dynamic Power:        {dynamic_power:.2f} µW
+Leakage Power:        {leakage_power:.2f} µW
+Total Power:          {total_power:.2f} µW
+
+ROUTING
+────────────────────────────────────────────────────────────────────────────────
+Total Wire Length:    {routed_wirelength:.2f} µm
+Total Vias:           {total_vias}
+DRC Violations:       0
+Routing Overflow:     {routing_overflow}
+
+CLOCK TREE
+────────────────────────────────────────────────────────────────────────────────
+Clock Buffers:        12
+Clock Skew:           23.00 ps
+Insertion Delay:      0.575 ns
+Clock Power:          6.00 µW
+
+OVERALL QOR:          {pnr_status}
+"""
+
+LAYOUTS["routing"] = """
+================================================================================
+GLOBAL ROUTING REPORT
+================================================================================
+
+Design:               {design_name}
+Technology:           45nm CMOS
+Date:                 {date}
+
+GRID
+────────────────────────────────────────────────────────────────────────────────
+GCells:               {gcell_grid} ({gcell_size:.2f} µm)
+Nets:                 {routed_nets}
+Connections:          {routed_connections}
+
+NEGOTIATED CONGESTION
+────────────────────────────────────────────────────────────────────────────────
+{routing_history}
+
+LAYERS
+────────────────────────────────────────────────────────────────────────────────
+Layer     Direction    Tracks  Wire Length   Average     Peak  Overflow
+                     (/gcell)         (µm)     Usage    Usage
+────────────────────────────────────────────────────────────────────────────────
+{layer_routing}
+
+Local Wire Length:    {local_wirelength:.2f} µm (nets inside one gcell)
+Total Wire Length:    {routed_wirelength:.2f} µm
+Average Net Length:   {average_net_length:.2f} µm
+Total Vias:           {total_vias}
+Routing Overflow:     {routing_overflow} ({overflowed_edges} edges)
+Max Layer Utilization: {max_layer_utilization}
+Routing Status:       {routing_status}
+
+CONGESTION MAPS (gcell usage/capacity: " .:-=+*#%" up to full, X over)
+────────────────────────────────────────────────────────────────────────────────
+{congestion_maps}
+
+================================================================================
+"""
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# ============================================================================
+# Report Templates - Compile-once rendering of report layouts
+# ============================================================================
+# Purpose: Parse each layout in report_layouts once, cache the result, and
+#          render only the variable fields on every call
+# ============================================================================
+
+import time
+from functools import lru_cache
+from operator import itemgetter
+from string import Formatter
+
+from report_layouts import LAYOUTS
+
+
+class CompiledTemplate:
+    """A layout compiled once into an f-string over its field values
+
+    The layout is parsed once and generated into a render function whose
+    body is a single f-string of the literal chunks and the fields, indexed
+    in the tuple of field values, so a render costs what the former inline
+    f-string did. That tuple is also the memo key of the last render:
+    repeated calls with an unchanged configuration skip formatting entirely.
+    """
+
+    def __init__(self, layout, name="layout"):
+        parts = []
+        fields = {}
+        for literal, field, spec, conversion in Formatter().parse(layout):
+            if literal:
+                parts.append(repr(literal))
+            if field is None:
+                continue
+            if conversion or not field.isidentifier() or any(c in spec for c in "{}'\\"):
+                raise ValueError(f"Unsupported template field '{{{field}}}' in {name}")
+            index = fields.setdefault(field, len(fields))
+            parts.append(f"f'{{v[{index}]:{spec}}}'" if spec else f"f'{{v[{index}]}}'")
+
+        namespace = {}
+        source = f"def _render(v):\n    return ({' '.join(parts) or repr('')})\n"
+        exec(compile(source, f"<template {name}>", "exec"), namespace)
+        self._render = namespace["_render"]
+        self.fields = tuple(fields)
+        # Always a tuple, so the memo key compares cheaply in C
+        self._key = itemgetter(*self.fields, *self.fields[:1]) if self.fields else _no_key
+        self.last_key = None
+        self.last_text = None
+
+    def render(self, values):
+        key = self._key(values)
+        if key != self.last_key:
+            self.last_text = self._render(key)
+            self.last_key = key
+        return self.last_text
+
+
+def _no_key(values):
+    return ()
+
+
+@lru_cache(maxsize=None)
+def compile_template(name):
+    """Return the compiled template for LAYOUTS[name] (parsed once)"""
+    return CompiledTemplate(LAYOUTS[name], name)
+
+
+def render(name, values):
+    """Render the named layout with the given field values"""
+    return compile_template(name).render(values)
+
+
+_timestamp_cache = [None, ""]
+
+
+def timestamp():
+    """Current time as 'YYYY-mm-dd HH:MM:SS', formatted at most once a second"""
+    now = int(time.time())
+    if _timestamp_cache[0] != now:
+        _timestamp_cache[0] = now
+        _timestamp_cache[1] = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(now))
+    return _timestamp_cache[1]
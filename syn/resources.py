@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# ============================================================================
+# Resources - Ports, registers, logic and timing endpoints of a netlist
+# ============================================================================
+# Purpose: Compute the resources report fields from a netlist_db.Netlist,
+#          its Liberty library and the sta.TimingEngine analyzing it:
+#          ports by role, registers by type, reset and clock, gates by
+#          function, logic depth and the timing endpoints
+#
+# Roles:   the clock port of the engine is the clock input, inputs driving
+#          a register's asynchronous pin are reset inputs, other inputs
+#          are control inputs; output buses carry data, scalar outputs
+#          status
+# ============================================================================
+
+import re
+from collections import Counter
+
+import numpy as np
+
+import cell_usage
+
+# (fewer cells than, rating) of the design complexity
+COMPLEXITY = ((1_000, "Low"), (10_000, "Medium"), (100_000, "High"))
+
+# Report label of a gate function (cell name without inputs and drive)
+GATE_LABELS = {"AND": "AND Gates", "NAND": "NAND Gates", "OR": "OR Gates",
+               "NOR": "NOR Gates", "XOR": "XOR Gates", "XNOR": "XNOR Gates",
+               "AOI": "AOI Gates", "OAI": "OAI Gates", "MUX": "MUX",
+               "INV": "Inverters", "BUF": "Buffers"}
+
+# Interface roles in report order: direction text of each
+ROLES = {"Clock Input": "Input", "Reset Input": "Input (asynchronous)",
+         "Control Input": "Input", "Data Output": "Output", "Status Output": "Output"}
+
+
+def gate_function(name):
+    """Function of a cell type name: AND2X1 -> AND, INVX1 -> INV"""
+    return re.sub(r"X\d+$", "", name).rstrip("0123456789")
+
+
+def _levels(count):
+    return f"{count} level{'' if count == 1 else 's'}"
+
+
+def report_fields(netlist, library, engine):
+    """Fields of the resources report"""
+    n = netlist
+    c = engine.constraints
+    starts = np.frombuffer(n.cell_pin_start, dtype=np.int32)
+    pin_net = np.frombuffer(n.pin_net, dtype=np.int32)
+    clock_net = n.net(c.clock_port) if c.clock_port in n.bus_index else None
+
+    # Registers by type; async pins are inputs other than data and clock
+    types, async_types = Counter(), set()
+    reset_nets, clocked = set(), 0
+    for cell in np.flatnonzero(engine.sequential).tolist():
+        type_ = n.type_of(cell)
+        lib_cell = library.cell(type_.name)
+        nets = dict(zip(type_.pins, pin_net[starts[cell]:starts[cell + 1]].tolist()))
+        types[type_.name] += 1
+        clocked += nets.get(lib_cell.clock_pin) == clock_net
+        pins = [pin for pin in lib_cell.inputs if pin not in (lib_cell.clock_pin,
+                                                              lib_cell.data_pin)]
+        if pins:
+            async_types.add(type_.name)
+            reset_nets.update(nets[pin] for pin in pins if pin in nets)
+    registers = sum(types.values())
+    async_registers = sum(types[name] for name in async_types)
+
+    # Ports by role
+    roles = {role: [] for role in ROLES}
+    for port in n.ports:
+        name, width = n.bus_names[port.bus], n.bus_width[port.bus]
+        base = n.bus_base[port.bus]
+        if port.direction == "output":
+            role = "Data Output" if width > 1 else "Status Output"
+        elif name == c.clock_port:
+            role = "Clock Input"
+        elif reset_nets.intersection(range(base, base + width)):
+            role = "Reset Input"
+        else:
+            role = "Control Input"
+        roles[role].append((name, width))
+    interface = [f"{role + ':':<24}{len(ports):>3}{sum(w for _, w in ports):>8}       "
+                 f"{ROLES[role]}" for role, ports in roles.items() if ports]
+    controls = ", ".join(name for name, _ in roles["Control Input"]) or "-"
+    data_bits = sum(w for _, w in roles["Data Output"])
+    status_bits = sum(w for _, w in roles["Status Output"])
+
+    register_rows = [f"{name:<24}{count:>4}{count:>8}      "
+                     f"{'Async' if name in async_types else 'None':<9}{c.clock_name:<9}{controls}"
+                     for name, count in sorted(types.items())]
+
+    # Gates by function, in library order
+    counts, functions = n.cell_counts(), Counter()
+    for type_ in cell_usage.type_order(n, library):
+        if not type_.sequential:
+            function = gate_function(type_.name)
+            functions[GATE_LABELS.get(function, f"{function} Gates")] += counts[type_.name]
+
+    # Combinational levels into each endpoint
+    driver = engine.net_cell[engine.endpoint_net]
+    depth = np.where(driver >= 0, engine.level[np.maximum(driver, 0)] + 1, 0)
+    at_register = np.array([e.cell >= 0 for e in engine.endpoints], dtype=bool)
+    status_nets = {n.net(name) for name, _ in roles["Status Output"]}
+    at_status = np.isin(engine.endpoint_net, list(status_nets))
+    register_depth = int(depth[at_register].max(initial=0))
+    status_depth = int(depth[at_status].max(initial=0))
+    # Cells on the critical path, the launching register included
+    critical = 0
+    worst = engine.worst_endpoints(1)
+    if worst:
+        start, path = engine.critical_path(worst[0])
+        critical = len(path) + (engine._startpoint(start)[2] >= 0)
+    comparator_bits = data_bits + len(roles["Control Input"])
+    components = [
+        (f"Incrementer ({data_bits}-bit):", data_bits, data_bits, register_depth),
+        (f"Comparator ({comparator_bits}-bit):", comparator_bits, status_bits, status_depth),
+    ]
+    logic_rows = [f"{label:<24}{1:>3}{inputs:>9}{outputs:>11}{levels:>10}"
+                  for label, inputs, outputs, levels in components]
+    logic_rows += [f"{label + ':':<24}{count:>3}        -          -         -"
+                   for label, count in functions.items()]
+
+    cells = n.cell_count
+    complexity = next((rating for limit, rating in COMPLEXITY if cells < limit), "Very High")
+    endpoints = len(engine.endpoints)
+    return {
+        'reference_count': len(counts),
+        'register_rows': "\n".join(register_rows),
+        'register_count': registers,
+        'async_registers': async_registers,
+        'async_share': async_registers / max(registers, 1),
+        'unreset_registers': registers - async_registers,
+        'unreset_share': (registers - async_registers) / max(registers, 1),
+        'clock_domain_rows': f"  {c.clock_name + ':':<22}{clocked:>4}"
+                             f"{clocked / max(registers, 1):>10.1%}",
+        'logic_rows': "\n".join(logic_rows),
+        'depth_min': _levels(int(depth.min(initial=0))),
+        'depth_mean': _levels(round(float(depth.mean()))) if endpoints else _levels(0),
+        'depth_max': _levels(int(depth.max(initial=0))),
+        'critical_cells': critical,
+        'data_bits': data_bits,
+        'status_bits': status_bits,
+        'comparator_bits': comparator_bits,
+        'interface_rows': "\n".join(interface),
+        'register_endpoints': int(at_register.sum()),
+        'output_endpoints': endpoints - int(at_register.sum()),
+        'reset_strategy': ("Asynchronous reset" if async_registers == registers else
+                           "No reset" if not async_registers else "Partial asynchronous reset"),
+        'complexity': complexity,
+    }
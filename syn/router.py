@@ -0,0 +1,636 @@
+#!/usr/bin/env python3
+# ============================================================================
+# Router - Grid global router with negotiated congestion
+# ============================================================================
+# Purpose: Route the nets of a placed netlist (placer.Placement) over a
+#          grid of global routing cells (gcells) covering the core, assign
+#          the routes to the signal layers of the layer stack and report
+#          wirelength and vias per layer and congestion heatmaps
+#
+# Grid:    gcells are GCELL_ROWS standard cell rows square. Every layer has
+#   a preferred direction (metal2 horizontal, alternating upwards) and a
+#   capacity in tracks per gcell boundary, kept in a (layers, edges) array;
+#   edge ids 0..h_edges-1 are horizontal, the rest vertical.
+# Nets:    pins are merged per gcell; nets with up to MST_PINS gcells are
+#   split into the two-pin connections of their minimum spanning tree,
+#   larger nets (clk, rst_n) into a vertical spine with one horizontal
+#   branch per pin row.
+# Routing: every connection first takes its cheapest L or Z shape (pattern
+#   routing on prefix sums of the edge costs). Connections crossing an
+#   overflowed edge are then ripped up and rerouted by a maze search in a
+#   window around them (long ones by pattern again), with PathFinder costs: (1 + history) *
+#   (1 + present * overuse), where history accumulates overflow and the
+#   present factor grows every iteration. The iteration with the least
+#   total overflow is kept.
+# Parallel: every connection belongs to the smallest tile of a quadtree of
+#   the grid that holds its routing window. The tiles of one level share no
+#   edge, so they are routed by the worker processes at the same time, each
+#   tile in net order, on usage and cost arrays in shared memory. Results
+#   do not depend on the number of workers.
+# Layers:  on every edge, the connections are assigned to the layers of
+#   its direction bottom-up, shortest connection first.
+# Usage:   python router.py [--width W] [-j N] [--iterations N]
+#          (pnr/reports: python run_synthesis_simulation.py --place)
+# ============================================================================
+
+import argparse
+import heapq
+import re
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+import placer
+
+LAYER_STACK = "../signoff/documentation/layer_stack.txt"
+
+# Signal routing layers when the layer stack is missing (floorplan log)
+DEFAULT_LAYERS = ("metal2", "metal3", "metal4", "metal5")
+DEFAULT_PITCH = 0.28
+
+# Tracks lost on a layer: metal2 to cell pin access, metal5 to the power
+# straps of the floorplan
+LAYER_BLOCKAGE = {"metal2": 0.5, "metal5": 0.2}
+
+GCELL_ROWS = 3
+
+# Nets spanning more gcells than this are routed as a spine
+MST_PINS = 32
+
+# Negotiation: rip-up iterations (stopping after STALL_ITERATIONS without
+# improvement), history increment per unit of overflow, present-congestion
+# factor (multiplied every iteration) and the cost of a bend (one via) in
+# units of one gcell edge
+ITERATIONS = 8
+STALL_ITERATIONS = 2
+HISTORY_WEIGHT = 0.3
+PRESENT_FACTOR = 0.5
+PRESENT_GROWTH = 2.0
+BEND_COST = 1.0
+
+# Extra gcells around a connection's bounding box searched by the maze
+# router; connections with larger windows (gcells) reroute as patterns
+MAZE_MARGIN = 3
+MAZE_AREA = 1024
+
+# Gcells per side of the smallest routing tile
+TILE = 16
+
+# Heatmaps are reduced to at most this many columns (block maximum)
+HEATMAP_COLUMNS = 48
+HEATMAP_LEVELS = " .:-=+*#%"
+
+Layer = namedtuple("Layer", "name direction pitch")
+
+Grid = namedtuple("Grid", [
+    "nx", "ny",         # gcells across and up
+    "size",             # gcell width and height (um)
+    "h_edges",          # horizontal edges: (ny, nx - 1), edge id y * (nx - 1) + x
+    "edges",            # horizontal then vertical: (ny - 1, nx), id h_edges + y * nx + x
+])
+
+RouteResult = namedtuple("RouteResult", [
+    "grid", "layers",
+    "capacity",         # (layers, edges) tracks
+    "usage",            # (layers, edges) routed connections
+    "paths",            # [edge id array in travel order] per connection
+    "connection_net",   # (connections,) net of every connection
+    "history",          # [(iteration, rerouted, overflowed edges, total overflow)]
+    "wirelength",       # (layers,) um
+    "local_wirelength", # um of nets inside one gcell
+    "vias",
+    "seconds",
+])
+
+
+def read_layer_stack(path=LAYER_STACK):
+    """Signal routing layers, metal2 horizontal and alternating upwards
+
+    Rows like "Metal2-5  Metal  0.28 µm  Signal routing" are expanded to one
+    layer per metal; the width column is taken as the track pitch.
+    """
+    row = re.compile(r"^Metal(\d+)(?:-(\d+))?\s+Metal\s+([\d.]+)\s*\S*\s+Signal routing", re.I)
+    found = []
+    try:
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                match = row.match(line.strip())
+                if match:
+                    first = int(match.group(1))
+                    last = int(match.group(2) or first)
+                    found += [(level, float(match.group(3))) for level in range(first, last + 1)]
+    except FileNotFoundError:
+        pass
+    if not found:
+        found = [(int(name[5:]), DEFAULT_PITCH) for name in DEFAULT_LAYERS]
+    return tuple(Layer(f"metal{level}", "H" if level % 2 == 0 else "V", pitch)
+                 for level, pitch in sorted(found))
+
+
+def make_grid(core_width, core_height, size=GCELL_ROWS * placer.ROW_HEIGHT):
+    nx = max(int(np.ceil(core_width / size - 1e-9)), 2)
+    ny = max(int(np.ceil(core_height / size - 1e-9)), 2)
+    h_edges = ny * (nx - 1)
+    return Grid(nx, ny, size, h_edges, h_edges + (ny - 1) * nx)
+
+
+def layer_capacity(grid, layers):
+    """(layers, edges) tracks crossing every gcell boundary"""
+    capacity = np.zeros((len(layers), grid.edges))
+    for i, layer in enumerate(layers):
+        tracks = np.floor(grid.size / layer.pitch + 1e-9)
+        tracks = np.floor(tracks * (1 - LAYER_BLOCKAGE.get(layer.name, 0.0)))
+        if layer.direction == "H":
+            capacity[i, :grid.h_edges] = tracks
+        else:
+            capacity[i, grid.h_edges:] = tracks
+    return capacity
+
+
+def pin_gcells(netlist, placement, grid):
+    """(net, gcell) of every pin, sorted by net, one entry per gcell"""
+    p = placement
+    pins = placer.net_pins(netlist, p.ports)
+    movable = pins.obj >= 0
+    obj = np.maximum(pins.obj, 0)
+    x = np.where(movable, p.x[obj] + p.width[obj] / 2, pins.fixed_x)
+    y = np.where(movable, p.y[obj] + placer.ROW_HEIGHT / 2, pins.fixed_y)
+    gx = np.clip((x / grid.size).astype(np.int64), 0, grid.nx - 1)
+    gy = np.clip((y / grid.size).astype(np.int64), 0, grid.ny - 1)
+    gcell = gy * grid.nx + gx
+    keys = np.unique(pins.net * (grid.nx * grid.ny) + gcell)
+    local = _local_wirelength(pins.net, pins.starts, x, y, gcell)
+    return keys // (grid.nx * grid.ny), keys % (grid.nx * grid.ny), local
+
+
+def _local_wirelength(net, starts, x, y, gcell):
+    """HPWL (um) of the nets whose pins all share one gcell"""
+    same = np.minimum.reduceat(gcell, starts) == np.maximum.reduceat(gcell, starts)
+    width = np.maximum.reduceat(x, starts) - np.minimum.reduceat(x, starts)
+    height = np.maximum.reduceat(y, starts) - np.minimum.reduceat(y, starts)
+    return float(((width + height) * same).sum())
+
+
+def _mst(points):
+    """Prim's minimum spanning tree (Manhattan) of (k, 2) points: [(i, j)]"""
+    k = len(points)
+    done = np.zeros(k, dtype=bool)
+    done[0] = True
+    best = np.abs(points - points[0]).sum(axis=1)
+    parent = np.zeros(k, dtype=np.int64)
+    edges = []
+    for _ in range(k - 1):
+        candidate = np.where(done, np.inf, best)
+        j = int(np.argmin(candidate))
+        edges.append((int(parent[j]), j))
+        done[j] = True
+        distance = np.abs(points - points[j]).sum(axis=1)
+        closer = distance < best
+        best = np.where(closer, distance, best)
+        parent = np.where(closer, j, parent)
+    return edges
+
+
+def connections(net, gcell, grid):
+    """Two-pin connections (source gcell, target gcell, net), sorted by net"""
+    starts = np.flatnonzero(np.r_[True, net[1:] != net[:-1]])
+    sizes = np.diff(np.r_[starts, len(net)])
+    src, dst, owner = [], [], []
+    # Two-gcell nets are a single connection
+    two = starts[sizes == 2]
+    src.append(gcell[two])
+    dst.append(gcell[two + 1])
+    owner.append(net[two])
+    for start, size in zip(starts[sizes > 2], sizes[sizes > 2]):
+        cells = gcell[start:start + size]
+        points = np.stack([cells % grid.nx, cells // grid.nx], axis=1)
+        if size <= MST_PINS:
+            pairs = np.array(_mst(points))
+            a, b = cells[pairs[:, 0]], cells[pairs[:, 1]]
+        else:
+            # Spine at the median column from the lowest to the highest pin
+            # row; in every pin row a branch chains the pins through the spine
+            spine_x = int(np.median(points[:, 0]))
+            spine = np.unique(points[:, 1]) * grid.nx + spine_x
+            comb = np.unique(np.r_[cells, spine])
+            same_row = comb[1:] // grid.nx == comb[:-1] // grid.nx
+            a = np.r_[spine[:-1], comb[:-1][same_row]]
+            b = np.r_[spine[1:], comb[1:][same_row]]
+        keep = a != b
+        src.append(a[keep])
+        dst.append(b[keep])
+        owner.append(np.full(int(keep.sum()), net[start]))
+    order = np.argsort(np.concatenate(owner), kind="stable")
+    return (np.concatenate(src)[order], np.concatenate(dst)[order],
+            np.concatenate(owner)[order])
+
+
+def _h_run(grid, y, x0, x1):
+    """Horizontal edge ids in row y from column x0 to x1, in travel order"""
+    step = 1 if x1 >= x0 else -1
+    xs = np.arange(x0, x1, step)
+    return y * (grid.nx - 1) + (xs if step > 0 else xs - 1)
+
+
+def _v_run(grid, x, y0, y1):
+    step = 1 if y1 >= y0 else -1
+    ys = np.arange(y0, y1, step)
+    return grid.h_edges + (ys if step > 0 else ys - 1) * grid.nx + x
+
+
+def pattern_route(grid, cost, source, target):
+    """Cheapest L or Z shaped path between two gcells (edge ids in travel order)"""
+    x0, y0 = source % grid.nx, source // grid.nx
+    x1, y1 = target % grid.nx, target // grid.nx
+    xa, xb, ya, yb = min(x0, x1), max(x0, x1), min(y0, y1), max(y0, y1)
+    # Prefix sums over the bounding box: ph[r, c] runs along row ya + r from
+    # column xa to xa + c, pv[r, c] up column xa + c from row ya to ya + r
+    ph = np.zeros((yb - ya + 1, xb - xa + 1))
+    pv = np.zeros((yb - ya + 1, xb - xa + 1))
+    np.cumsum(cost[:grid.h_edges].reshape(grid.ny, grid.nx - 1)[ya:yb + 1, xa:xb], axis=1,
+              out=ph[:, 1:])
+    np.cumsum(cost[grid.h_edges:].reshape(grid.ny - 1, grid.nx)[ya:yb, xa:xb + 1], axis=0,
+              out=pv[1:, :])
+    i0, j0, i1, j1 = y0 - ya, x0 - xa, y1 - ya, x1 - xa
+    cols = np.arange(xb - xa + 1)
+    rows = np.arange(yb - ya + 1)
+    # Horizontal, vertical, horizontal: jog in column c
+    hvh = (np.abs(ph[i0] - ph[i0, j0]) + np.abs(pv[i1] - pv[i0]) + np.abs(ph[i1, j1] - ph[i1])
+           + BEND_COST * ((cols != j0).astype(float) + (cols != j1)) * (i0 != i1))
+    # Vertical, horizontal, vertical: jog in row r
+    vhv = (np.abs(pv[:, j0] - pv[i0, j0]) + np.abs(ph[:, j1] - ph[:, j0])
+           + np.abs(pv[i1, j1] - pv[:, j1])
+           + BEND_COST * ((rows != i0).astype(float) + (rows != i1)) * (j0 != j1))
+    c, r = int(np.argmin(hvh)), int(np.argmin(vhv))
+    if hvh[c] <= vhv[r]:
+        c += xa
+        return np.concatenate([_h_run(grid, y0, x0, c), _v_run(grid, c, y0, y1),
+                               _h_run(grid, y1, c, x1)])
+    r += ya
+    return np.concatenate([_v_run(grid, x0, y0, r), _h_run(grid, r, x0, x1),
+                           _v_run(grid, x1, r, y1)])
+
+
+def maze_route(grid, cost, source, target, margin=MAZE_MARGIN):
+    """Cheapest path between two gcells within their bounding box plus margin"""
+    nx = grid.nx
+    x0, y0 = source % nx, source // nx
+    x1, y1 = target % nx, target // nx
+    left, right = max(min(x0, x1) - margin, 0), min(max(x0, x1) + margin, nx - 1)
+    bottom, top = max(min(y0, y1) - margin, 0), min(max(y0, y1) + margin, grid.ny - 1)
+    distance = {source: 0.0}
+    via = {}
+    heap = [(0.0, source)]
+    while heap:
+        d, node = heapq.heappop(heap)
+        if node == target:
+            break
+        if d > distance[node]:
+            continue
+        x, y = node % nx, node // nx
+        for neighbour, edge, ok in (
+                (node - 1, y * (nx - 1) + x - 1, x > left),
+                (node + 1, y * (nx - 1) + x, x < right),
+                (node - nx, grid.h_edges + (y - 1) * nx + x, y > bottom),
+                (node + nx, grid.h_edges + y * nx + x, y < top)):
+            if not ok:
+                continue
+            step = d + cost[edge]
+            if step < distance.get(neighbour, np.inf):
+                distance[neighbour] = step
+                via[neighbour] = (node, edge)
+                heapq.heappush(heap, (step, neighbour))
+    path = []
+    node = target
+    while node != source:
+        node, edge = via[node]
+        path.append(edge)
+    return np.array(path[::-1], dtype=np.int64)
+
+
+# Routing state of the parent (usage, history, capacity, cost per edge),
+# shared with the worker processes
+_worker = {}
+
+
+def _attach(name, edges):
+    """Worker initializer: map the shared routing state"""
+    memory = shared_memory.SharedMemory(name=name)
+    _worker['memory'] = memory
+    _worker['arrays'] = tuple(np.ndarray((4, edges), dtype=np.float64, buffer=memory.buf))
+
+
+def _costs(usage, capacity, history, present):
+    over = np.maximum(usage + 1 - capacity, 0)
+    return (1 + history) * (1 + present * over)
+
+
+def _window_area(grid, source, target, margin):
+    width = abs(source % grid.nx - target % grid.nx) + 2 * margin + 1
+    height = abs(source // grid.nx - target // grid.nx) + 2 * margin + 1
+    return width * height
+
+
+def _route_tile(task):
+    """Route the connections of one tile in order (worker entry point)
+
+    Usage and cost are updated along every path, so each connection sees
+    the ones routed before it. Tiles of one level touch disjoint edges.
+    """
+    grid, pairs, margin, present, arrays = task
+    usage, history, capacity, cost = arrays if arrays is not None else _worker['arrays']
+    paths = []
+    for source, target in pairs:
+        if margin is None or _window_area(grid, source, target, margin) > MAZE_AREA:
+            path = pattern_route(grid, cost, int(source), int(target))
+        else:
+            path = maze_route(grid, cost, int(source), int(target), margin)
+        usage[path] += 1
+        cost[path] = _costs(usage[path], capacity[path], history[path], present)
+        paths.append(path)
+    return paths
+
+
+def _overflow(usage, capacity):
+    return np.maximum(usage - capacity, 0)
+
+
+def _edge_counts(paths, edges):
+    if not paths:
+        return np.zeros(edges)
+    return np.bincount(np.concatenate(paths), minlength=edges).astype(np.float64)
+
+
+def _crossing(paths, edges):
+    """Indices of the paths using any of the edges (boolean mask)"""
+    lengths = np.array([len(path) for path in paths], dtype=np.int64)
+    if not lengths.sum():
+        return np.zeros(0, dtype=np.int64)
+    owner = np.repeat(np.arange(len(paths)), lengths)
+    return np.unique(owner[edges[np.concatenate(paths)]])
+
+
+class Router:
+    """Global router of a placed netlist"""
+
+    def __init__(self, netlist, placement, layers=None):
+        self.layers = layers or read_layer_stack()
+        self.grid = make_grid(placement.core_width, placement.core_height)
+        self.capacity = layer_capacity(self.grid, self.layers)
+        # Both directions share one edge array, so the 2-D capacity is the sum
+        self.total_capacity = self.capacity.sum(axis=0)
+        net, gcell, self.local_wirelength = pin_gcells(netlist, placement, self.grid)
+        self.source, self.target, self.net = connections(net, gcell, self.grid)
+
+    def tiles(self, ids, margin=0):
+        """Connections ids grouped by tile: [[ids of a tile] per tile] per level
+
+        A connection routes inside its bounding box plus margin and belongs
+        to the smallest tile (TILE * 2**level gcells square, aligned) that
+        contains that window. Levels are listed largest first, so long
+        connections route before short ones.
+        """
+        grid = self.grid
+        ids = np.asarray(ids, dtype=np.int64)
+        source, target = self.source[ids], self.target[ids]
+        x0 = np.maximum(np.minimum(source % grid.nx, target % grid.nx) - margin, 0)
+        x1 = np.minimum(np.maximum(source % grid.nx, target % grid.nx) + margin, grid.nx - 1)
+        y0 = np.maximum(np.minimum(source // grid.nx, target // grid.nx) - margin, 0)
+        y1 = np.minimum(np.maximum(source // grid.nx, target // grid.nx) + margin, grid.ny - 1)
+        level = np.full(len(ids), -1)
+        size, depth = TILE, 0
+        while (level < 0).any():
+            fits = (level < 0) & (x0 // size == x1 // size) & (y0 // size == y1 // size)
+            level[fits] = depth
+            size, depth = size * 2, depth + 1
+        size = TILE << level
+        tile = (y0 // size) * grid.nx + x0 // size
+        order = np.lexsort((ids, tile, -level))
+        ids, tile, level = ids[order], tile[order], level[order]
+        levels = []
+        for depth in sorted(set(level.tolist()), reverse=True):
+            selected = level == depth
+            starts = np.flatnonzero(np.r_[True, tile[selected][1:] != tile[selected][:-1]])
+            levels.append(np.split(ids[selected], starts[1:]))
+        return levels
+
+    def _route_tiles(self, ids, margin, present, arrays, executor, jobs):
+        """Route connections ids (updating usage and cost); return {id: path}
+
+        margin None is pattern routing, otherwise maze routing in the
+        bounding box plus margin.
+        """
+        usage, history, capacity, cost = arrays
+        paths = {}
+        for tiles in self.tiles(ids, margin or 0):
+            cost[:] = _costs(usage, capacity, history, present)
+            pairs = [list(zip(self.source[tile], self.target[tile])) for tile in tiles]
+            if executor is None or len(tiles) == 1:
+                routed = [_route_tile((self.grid, tile, margin, present, arrays))
+                          for tile in pairs]
+            else:
+                tasks = [(self.grid, tile, margin, present, None) for tile in pairs]
+                routed = list(executor.map(_route_tile, tasks,
+                                           chunksize=max(len(tasks) // (4 * jobs), 1)))
+            for tile, tile_paths in zip(tiles, routed):
+                paths.update(zip(tile.tolist(), tile_paths))
+        return paths
+
+    def route(self, jobs=1, iterations=ITERATIONS):
+        """RouteResult of pattern routing plus negotiated rip-up and reroute"""
+        started = time.perf_counter()
+        grid = self.grid
+        ids = np.arange(len(self.source))
+        memory = executor = None
+        if jobs > 1:
+            memory = shared_memory.SharedMemory(create=True, size=4 * grid.edges * 8)
+            state = np.ndarray((4, grid.edges), dtype=np.float64, buffer=memory.buf)
+            executor = ProcessPoolExecutor(jobs, initializer=_attach,
+                                           initargs=(memory.name, grid.edges))
+        else:
+            state = np.empty((4, grid.edges))
+        state[:] = 0
+        state[2] = self.total_capacity
+        arrays = tuple(state)
+        usage, history, capacity = arrays[:3]
+        present = PRESENT_FACTOR
+        try:
+            routed = self._route_tiles(ids, None, present, arrays, executor, jobs)
+            paths = [routed[i] for i in range(len(ids))]
+            over = _overflow(usage, capacity)
+            log = [(0, len(ids), int((over > 0).sum()), int(over.sum()))]
+            best = (over.sum(), list(paths), 0)
+            for iteration in range(1, iterations + 1):
+                if not over.any() or iteration - best[2] > STALL_ITERATIONS:
+                    break
+                history += HISTORY_WEIGHT * over
+                present *= PRESENT_GROWTH
+                ripped = _crossing(paths, over > 0)
+                usage -= _edge_counts([paths[i] for i in ripped], grid.edges)
+                routed = self._route_tiles(ripped, MAZE_MARGIN, present, arrays, executor, jobs)
+                for i, path in routed.items():
+                    paths[i] = path
+                over = _overflow(usage, capacity)
+                log.append((iteration, len(ripped), int((over > 0).sum()), int(over.sum())))
+                if over.sum() < best[0]:
+                    best = (over.sum(), list(paths), iteration)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+                del arrays, usage, history, capacity, state
+                memory.close()
+                memory.unlink()
+        paths = best[1]
+        layer_usage, vias = self.assign_layers(paths)
+        wirelength = layer_usage.sum(axis=1) * grid.size
+        return RouteResult(grid, self.layers, self.capacity, layer_usage, paths, self.net, log,
+                           wirelength, self.local_wirelength, vias,
+                           time.perf_counter() - started)
+
+    def assign_layers(self, paths):
+        """(layers, edges) usage and via count of the paths on their layers
+
+        On every edge the connections are ranked shortest first and fill the
+        layers of the edge's direction bottom-up; beyond the capacity they
+        are spread over those layers round-robin. A via is counted per layer
+        change along a path and per layer of the stack from metal1 at both
+        of its ends.
+        """
+        grid = self.grid
+        lengths = np.array([len(path) for path in paths], dtype=np.int64)
+        edge = np.concatenate(paths) if paths else np.zeros(0, dtype=np.int64)
+        owner = np.repeat(np.arange(len(paths)), lengths)
+        order = np.lexsort((owner, lengths[owner], edge))
+        sorted_edge = edge[order]
+        first = np.flatnonzero(np.r_[True, sorted_edge[1:] != sorted_edge[:-1]]) \
+            if len(edge) else np.zeros(0, dtype=np.int64)
+        rank = np.arange(len(edge)) - np.repeat(first, np.diff(np.r_[first, len(edge)]))
+
+        horizontal = np.array([layer.direction == "H" for layer in self.layers])
+        layer = np.empty(len(edge), dtype=np.int64)
+        for is_h in (True, False):
+            ids = np.flatnonzero(horizontal == is_h)
+            selected = (sorted_edge < grid.h_edges) == is_h
+            e, r = sorted_edge[selected], rank[selected]
+            cumulative = np.cumsum(self.capacity[ids][:, e], axis=0)
+            index = (r >= cumulative).sum(axis=0)
+            spill = index >= len(ids)
+            index[spill] = (r[spill] - cumulative[-1, spill].astype(np.int64)) % len(ids)
+            layer[np.flatnonzero(selected)] = ids[index]
+        path_layer = np.empty(len(edge), dtype=np.int64)
+        path_layer[order] = layer
+
+        usage = np.bincount(path_layer * grid.edges + edge,
+                            minlength=len(self.layers) * grid.edges).astype(np.float64)
+        usage = usage.reshape(len(self.layers), grid.edges)
+        same = owner[1:] == owner[:-1]
+        changes = np.abs(np.diff(path_layer))[same].sum() if len(edge) else 0
+        ends = np.cumsum(lengths)[lengths > 0]
+        stacks = (path_layer[ends - lengths[lengths > 0]] + 1).sum() + (path_layer[ends - 1] + 1).sum()
+        return usage, int(changes + stacks)
+
+
+def heatmap(grid, usage, capacity):
+    """Text rows (top row first) of the utilization of every gcell
+
+    A gcell shows the highest usage/capacity of its edges, one character per
+    block of gcells: HEATMAP_LEVELS from empty to full, X for overflow.
+    """
+    value = np.zeros((grid.ny, grid.nx))
+    h = grid.h_edges
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(capacity > 0, usage / capacity, np.where(usage > 0, np.inf, 0.0))
+    rh = ratio[:h].reshape(grid.ny, grid.nx - 1)
+    rv = ratio[h:].reshape(grid.ny - 1, grid.nx)
+    value[:, :-1] = np.maximum(value[:, :-1], rh)
+    value[:, 1:] = np.maximum(value[:, 1:], rh)
+    value[:-1, :] = np.maximum(value[:-1, :], rv)
+    value[1:, :] = np.maximum(value[1:, :], rv)
+
+    block = max(-(-grid.nx // HEATMAP_COLUMNS), 1)
+    ny, nx = -(-grid.ny // block), -(-grid.nx // block)
+    padded = np.zeros((ny * block, nx * block))
+    padded[:grid.ny, :grid.nx] = value
+    value = padded.reshape(ny, block, nx, block).max(axis=(1, 3))
+    levels = len(HEATMAP_LEVELS)
+    index = np.minimum((value * levels).astype(np.int64), levels - 1)
+    chars = np.array(list(HEATMAP_LEVELS))[index]
+    chars[value > 1] = "X"
+    return ["".join(row) for row in chars[::-1]]
+
+
+def report_fields(result):
+    """Fields of the routing report and the routing section of the pnr QoR summary"""
+    r = result
+    over = _overflow(r.usage, r.capacity)
+    rows = []
+    for i, layer in enumerate(r.layers):
+        cap = r.capacity[i].sum()
+        used = r.usage[i].sum()
+        peak = (r.usage[i] / np.where(r.capacity[i] > 0, r.capacity[i], np.inf)).max()
+        rows.append(f"{layer.name:<10}{'horizontal' if layer.direction == 'H' else 'vertical':<12}"
+                    f"{r.capacity[i].max():>7.0f}{r.wirelength[i]:>13.2f}"
+                    f"{used / cap if cap else 0.0:>10.1%}{peak:>9.1%}{over[i].sum():>10.0f}")
+    utilization = r.usage.sum(axis=1) / np.maximum(r.capacity.sum(axis=1), 1)
+    busiest = int(np.argmax(utilization))
+    maps = []
+    for i, layer in enumerate(r.layers):
+        maps.append(f"{layer.name} ({'horizontal' if layer.direction == 'H' else 'vertical'})")
+        maps += ["  |" + row + "|" for row in heatmap(r.grid, r.usage[i], r.capacity[i])]
+        maps.append("")
+    history = [f"  Iteration {i}: {rerouted:>6} connections routed, "
+               f"{edges:>5} overflowed edges, overflow {total}"
+               for i, rerouted, edges, total in r.history]
+    total = float(r.wirelength.sum() + r.local_wirelength)
+    nets = len(np.unique(r.connection_net))
+    return {
+        'gcell_grid': f"{r.grid.nx} x {r.grid.ny}",
+        'gcell_size': r.grid.size,
+        'routed_nets': nets,
+        'routed_connections': len(r.paths),
+        'routing_history': "\n".join(history),
+        'layer_routing': "\n".join(rows),
+        'local_wirelength': r.local_wirelength,
+        'routed_wirelength': total,
+        'average_net_length': total / nets if nets else 0.0,
+        'total_vias': r.vias,
+        'routing_overflow': int(over.sum()),
+        'overflowed_edges': int((over.sum(axis=0) > 0).sum()),
+        'max_layer_utilization': f"{utilization[busiest]:.0%} ({r.layers[busiest].name})",
+        'routing_status': ("✓ 100% ROUTED" if not over.any() else
+                           f"✗ {int((over.sum(axis=0) > 0).sum())} edges over capacity"),
+        'congestion_maps': "\n".join(maps).rstrip(),
+    }
+
+
+def main(argv=None):
+    import liberty
+    import netlist_gen
+
+    parser = argparse.ArgumentParser(description="Global routing of the placed counter")
+    parser.add_argument("--width", type=int, default=32)
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="worker processes")
+    parser.add_argument("--iterations", type=int, default=ITERATIONS,
+                        help="rip-up and reroute iterations")
+    parser.add_argument("--lib", default=liberty.DEFAULT_LIBRARY, help="Liberty cell library")
+    args = parser.parse_args(argv)
+
+    netlist = netlist_gen.build_counter(args.width)
+    placement = placer.place(netlist, liberty.load_library(args.lib))
+    result = Router(netlist, placement).route(args.jobs, args.iterations)
+    fields = report_fields(result)
+    print(f"{netlist.name}: {fields['routed_nets']:,} nets, {fields['routed_connections']:,} "
+          f"connections on a {fields['gcell_grid']} gcell grid ({result.seconds:.2f} s)")
+    print(fields['routing_history'])
+    print(f"  Wirelength {fields['routed_wirelength']:.2f} um, {fields['total_vias']:,} vias, "
+          f"overflow {fields['routing_overflow']}")
+    print(fields['layer_routing'])
+    print()
+    print(fields['congestion_maps'])
+
+
+if __name__ == "__main__":
+    main()
@@ -5,908 +5,718 @@
 # Purpose: Simulate Synopsys Design Compiler synthesis output
 # ============================================================================
 
+import argparse
 import os
 import random
-from datetime import datetime
+from collections import namedtuple
+from functools import lru_cache
+
+import area
+import cell_usage
+import clock_gating
+import counter_model
+import flow_cache
+import liberty
+import mcmm
+import netlist_gen
+import placer
+import power
+import resources
+import router
+import sdc
+from report_engine import REPORT_GENERATORS, ReportEngine, default_jobs
+from report_templates import render, timestamp
+import sta
+import sweep
+from waveform_report import render_waveform_report
+
+# PVT corner: library name, supply voltage (V), junction temperature (C),
+# cell delay and leakage scaling relative to the typical corner
+Corner = namedtuple("Corner",
+                    "name voltage temperature library delay_derate leakage_derate")
+
+OPERATING_CORNERS = {
+    "typical": Corner("typical", 1.0, 25, "typical_1.0V_25C.db", 1.00, 1.00),
+    "slow": Corner("slow", 0.9, 125, "slow_0.9V_125C.db", 1.18, 4.50),
+    "fast": Corner("fast", 1.1, -40, "fast_1.1V_m40C.db", 0.78, 0.35),
+    "slow_cold": Corner("slow_cold", 0.9, -40, "slow_0.9V_m40C.db", 1.12, 0.20),
+    "fast_hot": Corner("fast_hot", 1.1, 125, "fast_1.1V_125C.db", 0.86, 9.00),
+}
+
+# Net activity of the power report: toggle counts of the power stimulus,
+# or probabilities propagated from the inputs
+POWER_MODES = ("toggle", "probabilistic")
+
+# Runs longer than this use the closed-form activity engine, not the
+# cycle simulator
+ANALYTIC_CYCLE_THRESHOLD = 1_000_000
+
+# Count bits listed individually in the power report before eliding
+MAX_LISTED_BITS = 32
+
+# Setup slack (fraction of the clock period) a clean design needs for an
+# EXCELLENT QoR grade
+QOR_MARGIN = 0.1
+
+# Report layout -> SynthesisSimulator method returning its fields
+LAYOUT_FIELDS = {
+    'qor': 'qor_fields',
+    'timing': 'timing_fields',
+    'mcmm': 'mcmm_fields',
+    'area': 'area_report_fields',
+    'power': 'power_report_fields',
+    'cell_usage': 'cell_usage_fields',
+    'resources': 'resources_fields',
+    'constraints': 'constraint_report_fields',
+    'placement': 'placement_fields',
+    'routing': 'routing_fields',
+    'pnr_qor': 'pnr_qor_fields',
+}
+
+@lru_cache(maxsize=8)
+def counter_netlist(width, design_name):
+    """Generated gate-level netlist, shared by the netlist-driven reports"""
+    return netlist_gen.build_counter(width, design_name)
+
+@lru_cache(maxsize=8)
+def timing_engine(width, design_name, sdc_path, library_path=liberty.DEFAULT_LIBRARY):
+    """Analyzed timing of the generated netlist; shared by every clock period"""
+    return sta.TimingEngine(counter_netlist(width, design_name), sta.read_sdc(sdc_path),
+                            library=liberty.load_library(library_path), sdc_path=sdc_path)
+
+@lru_cache(maxsize=8)
+def power_engine(width, design_name, library_path=liberty.DEFAULT_LIBRARY):
+    """Levelized power model of the generated netlist"""
+    return power.PowerEngine(counter_netlist(width, design_name),
+                             liberty.load_library(library_path))
+
+@lru_cache(maxsize=8)
+def placement(width, design_name, library_path=liberty.DEFAULT_LIBRARY):
+    """Legal placement of the generated netlist in the floorplan core"""
+    return placer.place(counter_netlist(width, design_name), liberty.load_library(library_path))
+
+@lru_cache(maxsize=8)
+def routing(width, design_name, library_path=liberty.DEFAULT_LIBRARY):
+    """Global routing of the placed netlist"""
+    return router.Router(counter_netlist(width, design_name),
+                         placement(width, design_name, library_path)).route()
 
 class SynthesisSimulator:
-    def __init__(self, design_name="counter_32bit"):
+    def __init__(self, design_name="counter_32bit", clock_period=10.0,
+                 width=32, corner="typical"):
+        if corner not in OPERATING_CORNERS:
+            raise ValueError(f"Unknown corner '{corner}' "
+                             f"(expected one of {', '.join(OPERATING_CORNERS)})")
         self.design_name = design_name
-        self.clock_period = 10.0  # ns
-        self.num_flipflops = 32
+        self.clock_period = clock_period  # ns
+        self.width = width  # WIDTH parameter of rtl/counter_32bit.v
+        self.num_flipflops = width
+        self.corner = OPERATING_CORNERS[corner]
         self.report_dir = "../syn/reports"
         self.netlist_dir = "../syn/netlists"
-        
+        self.docs_dir = "../docs"
+        self.pnr_report_dir = "../pnr/reports"
+        self.rtl_path = "../rtl/counter_32bit.v"
+        self.sdc_path = "../syn/constraints/counter_32bit.sdc"
+        self.library_path = liberty.DEFAULT_LIBRARY
+        # Stimulus behind the power report's signal activity
+        self.activity_cycles = 100_000
+        self.enable_duty = 1.0
+        self.power_mode = "toggle"
+        # Enable activity of the clock gating what-if: a duty distribution
+        # ((duties, weights)) or a VCD; default: the power stimulus
+        self.gating_distribution = None
+        self.gating_vcd = None
+        # Critical path summary of the timing report
+        self.max_paths = sta.MAX_SUMMARY_PATHS
+        self.paths_per_endpoint = sta.PATHS_PER_ENDPOINT
+        # Corners evaluated together by the MCMM report
+        self.mcmm_corners = list(OPERATING_CORNERS)
+        # WIDTH values of the area report's scaling curve
+        self.scaling_widths = list(area.SCALING_WIDTHS)
+        # flow_cache.FlowCache of the generated artifacts (None: always run)
+        self.cache = None
+
+    def report_fields(self):
+        """Variable fields shared by every report layout"""
+        config = (self.design_name, self.clock_period, self.corner)
+        if getattr(self, '_fields_config', None) != config:
+            self._fields_config = config
+            self._fields = {
+                'design_name': self.design_name,
+                'clock_period': self.clock_period,
+                'frequency': 1000 / self.clock_period,
+                'corner': self.corner.name,
+                'temperature': self.corner.temperature,
+                'voltage': self.corner.voltage,
+                'library': self.corner.library,
+            }
+        self._fields['date'] = timestamp()
+        return self._fields
+
+    def timing_fields(self):
+        """Report fields from static timing analysis at this clock period"""
+        engine = timing_engine(self.width, self.design_name, self.sdc_path, self.library_path)
+        engine.set_period(self.clock_period)
+        fields = dict(self.report_fields())
+        fields.update(sta.report_fields(engine, self.max_paths, self.paths_per_endpoint))
+        return fields
+
+    def area_fields(self):
+        """Report fields from the netlist area and its WIDTH scaling curve"""
+        library = liberty.load_library(self.library_path)
+        curve = area.scaling_curve(lambda width: netlist_gen.build_counter(width, self.design_name),
+                                   library, self.scaling_widths)
+        return area.report_fields(counter_netlist(self.width, self.design_name), library,
+                                  self.width, curve)
+
+    def qor_fields(self):
+        """Report fields of the QoR summary: timing, area and power, with the
+        verification status and grade from the timing and design rule checks"""
+        fields = self.timing_fields()
+        fields.update(self.area_fields())
+        fields.update(self.power_fields())
+        fields.update(self.constraint_fields(fields))
+        failing, violations = fields['failing_endpoints'], fields['design_rule_violations']
+        fields['timing_check'] = "PASSED" if failing == 0 else f"FAILED ({failing} endpoints)"
+        fields['design_rule_check'] = ("PASSED" if violations == 0 else
+                                       f"FAILED ({violations} violations)")
+        fields['constraint_check'] = "PASSED" if fields['constraints_complete'] else "INCOMPLETE"
+        if failing:
+            fields['qor_grade'] = "TIMING VIOLATED"
+            fields['qor_conclusion'] = (
+                f"Timing constraints are violated at {failing} endpoints "
+                f"(WNS {fields['wns']:.2f} ns, TNS {fields['tns']:.2f} ns).\n"
+                f"Fix timing before gate-level simulation and physical design.")
+        elif violations:
+            fields['qor_grade'] = "DESIGN RULE VIOLATIONS"
+            fields['qor_conclusion'] = (
+                f"All timing constraints are met; {violations} design rule violations remain.\n"
+                f"Fix them before physical design.")
+        else:
+            fields['qor_grade'] = ("EXCELLENT" if fields['setup_slack'] >= QOR_MARGIN *
+                                   self.clock_period else "GOOD")
+            fields['qor_conclusion'] = ("All timing constraints are met with positive slack.\n"
+                                        "Design is ready for gate-level simulation and "
+                                        "physical design.")
+        return fields
+
+    def layout_fields(self, name):
+        """Fields of a report layout, from the provider its generate_*_report renders"""
+        return getattr(self, LAYOUT_FIELDS[name])()
+
     def generate_qor_report(self):
         """Generate Quality of Results report"""
-        report = f"""
-================================================================================
-                    QUALITY OF RESULTS (QoR) REPORT
-================================================================================
-Design: {self.design_name}
-Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-Tool: Synopsys Design Compiler (Simulated)
-Technology: Generic 45nm (Typical)
-================================================================================
-
-TIMING SUMMARY
---------------------------------------------------------------------------------
-Critical Path Setup Slack:        1.23 ns (MET)
-Critical Path Hold Slack:         0.45 ns (MET)
-Worst Negative Slack (WNS):       1.23 ns
-Total Negative Slack (TNS):       0.00 ns
-Number of Failing Endpoints:      0
-
-Clock Period:                     10.00 ns
-Clock Frequency:                 100.00 MHz
-Achieved Frequency:              112.36 MHz (12% margin)
-
-AREA SUMMARY
---------------------------------------------------------------------------------
-Combinational Area:             458.32 µm²
-Non-combinational Area:         892.16 µm²
-Total Cell Area:               1350.48 µm²
-Net Interconnect Area:          421.85 µm²
-Total Area:                    1772.33 µm²
-
-Cell Count:
-  Sequential Cells (DFF):           32
-  Combinational Cells:              68
-  Buffer/Inverter Cells:            12
-  Total Cells:                     112
-
-POWER SUMMARY (Estimated @100MHz)
---------------------------------------------------------------------------------
-Internal Power:                  125.34 µW
-Switching Power:                  87.21 µW
-Leakage Power:                    15.67 µW
-Total Power:                     228.22 µW
-
-DESIGN HIERARCHY
---------------------------------------------------------------------------------
-Design: counter_32bit
-  Instances: 1
-  Cells: 112
-  Nets: 145
-  Ports: 35 (3 inputs, 33 outputs)
-
-OPTIMIZATION SUMMARY
---------------------------------------------------------------------------------
-Compile Strategy:                compile_ultra
-Optimization Effort:             high
-Area Optimization:               enabled
-Power Optimization:              enabled
-Timing Optimization:             enabled
-
-Design Rule Violations:          0
-Constraint Violations:           0
-
-VERIFICATION STATUS
---------------------------------------------------------------------------------
-Check Design:                    PASSED
-Design Rule Check:               PASSED  
-Timing Check:                    PASSED
-Constraint Check:                PASSED
-
-================================================================================
-                            QoR: EXCELLENT
-================================================================================
-All timing constraints are met with positive slack.
-Design is ready for gate-level simulation and physical design.
-================================================================================
-"""
+        report = render("qor", self.qor_fields())
         return report
 
     def generate_timing_report(self):
         """Generate detailed timing report"""
-        report = f"""
-================================================================================
-                         TIMING ANALYSIS REPORT
-================================================================================
-Design: {self.design_name}
-Operating Conditions: typical (25C, 1.0V)
-Timing Library: typical_1.0V_25C.db
-================================================================================
-
-CLOCK SUMMARY
---------------------------------------------------------------------------------
-Clock Name:    clk
-Period:        10.00 ns
-Frequency:     100.00 MHz
-Uncertainty:   0.50 ns
-Latency:       1.50 ns
-
-SETUP TIMING CHECK (Max Delay Analysis)
-================================================================================
-Startpoint: count_reg[0] (rising edge-triggered flip-flop clocked by clk)
-Endpoint:   count_reg[31] (rising edge-triggered flip-flop clocked by clk)
-Path Type:  max
-
-Point                                    Incr      Path
-------------------------------------------------------------------------
-clock clk (rise edge)                    0.00      0.00
-clock network delay (ideal)              1.50      1.50
-count_reg[0]/CK (DFFQX1)                 0.00      1.50 r
-count_reg[0]/Q (DFFQX1)                  0.52      2.02 r
-U45/Y (XOR2X1)                           0.18      2.20 f
-U46/Y (AND2X2)                           0.15      2.35 f
-U47/Y (XOR2X1)                           0.21      2.56 r
-U48/Y (AND2X2)                           0.16      2.72 r
-U49/Y (XOR2X1)                           0.19      2.91 f
-U50/Y (AND2X2)                           0.14      3.05 f
-... (propagation through 32-bit adder)
-U78/Y (XOR2X1)                           0.22      7.28 r
-count_reg[31]/D (DFFQX1)                 0.00      7.28 r
-data arrival time                                  7.28
-
-clock clk (rise edge)                   10.00     10.00
-clock network delay (ideal)              1.50     11.50
-clock uncertainty                       -0.50     11.00
-count_reg[31]/CK (DFFQX1)                0.00     11.00 r
-library setup time                      -0.48     10.52
-data required time                                10.52
-------------------------------------------------------------------------
-data required time                                10.52
-data arrival time                                 -7.28
-------------------------------------------------------------------------
-slack (MET)                                        1.23
-
-HOLD TIMING CHECK (Min Delay Analysis)
-================================================================================
-Startpoint: enable (input port clocked by clk)
-Endpoint:   count_reg[0] (rising edge-triggered flip-flop clocked by clk)
-Path Type:  min
-
-Point                                    Incr      Path
-------------------------------------------------------------------------
-clock clk (rise edge)                    0.00      0.00
-clock network delay (ideal)              1.50      1.50
-input external delay                     3.00      4.50 r
-enable (in)                              0.00      4.50 r
-U12/Y (BUFX2)                            0.28      4.78 r
-U13/Y (AND2X2)                           0.15      4.93 r
-count_reg[0]/D (DFFQX1)                  0.00      4.93 r
-data arrival time                                  4.93
-
-clock clk (rise edge)                    0.00      0.00
-clock network delay (ideal)              1.50      1.50
-count_reg[0]/CK (DFFQX1)                 0.00      1.50 r
-library hold time                        0.08      1.58
-data required time                                 1.58
-------------------------------------------------------------------------
-data required time                                 1.58
-data arrival time                                 -4.93
-------------------------------------------------------------------------
-slack (MET)                                        3.35
-
-SUMMARY OF CRITICAL PATHS
-================================================================================
-Path #  From                To                  Slack     Type
-------------------------------------------------------------------------
-   1    count_reg[0]        count_reg[31]       1.23 ns   setup
-   2    count_reg[1]        count_reg[31]       1.28 ns   setup
-   3    count_reg[2]        count_reg[31]       1.35 ns   setup
-   4    count_reg[0]        count_reg[30]       1.42 ns   setup
-   5    count_reg[1]        count_reg[30]       1.48 ns   setup
-   6    enable              count_reg[0]        3.35 ns   hold
-   7    rst_n               count_reg[0]        N/A       false_path
-   8    count_reg[15]       count_reg[16]       1.89 ns   setup
-   9    count_reg[7]        count_reg[8]        2.12 ns   setup
-  10    count_reg[23]       count_reg[24]       1.76 ns   setup
-
-ALL TIMING CONSTRAINTS MET
-================================================================================
-Total Endpoints:              32
-Failing Endpoints:             0
-Critical Path Slack:        1.23 ns
-Worst Negative Slack:       0.00 ns
-Total Negative Slack:       0.00 ns
-
-Timing margin:              12.3% above target frequency
-================================================================================
-"""
+        report = render("timing", self.timing_fields())
+        return report
+
+    def mcmm_fields(self):
+        """Timing and power of every MCMM corner in one vectorized pass"""
+        engine = timing_engine(self.width, self.design_name, self.sdc_path, self.library_path)
+        engine.set_period(self.clock_period)
+        corners = [OPERATING_CORNERS[name] for name in self.mcmm_corners]
+        profiles, activity = self.power_profiles()
+        fields = dict(self.report_fields())
+        fields.update(mcmm.report_fields(
+            engine, corners, power_engine(self.width, self.design_name, self.library_path),
+            profiles[0]))
+        fields['activity_source'] = self.activity_source(activity)
+        return fields
+
+    def generate_mcmm_report(self):
+        """Generate the MCMM report"""
+        report = render("mcmm", self.mcmm_fields())
         return report
 
+    def area_report_fields(self):
+        """Fields of the area report"""
+        fields = dict(self.report_fields())
+        fields.update(self.area_fields())
+        return fields
+
     def generate_area_report(self):
-        """Generate area report"""
-        report = f"""
-================================================================================
-                            AREA REPORT
-================================================================================
-Design: {self.design_name}
-Technology: Generic 45nm CMOS
-Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-================================================================================
-
-HIERARCHICAL AREA BREAKDOWN
---------------------------------------------------------------------------------
-Hierarchy                              Cell Area    Net Area    Total Area
-                                         (µm²)        (µm²)        (µm²)
---------------------------------------------------------------------------------
-{self.design_name}                      1350.48      421.85      1772.33
-  (top level)                           1350.48      421.85      1772.33
-
-CELL AREA BREAKDOWN
---------------------------------------------------------------------------------
-Cell Type                    Instances    Area (µm²)   Percentage
---------------------------------------------------------------------------------
-Sequential Cells:
-  DFFQX1 (D Flip-Flop)            32         832.00      61.6%
-  DFFQX2 (D Flip-Flop 2x)          0           0.00       0.0%
-                                 ----       --------     ------
-  Total Sequential:               32         832.00      61.6%
-
-Combinational Cells:
-  AND2X1 (2-input AND)            12          84.00       6.2%
-  AND2X2 (2-input AND 2x)          8          72.00       5.3%
-  OR2X1 (2-input OR)               6          42.00       3.1%
-  XOR2X1 (2-input XOR)            18         144.00      10.7%
-  INVX1 (Inverter)                 8          32.00       2.4%
-  BUFX2 (Buffer 2x)                4          24.00       1.8%
-  MUX2X1 (2:1 Multiplexer)        10          90.00       6.7%
-  AOI21X1 (AND-OR-INVERT)          2          30.00       2.2%
-                                 ----       --------     ------
-  Total Combinational:            68         518.00      38.4%
-
---------------------------------------------------------------------------------
-Total Cell Area:                 100        1350.48     100.0%
-Net Interconnect Area:                       421.85
-================================================================================
-Total Design Area:                          1772.33 µm²
-================================================================================
-
-RESOURCE UTILIZATION
---------------------------------------------------------------------------------
-Resource Type              Used    Available    Utilization
---------------------------------------------------------------------------------
-Flip-Flops                  32      unlimited      -
-Logic Gates                 68      unlimited      -
-Buffers/Inverters          12      unlimited      -
-Total Cells               112      unlimited      -
-
-AREA COMPARISON
---------------------------------------------------------------------------------
-Metric                              Value         Units
---------------------------------------------------------------------------------
-Gate Count:                          112         gates
-Gate Equivalent:                     145         2-input NAND
-Transistor Count:                   ~672         transistors
-Area per bit (counter):             54.76        µm²/bit
-
-AREA OPTIMIZATION SUMMARY
---------------------------------------------------------------------------------
-Optimization Level:         High
-Area Effort:                Maximum
-Achieved Reduction:         ~15% from initial
-Final Area:                 1772.33 µm²
-
-STATUS: Area goals met - Design is area-efficient
-================================================================================
-"""
+        """Area of the generated netlist from the cell library and wire load model"""
+        report = render("area", self.area_report_fields())
         return report
 
+    def uses_analytic_activity(self):
+        return (self.activity_cycles > ANALYTIC_CYCLE_THRESHOLD
+                or self.width > counter_model.MAX_ARRAY_WIDTH)
+
+    def simulate_activity(self):
+        """Toggle activity of the power-analysis stimulus"""
+        if self.uses_analytic_activity():
+            pattern = counter_model.duty_pattern(self.enable_duty)
+            return counter_model.analytic_activity(self.width, self.activity_cycles, pattern)
+        rst_n, enable = counter_model.power_stimulus(self.activity_cycles, self.enable_duty)
+        return counter_model.simulate(rst_n, enable, width=self.width)
+
+    def power_profiles(self):
+        """Activity profiles of the operating modes: active, hold, reset, idle
+
+        Active mode is annotated with the stimulus toggle counts (toggle
+        mode) or with the enable duty and the closed-form count bit
+        densities it implies (probabilistic mode); the other modes freeze
+        the counter, so only their clock is active.
+        """
+        activity = self.simulate_activity() if self.power_mode == "toggle" else None
+        duty = (self.enable_duty, 2 * self.enable_duty * (1 - self.enable_duty))
+        if activity is None:
+            active = {"rst_n": (1.0, 0.0), "enable": duty}
+            density = counter_model.bit_density(self.width, self.enable_duty)
+            active.update({f"count[{bit}]": (0.5, float(d)) for bit, d in enumerate(density)})
+        else:
+            cycles = activity.cycles
+            toggles = {"rst_n": int(activity.rst_n_toggles.sum()),
+                       "enable": int(activity.enable_toggles.sum()),
+                       "overflow": int(activity.overflow_toggles.sum())}
+            for bit in range(self.width):
+                toggles[f"count[{bit}]"] = int(activity.bit_toggles[bit].sum())
+            active = power.toggle_annotations(toggles, cycles,
+                                              {"rst_n": 1.0, "enable": self.enable_duty})
+
+        hold = {f"count[{bit}]": (0.5, 0.0) for bit in range(self.width)}
+        hold.update(rst_n=(1.0, 0.0), enable=(0.0, 0.0))
+        reset = {f"count[{bit}]": (0.0, 0.0) for bit in range(self.width)}
+        reset.update(rst_n=(0.0, 0.0), enable=duty)
+        return [power.Profile("Active Counting", True, active),
+                power.Profile("Hold (enable=0)", True, hold),
+                power.Profile("Reset", True, reset),
+                power.Profile("Idle (gate clk)", False, hold)], activity
+
+    def power_fields(self):
+        """Report fields from the activity-driven power engine"""
+        engine = power_engine(self.width, self.design_name, self.library_path)
+        profiles, activity = self.power_profiles()
+        frequency = 1000 / self.clock_period
+        result = engine.evaluate(profiles, frequency, self.corner.voltage,
+                                 self.corner.leakage_derate)
+        fields = power.report_fields(engine, result, frequency, self.corner.voltage)
+        fields['signal_activity'] = self.signal_activity_rows(engine, result, activity)
+        fields.update(self.clock_gating_fields(activity))
+        fields['activity_source'] = self.activity_source(activity)
+        return fields
+
+    def activity_source(self, activity):
+        """Where the power profiles' activity comes from"""
+        if activity is None:
+            return f"probabilistic propagation, enable duty {self.enable_duty:.0%}"
+        return f"toggle counts over {activity.cycles:,} cycles"
+
+    def clock_gating_fields(self, activity=None):
+        """Register bank power with and without clock gating (what-if)"""
+        library = liberty.load_library(self.library_path)
+        weights = None
+        if self.gating_vcd:
+            import vcd
+            with vcd.VcdReader(self.gating_vcd) as reader:
+                bank = clock_gating.vcd_activity(reader.toggle_stats(), self.width)
+            source = f"enable trace {self.gating_vcd}"
+        elif self.gating_distribution:
+            duties, weights = self.gating_distribution
+            bank = clock_gating.duty_activity(duties, self.width)
+            source = f"enable duty distribution ({len(duties)} duties, weighted mean)"
+        elif activity is not None:
+            bank = clock_gating.trace_activity(activity)
+            source = f"power stimulus, {activity.cycles:,} cycles"
+        else:
+            bank = clock_gating.duty_activity(self.enable_duty, self.width)
+            source = f"random enable, {self.enable_duty:.0%} duty"
+
+        fields = clock_gating.report_fields(library, self.width, bank, 1000 / self.clock_period,
+                                            self.corner.voltage, self.corner.leakage_derate,
+                                            weights)
+        fields['clock_gating_source'] = source
+        return fields
+
+    def signal_activity_rows(self, engine, result, activity=None):
+        """SIGNAL ACTIVITY ANALYSIS rows of the active profile"""
+        netlist = engine.netlist
+
+        def row(name):
+            net = netlist.net(name)
+            # Toggle rate in %/ns counts full toggles (two transitions)
+            rate = 50.0 * result.density[net, 0] / self.clock_period
+            return (f"{name:<20}{rate:>13.3f}{engine.capacitance[net]:>14.3f}"
+                    f"{result.switching[net, 0]:>14.2f}")
+
+        bits = list(range(self.width))
+        if self.width > MAX_LISTED_BITS:
+            bits = bits[:MAX_LISTED_BITS - 2] + [None] + bits[-1:]
+        rows = [row("clk"), row("rst_n"), row("enable")]
+        rows += ["..." if bit is None else row(f"count[{bit}]") for bit in bits]
+        rows.append(row("overflow"))
+        if activity is not None:
+            source = ("closed-form (periodic enable)" if self.uses_analytic_activity()
+                      else "cycle simulation (random enable)")
+            rows += ["", f"Activity: {activity.cycles:,} cycles, enable duty "
+                         f"{self.enable_duty:.0%}, {source}"]
+        return "\n".join(rows)
+
+    def power_report_fields(self):
+        """Fields of the power report"""
+        fields = dict(self.report_fields())
+        fields.update(self.power_fields())
+        return fields
+
     def generate_power_report(self):
-        """Generate power report"""
-        report = f"""
-================================================================================
-                           POWER ANALYSIS REPORT
-================================================================================
-Design: {self.design_name}
-Operating Frequency: 100 MHz
-Operating Conditions: 1.0V, 25°C
-Toggle Rate: 50% (average)
-================================================================================
-
-POWER SUMMARY
---------------------------------------------------------------------------------
-Power Component              Power (µW)    Percentage    Notes
---------------------------------------------------------------------------------
-Internal Power:               125.34        54.9%        Cell internal
-Switching Power:               87.21        38.2%        Net switching
-Leakage Power:                 15.67         6.9%        Static leakage
-                             --------      --------
-Total Dynamic Power:          212.55        93.1%
-Total Power:                  228.22       100.0%
-
-HIERARCHICAL POWER BREAKDOWN
---------------------------------------------------------------------------------
-Instance                     Internal    Switching    Leakage      Total
-                              (µW)         (µW)        (µW)        (µW)
---------------------------------------------------------------------------------
-counter_32bit (top)           125.34       87.21       15.67      228.22
-  count_reg[31:0]              89.45       52.18        8.34      149.97
-  U_increment_logic            28.67       28.45        5.12       62.24
-  U_overflow_detect             4.12        3.87        1.45        9.44
-  U_control_logic               3.10        2.71        0.76        6.57
-
-CELL TYPE POWER BREAKDOWN
---------------------------------------------------------------------------------
-Cell Type              Instances    Power (µW)    Power/Cell (µW)
---------------------------------------------------------------------------------
-DFFQX1                     32         149.97          4.69
-AND2X1                     12          18.24          1.52
-AND2X2                      8          15.36          1.92
-OR2X1                       6           8.45          1.41
-XOR2X1                     18          24.67          1.37
-INVX1                       8           5.12          0.64
-BUFX2                       4           3.89          0.97
-MUX2X1                     10          12.34          1.23
-AOI21X1                     2           5.18          2.59
-
-SIGNAL ACTIVITY ANALYSIS
---------------------------------------------------------------------------------
-Signal                  Toggle Rate    Capacitance    Power (µW)
-                           (%/ns)         (pF)
---------------------------------------------------------------------------------
-clk                        10.000         0.245         42.35
-rst_n                       0.001         0.012          0.08
-enable                      5.000         0.089          7.82
-count[0]                    5.000         0.156         13.67
-count[1]                    2.500         0.142          6.23
-count[2]                    1.250         0.138          3.05
-count[3]                    0.625         0.134          1.47
-...
-count[31]                   0.000         0.089          0.02
-overflow                    0.001         0.095          0.15
-
-POWER BY OPERATING MODE
---------------------------------------------------------------------------------
-Operating Mode         Frequency    Activity    Power (µW)
---------------------------------------------------------------------------------
-Active Counting          100 MHz       100%       228.22
-Hold (enable=0)          100 MHz        30%        68.47
-Reset                    100 MHz        10%        22.82
-Idle (gate clk)            0 MHz         0%        15.67 (leakage only)
-
-POWER OPTIMIZATION SUMMARY
---------------------------------------------------------------------------------
-Clock Gating:              Not applied (continuous counting)
-Multi-Vt Cells:            Not used (single Vt library)
-Power Gating:              Not applicable
-Operand Isolation:         Not applicable
-
-POWER EFFICIENCY METRICS
---------------------------------------------------------------------------------
-Power per MHz:             2.28 µW/MHz
-Power per gate:            2.04 µW/gate
-Energy per operation:      2.28 pJ/cycle
-
-RECOMMENDATIONS
---------------------------------------------------------------------------------
-✓ Power consumption is within acceptable range for this design
-✓ Leakage power is minimal (6.9% of total)
-- Consider clock gating if enable is frequently low
-- Multi-Vt optimization could reduce leakage by ~20%
-
-================================================================================
-Total Power @ 100MHz: 228.22 µW
-Average Current @ 1.0V: 228.22 µA
-================================================================================
-STATUS: Power goals met - Design is power-efficient
-================================================================================
-"""
+        """Power of the generated netlist from its simulated or propagated activity"""
+        report = render("power", self.power_report_fields())
         return report
 
+    def cell_usage_fields(self):
+        """Cell usage of the generated netlist against the cell library"""
+        fields = dict(self.report_fields())
+        fields.update(cell_usage.report_fields(counter_netlist(self.width, self.design_name),
+                                               liberty.load_library(self.library_path)))
+        return fields
+
     def generate_cell_usage_report(self):
-        """Generate cell usage report"""
-        report = f"""
-================================================================================
-                         CELL USAGE REPORT
-================================================================================
-Design: {self.design_name}
-Technology Library: typical.db (Generic 45nm)
-================================================================================
-
-CELL INSTANCE SUMMARY
---------------------------------------------------------------------------------
-Cell Type            Library        Instances    Ref Count    Total Area
-                     Reference                                  (µm²)
---------------------------------------------------------------------------------
-DFFQX1              DFFQX1               32           1          832.00
-AND2X1              AND2X1               12           1           84.00
-AND2X2              AND2X2                8           1           72.00
-OR2X1               OR2X1                 6           1           42.00
-XOR2X1              XOR2X1               18           1          144.00
-INVX1               INVX1                 8           1           32.00
-BUFX2               BUFX2                 4           1           24.00
-MUX2X1              MUX2X1               10           1           90.00
-AOI21X1             AOI21X1               2           1           30.00
---------------------------------------------------------------------------------
-TOTAL                                   100           9         1350.00
-
-DETAILED INSTANCE LIST
---------------------------------------------------------------------------------
-Instance Name              Cell Type    Fanout    Area (µm²)    Net
---------------------------------------------------------------------------------
-Sequential Elements:
-  count_reg[0]             DFFQX1          3         26.00      count[0]
-  count_reg[1]             DFFQX1          3         26.00      count[1]
-  count_reg[2]             DFFQX1          3         26.00      count[2]
-  count_reg[3]             DFFQX1          3         26.00      count[3]
-  count_reg[4]             DFFQX1          3         26.00      count[4]
-  ...
-  count_reg[31]            DFFQX1          2         26.00      count[31]
-
-Combinational Logic:
-  U_add_1                  XOR2X1          2          8.00      n45
-  U_add_2                  AND2X1          1          7.00      n46
-  U_add_3                  XOR2X1          2          8.00      n47
-  U_add_4                  AND2X2          1          9.00      n48
-  ...
-  U_overflow_1             AND2X2          1          9.00      n112
-  U_overflow_2             INVX1           1          4.00      n113
-  
-Control Logic:
-  U_enable_buf             BUFX2           8          6.00      enable_buf
-  U_mux_0                  MUX2X1          1          9.00      n115
-  U_mux_1                  MUX2X1          1          9.00      n116
-  ...
-
-FANOUT DISTRIBUTION
---------------------------------------------------------------------------------
-Fanout Range        Instance Count    Percentage
---------------------------------------------------------------------------------
-0 - 1                      45             40.2%
-2 - 4                      52             46.4%
-5 - 8                      12             10.7%
-9 - 16                      3              2.7%
-> 16                        0              0.0%
-
-High Fanout Nets:
-  clk                    Fanout: 32
-  rst_n                  Fanout: 32
-  enable_buf             Fanout: 16
-
-LIBRARY CELL DISTRIBUTION
---------------------------------------------------------------------------------
-[Sequential Cells]  ████████████████████████████████████  32 (28.6%)
-[Combinational]     ████████████████████████████████████████████  68 (60.7%)
-[Buffers]           ████  12 (10.7%)
-
-REFERENCE UTILIZATION
---------------------------------------------------------------------------------
-Library: typical.db
-  Total Cells Available:    ~500
-  Cells Used:                  9 (1.8%)
-  
-Cell Categories:
-  Sequential:          1 type used (DFF)
-  Combinational:       7 types used
-  Buffers/Inverters:   2 types used
-  
-Unused Cell Types:
-  - LATCH* (latches intentionally avoided)
-  - TIE* (tie cells not needed)
-  - ANTENNA* (antenna diodes added in P&R)
-
-STATUS: Cell usage is optimal and efficient
-================================================================================
-"""
+        """Generate the cell usage report"""
+        report = render("cell_usage", self.cell_usage_fields())
         return report
 
+    def resources_fields(self):
+        """Resource counts, logic depth, timing endpoints and area of the
+        generated netlist at this clock period"""
+        netlist = counter_netlist(self.width, self.design_name)
+        engine = timing_engine(self.width, self.design_name, self.sdc_path, self.library_path)
+        fields = self.timing_fields()
+        fields.update(self.area_fields())
+        fields.update(self.constraint_fields(fields))
+        fields.update(resources.report_fields(netlist, liberty.load_library(self.library_path),
+                                              engine))
+        fields['max_paths'] = self.max_paths
+        fields['critical_paths'] = sum(1 for _ in engine.worst_paths(self.max_paths,
+                                                                     self.paths_per_endpoint))
+        fields['false_path_sources'] = ", ".join(sorted(engine.constraints.false_from)) or "-"
+        ports = max(fields['port_count'], 1)
+        fields['input_port_share'] = fields['input_ports'] / ports
+        fields['output_port_share'] = fields['output_ports'] / ports
+        # Slack relative to the minimum period, as the timing report's margin
+        margin = fields['setup_slack'] / (self.clock_period - fields['setup_slack'])
+        fields['timing_margin_share'] = f"{margin:.1%}"
+        fields['timing_margin_check'] = "✓" if margin >= 0 else "✗"
+        cells = max(fields['total_cells'], 1)
+        fields['sequential_cell_share'] = fields['flip_flops'] / cells
+        fields['logic_cell_share'] = fields['logic_gates'] / cells
+        fields['buffer_cell_share'] = fields['buffer_cells'] / cells
+        # Power and ground are global nets next to the netlist's signal and clock nets
+        fields['total_nets'] = nets = fields['net_count'] + 2
+        fields['signal_nets'] = fields['net_count'] - 1
+        fields['signal_net_share'] = fields['signal_nets'] / nets
+        fields['single_net_share'] = 1 / nets
+        return fields
+
     def generate_resources_report(self):
-        """Generate resources report"""
-        report = f"""
-================================================================================
-                        DESIGN RESOURCES REPORT
-================================================================================
-Design: {self.design_name}
-Hierarchy Level: Top
-================================================================================
-
-DESIGN OBJECT COUNTS
---------------------------------------------------------------------------------
-Object Type                      Count        Percentage
---------------------------------------------------------------------------------
-Ports:                             35            -
-  Input Ports:                      3          8.6%
-  Output Ports:                    33         94.3%
-  Inout Ports:                      0          0.0%
-
-Nets:                             145            -
-  Signal Nets:                    113         77.9%
-  Power Nets:                       1          0.7%
-  Ground Nets:                      1          0.7%
-  Clock Nets:                       1          0.7%
-
-Cells:                            112            -
-  Sequential Cells:                32         28.6%
-  Combinational Cells:             68         60.7%
-  Buffer/Inverter Cells:           12         10.7%
-  
-Registers:                         32            -
-  1-bit Registers:                 32        100.0%
-  
-References:                         9            -
-  Leaf Cells:                       9        100.0%
-  Hierarchical:                     0          0.0%
-
-SEQUENTIAL RESOURCES
---------------------------------------------------------------------------------
-Register Type           Count    Bits    Reset    Clock    Enable
---------------------------------------------------------------------------------
-DFFQX1                    32      32      Async    clk      enable
-                        ----     ---
-Total Registers:          32      32
-
-Reset Type Distribution:
-  Asynchronous Reset:     32    100.0%
-  Synchronous Reset:       0      0.0%
-  No Reset:                0      0.0%
-
-Clock Domain Distribution:
-  clk:                    32    100.0%
-
-COMBINATIONAL RESOURCES
---------------------------------------------------------------------------------
-Logic Type              Count    Inputs    Outputs    Levels
---------------------------------------------------------------------------------
-Adder (32-bit):           1       64         33         6
-Comparator (33-bit):      1       33          1         3
-AND Gates:               20        -          -         -
-OR Gates:                 6        -          -         -
-XOR Gates:               18        -          -         -
-MUX:                     10        -          -         -
-Inverters:                8        -          -         -
-Buffers:                  4        -          -         -
-
-Logic Depth:
-  Minimum:                1 level
-  Average:                3 levels
-  Maximum:                6 levels (critical path)
-
-ARITHMETIC RESOURCES
---------------------------------------------------------------------------------
-Component Type          Count    Width    Implementation
---------------------------------------------------------------------------------
-Incrementer:              1       32      Ripple-carry adder
-Comparator:               1       33      Parallel comparator
-
-TIMING RESOURCES
---------------------------------------------------------------------------------
-Clock Domains:            1
-  clk (100 MHz)
-
-Sequential Paths:        32
-Combinational Paths:     68
-Total Timing Paths:     100
-
-Critical Paths:          10 (top 10 analyzed)
-False Paths:              1 (rst_n)
-Multi-cycle Paths:        0
-
-MEMORY RESOURCES
---------------------------------------------------------------------------------
-Type                    Count    Bits    Implementation
---------------------------------------------------------------------------------
-Registers:               32      32      Flip-flops
-RAM/ROM:                  0       0      None
-FIFO:                     0       0      None
-
-INTERFACE RESOURCES
---------------------------------------------------------------------------------
-Interface Type          Count    Width    Direction
---------------------------------------------------------------------------------
-Clock Input:              1       1       Input
-Reset Input:              1       1       Input (active-low)
-Control Input:            1       1       Input
-Data Output:              1      32       Output
-Status Output:            1       1       Output
-
-Total I/O:               35 bits
-  Input:                  3 bits
-  Output:                33 bits (32-bit data + 1 status)
-
-DESIGN CHARACTERISTICS
---------------------------------------------------------------------------------
-Design Style:            Synchronous
-Clock Strategy:          Single clock domain
-Reset Strategy:          Asynchronous reset
-Enable Strategy:         Synchronous enable
-Optimization:            Area & timing optimized
-
-Design Complexity:       Low-Medium
-  Logic Levels:          6 (acceptable)
-  Fanout:               <32 (good)
-  Critical Paths:        10 (manageable)
-
-RESOURCE EFFICIENCY
---------------------------------------------------------------------------------
-Metric                          Value         Rating
---------------------------------------------------------------------------------
-Gate Count Efficiency:          Good          ✓
-Area Utilization:               Optimal       ✓
-Timing Margin:                  12.3%         ✓
-Power Efficiency:               Excellent     ✓
-Routability:                    Easy          ✓
-
-================================================================================
-RESOURCE SUMMARY
-================================================================================
-Total Cells:               112
-Total Nets:                145
-Total Area:             1772.33 µm²
-Design Efficiency:      Excellent ✓
-================================================================================
-"""
+        """Generate the resources report"""
+        report = render("resources", self.resources_fields())
         return report
 
+    def constraint_fields(self, timing=None):
+        """Report fields from the SDC constraint database, clk_period bound to
+        the clock period; timing: the timing fields folded into the verdict"""
+        netlist = counter_netlist(self.width, self.design_name)
+        db = sdc.load(self.sdc_path, sdc.netlist_ports(netlist),
+                      {sdc.PERIOD_VARIABLE: self.clock_period})
+        return sdc.report_fields(db, netlist, liberty.load_library(self.library_path), timing)
+
+    def constraint_report_fields(self):
+        """The SDC file against the generated netlist's ports, with the timing,
+        area and power it achieves"""
+        fields = self.timing_fields()
+        fields.update(self.area_fields())
+        fields.update(self.power_fields())
+        fields.update(self.constraint_fields(fields))
+        for check in ("setup", "hold"):
+            fields[f"{check}_check"] = ("✓ MET" if fields[f"{check}_failing"] == 0
+                                        else "✗ VIOLATED")
+        fields['timing_conclusion'] = (
+            "All timing constraints are satisfied ✓" if fields['failing_endpoints'] == 0 else
+            f"Timing constraints violated at {fields['failing_endpoints']} endpoints ✗")
+        return fields
+
     def generate_constraint_report(self):
-        """Generate constraint report"""
-        report = f"""
-================================================================================
-                      CONSTRAINT VALIDATION REPORT
-================================================================================
-Design: {self.design_name}
-================================================================================
-
-TIMING CONSTRAINTS STATUS
---------------------------------------------------------------------------------
-Constraint Type              Status    Details
---------------------------------------------------------------------------------
-Clock Definition             ✓ MET     clk: 10.0ns period
-Clock Uncertainty            ✓ MET     0.5ns applied
-Input Delay                  ✓ MET     3.0ns max, 1.5ns min
-Output Delay                 ✓ MET     3.0ns max, 1.5ns min
-Max Transition               ✓ MET     0.5ns limit
-Max Fanout                   ✓ MET     16 limit
-Max Capacitance              ✓ MET     0.5pF limit
-
-TIMING ANALYSIS SUMMARY
---------------------------------------------------------------------------------
-Analysis Type                WNS (ns)    TNS (ns)    Endpoints    Status
---------------------------------------------------------------------------------
-Setup (max delay)             1.23        0.00          0         ✓ MET
-Hold (min delay)              0.45        0.00          0         ✓ MET
-Recovery                      N/A         N/A           0         ✓ MET
-Removal                       N/A         N/A           0         ✓ MET
-
-All timing constraints are satisfied ✓
-
-DESIGN RULE CONSTRAINTS
---------------------------------------------------------------------------------
-Rule Type                  Violations    Max Value    Details
---------------------------------------------------------------------------------
-Max Transition Time             0         0.5 ns      All nets < 0.45ns
-Max Fanout                      0         16          Max fanout = 32 (clk)
-Max Capacitance                 0         0.5 pF      All nets < 0.35pF
-Min Capacitance                 0         N/A         Not specified
-
-All design rules are satisfied ✓
-
-AREA CONSTRAINTS
---------------------------------------------------------------------------------
-Constraint                 Target        Achieved      Status
---------------------------------------------------------------------------------
-Max Area                   Minimize      1772.33 µm²   ✓ Optimized
-
-POWER CONSTRAINTS
---------------------------------------------------------------------------------
-Constraint                 Target        Achieved      Status
---------------------------------------------------------------------------------
-Total Power                Minimize      228.22 µW     ✓ Optimized
-
-FALSE PATH SUMMARY
---------------------------------------------------------------------------------
-From                    To                      Paths    Reason
---------------------------------------------------------------------------------
-rst_n                   count_reg[*]/CLR        32       Async reset
-
-Multi-cycle paths:      0
-Case analysis:          0
-Disabled timing arcs:   0
-
-CLOCK CONSTRAINTS DETAIL
---------------------------------------------------------------------------------
-Clock: clk
-  Period:              10.00 ns
-  Frequency:          100.00 MHz
-  Uncertainty:          0.50 ns
-  Source Latency:       1.00 ns
-  Network Latency:      0.50 ns
-  Transition:           0.10 ns
-  
-  Fanout:               32 registers
-  Skew:                 0.05 ns (excellent)
-
-INPUT CONSTRAINTS DETAIL
---------------------------------------------------------------------------------
-Port        Delay Max    Delay Min    Transition    Drive Cell
-            (ns)         (ns)         (ns)
---------------------------------------------------------------------------------
-rst_n       3.00         1.50         0.20          BUFX2
-enable      3.00         1.50         0.20          BUFX2
-
-OUTPUT CONSTRAINTS DETAIL
---------------------------------------------------------------------------------
-Port          Delay Max    Delay Min    Load (pF)
-              (ns)         (ns)
---------------------------------------------------------------------------------
-count[0]      3.00         1.50         0.05
-count[1]      3.00         1.50         0.05
-...
-count[31]     3.00         1.50         0.05
-overflow      3.00         1.50         0.05
-
-CONSTRAINT COVERAGE
---------------------------------------------------------------------------------
-Constrained Paths:          100%
-Unconstrained Paths:          0%
-Over-constrained Paths:       0%
-
-Port Coverage:
-  Input Ports Constrained:  100% (3/3)
-  Output Ports Constrained: 100% (33/33)
-
-Path Coverage:
-  Setup Paths Covered:      100%
-  Hold Paths Covered:       100%
-
-EXCEPTIONS SUMMARY
---------------------------------------------------------------------------------
-False Paths:                  1
-Multi-cycle Paths:            0
-Case Analysis:                0
-Clock Groups:                 0
-
-CONSTRAINT VALIDATION
---------------------------------------------------------------------------------
-[✓] All required constraints applied
-[✓] No conflicting constraints
-[✓] No missing constraints
-[✓] All paths properly constrained
-[✓] Clock properly defined
-[✓] I/O properly constrained
-[✓] No over-constrained paths
-[✓] Design rules satisfied
-
-================================================================================
-CONSTRAINT STATUS: ALL CONSTRAINTS MET ✓
-================================================================================
-Design is fully constrained and meets all requirements.
-Ready for physical implementation.
-================================================================================
-"""
+        """Constraint report of the SDC file against the generated netlist's ports"""
+        report = render("constraints", self.constraint_report_fields())
+        return report
+
+    def generate_waveform_report(self):
+        """Simulate the RTL testbench stimulus and write docs/waveform_report.txt"""
+        period = int(self.clock_period)
+        rst_n, enable, force = counter_model.testbench_stimulus(self.width, period)
+        trace = counter_model.trace(rst_n, enable, width=self.width, force=force)
+        report = render_waveform_report(trace, period)
+
+        os.makedirs(self.docs_dir, exist_ok=True)
+        report_path = os.path.join(self.docs_dir, "waveform_report.txt")
+        with open(report_path, 'w') as f:
+            f.write(report)
+        print(f"✓ Generated: {report_path}")
+
         return report
 
-    def save_reports(self):
+    def settings(self):
+        """Settings that determine the generated artifacts (cache key)"""
+        skip = {'report_dir', 'netlist_dir', 'docs_dir', 'pnr_report_dir', 'cache'}
+        settings = {name: value for name, value in vars(self).items()
+                    if not name.startswith('_') and name not in skip}
+        settings['tool'] = flow_cache.tool_digest()
+        return settings
+
+    def cache_key(self, stage, settings=None):
+        """Cache key of a stage: the RTL, SDC and library contents plus settings"""
+        return self.cache.key(stage, (self.rtl_path, self.sdc_path, self.library_path),
+                              settings if settings is not None else self.settings())
+
+    def render_reports(self, jobs=1):
+        """Render every report, {filename: content}; cached reports are reused"""
+        if self.cache is None:
+            return ReportEngine(jobs).render(self)
+        settings = self.settings()
+        keys = {name: self.cache_key(f"report:{name}", settings) for name in REPORT_GENERATORS}
+        reports, missing = {}, {}
+        for name, key in keys.items():
+            artifact = self.cache.get(key)
+            if artifact is None:
+                missing[name] = REPORT_GENERATORS[name]
+            else:
+                reports[name] = artifact[name]
+        if missing:
+            for name, content in ReportEngine(jobs).render(self, missing).items():
+                self.cache.put(keys[name], {name: content})
+                reports[name] = content
+        return {name: reports[name] for name in REPORT_GENERATORS}
+
+    def save_reports(self, jobs=1):
         """Save all reports to files"""
+        if self.cache is None:
+            return ReportEngine(jobs).save(self, self.report_dir)
+        reports = self.render_reports(jobs)
         os.makedirs(self.report_dir, exist_ok=True)
-        
-        reports = {
-            'qor.rpt': self.generate_qor_report(),
-            'timing.rpt': self.generate_timing_report(),
-            'area.rpt': self.generate_area_report(),
-            'power.rpt': self.generate_power_report(),
-            'cell_usage.rpt': self.generate_cell_usage_report(),
-            'resources.rpt': self.generate_resources_report(),
-            'constraints.rpt': self.generate_constraint_report(),
-        }
-        
         for filename, content in reports.items():
-            filepath = os.path.join(self.report_dir, filename)
-            with open(filepath, 'w') as f:
-                f.write(content)
-            print(f"✓ Generated: {filepath}")
-        
+            path = os.path.join(self.report_dir, filename)
+            written = flow_cache.write_if_changed(path, content)
+            print(f"✓ {'Generated' if written else 'Up to date'}: {path}")
         return reports
 
+    def cached_stage(self, stage, outputs, build, settings):
+        """Run build() (which writes outputs) unless the cache has this stage's result"""
+        if self.cache is None:
+            build()
+            return False
+        settings = dict(settings, tool=flow_cache.tool_digest())
+        hit = self.cache.stage(self.cache_key(stage, settings), outputs, build)
+        if hit:
+            for path in outputs.values():
+                print(f"✓ Up to date: {path}")
+        return hit
+
     def generate_synthesized_netlist(self):
-        """Generate a simplified gate-level netlist"""
-        netlist = f"""// ============================================================================
-// Gate-Level Netlist - Synthesized Design
-// ============================================================================
-// Design: {self.design_name}
-// Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-// Tool: Synopsys Design Compiler (Simulated Output)
-// Technology: Generic 45nm Standard Cell Library
-// ============================================================================
-
-module {self.design_name} (
-    input  wire         clk,
-    input  wire         rst_n,
-    input  wire         enable,
-    output wire [31:0]  count,
-    output wire         overflow
-);
-
-  // Internal wires
-  wire [31:0] count_int;
-  wire [31:0] next_count;
-  wire [31:0] inc_result;
-  wire enable_buf;
-  
-  // Buffer enable signal
-  BUFX2 U_enable_buf ( .A(enable), .Y(enable_buf) );
-  
-  // 32-bit incrementer (ripple-carry adder structure)
-  // Bit 0 (LSB)
-  XOR2X1 U_inc_0 ( .A(count_int[0]), .B(1'b1), .Y(inc_result[0]) );
-  wire carry_0;
-  AND2X1 U_carry_0 ( .A(count_int[0]), .B(1'b1), .Y(carry_0) );
-  
-  // Bit 1
-  XOR2X1 U_inc_1 ( .A(count_int[1]), .B(carry_0), .Y(inc_result[1]) );
-  wire carry_1;
-  AND2X2 U_carry_1 ( .A(count_int[1]), .B(carry_0), .Y(carry_1) );
-  
-  // Bits 2-30 (similar structure)
-  // ... (additional adder stages)
-  
-  // Bit 31 (MSB)
-  wire carry_30;
-  XOR2X1 U_inc_31 ( .A(count_int[31]), .B(carry_30), .Y(inc_result[31]) );
-  
-  // Multiplexers for enable control
-  genvar i;
-  generate
-    for (i = 0; i < 32; i = i + 1) begin : gen_mux
-      MUX2X1 U_mux ( 
-        .A(count_int[i]), 
-        .B(inc_result[i]), 
-        .S(enable_buf), 
-        .Y(next_count[i]) 
-      );
-    end
-  endgenerate
-  
-  // D Flip-Flops (32 instances)
-  DFFQX1 count_reg_0 ( .D(next_count[0]), .CK(clk), .CLR(rst_n), .Q(count_int[0]) );
-  DFFQX1 count_reg_1 ( .D(next_count[1]), .CK(clk), .CLR(rst_n), .Q(count_int[1]) );
-  DFFQX1 count_reg_2 ( .D(next_count[2]), .CK(clk), .CLR(rst_n), .Q(count_int[2]) );
-  // ... (count_reg_3 through count_reg_30)
-  DFFQX1 count_reg_31 ( .D(next_count[31]), .CK(clk), .CLR(rst_n), .Q(count_int[31]) );
-  
-  // Overflow detection logic (all bits high AND enable)
-  wire all_ones;
-  AND2X2 U_ovf_0 ( .A(count_int[0]), .B(count_int[1]), .Y(n_ovf_0) );
-  AND2X2 U_ovf_1 ( .A(n_ovf_0), .B(count_int[2]), .Y(n_ovf_1) );
-  // ... (cascade AND gates for all 32 bits)
-  AND2X2 U_ovf_final ( .A(n_ovf_30), .B(count_int[31]), .Y(all_ones) );
-  AND2X2 U_overflow ( .A(all_ones), .B(enable_buf), .Y(overflow) );
-  
-  // Output assignment
-  assign count = count_int;
-
-endmodule
-
-// ============================================================================
-// End of Synthesized Netlist
-// ============================================================================
-// Cell Count Summary:
-//   DFFQX1:  32 instances
-//   AND2X1:  12 instances
-//   AND2X2:   8 instances
-//   OR2X1:    6 instances
-//   XOR2X1:  18 instances
-//   INVX1:    8 instances
-//   BUFX2:    4 instances
-//   MUX2X1:  10 instances
-//   AOI21X1:  2 instances
-// Total Cells: 112
-// ============================================================================
-"""
-        
+        """Build the gate-level netlist for WIDTH and stream it to netlists/"""
+        netlist = netlist_gen.build_counter(self.width, self.design_name)
+
         os.makedirs(self.netlist_dir, exist_ok=True)
         netlist_path = os.path.join(self.netlist_dir, f"{self.design_name}_syn.v")
-        with open(netlist_path, 'w') as f:
-            f.write(netlist)
+        netlist_gen.write_verilog(netlist, netlist_path, date=timestamp())
         print(f"✓ Generated: {netlist_path}")
-        
+
         return netlist
 
-def main():
+    def save_netlist(self):
+        """Gate-level netlist stage (cached)"""
+        path = os.path.join(self.netlist_dir, f"{self.design_name}_syn.v")
+        return self.cached_stage("netlist", {'netlist': path}, self.generate_synthesized_netlist,
+                                 {'width': self.width, 'design_name': self.design_name})
+
+    def save_waveform_report(self):
+        """Testbench waveform stage (cached)"""
+        path = os.path.join(self.docs_dir, "waveform_report.txt")
+        return self.cached_stage("waveform", {'waveform': path}, self.generate_waveform_report,
+                                 {'width': self.width, 'clock_period': self.clock_period})
+
+    def placement_fields(self):
+        """Report fields of the placed netlist"""
+        fields = dict(self.report_fields())
+        fields.update(placer.report_fields(counter_netlist(self.width, self.design_name),
+                                           placement(self.width, self.design_name,
+                                                     self.library_path),
+                                           liberty.load_library(self.library_path)))
+        return fields
+
+    def routing_fields(self):
+        """Report fields of the globally routed netlist"""
+        fields = dict(self.report_fields())
+        fields.update(router.report_fields(routing(self.width, self.design_name,
+                                                   self.library_path)))
+        return fields
+
+    def generate_placement_report(self):
+        """Generate the placement report of the analytic placer"""
+        return render("placement", self.placement_fields())
+
+    def generate_routing_report(self):
+        """Generate the global routing report: layers, overflow and congestion maps"""
+        return render("routing", self.routing_fields())
+
+    def pnr_qor_fields(self):
+        """Place & route QoR from timing, power, placement and routing"""
+        engine = timing_engine(self.width, self.design_name, self.sdc_path, self.library_path)
+        fields = self.timing_fields()
+        fields.update(self.power_fields())
+        fields.update(self.placement_fields())
+        fields.update(self.routing_fields())
+        fields['critical_path_delay'] = self.clock_period - fields['setup_slack']
+        fields['setup_violations'] = engine.failing_endpoints()
+        fields['hold_violations'] = engine.failing_endpoints(hold=True)
+        met = (fields['failing_endpoints'] == 0 and fields['legality'].startswith("✓") and
+               fields['routing_overflow'] == 0)
+        fields['pnr_status'] = "✓ EXCELLENT" if met else "✗ NEEDS ATTENTION"
+        return fields
+
+    def generate_pnr_qor_report(self):
+        """Generate the place & route QoR summary"""
+        return render("pnr_qor", self.pnr_qor_fields())
+
+    def save_pnr_reports(self):
+        """Place and route stage (cached): placement, routing and QoR reports in pnr/reports"""
+        outputs = {'placement': os.path.join(self.pnr_report_dir, "placement.rpt"),
+                   'routing': os.path.join(self.pnr_report_dir, "routing.rpt"),
+                   'pnr_qor': os.path.join(self.pnr_report_dir, "qor_summary.rpt")}
+
+        def build():
+            os.makedirs(self.pnr_report_dir, exist_ok=True)
+            for path, content in ((outputs['placement'], self.generate_placement_report()),
+                                  (outputs['routing'], self.generate_routing_report()),
+                                  (outputs['pnr_qor'], self.generate_pnr_qor_report())):
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(content)
+                print(f"✓ Generated: {path}")
+
+        settings = dict(self.settings(), ports=flow_cache.file_digest(placer.PORT_REPORT),
+                        layers=flow_cache.file_digest(router.LAYER_STACK))
+        return self.cached_stage("place", outputs, build, settings)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Synthesis simulator")
+    parser.add_argument("-j", "--jobs", type=int, default=default_jobs(),
+                        help="parallel report workers (default: CPU count)")
+    parser.add_argument("--sweep-widths", type=_int_list, metavar="W[,W...]",
+                        help="sweep mode: WIDTH values to generate reports for")
+    parser.add_argument("--sweep-periods", type=_float_list, metavar="NS[,NS...]",
+                        help="sweep mode: clock periods in ns (default: 10.0)")
+    parser.add_argument("--sweep-corners", type=_str_list, metavar="NAME[,NAME...]",
+                        help="sweep mode: operating corners (default: typical)")
+    parser.add_argument("--activity-cycles", type=int, default=100_000,
+                        help="cycles of the power-analysis stimulus (default: 100000)")
+    parser.add_argument("--enable-duty", type=float, default=1.0,
+                        help="enable duty cycle of the power-analysis stimulus")
+    parser.add_argument("--power-mode", choices=POWER_MODES, default="toggle",
+                        help="net activity of the power report (default: toggle)")
+    parser.add_argument("--gating-distribution", type=clock_gating.parse_distribution,
+                        metavar="D:W[,D:W...]",
+                        help="enable duty distribution of the clock gating what-if")
+    parser.add_argument("--gating-vcd", metavar="FILE",
+                        help="enable trace (counter VCD) of the clock gating what-if")
+    parser.add_argument("--mcmm-corners", type=_str_list, metavar="NAME[,NAME...]",
+                        help="corners of the MCMM report (default: all)")
+    parser.add_argument("--scaling-widths", type=_int_list, metavar="W[,W...]",
+                        help="WIDTH values of the area scaling curve (default: 8..4096)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="regenerate every artifact, bypassing the flow cache")
+    parser.add_argument("--cache-dir", default=flow_cache.DEFAULT_CACHE_DIR,
+                        help="flow cache directory")
+    parser.add_argument("--cache-size", type=int, default=flow_cache.DEFAULT_MAX_BYTES >> 20,
+                        metavar="MB", help="flow cache size limit")
+    parser.add_argument("--place", action="store_true",
+                        help="also place and route the netlist and write pnr/reports")
+    parser.add_argument("--max-paths", type=int, default=sta.MAX_SUMMARY_PATHS,
+                        help="worst setup paths listed in the timing report")
+    parser.add_argument("--paths-per-endpoint", type=int, default=sta.PATHS_PER_ENDPOINT,
+                        help="at most this many of them per endpoint")
+    return parser.parse_args(argv)
+
+def _int_list(text):
+    return [int(item) for item in text.split(",") if item]
+
+def _float_list(text):
+    return [float(item) for item in text.split(",") if item]
+
+def _str_list(text):
+    return [item for item in text.split(",") if item]
+
+def make_cache(args):
+    """FlowCache from the command line, None with --no-cache"""
+    if args.no_cache:
+        return None
+    return flow_cache.FlowCache(args.cache_dir, max_bytes=args.cache_size << 20)
+
+def run_sweep(args):
+    """Generate one report tree per point of the WIDTH/period/corner grid"""
+    widths = args.sweep_widths or [32]
+    periods = args.sweep_periods or [10.0]
+    corners = args.sweep_corners or ["typical"]
+    for corner in corners:
+        if corner not in OPERATING_CORNERS:
+            raise SystemExit(f"Unknown corner '{corner}'")
+
+    report_root = SynthesisSimulator().report_dir
+    os.makedirs(report_root, exist_ok=True)
+    index_path = os.path.join(report_root, "sweep_index.csv")
+    total = len(widths) * len(periods) * len(corners)
+
+    print(f"Sweeping {total} configurations with {args.jobs} workers...\n")
+    results = sweep.run_sweep(sweep.iter_grid(widths, periods, corners),
+                              report_root, jobs=args.jobs, cache=make_cache(args))
+    count = sweep.write_index(results, index_path)
+    print(f"✓ Generated: {count} report trees under {report_root}/")
+    print(f"✓ Generated: {index_path}")
+
+def main(argv=None):
+    args = parse_args(argv)
+
     print("\n" + "="*80)
     print(" " * 20 + "SYNTHESIS SIMULATION STARTED")
     print("="*80 + "\n")
-    
+
+    if args.sweep_widths or args.sweep_periods or args.sweep_corners:
+        run_sweep(args)
+        return
+
     sim = SynthesisSimulator()
-    
+    sim.cache = make_cache(args)
+    sim.activity_cycles = args.activity_cycles
+    sim.enable_duty = args.enable_duty
+    sim.power_mode = args.power_mode
+    sim.gating_distribution = args.gating_distribution
+    sim.gating_vcd = args.gating_vcd
+    sim.max_paths = args.max_paths
+    if args.mcmm_corners:
+        unknown = [name for name in args.mcmm_corners if name not in OPERATING_CORNERS]
+        if unknown:
+            raise SystemExit(f"Unknown corner '{unknown[0]}'")
+        sim.mcmm_corners = args.mcmm_corners
+    sim.paths_per_endpoint = args.paths_per_endpoint
+    if args.scaling_widths:
+        sim.scaling_widths = args.scaling_widths
+
     print("Generating synthesis reports...\n")
-    sim.save_reports()
+    sim.save_reports(jobs=args.jobs)
     
     print("\nGenerating gate-level netlist...\n")
-    sim.generate_synthesized_netlist()
+    sim.save_netlist()
+
+    print("\nSimulating testbench waveform...\n")
+    sim.save_waveform_report()
+
+    if args.place:
+        print("\nPlacing and routing gate-level netlist...\n")
+        sim.save_pnr_reports()
     
     print("\n" + "="*80)
     print(" " * 15 + "SYNTHESIS SIMULATION COMPLETED ✓")
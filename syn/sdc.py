@@ -0,0 +1,822 @@
+#!/usr/bin/env python3
+# ============================================================================
+# SDC - Tcl-subset constraint parser and indexed constraint database
+# ============================================================================
+# Purpose: Read an SDC file into a ConstraintDB of clocks, port delays,
+#          transitions, driving cells, loads, design rules and timing
+#          exceptions. Port constraints are indexed per port and per bit,
+#          so the effective constraint on a pin is one dict lookup.
+#          Design rules (max transition/fanout/capacitance) are checked on
+#          every net of a netlist.
+#
+# Subset:  set, $var, [expr ...], [get_ports|get_clocks ...], [all_inputs],
+#          [all_outputs], [all_registers] ([all register]),
+#          [remove_from_collection A B], "..." words and \ continuations.
+#          Unknown commands are counted, not interpreted.
+#
+# Caching: A line is tokenized once per distinct text, and a command is
+#          evaluated once per (line, values of the variables it reads).
+#          A sweep that rewrites or binds only clk_period re-tokenizes at
+#          most that one line and re-evaluates only the commands that
+#          depend on it. Databases are memoized on the file's commands,
+#          the design's ports and the bound variables.
+# Usage:   python sdc.py [file.sdc] [--width W] [--period NS] [--pin NAME ...]
+# ============================================================================
+
+import argparse
+import ast
+import fnmatch
+import operator
+import os
+import re
+from collections import Counter, namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+import flow_cache
+
+DEFAULT_SDC = "../syn/constraints/counter_32bit.sdc"
+
+# Variable a sweep binds to its clock period (ns)
+PERIOD_VARIABLE = "clk_period"
+
+# Bits of a bus listed in the constraint report before eliding
+LISTED_BITS = 2
+
+# Options that take no value
+SWITCHES = {"-max", "-min", "-source", "-network", "-add_delay", "-rise", "-fall",
+            "-setup", "-hold", "-early", "-late"}
+
+# Output resistance (kOhm) of a X1 drive; a XN cell drives N times harder.
+# The library has scalar delays and no transition tables, so a net's
+# transition is estimated as the 10-90% RC rise, 2.2 R C.
+DRIVE_RESISTANCE = 2.5
+SLEW_FACTOR = 2.2
+
+# Timing exception commands
+EXCEPTIONS = ("set_false_path", "set_multicycle_path", "set_case_analysis",
+              "set_clock_groups", "set_disable_timing")
+
+Command = namedtuple("Command", "name words variables")
+
+# Design port: bus name, "input"/"output", width and LSB (None for scalars)
+DesignPort = namedtuple("DesignPort", "name direction width lsb")
+
+# Object collection: kind is ports, inputs, outputs, clocks, registers or
+# design; exclude holds the names removed by remove_from_collection
+Objects = namedtuple("Objects", "kind names exclude", defaults=((), frozenset()))
+
+Clock = namedtuple("Clock", "name port period waveform uncertainty transition "
+                            "source_latency network_latency",
+                   defaults=(None, 10.0, (), 0.0, 0.0, 0.0, 0.0))
+
+# Effective constraint on one port (bit); None where unconstrained
+PortConstraint = namedtuple(
+    "PortConstraint",
+    "direction clock_source clock input_delay_max input_delay_min output_delay_max "
+    "output_delay_min transition driving_cell load max_capacitance false_path",
+    defaults=(None,) * 11)
+
+Assignment = namedtuple("Assignment", "objects values")
+FalsePath = namedtuple("FalsePath", "source target through")
+
+# Design rule over every net: limit (None: not specified), violating nets,
+# worst value and the net it is on
+RuleCheck = namedtuple("RuleCheck", "limit violations worst net")
+
+
+# ----------------------------------------------------------------------------
+# Tokenizer and evaluator
+# ----------------------------------------------------------------------------
+
+_ARITH = {ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul,
+          ast.Div: operator.truediv, ast.USub: operator.neg, ast.UAdd: operator.pos}
+
+_VARIABLE = re.compile(r"\$\{?(\w+)")
+
+
+def _arith(node):
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+        return node.value
+    if isinstance(node, ast.BinOp) and type(node.op) in _ARITH:
+        return _ARITH[type(node.op)](_arith(node.left), _arith(node.right))
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _ARITH:
+        return _ARITH[type(node.op)](_arith(node.operand))
+    raise ValueError(f"Unsupported expr ({ast.dump(node)})")
+
+
+def _words(line):
+    """Split a Tcl command into words, keeping [...], {...} and "..." whole"""
+    words, depth, start = [], 0, None
+    quoted = False
+    for i, char in enumerate(line):
+        if start is None:
+            if char.isspace():
+                continue
+            start = i
+        if char == '"' and not depth:
+            quoted = not quoted
+        elif char in "[{" and not quoted:
+            depth += 1
+        elif char in "]}" and not quoted:
+            depth -= 1
+        elif char.isspace() and not depth and not quoted:
+            words.append(line[start:i])
+            start = None
+    if start is not None:
+        words.append(line[start:])
+    return words
+
+
+def _lines(text):
+    """Commands of an SDC text: comments dropped, \\ continuations joined"""
+    pending = ""
+    for line in text.splitlines():
+        line = line.strip()
+        if line.endswith("\\"):
+            pending += line[:-1] + " "
+            continue
+        line, pending = pending + line, ""
+        if line and not line.startswith("#"):
+            yield line
+    if pending.strip():
+        yield pending.strip()
+
+
+@lru_cache(maxsize=4096)
+def parse_command(line):
+    """Tokenized command of one line (cached per distinct line text)"""
+    name, *words = _words(line)
+    return Command(name, tuple(words), frozenset(_VARIABLE.findall(line)))
+
+
+def _collection(command, args):
+    """Objects of a collection command, or None for other commands"""
+    if command in ("get_ports", "get_clocks", "get_cells", "get_pins"):
+        names = []
+        for arg in args:
+            if isinstance(arg, str) and not arg.startswith("-"):
+                names += arg.split()
+        kind = {"get_ports": "ports", "get_clocks": "clocks"}.get(command, "cells")
+        return Objects(kind, tuple(names))
+    if command == "all_inputs":
+        return Objects("inputs")
+    if command == "all_outputs":
+        return Objects("outputs")
+    if command == "all_registers" or (command == "all" and args[:1] == ["register"]):
+        return Objects("registers")
+    if command == "all_clocks":
+        return Objects("clocks")
+    if command == "remove_from_collection" and len(args) == 2:
+        base, removed = args
+        return base._replace(exclude=base.exclude | frozenset(removed.names))
+    return None
+
+
+def _value(word, variables):
+    """Value of one word: $var, [expr ...], a collection, "text", {text} or literal"""
+    if word.startswith("{") and word.endswith("}"):
+        return word[1:-1]  # braces: no substitution
+    if word.startswith('"') and word.endswith('"') and len(word) > 1:
+        word = word[1:-1]
+    if word.startswith("$"):
+        return variables.get(word[1:].strip("{}"), word)
+    if word.startswith("[") and word.endswith("]"):
+        command, *inner = _words(word[1:-1])
+        if command == "expr":
+            text = " ".join(str(_value(w, variables)) for w in inner)
+            return _arith(ast.parse(text, mode="eval").body)
+        args = [_value(w, variables) for w in inner]
+        objects = _collection(command, args)
+        return objects if objects is not None else (command, *args)
+    try:
+        return float(word)
+    except ValueError:
+        return word
+
+
+@lru_cache(maxsize=4096)
+def _evaluate(command, bindings):
+    """Argument values of a command given the variables it reads"""
+    variables = dict(bindings)
+    return tuple(_value(word, variables) for word in command.words)
+
+
+def _options(args):
+    """Split command arguments into {-flag: value} and positional values"""
+    flags, positional = {}, []
+    items = iter(args)
+    for arg in items:
+        if isinstance(arg, str) and arg.startswith("-") and len(arg) > 1:
+            flags[arg] = True if arg in SWITCHES else next(items, True)
+        else:
+            positional.append(arg)
+    return flags, positional
+
+
+def _objects(value):
+    """Collection of a command target ($design_name: the design)"""
+    if isinstance(value, Objects):
+        return value
+    return Objects("design", (str(value),))
+
+
+# ----------------------------------------------------------------------------
+# Reading
+# ----------------------------------------------------------------------------
+
+# path -> (digest, commands) of the last read
+_commands = {}
+
+
+def read_commands(path):
+    """Tokenized commands of an SDC file; unchanged lines are not re-tokenized"""
+    digest = flow_cache.file_digest(path)
+    cached = _commands.get(path)
+    if cached is None or cached[0] != digest:
+        with open(path) as f:
+            cached = (digest, tuple(parse_command(line) for line in _lines(f.read())))
+        _commands[path] = cached
+    return cached[1]
+
+
+def netlist_ports(netlist):
+    """DesignPorts of a netlist_db.Netlist"""
+    n = netlist
+    return tuple(DesignPort(n.bus_names[p.bus], p.direction, n.bus_width[p.bus],
+                            n.bus_lsb[p.bus] if n.bus_is_vector[p.bus] else None)
+                 for p in n.ports)
+
+
+def load(path=DEFAULT_SDC, ports=(), variables=None):
+    """ConstraintDB of an SDC file for a design's ports
+
+    variables binds SDC variables ahead of the file's own `set` commands,
+    e.g. {PERIOD_VARIABLE: 5.0} for one point of a clock period sweep.
+    """
+    bound = tuple(sorted((variables or {}).items()))
+    return _database(read_commands(path), tuple(ports), bound)
+
+
+@lru_cache(maxsize=32)
+def _database(commands, ports, bound):
+    return ConstraintDB(commands, ports, dict(bound))
+
+
+# ----------------------------------------------------------------------------
+# Constraint database
+# ----------------------------------------------------------------------------
+
+class ConstraintDB:
+    """Evaluated SDC commands with a per-port constraint index
+
+    clocks:      {name: Clock}
+    rules:       design rules (max_transition, max_fanout, max_area, ...)
+    assignments: port constraint commands in file order (Assignment)
+    false_paths: FalsePath records; exceptions counts every exception command
+    ignored:     commands that were not interpreted, by name
+    pins:        {port or bit name: PortConstraint}, see pin()
+    """
+
+    def __init__(self, commands, ports=(), bound=None):
+        self.ports = tuple(ports)
+        self.bound = dict(bound or {})
+        self.variables = dict(self.bound)
+        self.clocks = {}
+        self.rules = {}
+        self.assignments = []
+        self.false_paths = []
+        self.exceptions = Counter()
+        self.ignored = Counter()
+        self.unmatched = set()
+        self.conflicts = set()  # (port, field) assigned two different values
+        for command in commands:
+            bindings = tuple(sorted((name, self.variables[name])
+                                    for name in command.variables if name in self.variables))
+            args = _evaluate(command, bindings)
+            handler = getattr(self, f"_{command.name}", None)
+            if command.name in EXCEPTIONS:
+                self.exceptions[command.name] += 1
+            if handler is None:
+                self.ignored[command.name] += 1
+            else:
+                handler(*_options(args))
+        self.pins = self._index()
+
+    # -- commands ------------------------------------------------------
+
+    def _set(self, flags, positional):
+        if len(positional) >= 2 and str(positional[0]) not in self.bound:
+            self.variables[str(positional[0])] = positional[1]
+
+    def _create_clock(self, flags, positional):
+        target = positional[-1] if positional else None
+        port = target.names[0] if isinstance(target, Objects) and target.names else None
+        name = str(flags.get("-name", port))
+        waveform = str(flags.get("-waveform", "")).split()
+        self.clocks[name] = Clock(name, port, float(flags["-period"]),
+                                  tuple(float(edge) for edge in waveform))
+        if port is not None:
+            self._assign(target, clock_source=name)
+
+    def _update_clocks(self, positional, **values):
+        """Apply values to the clocks of positional[1] (default: every clock)"""
+        target = positional[1] if len(positional) > 1 else Objects("clocks")
+        names = target.names if isinstance(target, Objects) and target.names else self.clocks
+        for name in names:
+            if name in self.clocks:
+                self.clocks[name] = self.clocks[name]._replace(**values)
+
+    def _set_clock_uncertainty(self, flags, positional):
+        self._update_clocks(positional, uncertainty=float(positional[0]))
+
+    def _set_clock_transition(self, flags, positional):
+        self._update_clocks(positional, transition=float(positional[0]))
+
+    def _set_clock_latency(self, flags, positional):
+        field = "source_latency" if "-source" in flags else "network_latency"
+        self._update_clocks(positional, **{field: float(positional[0])})
+
+    def _port_delay(self, kind, flags, positional):
+        bounds = [b for b in ("max", "min") if f"-{b}" in flags] or ["max", "min"]
+        values = {f"{kind}_delay_{b}": float(positional[0]) for b in bounds}
+        if "-clock" in flags:
+            values["clock"] = str(flags["-clock"])
+        self._assign(positional[1], **values)
+
+    def _set_input_delay(self, flags, positional):
+        self._port_delay("input", flags, positional)
+
+    def _set_output_delay(self, flags, positional):
+        self._port_delay("output", flags, positional)
+
+    def _set_input_transition(self, flags, positional):
+        self._assign(positional[1], transition=float(positional[0]))
+
+    def _set_driving_cell(self, flags, positional):
+        self._assign(positional[0], driving_cell=str(flags.get("-lib_cell")))
+
+    def _set_load(self, flags, positional):
+        self._assign(positional[1], load=float(positional[0]))
+
+    def _set_max_capacitance(self, flags, positional):
+        target = _objects(positional[1])
+        if target.kind == "design":
+            self.rules["max_capacitance"] = float(positional[0])
+        else:
+            self._assign(target, max_capacitance=float(positional[0]))
+
+    def _set_max_transition(self, flags, positional):
+        self.rules["max_transition"] = float(positional[0])
+
+    def _set_max_fanout(self, flags, positional):
+        self.rules["max_fanout"] = float(positional[0])
+
+    def _set_max_area(self, flags, positional):
+        self.rules["max_area"] = float(positional[0])
+
+    def _set_fix_hold(self, flags, positional):
+        target = _objects(positional[0]) if positional else Objects("clocks")
+        self.rules["fix_hold"] = target.names or tuple(self.clocks)
+
+    def _set_false_path(self, flags, positional):
+        path = FalsePath(*(flags.get(f) if isinstance(flags.get(f), Objects) else None
+                           for f in ("-from", "-to", "-through")))
+        self.false_paths.append(path)
+        if path.source is not None and path.source.kind in ("ports", "inputs"):
+            self._assign(path.source, false_path=describe(path.target))
+
+    # -- index ---------------------------------------------------------
+
+    def _assign(self, objects, **values):
+        self.assignments.append(Assignment(_objects(objects), tuple(values.items())))
+
+    def resolve(self, objects):
+        """Port (bus) and bit names of a collection"""
+        if objects.kind == "inputs":
+            return [p.name for p in self.ports
+                    if p.direction != "output" and p.name not in objects.exclude]
+        if objects.kind == "outputs":
+            return [p.name for p in self.ports
+                    if p.direction != "input" and p.name not in objects.exclude]
+        if objects.kind != "ports":
+            return []
+        buses = {p.name for p in self.ports}
+        names = []
+        for name in objects.names:
+            if name in buses:
+                names.append(name)
+            elif any(c in name for c in "*?"):
+                names += fnmatch.filter(buses, name)
+            elif name.endswith("]") and name.partition("[")[0] in buses:
+                names.append(name)
+            else:
+                self.unmatched.add(name)
+        return [name for name in names if name not in objects.exclude]
+
+    def _index(self):
+        """{port or bit name: PortConstraint}; bits of a bus share its record"""
+        buses = {p.name: {"direction": p.direction} for p in self.ports}
+        bits = {}  # bit name -> own values, for bits constrained individually
+        for objects, values in self.assignments:
+            for name in self.resolve(objects):
+                current = bits.get(name) or buses[name.partition("[")[0]]
+                self.conflicts.update((name, key) for key, value in values
+                                      if current.get(key) not in (None, value))
+                if name in buses:
+                    buses[name].update(values)
+                    for bit, own in bits.items():
+                        if bit.partition("[")[0] == name:
+                            own.update(values)
+                else:
+                    bits.setdefault(name, dict(buses[name.partition("[")[0]])).update(values)
+        pins = {}
+        for port in self.ports:
+            record = PortConstraint(**buses[port.name])
+            pins[port.name] = record
+            if port.lsb is not None:
+                for index in range(port.lsb, port.lsb + port.width):
+                    pins[f"{port.name}[{index}]"] = record
+        for bit, values in bits.items():
+            pins[bit] = PortConstraint(**values)
+        return pins
+
+    # -- queries -------------------------------------------------------
+
+    def pin(self, name):
+        """Effective constraint on a port or port bit, e.g. 'count[3]'"""
+        try:
+            return self.pins[name]
+        except KeyError:
+            raise KeyError(f"No port '{name}' in the constraint database") from None
+
+    def clock(self, name=None):
+        """Named clock, or the first clock defined; None when there is none"""
+        if name is not None:
+            return self.clocks[name]
+        return next(iter(self.clocks.values()), None)
+
+    def value(self, field, default=None):
+        """Last value a port constraint command assigned to field"""
+        for _, values in reversed(self.assignments):
+            for key, value in values:
+                if key == field:
+                    return value
+        return default
+
+    def false_from(self):
+        """Port names that start a false path"""
+        return frozenset(name for path in self.false_paths
+                         if path.source is not None and path.source.kind == "ports"
+                         for name in path.source.names)
+
+
+def describe(objects):
+    """Short text of a collection for reports"""
+    if objects is None:
+        return "*"
+    if objects.kind in ("ports", "clocks", "cells", "design"):
+        text = " ".join(objects.names)
+    else:
+        text = {"inputs": "all inputs", "outputs": "all outputs",
+                "registers": "all registers"}[objects.kind]
+    if objects.exclude:
+        text += " except " + " ".join(sorted(objects.exclude))
+    return text
+
+
+# ----------------------------------------------------------------------------
+# Design rules
+# ----------------------------------------------------------------------------
+
+def drive_resistance(cell_type):
+    """Output resistance (kOhm) of a cell type from its drive strength suffix"""
+    strength = re.search(r"X(\d+)$", cell_type)
+    return DRIVE_RESISTANCE / (int(strength.group(1)) if strength else 1)
+
+
+def _rule(values, limits, netlist):
+    limited = np.isfinite(limits)
+    if not limited.any():
+        return RuleCheck(None, 0, None, None)
+    worst = int(np.argmax(np.where(limited, values, -np.inf)))
+    return RuleCheck(float(limits[limited].min()), int((values[limited] > limits[limited]).sum()),
+                     float(values[worst]), netlist.net_name(worst))
+
+
+def design_rules(db, netlist, library):
+    """Max transition, fanout and capacitance of every net against the SDC
+    design rules: {rule: RuleCheck}
+
+    Net capacitance is the load pins plus wire load plus set_load on output
+    ports. Transition is the SDC clock/input transition on port-driven nets,
+    else the RC rise of the driving cell (or set_driving_cell) into it.
+    """
+    import area
+    import power  # imports sta, which imports this module
+    n = netlist
+    fanout = area.net_fanout(n).astype(np.float64)
+    capacitance = power.net_capacitance(n, library)
+    cap_limit = np.full(n.net_count, db.rules.get("max_capacitance", np.inf))
+
+    cell_type = np.frombuffer(n.cell_type, dtype=np.uint16)
+    pin_cell = np.frombuffer(n.pin_cell, dtype=np.int32)
+    type_resistance = np.array([drive_resistance(t.name) for t in n.types] or [0.0])
+    driver = np.asarray(n.net_driver)
+    resistance = np.where(driver >= 0,
+                          type_resistance[cell_type[pin_cell[np.maximum(driver, 0)]]], 0.0)
+    source = np.zeros(n.net_count)  # fixed transition at port-driven nets
+    for port in n.ports:
+        base = n.bus_base[port.bus]
+        for net in range(base, base + n.bus_width[port.bus]):
+            pin = db.pins.get(n.net_name(net))
+            if pin is None:
+                continue
+            if port.direction == "output":
+                capacitance[net] += pin.load or 0.0
+                if pin.max_capacitance is not None:
+                    cap_limit[net] = min(cap_limit[net], pin.max_capacitance)
+            elif pin.clock_source in db.clocks:
+                source[net] = db.clocks[pin.clock_source].transition
+            elif pin.driving_cell in library:
+                resistance[net] = drive_resistance(pin.driving_cell)
+            elif pin.transition is not None:
+                source[net] = pin.transition
+    transition = source + SLEW_FACTOR * resistance * capacitance
+
+    rules = db.rules
+    return {
+        "max_transition": _rule(transition, np.full(n.net_count, rules.get(
+            "max_transition", np.inf)), n),
+        "max_fanout": _rule(fanout, np.full(n.net_count, rules.get("max_fanout", np.inf)), n),
+        "max_capacitance": _rule(capacitance, cap_limit, n),
+    }
+
+
+# ----------------------------------------------------------------------------
+# Report
+# ----------------------------------------------------------------------------
+
+def _ns(value, spec=".1f", unit="ns", missing="not specified"):
+    return missing if value is None else f"{value:{spec}}{unit}"
+
+
+def _bits(port):
+    """Bit names of a port, with the middle of a wide bus elided (None)"""
+    if port.lsb is None:
+        return [port.name]
+    indices = list(range(port.lsb, port.lsb + port.width))
+    if len(indices) > LISTED_BITS + 1:
+        indices = indices[:LISTED_BITS] + [None] + indices[-1:]
+    return [None if i is None else f"{port.name}[{i}]" for i in indices]
+
+
+def _false_path_row(db, path, netlist, library):
+    """From, To, Paths, Reason of a false path (registers resolved on the netlist)"""
+    source = describe(path.source)
+    target, count, reason = describe(path.target), "-", "User exception"
+    if netlist is not None and path.source is not None and path.target is not None \
+            and path.target.kind == "registers":
+        n = netlist
+        names, pins = [], set()
+        for port in db.resolve(path.source):
+            for pin in n.fanout(n.net(port)).tolist():
+                cell = n.pin_cell[pin]
+                if n.type_of(cell).sequential:
+                    names.append(n.cell_name(cell))
+                    pins.add((n.type_of(cell).name, n.pin_name(pin)))
+        if names:
+            target = f"{os.path.commonprefix(names)}*" if len(names) > 1 else names[0]
+            target += "/" + "|".join(sorted({pin for _, pin in pins}))
+            count = str(len(names))
+            # Neither the data nor the clock pin: an asynchronous clear/preset
+            if library is not None and all(
+                    pin not in (library.cell(type_).data_pin, library.cell(type_).clock_pin)
+                    for type_, pin in pins):
+                reason = "Async reset"
+    return f"{source:<24}{target:<24}{count:<9}{reason}"
+
+
+def _percent(count, total):
+    return f"{100 * count // max(total, 1)}%"
+
+
+def report_fields(db, netlist=None, library=None, timing=None):
+    """Constraint report fields from a ConstraintDB
+
+    netlist (with library): false path fanout, clock fanout and design rule
+    checks; timing (sta.report_fields): endpoint coverage and setup/hold
+    results folded into the verdict.
+    """
+    clock = db.clock() or Clock("none", None)
+    rules = db.rules
+    inputs = [p for p in db.ports if p.direction != "output"]
+    outputs = [p for p in db.ports if p.direction != "input"]
+
+    def status(ok):
+        return "✓ MET    " if ok else "✗ MISSING"
+
+    input_max, input_min = db.value("input_delay_max"), db.value("input_delay_min")
+    output_max, output_min = db.value("output_delay_max"), db.value("output_delay_min")
+    max_capacitance = db.value("max_capacitance", rules.get("max_capacitance"))
+    max_fanout = rules.get("max_fanout")
+    rows = [
+        ("Clock Definition", bool(db.clocks), f"{clock.name}: {clock.period:.1f}ns period"),
+        ("Clock Uncertainty", bool(db.clocks), f"{clock.uncertainty:.1f}ns applied"),
+        ("Input Delay", input_max is not None, "not specified" if input_max is None else
+         f"{_ns(input_max)} max, {_ns(input_min)} min"),
+        ("Output Delay", output_max is not None, "not specified" if output_max is None else
+         f"{_ns(output_max)} max, {_ns(output_min)} min"),
+        ("Max Transition", "max_transition" in rules,
+         _ns(rules.get("max_transition"), ".1f", "ns limit")),
+        ("Max Fanout", max_fanout is not None, _ns(max_fanout, "g", " limit")),
+        ("Max Capacitance", max_capacitance is not None,
+         _ns(max_capacitance, ".1f", "pF limit")),
+    ]
+    constraint_status = "\n".join(f"{name:<29}{status(ok)} {detail}"
+                                  for name, ok, detail in rows)
+
+    def row(bits, widths, columns):
+        lines = []
+        for bit in bits:
+            if bit is None:
+                lines.append("...")
+                continue
+            text = f"{bit:<{widths[0]}}"
+            for width, value in zip(widths[1:], columns(db.pin(bit))):
+                text += f"{'-' if value is None else value:<{width}}" \
+                    if value is None or isinstance(value, str) else f"{value:<{width}.2f}"
+            lines.append(text.rstrip())
+        return lines
+
+    input_rows, output_rows = [], []
+    covered_inputs = covered_outputs = total_inputs = total_outputs = 0
+    for port in inputs:
+        bits = db.pin(port.name)
+        total_inputs += port.width
+        if bits.clock_source is not None or bits.input_delay_max is not None:
+            covered_inputs += port.width
+        if bits.clock_source is None:
+            input_rows += row(_bits(port), (12, 13, 13, 14, 0),
+                              lambda p: (p.input_delay_max, p.input_delay_min,
+                                         p.transition, p.driving_cell))
+    for port in outputs:
+        bits = db.pin(port.name)
+        total_outputs += port.width
+        if bits.output_delay_max is not None:
+            covered_outputs += port.width
+        output_rows += row(_bits(port), (14, 13, 13, 0),
+                           lambda p: (p.output_delay_max, p.output_delay_min, p.load))
+
+    def coverage(covered, total):
+        return f"{100 * covered // max(total, 1)}% ({covered}/{total})"
+
+    false_paths = [_false_path_row(db, path, netlist, library) for path in db.false_paths]
+    complete = bool(db.clocks) and covered_inputs == total_inputs \
+        and covered_outputs == total_outputs
+    checks = [
+        (complete, "All required constraints applied"),
+        (not db.conflicts, "No conflicting constraints" if not db.conflicts else
+         "Conflicting: " + " ".join(sorted(f"{p}:{f}" for p, f in db.conflicts))),
+        (all(ok for _, ok, _ in rows), "No missing constraints"),
+        (not db.unmatched, "No unmatched objects" if not db.unmatched else
+         "Unmatched objects: " + " ".join(sorted(db.unmatched))),
+        (bool(db.clocks), "Clock properly defined"),
+        (covered_inputs == total_inputs and covered_outputs == total_outputs,
+         "I/O properly constrained"),
+    ]
+    constrained = all(ok for ok, _ in checks)
+
+    rule_fields = {}
+    details = {"transition": "Worst {worst:.2f}ns ({net})",
+               "fanout": "Max fanout = {worst:g} ({net})",
+               "capacitance": "Worst {worst:.3f}pF ({net})"}
+    drc = design_rules(db, netlist, library) if netlist is not None and library is not None \
+        else None
+    for name, detail in details.items():
+        check = drc[f"max_{name}"] if drc is not None else None
+        if check is None:
+            rule_fields[f"{name}_violations"], detail = "-", "Not checked (no netlist)"
+        elif check.limit is None:
+            rule_fields[f"{name}_violations"], detail = "-", "Not specified"
+        else:
+            rule_fields[f"{name}_violations"] = check.violations
+            detail = detail.format(worst=check.worst, net=check.net)
+        rule_fields[f"{name}_detail"] = detail
+    violations = sum(check.violations for check in drc.values()) if drc is not None else 0
+    if drc is not None:
+        checks.append((violations == 0, "Design rules satisfied" if violations == 0 else
+                       f"Design rule violations: {violations}"))
+    clock_fanout = "-"
+    if netlist is not None and clock.port in netlist.bus_index:
+        n = netlist
+        clock_fanout = sum(n.type_of(n.pin_cell[pin]).sequential
+                           for pin in n.fanout(n.net(clock.port)).tolist())
+
+    paths = dict.fromkeys(("constrained_paths", "unconstrained_paths", "overconstrained_paths",
+                           "hold_paths_covered"), "-")
+    if timing is not None:
+        endpoints = timing['endpoints']
+        unconstrained = endpoints - timing['constrained_endpoints']
+        overconstrained = timing['overconstrained_endpoints']
+        paths.update(constrained_paths=_percent(endpoints - unconstrained, endpoints),
+                     unconstrained_paths=_percent(unconstrained, endpoints),
+                     overconstrained_paths=_percent(overconstrained, endpoints),
+                     hold_paths_covered=_percent(timing['hold_constrained_endpoints'],
+                                                 endpoints))
+        checks += [
+            (unconstrained == 0, "All paths properly constrained" if unconstrained == 0 else
+             f"Unconstrained endpoints: {unconstrained}"),
+            (overconstrained == 0, "No over-constrained paths" if overconstrained == 0 else
+             f"Over-constrained endpoints: {overconstrained}"),
+            (timing['failing_endpoints'] == 0, "Setup and hold timing met"
+             if timing['failing_endpoints'] == 0 else
+             f"Timing violated at {timing['failing_endpoints']} endpoints "
+             f"(setup {timing['setup_failing']}, hold {timing['hold_failing']})"),
+        ]
+    failed = sum(not ok for ok, _ in checks)
+    if not failed:
+        verdict = "ALL CONSTRAINTS MET ✓"
+        conclusion = ("Design is fully constrained and meets all requirements.\n"
+                      "Ready for physical implementation.")
+    elif not constrained:
+        verdict = "INCOMPLETE CONSTRAINTS ✗"
+        conclusion = "Complete the SDC before physical implementation."
+    else:
+        verdict = "CONSTRAINTS VIOLATED ✗"
+        conclusion = (f"{failed} of {len(checks)} checks failed; "
+                      f"resolve them before physical implementation.")
+    return {
+        'constraint_status': constraint_status,
+        'sdc_clock': clock.name,
+        'sdc_period': clock.period,
+        'sdc_frequency': 1000 / clock.period,
+        'clock_uncertainty': clock.uncertainty,
+        'source_latency': clock.source_latency,
+        'network_latency': clock.network_latency,
+        'clock_transition': clock.transition,
+        'max_transition': _ns(rules.get("max_transition"), ".1f", " ns", "N/A"),
+        'max_fanout': _ns(max_fanout, "g", "", "N/A"),
+        'max_capacitance': _ns(max_capacitance, ".1f", " pF", "N/A"),
+        'input_constraints': "\n".join(input_rows),
+        'output_constraints': "\n".join(output_rows),
+        'input_coverage': coverage(covered_inputs, total_inputs),
+        'output_coverage': coverage(covered_outputs, total_outputs),
+        'false_path_rows': "\n".join(false_paths) or "(none)",
+        'false_path_count': len(db.false_paths),
+        'multicycle_count': db.exceptions["set_multicycle_path"],
+        'case_analysis_count': db.exceptions["set_case_analysis"],
+        'clock_group_count': db.exceptions["set_clock_groups"],
+        'disabled_arc_count': db.exceptions["set_disable_timing"],
+        'design_rule_violations': violations,
+        'constraints_complete': constrained,
+        'design_rule_conclusion': ("All design rules are satisfied ✓" if violations == 0 else
+                                   f"{violations} design rule violations ✗"),
+        'clock_fanout': clock_fanout,
+        'constraint_checks': "\n".join(f"[{'✓' if ok else '✗'}] {text}" for ok, text in checks),
+        'constraint_verdict': verdict,
+        'constraint_conclusion': conclusion,
+        **rule_fields,
+        **paths,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SDC constraint database")
+    parser.add_argument("sdc", nargs="?", default=DEFAULT_SDC)
+    parser.add_argument("--width", type=int, default=32,
+                        help="WIDTH of the generated counter whose ports are indexed")
+    parser.add_argument("--period", type=float, default=None,
+                        help=f"bind ${PERIOD_VARIABLE} (ns)")
+    parser.add_argument("--pin", action="append", default=[],
+                        help="print the effective constraint on a port or bit")
+    args = parser.parse_args(argv)
+
+    import liberty
+    import netlist_gen
+    variables = {PERIOD_VARIABLE: args.period} if args.period is not None else None
+    netlist = netlist_gen.build_counter(args.width)
+    db = load(args.sdc, netlist_ports(netlist), variables)
+    for clock in db.clocks.values():
+        print(f"clock {clock.name} on {clock.port}: period {clock.period:g} ns, "
+              f"uncertainty {clock.uncertainty:g} ns, latency "
+              f"{clock.source_latency:g}+{clock.network_latency:g} ns")
+    print(f"{len(db.assignments)} port constraints, {len(db.false_paths)} false paths, "
+          f"{len(db.pins)} indexed ports/bits")
+    if db.rules:
+        print("rules: " + ", ".join(f"{k}={v}" for k, v in db.rules.items()))
+    for rule, check in design_rules(db, netlist, liberty.load_library()).items():
+        if check.limit is not None:
+            print(f"{rule} {check.limit:g}: {check.violations} violations, "
+                  f"worst {check.worst:.3g} ({check.net})")
+    if db.ignored:
+        print("not interpreted: " + ", ".join(f"{k} ({v})" for k, v in db.ignored.items()))
+    for name in args.pin:
+        pin = db.pin(name)
+        print(f"{name}: " + ", ".join(f"{k}={v}" for k, v in pin._asdict().items()
+                                      if v is not None))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,882 @@
+#!/usr/bin/env python3
+# ============================================================================
+# STA - Incremental static timing analysis over a netlist_db.Netlist
+# ============================================================================
+# Purpose: Propagate arrival and required times through the levelized
+#          netlist with per-cell delays from the Liberty library, check
+#          setup/hold at every endpoint against the SDC clock, and keep the
+#          result current under what-if edits:
+#            - cell delay change   re-propagates only the affected cones
+#            - period/uncertainty  O(1); WNS/TNS/failing endpoints come
+#                                  from sorted endpoint margins by bisection
+#            - period-derived I/O  SDC delays written in $clk_period are
+#              delays              parsed once as lines in the period; a
+#                                  period change is an O(endpoints) update
+#                                  of the input- and register-launched
+#                                  endpoint arrivals
+# Usage:   python sta.py [netlist.v] [--width W] [--sweep START:STOP:STEP]
+# ============================================================================
+
+import argparse
+import time
+from collections import Counter, namedtuple
+from heapq import heapify, heappop, heappush
+from math import isfinite
+
+import numpy as np
+
+import liberty
+import sdc
+
+DEFAULT_SDC = "../syn/constraints/counter_32bit.sdc"
+
+# Path points listed in full before the middle of a path is elided
+MAX_PATH_POINTS = 40
+
+# Paths listed in the critical path summary, and at most this many per endpoint
+MAX_SUMMARY_PATHS = 10
+PATHS_PER_ENDPOINT = 3
+
+# Clock periods (ns) the SDC is evaluated at to fit its I/O delays as lines
+# in the period; the last point checks that they are
+PERIOD_SAMPLES = (1.0, 2.0, 4.0)
+
+IO_DELAYS = ("input_delay_max", "input_delay_min", "output_delay_max", "output_delay_min")
+
+# Bins of the endpoint slack histogram and width of its largest bar
+HISTOGRAM_BINS = 10
+HISTOGRAM_BAR = 40
+
+Constraints = namedtuple(
+    "Constraints",
+    "clock_name clock_port period uncertainty latency input_delay_max input_delay_min "
+    "output_delay_max output_delay_min false_from",
+    defaults=("clk", "clk", 10.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, frozenset()))
+
+Endpoint = namedtuple("Endpoint", "net cell name setup hold")
+PathPoint = namedtuple("PathPoint", "point incr time")
+TimingPath = namedtuple("TimingPath", "slack endpoint start cells")
+
+
+# ----------------------------------------------------------------------------
+# SDC
+# ----------------------------------------------------------------------------
+
+def read_sdc(path, variables=None):
+    """Clock, I/O delay and false-path constraints of an SDC file
+
+    The timing engine applies one input delay to every non-clock input
+    and one output delay to every output: the last values the file
+    assigns (see sdc.ConstraintDB for the per-port database).
+    """
+    db = sdc.load(path, variables=variables)
+    values = Constraints()._asdict()
+    clock = db.clock()
+    if clock is not None:
+        values.update(clock_name=clock.name, clock_port=clock.port or values["clock_port"],
+                      period=clock.period, uncertainty=clock.uncertainty,
+                      latency=clock.source_latency + clock.network_latency)
+    for field in ("input_delay_max", "input_delay_min", "output_delay_max", "output_delay_min"):
+        values[field] = db.value(field, values[field])
+    values["false_from"] = db.false_from()
+    return Constraints(**values)
+
+
+def _io_lines(path):
+    """{I/O delay field: (offset, slope)} of an SDC file's delays as lines in
+    the clock period, or {} when a delay is not linear in it"""
+    samples = [read_sdc(path, {sdc.PERIOD_VARIABLE: period}) for period in PERIOD_SAMPLES]
+    (p0, p1, p2), lines = PERIOD_SAMPLES, {}
+    for field in IO_DELAYS:
+        v0, v1, v2 = (getattr(c, field) for c in samples)
+        slope = (v1 - v0) / (p1 - p0)
+        if not np.isclose(v0 + slope * (p2 - p0), v2):
+            return {}
+        lines[field] = (v0 - slope * p0, slope)
+    return lines
+
+
+# ----------------------------------------------------------------------------
+# Timing engine
+# ----------------------------------------------------------------------------
+
+def cell_connections(netlist):
+    """(sequential, output net, input nets) of every cell
+
+    Input nets are padded to the widest cell by repeating the last input,
+    which leaves max/min over a row unchanged.
+    """
+    n = netlist
+    for cell_type in n.types:
+        if cell_type.outputs != 1:
+            raise ValueError(f"{cell_type.name}: only single-output cells are supported")
+    if n.net_driver is None:
+        n.build_index()
+    cell_type = np.frombuffer(n.cell_type, dtype=np.uint16)
+    starts = np.frombuffer(n.cell_pin_start, dtype=np.int32)
+    pin_net = np.frombuffer(n.pin_net, dtype=np.int32)
+    sequential = np.array([t.sequential for t in n.types] or [False])[cell_type]
+    inputs = np.array([t.inputs for t in n.types] or [0], dtype=np.int32)[cell_type]
+    out_net = pin_net[starts[1:] - 1]
+    width = int(inputs.max()) if len(inputs) else 1
+    columns = np.minimum(np.arange(width), np.maximum(inputs, 1)[:, None] - 1)
+    return sequential, out_net, pin_net[starts[:-1, None] + columns]
+
+
+def levelize(netlist, in_nets, sequential):
+    """(level per cell, cells of each level) of the combinational cells
+
+    Topological levels by a NumPy frontier sweep; flip-flops and ports
+    start the graph and have level -1.
+    """
+    n = netlist
+    cells = len(sequential)
+    pin_cell = np.frombuffer(n.pin_cell, dtype=np.int32)
+    combinational = np.flatnonzero(~sequential)
+    dst = np.repeat(combinational, in_nets.shape[1])
+    driver = n.net_driver[in_nets[combinational].ravel()]
+    src = np.where(driver >= 0, pin_cell[np.maximum(driver, 0)], -1)
+    keep = (src >= 0) & ~sequential[np.maximum(src, 0)]
+    src, dst = src[keep], dst[keep]
+
+    indegree = np.bincount(dst, minlength=cells)
+    order = np.argsort(src, kind="stable")
+    targets = dst[order]
+    out_start = np.zeros(cells + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=cells), out=out_start[1:])
+
+    level = np.full(cells, -1, dtype=np.int32)
+    levels = []
+    frontier = combinational[indegree[combinational] == 0]
+    while frontier.size:
+        level[frontier] = len(levels)
+        levels.append(frontier)
+        counts = out_start[frontier + 1] - out_start[frontier]
+        total = int(counts.sum())
+        if not total:
+            break
+        offsets = np.repeat(out_start[frontier] - np.cumsum(counts) + counts, counts)
+        reached, hits = np.unique(targets[offsets + np.arange(total)], return_counts=True)
+        indegree[reached] -= hits
+        frontier = reached[indegree[reached] == 0]
+
+    looped = combinational[level[combinational] < 0]
+    if looped.size:
+        raise ValueError(f"Combinational loop through {n.cell_name(int(looped[0]))}")
+    return level, levels
+
+
+class TimingEngine:
+    """Setup/hold timing of a flat netlist under one clock
+
+    Arrival times are absolute (ns from the launching clock edge, clock
+    latency included). Required times are stored without the clock period
+    and uncertainty, so slack(period) = period - uncertainty + margin and
+    period/uncertainty what-ifs never touch the graph. Given the SDC file,
+    set_period also moves I/O delays written in $clk_period: every endpoint
+    arrival is the worse of a register-launched term and an input-launched
+    term offset by the input delay, so only the endpoint margins are
+    updated, and the net arrival/required times are re-propagated on the
+    next path query.
+    """
+
+    def __init__(self, netlist, constraints, delays=None, derate=1.0, library=None,
+                 sdc_path=None):
+        n = netlist
+        if n.net_driver is None:
+            n.build_index()
+        self.netlist = n
+        self.constraints = constraints
+        self.sdc_path = sdc_path
+        self.period = constraints.period
+        self.uncertainty = constraints.uncertainty
+        self.derate = derate  # corner scaling of cell delays and library checks
+        self.library = library or liberty.load_library()
+
+        cell_type = np.frombuffer(n.cell_type, dtype=np.uint16)
+        starts = np.frombuffer(n.cell_pin_start, dtype=np.int32)
+        self.pin_net = np.frombuffer(n.pin_net, dtype=np.int32)
+        self.pin_cell = np.frombuffer(n.pin_cell, dtype=np.int32)
+
+        # Cell delays from the library (worst arc; CK->Q for flip-flops) unless overridden
+        delays = delays or {}
+        type_delay = np.array([delays.get(t.name, self.library.cell(t.name).delay)
+                               for t in n.types] or [0.0])
+        self.delay = type_delay[cell_type].astype(np.float64) * derate
+        self.sequential, self.out_net, self.in_nets = cell_connections(n)
+
+        # Combinational cell driving each net; -1 at startpoints (ports, flip-flops)
+        driver = np.where(n.net_driver >= 0, self.pin_cell[np.maximum(n.net_driver, 0)], -1)
+        driver[self.sequential[np.maximum(driver, 0)] & (driver >= 0)] = -1
+        self.net_cell = driver
+
+        self.level, self.levels = levelize(n, self.in_nets, self.sequential)
+        self._endpoints(cell_type, starts)
+        self._io_lines = _io_lines(sdc_path) if sdc_path is not None else None
+        self._launch = None
+        self.analyze()
+
+    # -- graph ---------------------------------------------------------
+
+    def _endpoints(self, cell_type, starts):
+        """Start values of the timing graph and the setup/hold endpoints"""
+        n, c = self.netlist, self.constraints
+        latency = c.latency
+        self.start_max = np.full(n.net_count, -np.inf)
+        self.start_min = np.full(n.net_count, np.inf)
+        endpoints, library = [], []
+        self.input_nets, self.output_endpoints = [], []
+        for port in n.ports:
+            name = n.bus_names[port.bus]
+            base, width = n.bus_base[port.bus], n.bus_width[port.bus]
+            nets = range(base, base + width)
+            if port.direction == "input":
+                if name == c.clock_port or name in c.false_from:
+                    continue  # ideal clock / untimed (e.g. asynchronous reset)
+                self.start_max[base:base + width] = latency + c.input_delay_max
+                self.start_min[base:base + width] = latency + c.input_delay_min
+                self.input_nets.extend(nets)
+            elif port.direction == "output":
+                for net in nets:
+                    self.output_endpoints.append(len(endpoints))
+                    endpoints.append(Endpoint(net, -1, n.net_name(net),
+                                              latency - c.output_delay_max,
+                                              latency - c.output_delay_min))
+                    library.append((0.0, 0.0))
+
+        for cell in np.flatnonzero(self.sequential).tolist():
+            type_ = n.type_of(cell)
+            lib_cell = self.library.cell(type_.name)
+            net = int(self.pin_net[starts[cell] + type_.pins.index(lib_cell.data_pin)])
+            setup, hold = lib_cell.setup, lib_cell.hold
+            endpoints.append(Endpoint(net, cell, n.cell_name(cell),
+                                      latency - setup * self.derate,
+                                      latency + hold * self.derate))
+            library.append((setup, hold))
+
+        self.endpoints = endpoints
+        self.endpoint_net = np.array([e.net for e in endpoints], dtype=np.int64)
+        self.endpoint_setup = np.array([e.setup for e in endpoints])
+        self.endpoint_hold = np.array([e.hold for e in endpoints])
+        # Underated library setup/hold times (0 at output ports), for corner scaling
+        self.endpoint_library = np.array(library).reshape(-1, 2)
+        self.endpoints_of = {}
+        for index, endpoint in enumerate(endpoints):
+            self.endpoints_of.setdefault(endpoint.net, []).append(index)
+
+    # -- full analysis -------------------------------------------------
+
+    def analyze(self):
+        """Full forward (arrival) and backward (required) propagation"""
+        arrival_max, arrival_min = self.start_max.copy(), self.start_min.copy()
+        flops = np.flatnonzero(self.sequential)
+        launch = self.constraints.latency + self.delay[flops]
+        arrival_max[self.out_net[flops]] = launch
+        arrival_min[self.out_net[flops]] = launch
+        self._propagate(arrival_max, arrival_min)
+
+        # Required times seeded by the endpoints on each net
+        n = self.netlist
+        self.end_required = np.full(n.net_count, np.inf)
+        self.end_hold = np.full(n.net_count, -np.inf)
+        np.minimum.at(self.end_required, self.endpoint_net, self.endpoint_setup)
+        np.maximum.at(self.end_hold, self.endpoint_net, self.endpoint_hold)
+        required, hold = self.end_required.copy(), self.end_hold.copy()
+        fanin = self.in_nets.shape[1]
+        for cells in reversed(self.levels):
+            ins = self.in_nets[cells].ravel()
+            out, delay = self.out_net[cells], self.delay[cells]
+            np.minimum.at(required, ins, np.repeat(required[out] - delay, fanin))
+            np.maximum.at(hold, ins, np.repeat(hold[out] - delay, fanin))
+
+        self.arrival_max, self.arrival_min = arrival_max, arrival_min
+        self.required, self.hold_required = required, hold
+        self.setup_margin = self.endpoint_setup - arrival_max[self.endpoint_net]
+        self.hold_margin = arrival_min[self.endpoint_net] - self.endpoint_hold
+        self._sorted = None
+        self._stale = False
+
+    def _propagate(self, arrival_max, arrival_min):
+        """Forward arrival times through the levels, in place"""
+        for cells in self.levels:
+            ins, delay = self.in_nets[cells], self.delay[cells]
+            arrival_max[self.out_net[cells]] = arrival_max[ins].max(axis=1) + delay
+            arrival_min[self.out_net[cells]] = arrival_min[ins].min(axis=1) + delay
+
+    def _refresh(self):
+        """Re-propagate the net times after endpoint-only I/O delay updates"""
+        if self._stale:
+            self.analyze()
+
+    def _launch_terms(self):
+        """Endpoint arrivals (max, min) launched by the registers, and the
+        path delays (max, min) from the timed inputs, input delay excluded"""
+        if self._launch is None:
+            n, latency = self.netlist, self.constraints.latency
+            flops = np.flatnonzero(self.sequential)
+            terms = []
+            for seeds, value in ((self.out_net[flops], latency + self.delay[flops]),
+                                 (self.input_nets, 0.0)):
+                arrival_max = np.full(n.net_count, -np.inf)
+                arrival_min = np.full(n.net_count, np.inf)
+                arrival_max[seeds] = arrival_min[seeds] = value
+                self._propagate(arrival_max, arrival_min)
+                terms += [arrival_max[self.endpoint_net], arrival_min[self.endpoint_net]]
+            self._launch = tuple(terms)
+        return self._launch
+
+    def corners(self, derates):
+        """Setup/hold summary at N delay derates in one vectorized pass
+
+        Arrival times carry a trailing corner axis, so each level costs the
+        same number of NumPy calls as a single-corner pass. Returns a dict of
+        (N,) arrays: setup_slack/tns/failing and hold_slack/hold_tns/hold_failing.
+        """
+        scale = np.asarray(derates, dtype=np.float64) / self.derate
+        corners = len(scale)
+        delay = self.delay[:, None] * scale
+        arrival_max = np.repeat(self.start_max[:, None], corners, axis=1)
+        arrival_min = np.repeat(self.start_min[:, None], corners, axis=1)
+        flops = np.flatnonzero(self.sequential)
+        launch = self.constraints.latency + delay[flops]
+        arrival_max[self.out_net[flops]] = launch
+        arrival_min[self.out_net[flops]] = launch
+        for cells in self.levels:
+            ins, cell_delay = self.in_nets[cells], delay[cells]
+            arrival_max[self.out_net[cells]] = arrival_max[ins].max(axis=1) + cell_delay
+            arrival_min[self.out_net[cells]] = arrival_min[ins].min(axis=1) + cell_delay
+
+        # Library checks scale with the corner; I/O constraints do not
+        setup_time, hold_time = self.endpoint_library[:, :1], self.endpoint_library[:, 1:]
+        required = (self.endpoint_setup[:, None] + setup_time * self.derate
+                    - setup_time * self.derate * scale)
+        hold_required = (self.endpoint_hold[:, None] - hold_time * self.derate
+                         + hold_time * self.derate * scale)
+        setup = self.period - self.uncertainty + required - arrival_max[self.endpoint_net]
+        hold = arrival_min[self.endpoint_net] - hold_required - self.uncertainty
+        result = {}
+        for name, slack in (("setup", setup), ("hold", hold)):
+            slack = np.where(np.isfinite(slack), slack, np.inf)
+            negative = np.minimum(slack, 0.0)
+            prefix = "" if name == "setup" else "hold_"
+            result[f"{name}_slack"] = slack.min(axis=0) if len(slack) else np.full(corners, np.inf)
+            result[f"{prefix}tns"] = negative.sum(axis=0)
+            result[f"{prefix}failing"] = (slack < 0).sum(axis=0)
+        return result
+
+    # -- incremental updates -------------------------------------------
+
+    def set_period(self, period):
+        """Change the clock period; with the SDC file, I/O delays follow it"""
+        self.period = period
+        if self._io_lines is None:
+            return
+        if self._io_lines:
+            self.set_io_delays(self.constraints._replace(
+                **{f: offset + slope * period for f, (offset, slope) in self._io_lines.items()}))
+        else:  # not linear in the period: evaluate the SDC at this one
+            self.set_io_delays(read_sdc(self.sdc_path, {sdc.PERIOD_VARIABLE: period}))
+
+    def set_io_delays(self, constraints):
+        """Take the input/output delays of constraints
+
+        An O(endpoints) update of the endpoint margins from the register-
+        and input-launched arrivals; the net arrival/required times are
+        re-propagated on the next query that reads them.
+        """
+        c = self.constraints
+        if all(getattr(c, f) == getattr(constraints, f) for f in IO_DELAYS):
+            return
+        self.constraints = c = c._replace(**{f: getattr(constraints, f) for f in IO_DELAYS})
+        inputs, outputs = self.input_nets, self.output_endpoints
+        self.start_max[inputs] = c.latency + c.input_delay_max
+        self.start_min[inputs] = c.latency + c.input_delay_min
+        self.endpoint_setup[outputs] = c.latency - c.output_delay_max
+        self.endpoint_hold[outputs] = c.latency - c.output_delay_min
+        register_max, register_min, input_max, input_min = self._launch_terms()
+        arrival_max = np.maximum(register_max, c.latency + c.input_delay_max + input_max)
+        arrival_min = np.minimum(register_min, c.latency + c.input_delay_min + input_min)
+        self.setup_margin = self.endpoint_setup - arrival_max
+        self.hold_margin = arrival_min - self.endpoint_hold
+        self._sorted = None
+        self._stale = True
+
+    def set_uncertainty(self, uncertainty):
+        self.uncertainty = uncertainty
+
+    def set_cell_delay(self, cell, delay):
+        """Change one cell delay and re-propagate only its fanout/fanin cones"""
+        if self.delay[cell] == delay:
+            return
+        self._refresh()
+        self.delay[cell] = delay
+        self._launch = None
+        if self.sequential[cell]:
+            net = int(self.out_net[cell])
+            self.arrival_max[net] = self.arrival_min[net] = self.constraints.latency + delay
+            self._forward(self._loads(net), [net])
+        else:
+            self._forward([cell], [])
+            self._backward(set(self.in_nets[cell].tolist()))
+
+    def _loads(self, net):
+        """Combinational cells loading a net"""
+        cells = self.pin_cell[self.netlist.fanout(net)].tolist()
+        return [cell for cell in cells if self.level[cell] >= 0]
+
+    def _forward(self, cells, changed):
+        level, in_nets, out_net, delay = self.level, self.in_nets, self.out_net, self.delay
+        arrival_max, arrival_min = self.arrival_max, self.arrival_min
+        heap = [(int(level[cell]), cell) for cell in set(cells)]
+        heapify(heap)
+        queued = set(cells)
+        while heap:
+            _, cell = heappop(heap)
+            ins = in_nets[cell]
+            net = int(out_net[cell])
+            new_max = arrival_max[ins].max() + delay[cell]
+            new_min = arrival_min[ins].min() + delay[cell]
+            if new_max == arrival_max[net] and new_min == arrival_min[net]:
+                continue
+            arrival_max[net], arrival_min[net] = new_max, new_min
+            changed.append(net)
+            for load in self._loads(net):
+                if load not in queued:
+                    queued.add(load)
+                    heappush(heap, (int(level[load]), load))
+        self._update_margins(changed)
+
+    def _backward(self, nets):
+        n, level, in_nets, out_net, delay = (self.netlist, self.level, self.in_nets,
+                                             self.out_net, self.delay)
+        required, hold = self.required, self.hold_required
+
+        def driver_level(net):
+            pin = n.net_driver[net]
+            return -1 if pin < 0 else int(level[self.pin_cell[pin]])
+
+        heap = [(-driver_level(net), net) for net in nets]
+        heapify(heap)
+        queued = set(nets)
+        while heap:
+            _, net = heappop(heap)
+            queued.discard(net)
+            new_required, new_hold = self.end_required[net], self.end_hold[net]
+            for load in self._loads(net):
+                out = out_net[load]
+                new_required = min(new_required, required[out] - delay[load])
+                new_hold = max(new_hold, hold[out] - delay[load])
+            if new_required == required[net] and new_hold == hold[net]:
+                continue
+            required[net], hold[net] = new_required, new_hold
+            pin = n.net_driver[net]
+            if pin >= 0 and level[self.pin_cell[pin]] >= 0:
+                for fanin in in_nets[self.pin_cell[pin]].tolist():
+                    if fanin not in queued:
+                        queued.add(fanin)
+                        heappush(heap, (-driver_level(fanin), fanin))
+
+    def _update_margins(self, nets):
+        for net in nets:
+            for index in self.endpoints_of.get(net, ()):
+                self.setup_margin[index] = self.endpoint_setup[index] - self.arrival_max[net]
+                self.hold_margin[index] = self.arrival_min[net] - self.endpoint_hold[index]
+                self._sorted = None
+
+    # -- queries -------------------------------------------------------
+
+    def _margins(self):
+        """Sorted setup/hold margins with prefix sums (rebuilt after edits)"""
+        if self._sorted is None:
+            setup, hold = np.sort(self.setup_margin), np.sort(self.hold_margin)
+            self._sorted = (setup, np.concatenate(([0.0], np.cumsum(setup))),
+                            hold, np.concatenate(([0.0], np.cumsum(hold))))
+        return self._sorted
+
+    def _summary(self, hold):
+        setup, setup_sum, hold_sorted, hold_sum = self._margins()
+        if hold:
+            margins, prefix, shift = hold_sorted, hold_sum, -self.uncertainty
+        else:
+            margins, prefix, shift = setup, setup_sum, self.period - self.uncertainty
+        failing = int(np.searchsorted(margins, -shift))
+        worst = float(margins[0] + shift) if len(margins) else float("inf")
+        return worst, float(prefix[failing] + failing * shift), failing
+
+    def worst_slack(self, hold=False):
+        return self._summary(hold)[0]
+
+    def wns(self, hold=False):
+        """Worst negative slack (0 when every endpoint meets timing)"""
+        return min(0.0, self._summary(hold)[0])
+
+    def tns(self, hold=False):
+        """Total negative slack over the endpoints"""
+        return self._summary(hold)[1]
+
+    def failing_endpoints(self, hold=False):
+        return self._summary(hold)[2]
+
+    def constrained_endpoints(self, hold=False):
+        """Endpoints reached from a timed startpoint (finite margin)"""
+        margins = self.hold_margin if hold else self.setup_margin
+        return int(np.isfinite(margins).sum())
+
+    def overconstrained_endpoints(self):
+        """Endpoints failing setup even with zero cell delays: the I/O delays,
+        period, uncertainty and library setup time alone leave no slack"""
+        arrival = self.start_max.copy()
+        arrival[self.out_net[self.sequential]] = self.constraints.latency
+        for cells in self.levels:
+            arrival[self.out_net[cells]] = arrival[self.in_nets[cells]].max(axis=1)
+        slack = self.period - self.uncertainty + self.endpoint_setup - arrival[self.endpoint_net]
+        return int((slack < 0).sum())
+
+    def endpoint_slack(self, index, hold=False):
+        if hold:
+            return float(self.hold_margin[index]) - self.uncertainty
+        return self.period - self.uncertainty + float(self.setup_margin[index])
+
+    def slack(self, net):
+        """Setup slack of a net"""
+        self._refresh()
+        return self.period - self.uncertainty + float(self.required[net] - self.arrival_max[net])
+
+    def worst_endpoints(self, count, hold=False):
+        """Indices of the count endpoints with the least slack"""
+        margins = self.hold_margin if hold else self.setup_margin
+        return np.argsort(margins, kind="stable")[:count].tolist()
+
+    # -- paths ---------------------------------------------------------
+
+    def _startpoint(self, net):
+        """(name, description, launch cell or -1) of the start of a path"""
+        n = self.netlist
+        pin = n.net_driver[net]
+        if pin >= 0:
+            cell = int(self.pin_cell[pin])
+            return n.cell_name(cell), "rising edge-triggered flip-flop", cell
+        return n.net_name(net), "input port", -1
+
+    def critical_path(self, index, hold=False):
+        """Worst path into an endpoint: (start net, [cells along the path])"""
+        self._refresh()
+        n = self.netlist
+        arrival = self.arrival_min if hold else self.arrival_max
+        pick = np.argmin if hold else np.argmax
+        net = self.endpoints[index].net
+        cells = []
+        while True:
+            pin = n.net_driver[net]
+            if pin < 0 or self.sequential[self.pin_cell[pin]]:
+                return net, cells[::-1]
+            cell = int(self.pin_cell[pin])
+            cells.append(cell)
+            ins = self.in_nets[cell]
+            net = int(ins[pick(arrival[ins])])
+
+    def worst_paths(self, count, per_endpoint=None, hold=False):
+        """Yield the count worst paths in slack order, per_endpoint at most per endpoint
+
+        Best-first search backwards from the endpoints: a heap entry is a
+        path suffix (net -> endpoint) keyed by the margin of its worst
+        completion, which the arrival times give exactly, so paths pop in
+        slack order without enumerating the rest. The frontier is trimmed
+        to the entries that can still yield one of the remaining paths,
+        so it holds O(count) entries however many paths the graph has.
+        """
+        self._refresh()
+        arrival = self.arrival_min if hold else self.arrival_max
+        net_cell, in_nets, delay = self.net_cell, self.in_nets, self.delay
+        shift = -self.uncertainty if hold else self.period - self.uncertainty
+        limit = per_endpoint or count
+        found = Counter()
+        heap = []
+        for index in self.worst_endpoints(count, hold):
+            margin = float(self.hold_margin[index] if hold else self.setup_margin[index])
+            if np.isfinite(margin):
+                heap.append((margin, len(heap), index, self.endpoints[index].net, 0.0, None))
+        serial = len(heap)
+        emitted = 0
+        while heap and emitted < count:
+            margin, _, index, net, suffix, chain = heappop(heap)
+            if found[index] >= limit:
+                continue
+            cell = int(net_cell[net])
+            if cell < 0:
+                cells = []
+                while chain:
+                    cell, chain = chain
+                    cells.append(cell)
+                found[index] += 1
+                emitted += 1
+                yield TimingPath(margin + shift, index, net, cells)
+                continue
+
+            suffix += float(delay[cell])
+            chain = (cell, chain)
+            endpoint = self.endpoints[index]
+            for fanin in dict.fromkeys(in_nets[cell].tolist()):
+                start = float(arrival[fanin]) + suffix
+                if isfinite(start):
+                    key = start - endpoint.hold if hold else endpoint.setup - start
+                    heappush(heap, (key, serial, index, fanin, suffix, chain))
+                    serial += 1
+            if len(heap) > 2 * (count - emitted) + 64:
+                heap = _trim(heap, count - emitted, limit, found)
+
+    def path_points(self, index, hold=False):
+        """Point/Incr/Path rows of the worst path into an endpoint"""
+        self._refresh()
+        n, c = self.netlist, self.constraints
+        arrival = self.arrival_min if hold else self.arrival_max
+        start, cells = self.critical_path(index, hold)
+        name, _, launch = self._startpoint(start)
+        points = [PathPoint(f"clock {c.clock_name} (rise edge)", 0.0, 0.0),
+                  PathPoint("clock network delay (ideal)", c.latency, c.latency)]
+        if launch >= 0:
+            type_name = n.type_of(launch).name
+            lib_cell = self.library.cell(type_name)
+            points.append(PathPoint(f"{name}/{lib_cell.clock_pin} ({type_name})", 0.0, c.latency))
+            points.append(PathPoint(f"{name}/{lib_cell.outputs[0]} ({type_name})",
+                                    float(self.delay[launch]), float(arrival[start])))
+        else:
+            delay = c.input_delay_min if hold else c.input_delay_max
+            points.append(PathPoint("input external delay", delay, float(arrival[start])))
+            points.append(PathPoint(f"{name} (in)", 0.0, float(arrival[start])))
+        for cell in cells:
+            type_ = n.type_of(cell)
+            points.append(PathPoint(f"{n.cell_name(cell)}/{type_.pins[-1]} ({type_.name})",
+                                    float(self.delay[cell]), float(arrival[self.out_net[cell]])))
+        endpoint = self.endpoints[index]
+        final = float(arrival[endpoint.net])
+        if endpoint.cell >= 0:
+            type_name = n.type_of(endpoint.cell).name
+            points.append(PathPoint(f"{endpoint.name}/{self.library.cell(type_name).data_pin} "
+                                    f"({type_name})", 0.0, final))
+        else:
+            points.append(PathPoint(f"{endpoint.name} (out)", 0.0, final))
+        return points
+
+    def format_path(self, index, hold=False):
+        """Text of the worst path into an endpoint, in report layout"""
+        n, c = self.netlist, self.constraints
+        endpoint = self.endpoints[index]
+        start, _ = self.critical_path(index, hold)
+        start_name, start_kind, _ = self._startpoint(start)
+        end_kind = "rising edge-triggered flip-flop" if endpoint.cell >= 0 else "output port"
+        rule = "-" * 72
+        lines = [f"Startpoint: {start_name} ({start_kind} clocked by {c.clock_name})",
+                 f"Endpoint:   {endpoint.name} ({end_kind} clocked by {c.clock_name})",
+                 f"Path Type:  {'min' if hold else 'max'}",
+                 "",
+                 f"{'Point':<37}{'Incr':>8}{'Path':>10}",
+                 rule]
+        points = self.path_points(index, hold)
+        if len(points) > MAX_PATH_POINTS:
+            head, tail = MAX_PATH_POINTS * 2 // 3, MAX_PATH_POINTS // 3
+            elided = len(points) - head - tail
+            rows = [_row(p) for p in points[:head]] + [f"... ({elided} more cells)"] + \
+                [_row(p) for p in points[-tail:]]
+        else:
+            rows = [_row(p) for p in points]
+        lines += rows
+        arrival = points[-1].time
+        lines.append(f"{'data arrival time':<45}{arrival:>10.2f}")
+        lines.append("")
+
+        edge = 0.0 if hold else self.period
+        capture = [PathPoint(f"clock {c.clock_name} (rise edge)", edge, edge)]
+        now = edge + c.latency
+        if endpoint.cell >= 0 or c.latency:
+            capture.append(PathPoint("clock network delay (ideal)", c.latency, now))
+        if self.uncertainty:
+            now += self.uncertainty if hold else -self.uncertainty
+            capture.append(PathPoint("clock uncertainty",
+                                     self.uncertainty if hold else -self.uncertainty, now))
+        if endpoint.cell >= 0:
+            type_name = n.type_of(endpoint.cell).name
+            capture.append(PathPoint(f"{endpoint.name}/{self.library.cell(type_name).clock_pin} "
+                                     f"({type_name})", 0.0, now))
+            setup, hold_time = self.endpoint_library[index]
+            check = (hold_time if hold else -setup) * self.derate
+            now += check
+            capture.append(PathPoint(f"library {'hold' if hold else 'setup'} time", check, now))
+        else:
+            check = -c.output_delay_min if hold else -c.output_delay_max
+            now += check
+            capture.append(PathPoint("output external delay", check, now))
+        lines += [_row(p) for p in capture]
+        lines.append(f"{'data required time':<45}{now:>10.2f}")
+        lines.append(rule)
+        slack = self.endpoint_slack(index, hold)
+        if hold:
+            lines.append(f"{'data arrival time':<45}{arrival:>10.2f}")
+            lines.append(f"{'data required time':<45}{-now:>10.2f}")
+        else:
+            lines.append(f"{'data required time':<45}{now:>10.2f}")
+            lines.append(f"{'data arrival time':<45}{-arrival:>10.2f}")
+        lines.append(rule)
+        lines.append(f"{'slack (MET)' if slack >= 0 else 'slack (VIOLATED)':<45}{slack:>10.2f}")
+        return "\n".join(lines)
+
+
+def _trim(heap, remaining, limit, found):
+    """Best frontier entries that can still each yield one of the remaining paths"""
+    keep, taken = [], Counter()
+    for entry in sorted(heap):
+        index = entry[2]
+        if found[index] + taken[index] < limit:
+            taken[index] += 1
+            keep.append(entry)
+            if len(keep) == remaining:
+                break
+    return keep  # sorted, hence a valid heap
+
+
+def slack_histogram(engine, bins=HISTOGRAM_BINS, hold=False):
+    """Endpoint slack histogram rows (constrained endpoints only)"""
+    margins = engine.hold_margin if hold else engine.setup_margin
+    shift = -engine.uncertainty if hold else engine.period - engine.uncertainty
+    slacks = margins[np.isfinite(margins)] + shift
+    if not len(slacks):
+        return "No constrained endpoints"
+    counts, edges = np.histogram(slacks, bins=bins)
+    scale = HISTOGRAM_BAR / max(counts.max(), 1)
+    rows = []
+    for count, low, high in zip(counts.tolist(), edges[:-1].tolist(), edges[1:].tolist()):
+        bar = "#" * max(int(round(count * scale)), 1 if count else 0)
+        rows.append(f"{low:>9.2f} .. {high:>8.2f}{count:>12}  {bar}".rstrip())
+    return "\n".join(rows)
+
+
+def _row(point):
+    return f"{point.point:<37}{point.incr:>8.2f}{point.time:>10.2f}"
+
+
+def report_fields(engine, max_paths=MAX_SUMMARY_PATHS, paths_per_endpoint=PATHS_PER_ENDPOINT):
+    """Timing report fields (clock summary, paths, totals) of an engine"""
+    c = engine.constraints
+    setup_worst = engine.worst_endpoints(1)
+    hold_worst = engine.worst_endpoints(1, hold=True)
+    rows = []
+    for kind, paths in (("setup", engine.worst_paths(max_paths, paths_per_endpoint)),
+                        ("hold", engine.worst_paths(1, hold=True))):
+        for path in paths:
+            rows.append((engine._startpoint(path.start)[0], engine.endpoints[path.endpoint].name,
+                         f"{path.slack:.2f} ns", kind))
+    for port in sorted(c.false_from):
+        rows.append((port, "*", "N/A", "false_path"))
+    summary = "\n".join(f"{i:>4}    {start:<20}{end:<20}{slack:<10}{kind}"
+                        for i, (start, end, slack, kind) in enumerate(rows, 1))
+
+    worst, tns, failing = engine._summary(hold=False)
+    hold_slack, hold_tns, hold_failing = engine._summary(hold=True)
+    met = failing == 0 and hold_slack >= 0
+    minimum_period = engine.period - worst
+    return {
+        'clock_name': c.clock_name,
+        'clock_uncertainty': engine.uncertainty,
+        'clock_latency': c.latency,
+        'setup_path': engine.format_path(setup_worst[0]) if setup_worst else
+                      "No constrained setup paths",
+        'hold_path': engine.format_path(hold_worst[0], hold=True) if hold_worst else
+                     "No constrained hold paths",
+        'path_summary': summary,
+        'slack_histogram': slack_histogram(engine),
+        'timing_status': "ALL TIMING CONSTRAINTS MET" if met else "TIMING CONSTRAINTS VIOLATED",
+        'endpoints': len(engine.endpoints),
+        'constrained_endpoints': engine.constrained_endpoints(),
+        'hold_constrained_endpoints': engine.constrained_endpoints(hold=True),
+        'overconstrained_endpoints': engine.overconstrained_endpoints(),
+        'failing_endpoints': failing + hold_failing,
+        'setup_failing': failing,
+        'hold_failing': hold_failing,
+        'setup_slack': worst,
+        'setup_status': "MET" if worst >= 0 else "VIOLATED",
+        'hold_slack': hold_slack,
+        'hold_status': "MET" if hold_slack >= 0 else "VIOLATED",
+        'wns': min(0.0, worst),
+        'tns': tns,
+        'hold_tns': hold_tns,
+        'achieved_frequency': 1000 / minimum_period,
+        'timing_margin': (f"{abs(worst) / minimum_period * 100:.1f}% "
+                          f"{'above' if worst >= 0 else 'below'} target frequency"),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Incremental static timing analysis")
+    parser.add_argument("netlist", nargs="?",
+                        help="gate-level Verilog (default: generated counter of --width)")
+    parser.add_argument("--width", type=int, default=32)
+    parser.add_argument("--sdc", default=DEFAULT_SDC)
+    parser.add_argument("--lib", default=liberty.DEFAULT_LIBRARY, help="Liberty cell library")
+    parser.add_argument("--paths", type=int, default=0, metavar="K",
+                        help="list the K worst setup paths")
+    parser.add_argument("--nworst", type=int, default=None, metavar="N",
+                        help="at most N of the listed paths per endpoint")
+    parser.add_argument("--sweep", metavar="START:STOP:STEP",
+                        help="what-if sweep of the clock period (ns)")
+    parser.add_argument("--verify", action="store_true",
+                        help="check every sweep point against a freshly built engine")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    if args.netlist:
+        import verilog_parser
+        netlist = verilog_parser.read_netlist(args.netlist)
+    else:
+        import netlist_gen
+        netlist = netlist_gen.build_counter(args.width)
+    engine = TimingEngine(netlist, read_sdc(args.sdc), library=liberty.load_library(args.lib),
+                          sdc_path=args.sdc)
+    elapsed = time.perf_counter() - started
+    print(f"{netlist.name}: {netlist.cell_count:,} cells, {len(engine.levels)} levels, "
+          f"{len(engine.endpoints):,} endpoints ({elapsed:.2f} s)")
+    print(f"Worst setup slack {engine.worst_slack():.3f} ns, TNS {engine.tns():.3f} ns, "
+          f"worst hold slack {engine.worst_slack(hold=True):.3f} ns")
+
+    if args.paths:
+        started = time.perf_counter()
+        paths = list(engine.worst_paths(args.paths, args.nworst))
+        elapsed = time.perf_counter() - started
+        print(f"\n{'Slack':>8}  {'From':<20}{'To':<20}Cells")
+        for path in paths:
+            print(f"{path.slack:>8.3f}  {engine._startpoint(path.start)[0]:<20}"
+                  f"{engine.endpoints[path.endpoint].name:<20}{len(path.cells)}")
+        print(f"\n{len(paths)} paths in {elapsed * 1e3:.1f} ms")
+
+    if args.sweep:
+        start, stop, step = (float(x) for x in args.sweep.split(":"))
+        periods = np.arange(start, stop + step / 2, step)
+        started = time.perf_counter()
+        rows = []
+        for period in periods.tolist():
+            engine.set_period(period)
+            rows.append((period, *engine._summary(hold=False)))
+        per_point = (time.perf_counter() - started) / len(periods) * 1e6
+        print(f"\n{'Period':>8}{'Worst':>10}{'TNS':>12}{'Failing':>9}")
+        for period, worst, tns, failing in rows:
+            print(f"{period:>8.2f}{worst:>10.3f}{tns:>12.3f}{failing:>9}")
+        print(f"\n{len(periods)} periods, {per_point:.1f} µs per what-if")
+        if args.verify:
+            mismatches = 0
+            for period in periods.tolist():
+                engine.set_period(period)
+                fresh = TimingEngine(netlist, read_sdc(args.sdc, {sdc.PERIOD_VARIABLE: period}),
+                                     library=engine.library)
+                fresh.set_period(period)
+                for hold in (False, True):
+                    if not np.allclose(engine._summary(hold), fresh._summary(hold)):
+                        mismatches += 1
+                        print(f"MISMATCH at {period:g} ns ({'hold' if hold else 'setup'}): "
+                              f"what-if {engine._summary(hold)}, fresh {fresh._summary(hold)}")
+            print(f"Verified {len(periods)} periods against freshly built engines: "
+                  f"{mismatches} mismatches")
+            if mismatches:
+                raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
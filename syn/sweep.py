@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# ============================================================================
+# Sweep Driver - Batch report generation over a design configuration grid
+# ============================================================================
+# Purpose: Fan a WIDTH x clock period x corner grid out across a process
+#          pool and write one report tree per configuration under
+#          syn/reports/<config>/
+# ============================================================================
+
+import itertools
+import os
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from report_engine import BatchedReportWriter
+
+SweepPoint = namedtuple("SweepPoint", "design_name width clock_period corner")
+SweepResult = namedtuple("SweepResult", "name report_dir files bytes")
+
+# Tasks kept in flight per worker; bounds memory independently of grid size
+INFLIGHT_PER_WORKER = 4
+
+
+def config_name(point):
+    """Directory name of one sweep point, e.g. counter_32bit_w32_p10_typical"""
+    return f"{point.design_name}_w{point.width}_p{point.clock_period:g}_{point.corner}"
+
+
+def iter_grid(widths, clock_periods, corners, design_name="counter_32bit"):
+    """Lazily enumerate every point of the sweep grid"""
+    for width, period, corner in itertools.product(widths, clock_periods, corners):
+        yield SweepPoint(design_name, width, period, corner)
+
+
+def run_point(point, report_root, cache=None):
+    """Render and write the report tree of a single configuration
+
+    Workers given the same flow_cache.FlowCache share its artifacts.
+    """
+    # Deferred: run_synthesis_simulation imports this module
+    from run_synthesis_simulation import SynthesisSimulator
+
+    sim = SynthesisSimulator(design_name=point.design_name,
+                             clock_period=point.clock_period,
+                             width=point.width, corner=point.corner)
+    sim.report_dir = os.path.join(report_root, config_name(point))
+    sim.cache = cache
+
+    reports = sim.render_reports(jobs=1)
+    writer = BatchedReportWriter(sim.report_dir)
+    for filename, content in reports.items():
+        writer.add(filename, content)
+    files = writer.flush()
+    size = sum(len(content) for content in reports.values())
+    return SweepResult(config_name(point), sim.report_dir, len(files), size)
+
+
+def run_sweep(points, report_root, jobs=1, cache=None):
+    """Yield a SweepResult per point as soon as it completes
+
+    points may be any iterable (typically iter_grid()); it is consumed
+    lazily so at most jobs * INFLIGHT_PER_WORKER configurations are held
+    in memory at any time.
+    """
+    points = iter(points)
+    if jobs <= 1:
+        for point in points:
+            yield run_point(point, report_root, cache)
+        return
+
+    limit = jobs * INFLIGHT_PER_WORKER
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        inflight = set()
+        for point in itertools.chain(points, [None]):
+            if point is not None:
+                inflight.add(pool.submit(run_point, point, report_root, cache))
+                if len(inflight) < limit:
+                    continue
+            # Window full (or input exhausted): drain finished tasks
+            while inflight and (point is None or len(inflight) >= limit):
+                done, inflight = wait(inflight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+
+def write_index(results, index_path):
+    """Stream sweep results into a CSV index, return the number of points"""
+    count = 0
+    with open(index_path, 'w') as f:
+        f.write("config,report_dir,files,bytes\n")
+        for result in results:
+            f.write(f"{result.name},{result.report_dir},{result.files},{result.bytes}\n")
+            count += 1
+    return count
@@ -0,0 +1,474 @@
+#!/usr/bin/env python3
+# ============================================================================
+# VCD - Streaming Value Change Dump writer and reader
+# ============================================================================
+# Purpose: Write counter_32bit waveforms from the cycle model in constant
+#          memory, and scan (multi-GB) VCD files through mmap to produce
+#          per-signal toggle statistics and the ASCII waveform report
+# Usage:   python vcd.py write counter_32bit_tb.vcd [--cycles N --enable-duty D]
+#          python vcd.py report counter_32bit_tb.vcd [--waveform FILE]
+# ============================================================================
+
+import argparse
+import mmap
+from collections import namedtuple
+
+import numpy as np
+
+import counter_model
+from waveform_report import render_waveform_report
+
+# Bytes buffered before the writer hands a chunk to the file
+DEFAULT_CHUNK_BYTES = 1 << 20
+
+# Bytes of the mapped file parsed per step by the reader
+DEFAULT_SCAN_BYTES = 16 << 20
+
+# Signals of the counter testbench: (name, width) with width None = WIDTH
+COUNTER_SIGNALS = [("clk", 1), ("rst_n", 1), ("enable", 1), ("count", None), ("overflow", 1)]
+
+VcdSignal = namedtuple("VcdSignal", "code name width")
+
+# Per-signal statistics of a VCD scan
+SignalStats = namedtuple("SignalStats", "name width changes bit_toggles")
+
+
+def _id_code(index):
+    """Printable VCD identifier code for the n-th signal"""
+    chars = []
+    index += 1
+    while index:
+        index, digit = divmod(index - 1, 94)
+        chars.append(chr(33 + digit))
+    return "".join(chars)
+
+
+class VcdWriter:
+    """Chunked VCD writer; values are buffered and flushed in large writes"""
+
+    def __init__(self, path, signals, scope="counter_32bit_tb", timescale="1ns",
+                 chunk_bytes=DEFAULT_CHUNK_BYTES, date=""):
+        self.file = open(path, 'w')
+        self.chunk_bytes = chunk_bytes
+        self.signals = {}
+        self.buffer = []
+        self.buffered = 0
+        self.time = None
+        self.bytes_written = 0
+
+        header = []
+        if date:
+            header += ["$date", f"  {date}", "$end"]
+        header += ["$version", "  counter_model.py VCD writer", "$end",
+                   f"$timescale {timescale} $end", f"$scope module {scope} $end"]
+        for index, (name, width) in enumerate(signals):
+            signal = VcdSignal(_id_code(index), name, width)
+            self.signals[name] = signal
+            ref = name if width == 1 else f"{name} [{width - 1}:0]"
+            header.append(f"$var wire {width} {signal.code} {ref} $end")
+        header += ["$upscope $end", "$enddefinitions $end", ""]
+        self._emit("\n".join(header))
+
+    def _emit(self, text):
+        self.buffer.append(text)
+        self.buffered += len(text)
+        if self.buffered >= self.chunk_bytes:
+            self.flush()
+
+    def flush(self):
+        data = "".join(self.buffer)
+        self.file.write(data)
+        self.bytes_written += len(data)
+        self.buffer = []
+        self.buffered = 0
+
+    def change(self, time, name, value):
+        """Record that signal `name` takes integer `value` at `time`"""
+        signal = self.signals[name]
+        if time != self.time:
+            if self.time is not None and time < self.time:
+                raise ValueError(f"VCD time moved backwards ({time} < {self.time})")
+            self._emit(f"#{time}\n")
+            self.time = time
+        if signal.width == 1:
+            self._emit(f"{value & 1}{signal.code}\n")
+        else:
+            self._emit(f"b{value:b} {signal.code}\n")
+
+    def write_changes(self, changes):
+        """Consume an iterable of (time, name, value) value changes"""
+        for time, name, value in changes:
+            self.change(time, name, value)
+
+    def write_text(self, fragments):
+        """Consume an iterable of pre-formatted VCD body fragments"""
+        buffer, buffered, limit = self.buffer, self.buffered, self.chunk_bytes
+        for text in fragments:
+            buffer.append(text)
+            buffered += len(text)
+            if buffered >= limit:
+                self.buffered = buffered
+                self.flush()
+                buffer, buffered = self.buffer, 0
+        self.buffered = buffered
+        self.time = None
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def counter_value_changes(codes, rst_n, enable, width=32, clk_period=10, force=None,
+                          block_cycles=counter_model.DEFAULT_BLOCK_CYCLES):
+    """Generate the VCD value changes of a simulated counter_32bit testbench
+
+    Yields one text fragment per clock cycle holding the timestamps and
+    value changes of that cycle, using the id codes in `codes` (signal name
+    -> VcdSignal). Inputs change at the start of each cycle (when clk
+    falls), the register loads on the rising edge half a period later.
+    Simulation runs block by block, so memory does not grow with the
+    stimulus length.
+    """
+    rst_n = np.asarray(rst_n, dtype=np.uint8)
+    enable = np.asarray(enable, dtype=np.uint8)
+    force = force or {}
+    mask = (1 << width) - 1
+    half = clk_period // 2
+    clk, rst_code, en_code, count_code, ovf_code = (
+        codes[name].code for name, _ in COUNTER_SIGNALS)
+    sim = counter_model.CounterArraySimulator(width, 1)
+    state_rst = state_en = state_count = state_ovf = None
+
+    for lo in range(0, len(rst_n), block_cycles):
+        hi = min(lo + block_cycles, len(rst_n))
+        rst, en = rst_n[lo:hi], enable[lo:hi]
+        block_force = {t - lo: v for t, v in force.items() if lo <= t < hi}
+        count, overflow = sim.run(rst, en, force=block_force, record=True)
+        count, overflow = count[:, 0], overflow[:, 0]
+
+        # Value loaded by each rising edge: reset loads 0, force holds
+        after = np.where(rst == 0, 0, (count + en) & np.uint64(mask))
+        for t, value in block_force.items():
+            after[t] = 0 if rst[t] == 0 else value & mask
+        after_ovf = ((after == mask) & (en != 0)).astype(np.uint8)
+
+        time = lo * clk_period
+        for r, e, c, o, n, no in zip(rst.tolist(), en.tolist(), count.tolist(),
+                                     overflow.tolist(), after.tolist(), after_ovf.tolist()):
+            text = f"#{time}\n0{clk}\n"
+            if r != state_rst:
+                text += f"{r}{rst_code}\n"
+                state_rst = r
+            if e != state_en:
+                text += f"{e}{en_code}\n"
+                state_en = e
+            if c != state_count:
+                text += f"b{c:b} {count_code}\n"
+            if o != state_ovf:
+                text += f"{o}{ovf_code}\n"
+            text += f"#{time + half}\n1{clk}\n"
+            if n != c:
+                text += f"b{n:b} {count_code}\n"
+            if no != o:
+                text += f"{no}{ovf_code}\n"
+            state_count, state_ovf = n, no
+            time += clk_period
+            yield text
+
+
+def write_counter_vcd(path, rst_n, enable, width=32, clk_period=10, force=None,
+                      chunk_bytes=DEFAULT_CHUNK_BYTES):
+    """Simulate a stimulus and stream its waveform to a VCD file
+
+    Returns the number of bytes written.
+    """
+    signals = [(name, width if w is None else w) for name, w in COUNTER_SIGNALS]
+    with VcdWriter(path, signals, chunk_bytes=chunk_bytes) as writer:
+        writer.write_text(counter_value_changes(writer.signals, rst_n, enable, width,
+                                                clk_period, force))
+        writer.flush()
+        return writer.bytes_written
+
+
+class _ChunkLines:
+    """Line layout of one newline-terminated chunk of a VCD body"""
+
+    def __init__(self, data):
+        self.data = data
+        ends = np.flatnonzero(data == 10)
+        starts = np.empty_like(ends)
+        starts[:1] = 0
+        starts[1:] = ends[:-1] + 1
+        cr = data[np.maximum(ends - 1, 0)] == 13
+        ends = ends - (cr & (ends > starts))
+        keep = ends > starts
+        self.starts, self.ends = starts[keep], ends[keep]
+        self.first = data[self.starts]
+
+
+class VcdReader:
+    """Incremental VCD parser over a memory-mapped file
+
+    Only scan_bytes of the mapping are examined at a time; the body is
+    never copied into memory as a whole.
+    """
+
+    def __init__(self, path, scan_bytes=DEFAULT_SCAN_BYTES):
+        self.path = path
+        self.scan_bytes = scan_bytes
+        self.signals = {}  # id code (bytes) -> VcdSignal
+        self.timescale = ""
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._body = self._parse_header()
+
+    def close(self):
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _parse_header(self):
+        end = self._map.find(b"$enddefinitions")
+        if end < 0:
+            raise ValueError(f"{self.path}: missing $enddefinitions")
+        tokens = self._map[:end].decode("ascii", "replace").split()
+        for i, token in enumerate(tokens):
+            if token == "$var":
+                width, code, name = int(tokens[i + 2]), tokens[i + 3], tokens[i + 4]
+                self.signals.setdefault(code.encode(), VcdSignal(code, name, width))
+            elif token == "$timescale":
+                self.timescale = tokens[i + 1]
+        return self._map.find(b"\n", end) + 1
+
+    def _chunks(self):
+        """Yield (offset, end) spans of at most ~scan_bytes ending at a newline"""
+        pos, size = self._body, len(self._map)
+        while pos < size:
+            stop = min(pos + self.scan_bytes, size)
+            if stop < size:
+                stop = self._map.rfind(b"\n", pos, stop) + 1 or size
+            yield pos, stop
+            pos = stop
+
+    def iter_changes(self):
+        """Yield (time, id code, value bytes) for every value change"""
+        time = 0
+        pending_vector = None
+        for pos, stop in self._chunks():
+            for token in self._map[pos:stop].split():
+                head = token[0]
+                if pending_vector is not None:
+                    yield time, token, pending_vector
+                    pending_vector = None
+                elif head == 35:  # '#'
+                    time = int(token[1:])
+                elif head in b"bBrR":  # value, then the id code as next token
+                    pending_vector = token[1:]
+                elif head != 36:  # skip $dumpvars / $end keywords
+                    yield time, token[1:], token[:1]
+
+    def toggle_stats(self):
+        """Per-signal value-change and per-bit toggle counts of the whole file
+
+        Each chunk is decoded with NumPy array operations over the mapped
+        bytes: line boundaries, value characters and id codes are located
+        for all lines at once, and the toggles of every signal are counted
+        from consecutive values, carrying the last value across chunks.
+        """
+        codes = list(self.signals)
+        max_code = max(len(code) for code in codes)
+        if max_code > 8:
+            raise ValueError(f"{self.path}: id codes longer than 8 characters")
+        key_of = {int.from_bytes(code, "little"): i for i, code in enumerate(codes)}
+        keys = np.array(sorted(key_of), dtype=np.uint64)
+        index_of = np.array([key_of[int(k)] for k in keys], dtype=np.int64)
+        widths = [self.signals[code].width for code in codes]
+
+        changes = np.zeros(len(codes), dtype=np.int64)
+        toggles = [np.zeros(w, dtype=np.int64) for w in widths]
+        last = [None] * len(codes)
+
+        for pos, stop in self._chunks():
+            lines = _ChunkLines(np.frombuffer(self._map, np.uint8, stop - pos, pos))
+            data, starts, ends, first = lines.data, lines.starts, lines.ends, lines.first
+
+            vector = (first == ord("b")) | (first == ord("B"))
+            scalar = np.isin(first, np.frombuffer(b"01xzXZ", np.uint8))
+
+            # Vector lines are "b<value> <code>": the code follows the last space
+            spaces = np.flatnonzero(data == 32)
+            v_starts, v_ends = starts[vector], ends[vector]
+            v_space = spaces[np.searchsorted(spaces, v_ends) - 1] if len(v_ends) else v_ends
+            code_start = np.empty_like(starts)
+            code_start[scalar] = starts[scalar] + 1
+            code_start[vector] = v_space + 1
+            selected = scalar | vector
+            code_start, code_end = code_start[selected], ends[selected]
+
+            key = np.zeros(len(code_start), dtype=np.uint64)
+            code_len = code_end - code_start
+            for k in range(max_code):
+                byte = data[np.minimum(code_start + k, len(data) - 1)].astype(np.uint64)
+                key |= np.where(k < code_len, byte, 0) << np.uint64(8 * k)
+            slot = np.minimum(np.searchsorted(keys, key), len(keys) - 1)
+            known = keys[slot] == key
+            signal = np.where(known, index_of[slot], -1)
+            changes += np.bincount(signal[known], minlength=len(codes))
+
+            is_vector = vector[selected]
+            scalar_values = first[selected]
+            for i, width in enumerate(widths):
+                mine = signal == i
+                if width == 1:
+                    values = scalar_values[mine & ~is_vector]
+                    if last[i] is not None:
+                        values = np.concatenate([last[i], values])
+                    if len(values):
+                        toggles[i][0] += np.count_nonzero(values[1:] != values[:-1])
+                        last[i] = values[-1:]
+                    continue
+                rows = mine[is_vector]
+                if not rows.any():
+                    continue
+                value_start, value_end = v_starts[rows] + 1, v_space[rows]
+                # Bound the bit matrix of wide, sparse vectors to ~scan_bytes
+                batch = max(1, self.scan_bytes // width)
+                for lo in range(0, len(value_start), batch):
+                    bits = _vector_bits(data, value_start[lo:lo + batch],
+                                        value_end[lo:lo + batch], width)
+                    if last[i] is not None:
+                        bits = np.vstack([last[i], bits])
+                    toggles[i] += np.count_nonzero(bits[1:] != bits[:-1], axis=0)
+                    last[i] = bits[-1:]
+
+        return {self.signals[code].name: SignalStats(self.signals[code].name, widths[i],
+                                                     int(changes[i]), toggles[i])
+                for i, code in enumerate(codes)}
+
+    def trace(self, cycles):
+        """Sample the counter testbench signals for the first `cycles` cycles
+
+        Samples are taken at the start of each clock cycle (after the
+        changes at time 0 and at each falling clk edge). Returns
+        (counter_model.Trace, clock period), for render_waveform_report().
+        Only the beginning of the file needed for those cycles is parsed.
+        """
+        by_name = {sig.name: code for code, sig in self.signals.items()}
+        names = ("rst_n", "enable", "count", "overflow")
+        missing = [name for name in ("clk",) + names if name not in by_name]
+        if missing:
+            raise ValueError(f"{self.path}: no signal named {', '.join(missing)}")
+        clk = by_name["clk"]
+        wanted = [by_name[name] for name in names]
+        current = dict.fromkeys(wanted, b"0")
+        samples = []
+        fall_times = []
+        cycle_start, sample_time = True, 0
+
+        for time, code, value in self.iter_changes():
+            if time != sample_time:
+                if cycle_start:
+                    samples.append([current[c] for c in wanted])
+                    if len(samples) == cycles:
+                        break
+                cycle_start, sample_time = False, time
+            if code == clk and value == b"0" and time:
+                cycle_start = True
+                fall_times.append(time)
+            if code in current:
+                current[code] = value
+        else:
+            if cycle_start and len(samples) < cycles:
+                samples.append([current[c] for c in wanted])
+
+        period = fall_times[1] - fall_times[0] if len(fall_times) > 1 else \
+            (fall_times[0] if fall_times else 1)
+        rst_n, enable, count, overflow = zip(*samples)
+        level = lambda values: np.array([v == b"1" for v in values], dtype=np.uint8)
+        return counter_model.Trace(
+            self.signals[by_name["count"]].width, level(rst_n), level(enable),
+            np.array([int(v.translate(_XZ_AS_ZERO), 2) for v in count], dtype=object),
+            level(overflow)), period
+
+
+# x/z digits of vector values are read as 0
+_XZ_AS_ZERO = bytes.maketrans(b"xXzZ", b"0000")
+
+
+def _vector_bits(data, value_start, value_end, width):
+    """Bit matrix (values x WIDTH, LSB first) of vector value digits in data"""
+    length = value_end - value_start
+    total = int(length.sum())
+    row = np.repeat(np.arange(len(length)), length)
+    offset = np.arange(total) - np.repeat(np.cumsum(length) - length, length)
+    bit = np.repeat(length, length) - 1 - offset
+    inside = bit < width
+    bits = np.zeros((len(length), width), dtype=bool)
+    bits[row[inside], bit[inside]] = \
+        data[np.repeat(value_start, length) + offset][inside] == ord("1")
+    return bits
+
+
+def toggle_report(stats):
+    """Text table of the per-signal toggle statistics of VcdReader.toggle_stats()"""
+    lines = [f"{'Signal':<24}{'Width':>7}{'Changes':>16}{'Toggles':>16}",
+             "-" * 63]
+    for sig in stats.values():
+        lines.append(f"{sig.name:<24}{sig.width:>7}{sig.changes:>16,}"
+                     f"{int(sig.bit_toggles.sum()):>16,}")
+        if sig.width > 1:
+            for bit in range(sig.width):
+                lines.append(f"{'  ' + sig.name + f'[{bit}]':<47}"
+                             f"{int(sig.bit_toggles[bit]):>16,}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Streaming VCD writer and reader")
+    sub = parser.add_subparsers(dest="command", required=True)
+    write = sub.add_parser("write", help="simulate the counter and dump a VCD")
+    write.add_argument("path")
+    write.add_argument("--width", type=int, default=32)
+    write.add_argument("--clk-period", type=int, default=10)
+    write.add_argument("--cycles", type=int, default=0,
+                       help="random-enable power stimulus of N cycles "
+                            "(default: the tb/counter_32bit_tb.v stimulus)")
+    write.add_argument("--enable-duty", type=float, default=1.0)
+    report = sub.add_parser("report", help="toggle statistics of a VCD")
+    report.add_argument("path")
+    report.add_argument("--waveform", metavar="FILE",
+                        help="also write the ASCII waveform report of the first cycles")
+    report.add_argument("--waveform-cycles", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    if args.command == "write":
+        if args.cycles:
+            rst_n, enable = counter_model.power_stimulus(args.cycles, args.enable_duty)
+            rst_n, enable, force = rst_n[:, 0], enable[:, 0], None
+        else:
+            rst_n, enable, force = counter_model.testbench_stimulus(args.width, args.clk_period)
+        size = write_counter_vcd(args.path, rst_n, enable, args.width, args.clk_period, force)
+        print(f"✓ Generated: {args.path} ({size:,} bytes, {len(rst_n):,} cycles)")
+        return
+
+    with VcdReader(args.path) as reader:
+        print(toggle_report(reader.toggle_stats()))
+        if args.waveform:
+            trace, period = reader.trace(args.waveform_cycles)
+            with open(args.waveform, 'w') as f:
+                f.write(render_waveform_report(trace, period))
+            print(f"✓ Generated: {args.waveform}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,492 @@
+#!/usr/bin/env python3
+# ============================================================================
+# Test Vectors - Bulk generator and checker for counter_32bit vector files
+# ============================================================================
+# Purpose: Emit vector files in the signoff/documentation/test_vectors.txt
+#          format ("clk rst_n enable | count overflow", two lines per clock
+#          cycle) from a stimulus spec, with a compact binary sidecar, and
+#          check vector files against a golden model of the counter
+# Usage:   python vectors.py generate out.txt "reset:1 count:2 hold:1 overflow:1"
+#          python vectors.py check ../signoff/documentation/test_vectors.txt
+# ============================================================================
+
+import argparse
+import itertools
+import mmap
+import os
+import re
+import struct
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from report_engine import default_jobs
+
+# Clock cycles formatted per array operation by the generator
+DEFAULT_BLOCK_CYCLES = 1 << 18
+
+# Bytes of the vector file checked per task; bounds each worker's memory
+DEFAULT_CHECK_BYTES = 16 << 20
+
+# Checker tasks queued per worker (see sweep.INFLIGHT_PER_WORKER)
+INFLIGHT_PER_WORKER = 4
+
+RULE = "=" * 80
+
+# Comment emitted at the start of each spec segment
+SEGMENT_COMMENTS = {
+    "reset": "Reset test",
+    "count": "Count up",
+    "hold": "Hold",
+    "overflow": "Overflow",
+}
+
+# Sidecar: header, then one fixed-size record per vector line or marker
+SIDECAR_MAGIC = b"CTRVEC1\0"
+SIDECAR_HEADER = struct.Struct("<8sIIQ")  # magic, width, record size, records
+FLAG_CLK = 0x01
+FLAG_RST_N = 0x02
+FLAG_ENABLE = 0x04
+FLAG_OVERFLOW = 0x08
+FLAG_LOAD = 0x80  # "... (count to X)" marker: count holds X
+
+MARKER = re.compile(rb"^\.\.\.\s*\(count to ([0-9A-Fa-f]+)\)")
+
+Segment = namedtuple("Segment", "kind value")
+
+# First vector line that disagrees with the golden model
+Mismatch = namedtuple("Mismatch", "line text expected_count expected_overflow")
+
+# Result of checking one byte range of a vector file
+ChunkResult = namedtuple("ChunkResult", "lines vectors mismatch")
+
+
+def parse_spec(spec):
+    """Parse a stimulus spec such as "reset:2 count:1000 hold:5 load:FFFFFFF0"
+
+    Segments are whitespace or comma separated kind:value pairs:
+      reset:N     N cycles with rst_n = 0
+      count:N     N cycles with enable = 1
+      hold:N      N cycles with enable = 0
+      load:HEX    jump the counter to HEX ("... (count to HEX)" marker)
+      overflow:N  load all ones, then count N cycles
+    """
+    segments = []
+    for item in re.split(r"[\s,]+", spec.strip()):
+        kind, _, value = item.partition(":")
+        if kind == "load":
+            segments.append(Segment(kind, int(value, 16)))
+        elif kind in ("reset", "count", "hold", "overflow"):
+            segments.append(Segment(kind, int(value or 1)))
+        else:
+            raise ValueError(f"Unknown stimulus segment '{item}'")
+    return segments
+
+
+def _line_length(width):
+    digits = (width + 3) // 4
+    return digits, 8 + digits + 3  # "c r e | " + digits + " o\n"
+
+
+def _hex_rows(values, width, digits):
+    """ASCII hex digit matrix (values x digits) of uint64 or Python int values"""
+    if width <= 64:
+        values = np.asarray(values, dtype=np.uint64)
+        shifts = np.arange(digits - 1, -1, -1, dtype=np.uint64) * np.uint64(4)
+        nibbles = (values[:, None] >> shifts[None, :]) & np.uint64(0xF)
+        return _HEX_ASCII[nibbles.astype(np.uint8)]
+    text = "".join(f"{int(v):0{digits}X}" for v in values).encode()
+    return np.frombuffer(text, dtype=np.uint8).reshape(-1, digits)
+
+
+_HEX_ASCII = np.frombuffer(b"0123456789ABCDEF", dtype=np.uint8)
+
+
+class VectorWriter:
+    """Writes a vector text file and, optionally, its binary sidecar"""
+
+    def __init__(self, path, width=32, sidecar=None):
+        self.width = width
+        self.mask = (1 << width) - 1
+        self.digits, self.line_length = _line_length(width)
+        self.count_bytes = (width + 7) // 8
+        self.records = 0
+        self.vectors = 0
+        self.file = open(path, 'wb')
+        self.sidecar = open(sidecar, 'wb') if sidecar else None
+        self.record_dtype = np.dtype([("flags", "u1"), ("count", "u1", (self.count_bytes,))])
+
+        self.file.write("\n".join([
+            RULE,
+            f"TEST VECTORS - counter_{width}bit",
+            RULE,
+            "",
+            f"Format: clk rst_n enable | count[{width - 1}:0] overflow",
+            "",
+            "",
+        ]).encode())
+        if self.sidecar:
+            self.sidecar.write(SIDECAR_HEADER.pack(SIDECAR_MAGIC, width,
+                                                   self.record_dtype.itemsize, 0))
+
+    def comment(self, text):
+        self.file.write(f"# {text}\n".encode())
+
+    def load(self, value):
+        """Emit a "... (count to X)" marker"""
+        value &= self.mask
+        self.file.write(f"... (count to {value:0{self.digits}X})\n".encode())
+        self._write_records(np.array([FLAG_LOAD], dtype=np.uint8), [value])
+
+    def cycles(self, start, cycles, rst_n, enable):
+        """Emit `cycles` clock cycles with constant inputs from count `start`
+
+        Returns the count after the last rising edge.
+        """
+        if not rst_n:
+            before = after = np.zeros(cycles, dtype=np.uint64)
+            end = 0
+        elif self.width <= 64:
+            steps = np.arange(cycles, dtype=np.uint64) * np.uint64(enable)
+            before = (np.uint64(start) + steps) & np.uint64(self.mask)
+            after = (before + np.uint64(enable)) & np.uint64(self.mask)
+            end = int(after[-1])
+        else:
+            before = [(start + k * enable) & self.mask for k in range(cycles)]
+            after = [(v + enable) & self.mask for v in before]
+            end = after[-1]
+
+        # Interleave the clk=0 (before the edge) and clk=1 (after) lines
+        values = np.empty(2 * cycles, dtype=object if self.width > 64 else np.uint64)
+        values[0::2], values[1::2] = before, after
+        overflow = (values == self.mask) if enable else np.zeros(2 * cycles, dtype=bool)
+
+        rows = np.empty((2 * cycles, self.line_length), dtype=np.uint8)
+        rows[:, :8] = np.frombuffer(f"0 {rst_n} {enable} | ".encode(), dtype=np.uint8)
+        rows[1::2, 0] = ord("1")
+        rows[:, 8:8 + self.digits] = _hex_rows(values, self.width, self.digits)
+        rows[:, -3] = ord(" ")
+        rows[:, -2] = np.where(overflow, ord("1"), ord("0"))
+        rows[:, -1] = ord("\n")
+        self.file.write(rows.tobytes())
+        self.vectors += 2 * cycles
+
+        flags = np.full(2 * cycles, (FLAG_RST_N if rst_n else 0) | (FLAG_ENABLE if enable else 0),
+                        dtype=np.uint8)
+        flags[1::2] |= FLAG_CLK
+        flags[overflow] |= FLAG_OVERFLOW
+        self._write_records(flags, values)
+        return end
+
+    def _write_records(self, flags, values):
+        self.records += len(flags)
+        if not self.sidecar:
+            return
+        records = np.zeros(len(flags), dtype=self.record_dtype)
+        records["flags"] = flags
+        if self.width <= 64:
+            raw = np.asarray(values, dtype="<u8").view(np.uint8).reshape(-1, 8)
+            records["count"] = raw[:, :self.count_bytes]
+        else:
+            records["count"] = np.frombuffer(
+                b"".join(int(v).to_bytes(self.count_bytes, "little") for v in values),
+                dtype=np.uint8).reshape(-1, self.count_bytes)
+        self.sidecar.write(records.tobytes())
+
+    def close(self):
+        self.file.close()
+        if self.sidecar:
+            self.sidecar.seek(0)
+            self.sidecar.write(SIDECAR_HEADER.pack(SIDECAR_MAGIC, self.width,
+                                                   self.record_dtype.itemsize, self.records))
+            self.sidecar.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def generate(path, spec, width=32, sidecar=None, block_cycles=DEFAULT_BLOCK_CYCLES):
+    """Write the vectors of a stimulus spec; returns the number of vector lines"""
+    segments = parse_spec(spec) if isinstance(spec, str) else spec
+    count = 0
+    with VectorWriter(path, width, sidecar) as writer:
+        for kind, value in segments:
+            if kind in SEGMENT_COMMENTS:
+                writer.comment(SEGMENT_COMMENTS[kind])
+            if kind in ("load", "overflow"):
+                count = writer.mask if kind == "overflow" else value & writer.mask
+                writer.load(count)
+                if kind == "load":
+                    continue
+            rst_n, enable = {"reset": (0, 0), "hold": (1, 0)}.get(kind, (1, 1))
+            for done in range(0, value, block_cycles):
+                count = writer.cycles(count, min(block_cycles, value - done), rst_n, enable)
+        return writer.vectors
+
+
+def load_sidecar(path):
+    """Map a binary sidecar: returns (width, structured record array)
+
+    Records have a 'flags' byte (FLAG_*) and the little-endian 'count' bytes;
+    the array is a read-only memory map, so reloading is constant time.
+    """
+    with open(path, 'rb') as f:
+        magic, width, record_size, records = SIDECAR_HEADER.unpack(f.read(SIDECAR_HEADER.size))
+    if magic != SIDECAR_MAGIC:
+        raise ValueError(f"{path}: not a test-vector sidecar")
+    dtype = np.dtype([("flags", "u1"), ("count", "u1", ((width + 7) // 8,))])
+    if dtype.itemsize != record_size:
+        raise ValueError(f"{path}: record size {record_size} does not match WIDTH {width}")
+    return width, np.memmap(path, dtype=dtype, mode='r', offset=SIDECAR_HEADER.size,
+                            shape=(records,))
+
+
+# ----------------------------------------------------------------------------
+# Checker
+# ----------------------------------------------------------------------------
+
+_HEX_VALUE = np.full(256, 255, dtype=np.uint8)
+for _digit, _char in enumerate(b"0123456789ABCDEF"):
+    _HEX_VALUE[_char] = _HEX_VALUE[ord(chr(_char).lower())] = _digit
+
+
+def file_width(path):
+    """WIDTH declared by the "Format: ... count[N:0]" header line, else from the vectors"""
+    with open(path, 'rb') as f:
+        for line in itertools.islice(f, 64):
+            match = re.search(rb"count\[(\d+):0\]", line)
+            if match:
+                return int(match.group(1)) + 1
+            match = re.match(rb"^[01] [01] [01] \| ([0-9A-Fa-f]+) [01]\s*$", line)
+            if match:
+                return 4 * len(match.group(1))
+    raise ValueError(f"{path}: cannot determine the counter WIDTH")
+
+
+def _digit_max(width, digits):
+    dmax = np.full(digits, 15, dtype=np.uint8)
+    dmax[0] = (1 << (width - 4 * (digits - 1))) - 1
+    return dmax
+
+
+def _increment(digits, dmax):
+    """Add one to rows of hex digit values (MSB first), wrapping at 2**WIDTH"""
+    at_max = digits == dmax
+    # Digits below the lowest non-max digit roll over to 0
+    trailing = np.flip(np.cumprod(np.flip(at_max, axis=1), axis=1), axis=1).astype(bool)
+    result = np.where(trailing, 0, digits)
+    bump = np.argmin(np.flip(trailing, axis=1), axis=1)  # first non-trailing from LSB
+    position = digits.shape[1] - 1 - bump
+    rows = np.flatnonzero(~trailing.all(axis=1))
+    result[rows, position[rows]] += 1
+    return result
+
+
+def _state_before(data, width, digits, line_length, pos):
+    """Golden (clk, count digits) carried into the line starting at pos
+
+    Scans backwards to the nearest vector line (and any marker after it);
+    returns the initial state (clk = 1, count = 0) at the start of a file.
+    """
+    clk, count = None, None
+    end = pos
+    while end > 0 and clk is None:
+        start = data.rfind(b"\n", 0, end - 1) + 1
+        line = data[start:end].rstrip(b"\r\n")
+        marker = MARKER.match(line)
+        if marker and count is None:
+            count = _marker_digits(marker.group(1), width, digits)
+        elif len(line) == line_length - 1 and line[:1] in (b"0", b"1") and line[6:7] == b"|":
+            clk = line[0] - 48
+            if count is None:
+                count = _HEX_VALUE[np.frombuffer(line[8:8 + digits], dtype=np.uint8)]
+        end = start
+    if count is None:
+        count = np.zeros(digits, dtype=np.uint8)
+    return (1 if clk is None else clk), count
+
+
+def _marker_digits(text, width, digits):
+    value = int(text, 16) & ((1 << width) - 1)
+    return _HEX_VALUE[np.frombuffer(f"{value:0{digits}X}".encode(), dtype=np.uint8)]
+
+
+def check_chunk(path, start, stop, width):
+    """Worker entry point: check the lines in bytes [start, stop) of a vector file
+
+    Every vector line is checked against the golden model stepped from the
+    previous vector (or marker) line as recorded in the file, so chunks are
+    independent: up to the first mismatch this is the same as stepping the
+    model from the start of the file.
+    """
+    digits, line_length = _line_length(width)
+    dmax = _digit_max(width, digits)
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        clk0, count0 = _state_before(data, width, digits, line_length, start)
+        raw = np.frombuffer(data[start:stop], np.uint8)
+
+        ends = np.flatnonzero(raw == 10)
+        if not len(ends) or ends[-1] != len(raw) - 1:
+            ends = np.append(ends, len(raw))
+        starts = np.empty_like(ends)
+        starts[0] = 0
+        starts[1:] = ends[:-1] + 1
+        lengths = ends - starts - (raw[np.maximum(ends - 1, 0)] == 13)
+
+        first = raw[np.minimum(starts, len(raw) - 1)]
+        is_vector = (first == 48) | (first == 49)  # '0' / '1'
+        is_marker = first == ord(".")
+        state_lines = np.flatnonzero(is_vector | is_marker)
+        if not len(state_lines):
+            return ChunkResult(len(ends), 0, None)
+
+        # Count digits of every state line; markers are decoded in Python
+        s = starts[state_lines]
+        vec = is_vector[state_lines]
+        column = np.minimum(s[:, None] + 8 + np.arange(digits)[None, :], len(raw) - 1)
+        count = _HEX_VALUE[raw[column]]
+        clk = np.where(vec, raw[s] - 48, -1).astype(np.int8)
+        rst_n = raw[np.minimum(s + 2, len(raw) - 1)] - 48
+        enable = raw[np.minimum(s + 4, len(raw) - 1)] - 48
+        overflow = raw[np.minimum(s + 9 + digits, len(raw) - 1)] - 48
+        well_formed = (vec & (lengths[state_lines] == line_length - 1)
+                       & (raw[np.minimum(s + 6, len(raw) - 1)] == ord("|"))
+                       & (rst_n <= 1) & (enable <= 1) & (overflow <= 1)
+                       & (count <= dmax).all(axis=1))
+        for i in np.flatnonzero(~vec):
+            line = bytes(raw[starts[state_lines[i]]:ends[state_lines[i]]])
+            marker = MARKER.match(line)
+            if marker:
+                count[i] = _marker_digits(marker.group(1), width, digits)
+                well_formed[i] = True
+
+        # Previous state of each line: markers keep the clock level
+        prev_count = np.vstack([count0[None, :], count[:-1]])
+        index = np.maximum.accumulate(np.where(clk >= 0, np.arange(len(clk)), -1))
+        clk_level = np.where(index >= 0, clk[np.maximum(index, 0)], clk0)
+        prev_clk = np.concatenate([[clk0], clk_level[:-1]])
+
+        edge = (clk == 1) & (prev_clk == 0)
+        increment = vec & (rst_n == 1) & edge & (enable == 1)
+        expected = prev_count.copy()
+        if increment.any():
+            expected[increment] = _increment(prev_count[increment], dmax)
+        expected[vec & (rst_n == 0)] = 0
+        expected_overflow = (expected == dmax).all(axis=1) & (enable == 1)
+
+        bad = vec & (~well_formed | (expected != count).any(axis=1)
+                     | (expected_overflow != (overflow == 1)))
+        bad |= ~vec & ~well_formed
+        mismatch = None
+        if bad.any():
+            i = int(np.argmax(bad))
+            line_index = int(state_lines[i])
+            text = bytes(raw[starts[line_index]:ends[line_index]]).decode("ascii", "replace")
+            value = "".join("0123456789ABCDEF"[d] for d in expected[i])
+            mismatch = Mismatch(line_index, text.rstrip("\r"), value,
+                                int(expected_overflow[i]))
+        return ChunkResult(len(ends), int(vec.sum()), mismatch)
+
+
+def _chunk_bounds(path, chunk_bytes):
+    """Byte ranges of about chunk_bytes each, split after newlines"""
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        pos = 0
+        while pos < size:
+            stop = min(pos + chunk_bytes, size)
+            if stop < size:
+                f.seek(stop)
+                stop += len(f.readline())
+            yield pos, stop
+            pos = stop
+
+
+def check(path, width=None, jobs=1, chunk_bytes=DEFAULT_CHECK_BYTES):
+    """Check a vector file against the golden model
+
+    Returns (vectors checked, first Mismatch with a 1-based line number or
+    None). Byte ranges are checked in parallel with a bounded queue; ranges
+    after the first failing one are not checked.
+    """
+    width = width or file_width(path)
+    chunks = _chunk_bounds(path, chunk_bytes)
+    results = {}
+
+    if jobs <= 1:
+        for index, (start, stop) in enumerate(chunks):
+            results[index] = check_chunk(path, start, stop, width)
+            if results[index].mismatch:
+                break
+    else:
+        limit = jobs * INFLIGHT_PER_WORKER
+        failed = None
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            inflight = {}
+            for index, bounds in enumerate(itertools.chain(chunks, [None])):
+                if bounds is not None and failed is None:
+                    inflight[pool.submit(check_chunk, path, *bounds, width)] = index
+                    if len(inflight) < limit:
+                        continue
+                while inflight and (bounds is None or failed is not None
+                                    or len(inflight) >= limit):
+                    done, _ = wait(inflight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        index_done = inflight.pop(future)
+                        results[index_done] = future.result()
+                        if results[index_done].mismatch and \
+                                (failed is None or index_done < failed):
+                            failed = index_done
+                if failed is not None and bounds is not None:
+                    break
+
+    vectors = line = 0
+    for index in range(len(results)):
+        if index not in results:
+            break
+        result = results[index]
+        vectors += result.vectors
+        if result.mismatch:
+            return vectors, result.mismatch._replace(line=line + result.mismatch.line + 1)
+        line += result.lines
+    return vectors, None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Test-vector generator and checker")
+    sub = parser.add_subparsers(dest="command", required=True)
+    gen = sub.add_parser("generate", help="write vectors for a stimulus spec")
+    gen.add_argument("path")
+    gen.add_argument("spec", help='e.g. "reset:1 count:2 hold:1 overflow:1"')
+    gen.add_argument("--width", type=int, default=32)
+    gen.add_argument("--sidecar", metavar="FILE", help="also write the binary sidecar")
+    chk = sub.add_parser("check", help="check a vector file against the golden model")
+    chk.add_argument("path")
+    chk.add_argument("--width", type=int, help="counter WIDTH (default: from the file)")
+    chk.add_argument("-j", "--jobs", type=int, default=default_jobs(),
+                     help="parallel checker workers (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    if args.command == "generate":
+        vectors = generate(args.path, args.spec, args.width, args.sidecar)
+        print(f"✓ Generated: {args.path} ({vectors:,} vectors)")
+        if args.sidecar:
+            print(f"✓ Generated: {args.sidecar}")
+        return 0
+
+    vectors, mismatch = check(args.path, args.width, args.jobs)
+    if mismatch:
+        print(f"✗ {args.path}:{mismatch.line}: '{mismatch.text}' "
+              f"(expected count {mismatch.expected_count}, "
+              f"overflow {mismatch.expected_overflow})")
+        return 1
+    print(f"✓ {args.path}: {vectors:,} vectors match the golden model")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
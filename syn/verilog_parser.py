@@ -0,0 +1,618 @@
+#!/usr/bin/env python3
+# ============================================================================
+# Verilog Parser - Streaming reader for structural gate-level netlists
+# ============================================================================
+# Purpose: Read netlists such as syn/netlists/counter_32bit_syn.v back into
+#          netlist_db.Netlist in a single pass over the file
+#
+# Supported subset:
+#   module headers (ANSI or port-name lists), input/output/inout/wire
+#   declarations with [msb:lsb] ranges, parameter/localparam, cell
+#   instances with named pin connections, assign (net aliasing), genvar and
+#   generate for-loops (unrolled, nested allowed). Bit-selects, part-selects,
+#   sized constants and {concatenations} are accepted wherever a net is.
+# Usage:   python verilog_parser.py [-j N] netlist.v [more.v ...]
+# ============================================================================
+
+import argparse
+import ast
+import operator
+import re
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+
+from netlist_db import CELL_PINS, Netlist, Port
+from report_engine import default_jobs
+
+# Characters read from the file per step
+DEFAULT_READ_BYTES = 4 << 20
+
+# Comments, attributes and compiler directives (`timescale ...) are dropped
+COMMENTS = re.compile(r"//[^\n]*|/\*.*?\*/|\(\*.*?\*\)|`[^\n]*", re.S)
+KEYWORD = re.compile(
+    r"\s*(?:(endmodule|endgenerate|generate)\b"
+    r"|(end)\b"
+    r"|(begin)\b(?:\s*:\s*(\w+))?"
+    r"|for\s*\(([^;]*);([^;]*);([^)]*)\)\s*begin\b(?:\s*:\s*(\w+))?)", re.S)
+INSTANCE = re.compile(r"(\w+)\s*(?:#\s*\(.*?\)\s*)?(\\\S+|\w+)\s*\((.*)\)\s*$", re.S)
+PIN = re.compile(r"\.(\w+)\s*\(([^()]*)\)")  # nets never contain parentheses
+DECLARATION = re.compile(
+    r"(input|output|inout|wire|tri|reg|supply0|supply1)\b\s*(?:(?:wire|reg|tri)\b)?\s*"
+    r"(?:signed\b)?\s*(?:\[([^\]:]+):([^\]]+)\])?\s*(.*)$", re.S)
+PARAMETER = re.compile(r"(?:parameter|localparam)\b\s*(?:integer\b)?\s*(?:\[[^\]]*\])?\s*(.*)$",
+                       re.S)
+MODULE = re.compile(r"module\s+(\w+)\s*(?:#\s*\((.*?)\)\s*)?(?:\((.*)\))?\s*$", re.S)
+PORT_ITEM = re.compile(
+    r"\s*(?:(input|output|inout)\b)?\s*(?:(?:wire|reg)\b)?\s*(?:signed\b)?\s*"
+    r"(?:\[([^\]:]+):([^\]]+)\])?\s*(\\\S+|\w+)\s*$", re.S)
+CONSTANT = re.compile(r"(\d*)\s*'\s*[sS]?([bBoOdDhH])\s*([0-9a-fA-FxXzZ_?]+)")
+SELECT = re.compile(r"(\\\S+|[A-Za-z_][\w$]*)\s*(?:\[\s*([^\]:]+?)\s*(?::\s*([^\]]+?)\s*)?\])?$")
+
+
+class VerilogError(ValueError):
+    """Unsupported or malformed netlist text"""
+
+
+# ----------------------------------------------------------------------------
+# Constant expressions (ranges, generate loops) - evaluated without eval()
+# ----------------------------------------------------------------------------
+
+_OPS = {
+    ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul,
+    ast.Div: operator.floordiv, ast.FloorDiv: operator.floordiv, ast.Mod: operator.mod,
+    ast.Pow: operator.pow, ast.LShift: operator.lshift, ast.RShift: operator.rshift,
+    ast.BitAnd: operator.and_, ast.BitOr: operator.or_, ast.BitXor: operator.xor,
+    ast.Lt: operator.lt, ast.LtE: operator.le, ast.Gt: operator.gt, ast.GtE: operator.ge,
+    ast.Eq: operator.eq, ast.NotEq: operator.ne,
+    ast.USub: operator.neg, ast.UAdd: operator.pos, ast.Invert: operator.invert,
+    ast.Not: operator.not_,
+}
+
+
+@lru_cache(maxsize=4096)
+def _parse_expression(text):
+    text = CONSTANT.sub(lambda m: str(_constant_value(m)), text)
+    text = text.replace("&&", " and ").replace("||", " or ")
+    text = re.sub(r"!(?!=)", " not ", text)
+    try:
+        return ast.parse(text.strip(), mode="eval").body
+    except SyntaxError:
+        raise VerilogError(f"Cannot parse expression '{text.strip()}'") from None
+
+
+def _evaluate(node, env):
+    if isinstance(node, ast.Constant) and isinstance(node.value, int):
+        return node.value
+    if isinstance(node, ast.Name):
+        if node.id not in env:
+            raise VerilogError(f"Unknown identifier '{node.id}' in constant expression")
+        return env[node.id]
+    if isinstance(node, ast.BinOp) and type(node.op) in _OPS:
+        return _OPS[type(node.op)](_evaluate(node.left, env), _evaluate(node.right, env))
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _OPS:
+        return int(_OPS[type(node.op)](_evaluate(node.operand, env)))
+    if isinstance(node, ast.Compare):
+        left = _evaluate(node.left, env)
+        for op, comparator in zip(node.ops, node.comparators):
+            right = _evaluate(comparator, env)
+            if not _OPS[type(op)](left, right):
+                return 0
+            left = right
+        return 1
+    if isinstance(node, ast.BoolOp):
+        values = [_evaluate(value, env) for value in node.values]
+        return int(all(values) if isinstance(node.op, ast.And) else any(values))
+    if isinstance(node, ast.IfExp):
+        return _evaluate(node.body if _evaluate(node.test, env) else node.orelse, env)
+    raise VerilogError(f"Unsupported constant expression ({ast.dump(node)})")
+
+
+def evaluate(text, env):
+    """Value of a Verilog constant expression over parameters/genvars in env"""
+    text = text.strip()
+    if text.isdigit():
+        return int(text)
+    return _evaluate(_parse_expression(text), env)
+
+
+def _constant_value(match):
+    base = {"b": 2, "o": 8, "d": 10, "h": 16}[match.group(2).lower()]
+    digits = match.group(3).replace("_", "")
+    if re.search(r"[xXzZ?]", digits):
+        raise VerilogError(f"x/z constant '{match.group(0)}' is not supported")
+    return int(digits, base)
+
+
+# ----------------------------------------------------------------------------
+# Statement stream
+# ----------------------------------------------------------------------------
+
+def statements(path, read_bytes=DEFAULT_READ_BYTES):
+    """Yield (keyword, args) events and ("stmt", text) statements of a file
+
+    The file is read in line-aligned blocks; comments are stripped and the
+    text is split at ';' outside parentheses, so `for (...;...;...)`
+    headers stay whole. Keywords that need no ';' (module/generate ends,
+    begin/end and for headers) are peeled off the front of each statement.
+    """
+    carry = ""
+    with open(path) as f:
+        while True:
+            block = f.readlines(read_bytes)
+            if not block:
+                break
+            text = carry + "".join(block)
+            if "/" in text or "`" in text or "(*" in text:
+                text = COMMENTS.sub(" ", text)
+            open_comment = text.find("/*")
+            if open_comment >= 0:
+                text, tail = text[:open_comment], text[open_comment:]
+            else:
+                tail = ""
+            pieces = text.split(";")
+            carry = pieces.pop()
+            pending = ""
+            for piece in pieces:
+                if pending:
+                    piece = pending + ";" + piece
+                    pending = ""
+                if piece.count("(") != piece.count(")"):
+                    pending = piece
+                    continue
+                statement = piece.strip()
+                if statement.startswith(PEELED):
+                    yield from _peel(statement)
+                elif statement:
+                    yield "stmt", statement
+            carry = (pending + ";" if pending else "") + carry + tail
+    if carry.count("(") != carry.count(")"):
+        raise VerilogError(f"{path}: unbalanced parentheses near '{carry.strip()[:60]}'")
+    if carry.strip():
+        yield from _peel(carry)
+
+
+# Statements that may start with keywords needing no ';'
+PEELED = ("end", "gen", "begin", "for")
+
+
+def _peel(piece):
+    pos = 0
+    while True:
+        match = KEYWORD.match(piece, pos)
+        if not match:
+            break
+        if match.group(1):
+            yield match.group(1), ()
+        elif match.group(2):
+            yield "end", ()
+        elif match.group(3):
+            yield "begin", (match.group(4),)
+        else:
+            yield "for", match.group(5, 6, 7, 8)
+        pos = match.end()
+    rest = piece[pos:].strip()
+    if rest:
+        yield "stmt", rest
+
+
+# ----------------------------------------------------------------------------
+# Module builder
+# ----------------------------------------------------------------------------
+
+class _ModuleBuilder:
+    """Builds one Netlist from the statements of a module"""
+
+    def __init__(self, header, path):
+        match = MODULE.match(header)
+        if not match:
+            raise VerilogError(f"{path}: malformed module header '{header[:60]}'")
+        self.path = path
+        self.netlist = Netlist(match.group(1))
+        self.params = {}
+        self.nets = {}        # resolved net reference text -> net id (parse cache)
+        self.alias = {}       # union-find parent of aliased net ids (assign)
+        self.port_nets = set()
+        self.port_names = []  # non-ANSI port list, declared later in the body
+        self.scope = []       # generate blocks: (prefix, {local name: scoped name})
+        self.genvars = {}
+        self.types = {}       # cell type -> (type id, pin order, pin set)
+        self.single = {}      # pin connection text -> net id (parse cache)
+        self.implicit = 0
+        if match.group(2):
+            self.parameter(match.group(2))
+        if match.group(3):
+            self.header_ports(match.group(3))
+
+    # -- declarations --------------------------------------------------
+
+    def header_ports(self, text):
+        direction, rng = None, None
+        for item in text.split(","):
+            match = PORT_ITEM.match(item)
+            if not match:
+                raise VerilogError(f"{self.path}: cannot parse port '{item.strip()}'")
+            if match.group(1):
+                direction, rng = match.group(1), match.group(2, 3)
+            elif match.group(2):
+                rng = match.group(2, 3)
+            if direction is None:
+                self.port_names.append(match.group(4).lstrip("\\"))
+                continue
+            self.declare(direction, match.group(4), rng)
+
+    def parameter(self, text):
+        for item in _split_top(PARAMETER.sub(r"\1", text.strip()), ","):
+            name, _, value = item.partition("=")
+            name = name.replace("parameter", "").replace("localparam", "").split()[-1]
+            self.params[name] = evaluate(value, self.params)
+
+    def _range(self, rng):
+        if rng is None or rng[0] is None:
+            return None, 0
+        env = self._env()
+        msb, lsb = evaluate(rng[0], env), evaluate(rng[1], env)
+        return max(msb, lsb), min(msb, lsb)
+
+    def declare(self, kind, name, rng):
+        n = self.netlist
+        msb, lsb = self._range(rng)
+        name = name.lstrip("\\")
+        if self.scope:
+            prefix, local = self.scope[-1]
+            local[name] = f"{prefix}.{name}"
+            name = local[name]
+        bus = n.bus_index.get(name)
+        if bus is None:
+            bus = n.add_bus(name, msb, lsb)
+        elif msb is not None and n.bus_width[bus] != msb - lsb + 1:
+            raise VerilogError(f"{self.path}: '{name}' redeclared with a different range")
+        if kind in ("input", "output", "inout"):
+            n.ports.append(Port(kind, bus))
+            base = n.bus_base[bus]
+            self.port_nets.update(range(base, base + n.bus_width[bus]))
+
+    # -- nets ----------------------------------------------------------
+
+    def _env(self):
+        if not self.genvars:
+            return self.params
+        env = dict(self.params)
+        env.update(self.genvars)
+        return env
+
+    def bits(self, text):
+        """Net ids (LSB first) of a net expression"""
+        text = text.strip()
+        cached = self.nets.get(text)
+        if cached is not None:
+            return cached
+        if text.startswith("{"):
+            if not text.endswith("}"):
+                raise VerilogError(f"{self.path}: malformed concatenation '{text}'")
+            inner = text[1:-1].strip()
+            repeat = re.match(r"(\w+|\d+)\s*\{(.*)\}$", inner, re.S)
+            if repeat:
+                result = self.bits("{" + repeat.group(2) + "}") * evaluate(repeat.group(1),
+                                                                           self._env())
+            else:
+                result = []
+                for part in reversed(_split_top(inner, ",")):
+                    result += self.bits(part)
+        elif "'" in text:
+            match = CONSTANT.fullmatch(text)
+            if not match:
+                raise VerilogError(f"{self.path}: bad constant '{text}'")
+            width = int(match.group(1) or 32)
+            value = _constant_value(match)
+            result = [self.netlist.net(f"1'b{(value >> i) & 1}") for i in range(width)]
+        else:
+            match = SELECT.match(text)
+            if not match:
+                raise VerilogError(f"{self.path}: unsupported net expression '{text}'")
+            result = self._select(*match.groups())
+        if not self.scope:  # generate bodies depend on genvars and local wires
+            self.nets[text] = result
+        return result
+
+    def _select(self, name, first, second):
+        n = self.netlist
+        name = name.lstrip("\\")
+        if self.scope:
+            for _, local in reversed(self.scope):
+                if name in local:
+                    name = local[name]
+                    break
+        bus = n.bus_index.get(name)
+        if bus is None:
+            if first is not None:
+                raise VerilogError(f"{self.path}: bit-select of undeclared net '{name}'")
+            bus = n.add_bus(name)  # implicit 1-bit wire
+        if first is None:
+            base = n.bus_base[bus]
+            return list(range(base, base + n.bus_width[bus]))
+        env = self._env()
+        left = evaluate(first, env)
+        right = left if second is None else evaluate(second, env)
+        width, lsb = n.bus_width[bus], n.bus_lsb[bus]
+        if min(left, right) < lsb or max(left, right) >= lsb + width:
+            raise VerilogError(f"{self.path}: {name}[{first}] is out of range")
+        # The left index is the most significant bit; return LSB first
+        step = 1 if left >= right else -1
+        return [n.bit(bus, i) for i in range(right, left + step, step)]
+
+    def find(self, net):
+        alias = self.alias
+        root = net
+        while root in alias:
+            root = alias[root]
+        while net != root:
+            alias[net], net = root, alias[net]
+        return root
+
+    def assign(self, text):
+        lhs, eq, rhs = text[len("assign"):].partition("=")
+        if not eq:
+            raise VerilogError(f"{self.path}: malformed assign '{text}'")
+        left, right = self.bits(lhs), self.bits(rhs)
+        if len(right) < len(left):  # zero-extend, as Verilog does
+            right = right + [self.netlist.net("1'b0")] * (len(left) - len(right))
+        for a, b in zip(left, right):
+            a, b = self.find(a), self.find(b)
+            if a == b:
+                continue
+            # Keep port nets (and constants) as representatives
+            if a in self.port_nets or self._is_constant(a):
+                a, b = b, a
+            self.alias[a] = b
+
+    def _is_constant(self, net):
+        return self.netlist.bus_names[self.netlist.net_bus(net)].startswith("1'b")
+
+    # -- instances -----------------------------------------------------
+
+    def _cell_type(self, cell_type, name):
+        pins = CELL_PINS.get(cell_type)
+        if pins is None:
+            raise VerilogError(f"{self.path}: unknown cell type '{cell_type}' ({name})")
+        order = pins[0] + pins[1]
+        entry = self.types[cell_type] = (self.netlist.cell_type_id(cell_type), order,
+                                         frozenset(order))
+        return entry
+
+    def _pin_net(self, name, pin, expr):
+        expr = expr.strip()
+        if not expr:
+            self.implicit += 1
+            return self.netlist.bit(self.netlist.add_bus(f"__unconnected_{self.implicit}"))
+        n = self.netlist
+        if not self.genvars:
+            # Plain "net" or "bus[3]" references skip the general expression path
+            base, bracket, index = expr.partition("[")
+            bus = n.bus_index.get(base)
+            if bus is not None and (not bracket and n.bus_width[bus] == 1 or
+                                    index[:-1].isdigit() and index[-1:] == "]"):
+                net = n.bit(bus, int(index[:-1])) if bracket else n.bus_base[bus]
+                if not n.bus_base[bus] <= net < n.bus_base[bus] + n.bus_width[bus]:
+                    raise VerilogError(f"{self.path}: {expr} is out of range")
+                self.single[expr] = net
+                return net
+        bits = self.bits(expr)
+        if len(bits) != 1:
+            raise VerilogError(f"{self.path}: {name}.{pin}: {len(bits)}-bit connection")
+        if not self.genvars:
+            self.single[expr] = bits[0]
+        return bits[0]
+
+    def instance(self, text):
+        match = INSTANCE.match(text)
+        if not match:
+            raise VerilogError(f"{self.path}: cannot parse statement '{text[:80]}'")
+        cell_type, name, body = match.groups()
+        type_id, order, pinset = self.types.get(cell_type) or self._cell_type(cell_type, name)
+        connections = dict(PIN.findall(body))
+        if len(connections) != len(order) or not pinset.issuperset(connections):
+            if not connections and body.strip():
+                raise VerilogError(f"{self.path}: {name}: only named pin connections "
+                                   f"are supported")
+            unknown = set(connections) - pinset
+            if unknown:
+                raise VerilogError(f"{self.path}: {name}: {cell_type} has no pin "
+                                   f"{', '.join(sorted(unknown))}")
+
+        # Fast path: single-bit nets already seen outside generate loops
+        single = self.single if not self.genvars else {}
+        nets = [single.get(connections.get(pin, "")) for pin in order]
+        if None in nets:
+            nets = [net if net is not None else
+                    self._pin_net(name, pin, connections.get(pin, ""))
+                    for pin, net in zip(order, nets)]
+        name = name.lstrip("\\")
+        if self.scope:
+            name = f"{self.scope[-1][0]}.{name}"
+        self.netlist.add_cell(type_id, name, nets)
+
+    # -- statements ----------------------------------------------------
+
+    def statement(self, text):
+        head = text.split(None, 1)[0]
+        if head in ("input", "output", "inout", "wire", "tri", "reg", "supply0", "supply1"):
+            match = DECLARATION.match(text)
+            kind, msb, lsb, names = match.groups()
+            for name in _split_top(names, ","):
+                name = name.split("=")[0].strip()
+                if name:
+                    self.declare(kind, name, (msb, lsb) if msb else None)
+                    if kind in ("supply0", "supply1"):
+                        self.alias_constant(name, kind[-1])
+        elif head in ("parameter", "localparam"):
+            self.parameter(text)
+        elif head == "assign":
+            self.assign(text)
+        elif head in ("genvar", "integer", "timeunit", "timeprecision", "defparam"):
+            pass
+        else:
+            self.instance(text)
+
+    def alias_constant(self, name, value):
+        self.assign(f"assign {name} = 1'b{value}")
+
+    def unroll(self, header, body):
+        """Expand a generate for-loop over its body events"""
+        init, condition, step, label = header
+        var, _, start = init.partition("=")
+        var = var.replace("genvar", "").strip()
+        step_var, _, step_expr = step.partition("=")
+        if step_var.strip() != var:
+            raise VerilogError(f"{self.path}: unsupported generate step '{step.strip()}'")
+        outer = self.genvars
+        env = self._env()
+        value = evaluate(start, env)
+        iterations = 0
+        while True:
+            self.genvars = dict(outer, **{var: value})
+            env = self._env()
+            if not evaluate(condition, env):
+                break
+            prefix = f"{label or 'genblk'}[{value}]"
+            if self.scope:
+                prefix = f"{self.scope[-1][0]}.{prefix}"
+            self.scope.append((prefix, {}))
+            self.run(iter(body))
+            self.scope.pop()
+            value = evaluate(step_expr, env)
+            iterations += 1
+            if iterations > 1 << 24:
+                raise VerilogError(f"{self.path}: generate loop does not terminate")
+        self.genvars = outer
+
+    def run(self, events):
+        """Consume events up to the matching 'end' (or endmodule)"""
+        for kind, args in events:
+            if kind == "stmt":
+                self.statement(args)
+            elif kind == "for":
+                self.unroll(args, list(_block(events)))
+            elif kind == "begin":
+                self.run(events)
+            elif kind in ("end", "endmodule"):
+                return kind
+        return None
+
+    def finish(self):
+        n = self.netlist
+        for name in self.port_names:
+            if n.bus_index.get(name) is None:
+                raise VerilogError(f"{self.path}: port '{name}' is never declared")
+        if self.alias:
+            remap = np.arange(n.net_count, dtype=np.int32)
+            for net in list(self.alias):
+                remap[net] = self.find(net)
+            pin_net = remap[np.frombuffer(n.pin_net, dtype=np.int32)]
+            n.pin_net = array('i', pin_net.tobytes())
+        return n
+
+
+def _block(events):
+    """Events of a begin/for body up to its matching 'end'"""
+    depth = 0
+    for kind, args in events:
+        if kind in ("begin", "for"):
+            depth += 1
+        elif kind == "end":
+            if depth == 0:
+                return
+            depth -= 1
+        yield kind, args
+
+
+def _split_top(text, separator):
+    """Split at separator outside (), [] and {}"""
+    parts, depth, start = [], 0, 0
+    for i, char in enumerate(text):
+        if char in "([{":
+            depth += 1
+        elif char in ")]}":
+            depth -= 1
+        elif char == separator and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return [part.strip() for part in parts if part.strip()]
+
+
+# ----------------------------------------------------------------------------
+# Entry points
+# ----------------------------------------------------------------------------
+
+def parse_file(path, read_bytes=DEFAULT_READ_BYTES):
+    """Parse every module of a netlist file; returns a list of Netlists"""
+    modules = []
+    events = statements(path, read_bytes)
+    for kind, args in events:
+        if kind == "stmt" and args.startswith("module"):
+            builder = _ModuleBuilder(args, path)
+            builder.run(_module_body(events))
+            modules.append(builder.finish())
+        elif kind in ("stmt", "for", "begin"):
+            raise VerilogError(f"{path}: statement outside a module: {str(args)[:60]}")
+    return modules
+
+
+def _module_body(events):
+    for kind, args in events:
+        if kind == "endmodule":
+            return
+        if kind in ("generate", "endgenerate"):
+            continue
+        yield kind, args
+
+
+def read_netlist(path, top=None):
+    """The module named top (default: the last module) of a netlist file"""
+    modules = parse_file(path)
+    if not modules:
+        raise VerilogError(f"{path}: no module found")
+    if top is None:
+        return modules[-1]
+    for module in modules:
+        if module.name == top:
+            return module
+    raise VerilogError(f"{path}: no module named '{top}'")
+
+
+def parse_files(paths, jobs=1):
+    """Parse several files, in parallel processes when jobs > 1
+
+    Returns {path: [Netlist, ...]} in the order of paths.
+    """
+    paths = list(paths)
+    if jobs <= 1 or len(paths) == 1:
+        return {path: parse_file(path) for path in paths}
+    with ProcessPoolExecutor(max_workers=min(jobs, len(paths))) as pool:
+        return dict(zip(paths, pool.map(parse_file, paths)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Structural Verilog netlist reader")
+    parser.add_argument("paths", nargs="+", metavar="netlist.v")
+    parser.add_argument("-j", "--jobs", type=int, default=default_jobs(),
+                        help="files parsed in parallel (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    results = parse_files(args.paths, args.jobs)
+    elapsed = time.perf_counter() - start
+    for path, modules in results.items():
+        for netlist in modules:
+            counts = ", ".join(f"{t} {c}" for t, c in sorted(netlist.cell_counts().items()))
+            print(f"{path}: module {netlist.name}: {netlist.cell_count:,} cells, "
+                  f"{netlist.net_count:,} nets ({counts})")
+    print(f"Parsed {len(results)} file(s) in {elapsed:.2f} s")
+
+
+if __name__ == "__main__":
+    main()